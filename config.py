@@ -259,6 +259,9 @@ class BotConfig:
     # Slack credentials
     slack_bot_token: str = field(default_factory=lambda: os.getenv("SLACK_BOT_TOKEN", ""))
     slack_app_token: str = field(default_factory=lambda: os.getenv("SLACK_APP_TOKEN", ""))
+    # Web API base URL. Empty means Slack's own; `tools/fake_slack.py` is what anything else is
+    # for — a local stand-in the turn benchmark points the whole bot at.
+    slack_api_url: str = field(default_factory=lambda: os.getenv("SLACK_API_URL", ""))
     
     # OpenAI credentials
     # Standard name first; OPENAI_KEY is the legacy pre-v3 name, still accepted so existing
@@ -292,6 +295,20 @@ class BotConfig:
     utility_reasoning_effort: str = field(default_factory=lambda: os.getenv("UTILITY_REASONING_EFFORT", "none"))
     utility_verbosity: str = field(default_factory=lambda: os.getenv("UTILITY_VERBOSITY", "low"))
     utility_max_tokens: int = field(default_factory=lambda: int(os.getenv("UTILITY_MAX_TOKENS", "20")))
+    # In-memory memo of utility-model answers (openai_client/utility_memo.py), keyed by
+    # operation, model, prompt version and a digest of the exact request. Opt-in PER OPERATION:
+    # the summaries are pure functions of their input and on by default; the image-prompt
+    # rewrites are creative and stay off unless listed. Wake classification and memory
+    # extraction are channel-bound and never memoized, whatever this list says. Empty disables.
+    utility_memo_operations: List[str] = field(default_factory=lambda: [
+        op.strip() for op in os.getenv(
+            "UTILITY_MEMO_OPERATIONS", "tool_result_summary,document_summary,ambient_summary"
+        ).split(",") if op.strip()
+    ])
+    utility_memo_max_bytes: int = field(
+        default_factory=lambda: int(os.getenv("UTILITY_MEMO_MAX_BYTES", str(4 * 1024 * 1024))))
+    utility_memo_ttl: float = field(
+        default_factory=lambda: float(os.getenv("UTILITY_MEMO_TTL", "3600")))
     # Participation judgment gets its own effort: referent resolution ("is 'you' me
     # or the other agent?") reliably fails at `none`, and this call sits behind the
     # debounce window — not on the response critical path — so `low` costs nothing
@@ -410,6 +427,41 @@ class BotConfig:
     
     # Database configuration
     database_dir: str = field(default_factory=lambda: os.getenv("DATABASE_DIR", "data"))
+    # Long-lived read connections the async accessors share (writes go through one dedicated
+    # writer connection on top of these). A borrower that finds them all busy waits its turn.
+    db_reader_pool_size: int = field(default_factory=lambda: max(1, int(os.getenv("DB_READER_POOL_SIZE", "4"))))
+    # Startup skips init_schema and the migration chain when the live schema and database.py
+    # still match the fingerprint the last full pass stored. VERIFY=true runs the full pass anyway.
+    db_schema_verify: bool = field(default_factory=lambda: os.getenv("DB_SCHEMA_VERIFY", "false").lower() == "true")
+    # Group commit (off by default): tool-usage, thread-activity, receipt and ambient-status
+    # writes queue behind one worker and commit together, up to MAX_ROWS per batch, one
+    # write-lock acquisition per batch. WINDOW_MS > 0 also holds a batch open that long for
+    # company. Each caller still returns only after its batch commits.
+    db_group_commit_enabled: bool = field(default_factory=lambda: os.getenv("DB_GROUP_COMMIT", "false").lower() == "true")
+    db_group_commit_window_ms: float = field(default_factory=lambda: max(0.0, float(os.getenv("DB_GROUP_COMMIT_WINDOW_MS", "0"))))
+    db_group_commit_max_rows: int = field(default_factory=lambda: max(1, int(os.getenv("DB_GROUP_COMMIT_MAX_ROWS", "64"))))
+    # Channel settings/policy/memory and user preferences are cached in-process and dropped by
+    # every write this process makes; the TTL bounds how long an edit made OUTSIDE the bot (the
+    # sqlite3 shell) can go unseen. 0 disables the cache.
+    db_settings_cache_ttl_seconds: float = field(default_factory=lambda: max(0.0, float(os.getenv("DB_SETTINGS_CACHE_TTL_SECONDS", "300"))))
+    # Debug: log every call site that runs a statement on the synchronous connection from the
+    # event-loop thread (each one stalls Socket Mode while it waits on the write lock).
+    db_loop_guard: bool = field(default_factory=lambda: os.getenv("DB_LOOP_GUARD", "false").lower() == "true")
+    # Retention sweeps delete/slim SWEEP_BATCH_ROWS rows per short write transaction and pause
+    # SWEEP_PAUSE_MS between batches; freed pages then go back to the OS VACUUM_PAGES_PER_STEP at
+    # a time. AUTO_VACUUM_CONVERT=true converts a pre-existing database to incremental
+    # auto-vacuum with a one-time VACUUM at the next nightly cleanup.
+    db_sweep_batch_rows: int = field(default_factory=lambda: max(1, int(os.getenv("DB_SWEEP_BATCH_ROWS", "500"))))
+    db_sweep_pause_ms: float = field(default_factory=lambda: max(0.0, float(os.getenv("DB_SWEEP_PAUSE_MS", "50"))))
+    db_vacuum_pages_per_step: int = field(default_factory=lambda: max(1, int(os.getenv("DB_VACUUM_PAGES_PER_STEP", "2048"))))
+    db_auto_vacuum_convert: bool = field(default_factory=lambda: os.getenv("DB_AUTO_VACUUM_CONVERT", "false").lower() == "true")
+    # Nightly backup pacing: copy PAGES_PER_STEP pages, sleep STEP_PAUSE_MS, repeat, from one
+    # pinned snapshot. COMPACT takes a defragmented VACUUM INTO copy instead (one unpaced
+    # statement). An interrupted copy is retried from a fresh snapshot up to ATTEMPTS times.
+    db_backup_pages_per_step: int = field(default_factory=lambda: max(1, int(os.getenv("DB_BACKUP_PAGES_PER_STEP", "1024"))))
+    db_backup_step_pause_ms: float = field(default_factory=lambda: max(0.0, float(os.getenv("DB_BACKUP_STEP_PAUSE_MS", "25"))))
+    db_backup_compact: bool = field(default_factory=lambda: os.getenv("DB_BACKUP_COMPACT", "false").lower() == "true")
+    db_backup_attempts: int = field(default_factory=lambda: max(1, int(os.getenv("DB_BACKUP_ATTEMPTS", "3"))))
 
     # Logging configuration
     log_level: str = field(default_factory=lambda: os.getenv("BOT_LOG_LEVEL", "INFO"))
@@ -429,6 +481,17 @@ class BotConfig:
     # BOTH as the outer asyncio.wait_for and as a per-request SDK timeout (the AsyncOpenAI
     # client is built with api_timeout_read, so wait_for alone can't extend past it).
     api_timeout_image: float = field(default_factory=lambda: float(os.getenv("API_TIMEOUT_IMAGE", "300")))
+    # The OpenAI HTTP pool (openai_client/transport.py). Idle connections are kept for
+    # KEEPALIVE_EXPIRY seconds, so it must outlast the keep-alive interval or the ping lands on
+    # a connection the pool has already dropped. HTTP/2 is used only when `h2` is installed.
+    openai_http_max_connections: int = field(default_factory=lambda: int(os.getenv("OPENAI_HTTP_MAX_CONNECTIONS", "50")))
+    openai_http_keepalive_connections: int = field(default_factory=lambda: int(os.getenv("OPENAI_HTTP_KEEPALIVE_CONNECTIONS", "10")))
+    openai_http_keepalive_expiry: float = field(default_factory=lambda: float(os.getenv("OPENAI_HTTP_KEEPALIVE_EXPIRY", "120")))
+    openai_http2: bool = field(default_factory=lambda: os.getenv("OPENAI_HTTP2", "true").lower() == "true")
+    # Connections opened at boot so the first turn does not pay TCP + TLS setup, and the idle
+    # gap after which a cheap request keeps one warm. 0 disables either.
+    openai_prewarm_connections: int = field(default_factory=lambda: int(os.getenv("OPENAI_PREWARM_CONNECTIONS", "2")))
+    openai_keepalive_interval: float = field(default_factory=lambda: float(os.getenv("OPENAI_KEEPALIVE_INTERVAL", "60")))
     # --- Socket-liveness monitor (F9, detection-only) ---
     # Seconds without ANY inbound Socket Mode envelope before the liveness monitor speaks
     # up: if slack_sdk's ping-pong is ALSO frozen for the same window it logs an ERROR
@@ -729,6 +792,22 @@ class BotConfig:
     # PARTICIPATION_DEBOUNCE_SECONDS above, and there is deliberately no second time constant.
     # Eviction can lose nothing anyone said: the map holds timestamps, never messages.
     participation_activity_lru_max: int = field(default_factory=lambda: int(os.getenv("PARTICIPATION_ACTIVITY_LRU_MAX", "1024")))
+    # While the gate debounces and classifies, start the pages a woken turn would read first
+    # (channel history back to the window floor, and the origin thread) into the Slack page cache,
+    # so a wake finds them in hand. Speculative: a decline or a newer message in the channel
+    # cancels it. Pages per arrival; 0 turns prefetch off. Needs the page cache
+    # (SLACK_PAGE_CACHE_TTL_SECONDS > 0) — without it there is nowhere to put the answers.
+    participation_prefetch_pages: int = field(default_factory=lambda: int(os.getenv("PARTICIPATION_PREFETCH_PAGES", "4")))
+    # Ceiling on prefetched pages per channel across a rolling minute, so a busy channel the gate
+    # keeps declining cannot spend its Slack rate limit on speculation.
+    participation_prefetch_pages_per_minute: int = field(default_factory=lambda: int(os.getenv("PARTICIPATION_PREFETCH_PAGES_PER_MINUTE", "12")))
+    # What that prefetch runs. `pages`: the turn's first reads only (history walk, origin thread).
+    # `stream`: the turn's whole stream build, speculatively and write-free, alongside the
+    # classifier — the reply fan-out and actor names too — with the result thrown away; the woken
+    # turn then builds from warm caches. It hides more of a wake and wastes more on a decline, and
+    # wants the two page limits above raised to cover a fan-out. The periodic `Wake-gate
+    # prefetch` stats line reports both sides. Anything else reads as `pages`.
+    participation_prefetch_mode: str = field(default_factory=lambda: os.getenv("PARTICIPATION_PREFETCH_MODE", "pages"))
     # F52: an EDIT to a recent human message can also drive a reply. A forgotten @mention ADDED
     # by an edit routes as an addressed wake (Slack fires no app_mention for edits); every other
     # channel edit goes through the participation engine's full typo-vs-meaning judgment, so a
@@ -767,6 +846,10 @@ class BotConfig:
     # Hard bound on a conversation's pending queue; beyond this, messages are dropped with a
     # log (Slack still has them — the thread is flagged for a transcript refetch).
     queue_max_pending: int = field(default_factory=lambda: int(os.getenv("QUEUE_MAX_PENDING", "25")))
+    # Warm threads absorb message/edit/delete events in place (checked against the root's
+    # reply_count/latest_reply before the turn uses them) instead of refetching the whole
+    # transcript on every edit or deletion. Off: every edit/deletion flags a full refetch.
+    thread_state_deltas: bool = field(default_factory=lambda: os.getenv("THREAD_STATE_DELTAS", "true").lower() == "true")
 
     # --- Local function-call loop (redesign Phase A) ---
     # Master switch for model-invoked local tools (history fetch, reactions, later search/memory).
@@ -782,6 +865,17 @@ class BotConfig:
     tool_call_timeout: float = field(default_factory=lambda: float(os.getenv("TOOL_CALL_TIMEOUT", "20")))
     # Truncation cap on a single tool result fed back to the model (characters).
     tool_result_max_chars: int = field(default_factory=lambda: int(os.getenv("TOOL_RESULT_MAX_CHARS", "20000")))
+    # Per-round caps by tool concurrency class (message_processor/tool_registry.py), as
+    # `class:limit` pairs. A round's calls still run concurrently, but no more than `limit` of one
+    # class at a time; the rest queue in call order. A class left out, or at 0, is unbounded, and
+    # so is a tool registered without a class.
+    tool_concurrency_limits: Dict[str, int] = field(default_factory=lambda: {
+        cls.strip(): int(limit)
+        for cls, _, limit in (pair.partition(":") for pair in os.getenv(
+            "TOOL_CONCURRENCY_LIMITS", "slack-read:4,slack-write:2,cpu-extract:2,openai:2"
+        ).split(","))
+        if cls.strip() and limit.strip()
+    })
     # Model-invoked emoji reactions (redesign Phase D) — allowlist still REACTION_EMOJIS.
     enable_react_tool: bool = field(default_factory=lambda: os.getenv("ENABLE_REACT_TOOL", "true").lower() == "true")
     # Model-invoked cross-thread reply tool (F23): post a reply into a DIFFERENT thread in the
@@ -906,6 +1000,27 @@ class BotConfig:
     # always the thing that stops the scan — the outer timeout is the backstop, never the plan.
     search_tool_timeout_seconds: float = field(default_factory=lambda: float(
         os.getenv("SEARCH_TOOL_TIMEOUT_SECONDS", "20")))
+    # In-memory search index per joined channel (slack_client/channel_index.py): built in the
+    # background at boot and kept current from live events, never written to disk. A channel
+    # whose index is built is searched from it; until then it gets the scan above.
+    search_index: bool = field(default_factory=lambda: os.getenv("SEARCH_INDEX", "true").lower() == "true")
+    # Messages one channel's index may hold; past it the oldest are dropped and the index stops
+    # claiming complete coverage.
+    search_index_max_messages: int = field(default_factory=lambda: max(1, int(
+        os.getenv("SEARCH_INDEX_MAX_MESSAGES", "10000"))))
+    # Approximate memory every channel's index may hold together; past it the oldest message in
+    # any channel is dropped first. 0 = no cap beyond the per-channel one.
+    search_index_max_mb: float = field(default_factory=lambda: max(0.0, float(
+        os.getenv("SEARCH_INDEX_MAX_MB", "256"))))
+    # Rebuild each channel's index this often, to catch anything a dropped socket never
+    # delivered. 0 = build once per boot.
+    search_index_refresh_seconds: float = field(default_factory=lambda: max(0.0, float(
+        os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "21600"))))
+    # Channels building at once, and the wall-clock bound on one build.
+    search_index_build_concurrency: int = field(default_factory=lambda: max(1, int(
+        os.getenv("SEARCH_INDEX_BUILD_CONCURRENCY", "2"))))
+    search_index_build_seconds: float = field(default_factory=lambda: max(1.0, float(
+        os.getenv("SEARCH_INDEX_BUILD_SECONDS", "900"))))
 
     # --- Document architecture (Phase D2) ---
     # Native file input: PDFs within the API limits ride the attach turn as an input_file
@@ -1041,6 +1156,15 @@ class BotConfig:
     # posted by then, but the turn is still held open, so a wedged upload would stall the next
     # message in the thread.
     artifact_publish_timeout: float = field(default_factory=lambda: float(os.getenv("ARTIFACT_PUBLISH_TIMEOUT", "120")))
+    # export_conversation streams: a part is staged as soon as it fills, so the bot holds a few
+    # parts at a time, never the channel. The part bound is this or ARTIFACT_MAX_MB, whichever is
+    # smaller.
+    export_part_mb: int = field(default_factory=lambda: max(1, int(os.getenv("EXPORT_PART_MB", "8"))))
+    # Thread-reply walks running at once inside one channel's export. The rate scheduler still
+    # paces conversations.replies, so this bounds in-flight work, not the request rate.
+    export_reply_concurrency: int = field(default_factory=lambda: max(1, int(os.getenv("EXPORT_REPLY_CONCURRENCY", "4"))))
+    # Channels exported at once when one call names several.
+    export_channel_concurrency: int = field(default_factory=lambda: max(1, int(os.getenv("EXPORT_CHANNEL_CONCURRENCY", "2"))))
     # Status-line emoji while the sandbox is running code.
     code_interpreter_emoji: str = field(default_factory=lambda: os.getenv("CODE_INTERPRETER_EMOJI", "📊"))
 
@@ -1109,6 +1233,30 @@ class BotConfig:
     # fails to build rather than one that merely builds slowly. The reply fan-out and the origin
     # fetch are UNBOUNDED by design and answer to the wall clock instead.
     history_page_ceiling: int = field(default_factory=lambda: max(1, int(os.getenv("HISTORY_PAGE_CEILING", "50"))))
+    # Memory-only cache of conversations.history/replies pages shared by every history reader
+    # (slack_client/page_cache.py). Message, edit and delete events invalidate it; the TTL bounds
+    # anything no event reported. Never persisted. A TTL of 0 turns it off.
+    slack_page_cache_ttl_seconds: float = field(default_factory=lambda: max(0.0, float(os.getenv("SLACK_PAGE_CACHE_TTL_SECONDS", "30"))))
+    slack_page_cache_max_mb: float = field(default_factory=lambda: max(0.0, float(os.getenv("SLACK_PAGE_CACHE_MAX_MB", "32"))))
+    # The in-memory user cache (slack_client/user_directory.py): at most this many users, least
+    # recently used evicted first, each refetched after the TTL. Size it above the workspace's
+    # member count so the directory sweep below fits whole — then name resolution never leaves
+    # memory. A TTL of 0 never expires an entry.
+    user_cache_max_entries: int = field(default_factory=lambda: max(1, int(os.getenv("USER_CACHE_MAX_ENTRIES", "20000"))))
+    user_cache_ttl_seconds: float = field(default_factory=lambda: max(0.0, float(os.getenv("USER_CACHE_TTL_SECONDS", "21600"))))
+    # Walk users.list in the background at start (and again every half TTL) so names render from
+    # memory instead of one users.info call per person after a restart. Persisted to the users
+    # table as it goes.
+    user_directory_warmup: bool = field(default_factory=lambda: os.getenv("USER_DIRECTORY_WARMUP", "true").lower() == "true")
+    # One client-side rate scheduler under every Slack Web API call (slack_client/rate_scheduler.py):
+    # token buckets per method at its published tier, per channel for chat.postMessage/update,
+    # and a 429 holds the method shut for everyone for Retry-After. Off = calls go straight out.
+    slack_rate_scheduler: bool = field(default_factory=lambda: os.getenv("SLACK_RATE_SCHEDULER", "true").lower() == "true")
+    # Share of each bucket background sweeps leave untouched for turn traffic.
+    slack_rate_background_reserve: float = field(default_factory=lambda: float(os.getenv("SLACK_RATE_BACKGROUND_RESERVE", "0.25")))
+    # Identical concurrent Slack reads (conversations.info/members/replies, users.info, ...) share
+    # one in-flight call and its response (slack_client/single_flight.py). Writes never do.
+    slack_single_flight: bool = field(default_factory=lambda: os.getenv("SLACK_SINGLE_FLIGHT", "true").lower() == "true")
     # Concurrent conversations.replies fetches while rebuilding one turn's stream.
     reply_fetch_concurrency: int = field(default_factory=lambda: max(1, int(os.getenv("REPLY_FETCH_CONCURRENCY", "4"))))
     # Per-turn retry budget for history/replies fetches. Retry-After is always honored; the
@@ -1116,8 +1264,10 @@ class BotConfig:
     fetch_retry_attempts: int = field(default_factory=lambda: max(1, int(os.getenv("FETCH_RETRY_ATTEMPTS", "3"))))
     fetch_retry_total_seconds: float = field(default_factory=lambda: float(os.getenv("FETCH_RETRY_TOTAL_SECONDS", "60")))
     # Channels whose bootstrap sweep may be actively fetching at once. Held only while a page
-    # is in flight — a worker parked on a ceiling or a Retry-After sleep releases it.
+    # is in flight — a worker parked on a ceiling or a Retry-After sleep releases it. This is
+    # the STARTING limit: it grows while pages succeed, up to the max below, and halves on a 429.
     coverage_sweep_concurrency: int = field(default_factory=lambda: max(1, int(os.getenv("COVERAGE_SWEEP_CONCURRENCY", "2"))))
+    coverage_sweep_max_concurrency: int = field(default_factory=lambda: max(1, int(os.getenv("COVERAGE_SWEEP_MAX_CONCURRENCY", "8"))))
 
     # --- Shallow stream window (SHALLOW_STREAM_RESPEC §2d) ---
     # BOTH COUNT TOP-LEVEL ROOTS, never events: replies posted inside the window's span ride
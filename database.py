@@ -14,9 +14,15 @@ import uuid
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Sequence, Dict, Iterable, List, Any, Tuple, cast
+from pathlib import Path
+from types import FrameType
+from typing import Optional, Sequence, Dict, Iterable, List, Any, Literal, Tuple, cast
 import logging
 import asyncio
+import contextvars
+import copy
+import sys
+import threading
 from config import dev_epoch_fence_requested
 from logger import LoggerMixin
 
@@ -36,6 +42,10 @@ OUTBOUND_RECEIPTS_EPOCH_KEY = "outbound_receipts_feature_epoch_ts"
 _P4A_CLEANUP_KEY = "p4a_compaction_schema_dropped"
 _COVERAGE_RENAME_KEY = "channel_coverage_renamed_to_inventory_at"
 
+# bot_meta key holding the schema fingerprint the last clean full migration pass ended on. A boot
+# whose live schema and database.py still hash to it skips the pass — see _open_schema.
+_SCHEMA_FINGERPRINT_KEY = "schema_fingerprint"
+
 # Receipt states, in the order the state machine allows: chrome and in_flight may promote,
 # finalized is absorbing.
 _RECEIPT_STATES = ("in_flight", "finalized", "chrome")
@@ -195,6 +205,37 @@ _UNATTENDED_SUFFIX = "). Not yet read."
 # an upgrading write may not replace a real summary with the placeholder.
 _UNATTENDED_LIKE = f"{_UNATTENDED_PREFIX}%{_UNATTENDED_SUFFIX}"
 
+# `images.channel_id` / `documents.channel_id`: the channel half of the "channel:thread" key,
+# as a VIRTUAL generated column so no writer (nor the upserts that move a row's thread_id) can
+# ever leave it stale. Up to the FIRST colon — thread keys carry colons of their own (CLAUDE.md
+# pitfall 3), channel ids never do — so "C1" cannot match "C12:…" the way a bare prefix could.
+# Indexed with created_at; the channel-scoped reads are equality lookups on it.
+_CHANNEL_OF_THREAD_ID_SQL = ("CASE WHEN instr(thread_id, ':') > 0 "
+                             "THEN substr(thread_id, 1, instr(thread_id, ':') - 1) END")
+_CHANNEL_CREATED_INDEXES = (
+    ("idx_images_channel_created", "images"),
+    ("idx_documents_channel_created", "documents"),
+    ("idx_tool_usage_channel_created", "message_tool_usage"),
+)
+# The per-turn sidecar read asks for a channel's rows by EXACT message ts; on the created_at
+# index that is a walk over the whole channel, which in a busy room is thousands of rows a turn.
+_CHANNEL_MESSAGE_INDEXES = (
+    ("idx_images_channel_message", "images"),
+    ("idx_documents_channel_message", "documents"),
+)
+
+# Full-text indexes over the DERIVED text the knowledge search reads: table → indexed columns.
+# External-content FTS5 tables (`<table>_fts`, rowid = the base row's id) kept in step by
+# triggers, so nothing is stored twice. The trigram tokenizer keeps LIKE's substring semantics —
+# "run_id" still finds "see run_id in the log" — and a trigram needs three characters, so a
+# shorter query falls back to the escaped LIKE scan.
+_KNOWLEDGE_FTS = {
+    "documents": ("filename", "summary"),
+    "images": ("analysis", "original_analysis"),
+    "ambient_artifacts": ("title", "summary"),
+}
+_FTS_MIN_QUERY_CHARS = 3
+
 
 def is_unattended_summary(summary: Optional[str]) -> bool:
     """True for the placeholder `catalog_unattended` writes instead of a real summary."""
@@ -203,6 +244,46 @@ def is_unattended_summary(summary: Optional[str]) -> bool:
             and len(text) > len(_UNATTENDED_PREFIX) + len(_UNATTENDED_SUFFIX))
 
 
+# save_document's statement, shared by its sync and async twins (see save_document for why the
+# channel surface upgrades in place and the placeholder never wins).
+_SAVE_DOCUMENT_SQL = f"""
+    INSERT INTO documents
+    (thread_id, filename, mime_type, summary, file_id, url_private,
+     size_bytes, page_structure, total_pages, metadata_json, message_ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (thread_id, message_ts, file_id)
+        WHERE {_CHANNEL_DOCS_PREDICATE}
+    DO UPDATE SET
+        filename = excluded.filename, mime_type = excluded.mime_type,
+        summary = excluded.summary, url_private = excluded.url_private,
+        size_bytes = excluded.size_bytes,
+        page_structure = excluded.page_structure,
+        total_pages = excluded.total_pages,
+        metadata_json = excluded.metadata_json
+    WHERE NOT (? = 1
+               AND TRIM(COALESCE(documents.summary, '')) <> ''
+               AND documents.summary NOT LIKE ?)
+"""
+
+# restore_document_derived's statement, likewise shared.
+_RESTORE_DOCUMENT_SQL = """
+    UPDATE documents
+    SET summary = ?, page_structure = ?, total_pages = ?,
+        size_bytes = COALESCE(?, size_bytes),
+        message_ts = COALESCE(?, message_ts)
+    WHERE thread_id = ? AND filename = ?
+"""
+
+
+def _save_document_params(thread_id, filename, mime_type, summary, file_id, url_private,
+                          size_bytes, page_structure, total_pages, metadata,
+                          message_ts) -> Tuple:
+    return (thread_id, filename, mime_type, summary, file_id, url_private, size_bytes,
+            json.dumps(page_structure) if page_structure else None, total_pages,
+            json.dumps(metadata) if metadata else None, message_ts,
+            1 if is_unattended_summary(summary) else 0, _UNATTENDED_LIKE)
+
+
 # Shared hash/normalize contract for channel-memory reconciliation. The settings modal builder,
 # the submit handler, and reconcile_channel_memory_from_textarea_async ALL route content through
 # these two functions so a content hash computed at modal-open matches one recomputed at submit —
@@ -588,6 +669,479 @@ def _build_channel_settings_write(channel_id, response_mode=_UNSET,
     return sql, params
 
 
+# What aiosqlite accepts for `isolation_level`; None is autocommit.
+_IsolationLevel = Optional[Literal["DEFERRED", "IMMEDIATE", "EXCLUSIVE"]]
+
+# True while the current task holds a pooled connection. A borrow made from INSIDE such a block
+# is served by a throwaway connection instead of the pool: the pool is small and the writer is a
+# single connection, so a task that waited on the pool while already holding a slot of it could
+# wait forever on itself. Per-call connections made that nesting free before the pool existed,
+# and the overflow path keeps it free.
+_POOL_BORROWED: "contextvars.ContextVar[bool]" = contextvars.ContextVar(
+    "database_pool_borrowed", default=False)
+
+# How long a sync shutdown waits for one retired connection to close before leaving it to its
+# (daemon) worker thread.
+_RETIRE_CLOSE_TIMEOUT_S = 5.0
+
+
+class _ConnectionPool:
+    """Long-lived aiosqlite connections for `DatabaseManager`: N readers plus ONE writer.
+
+    Opening a connection per call cost a worker thread, a file open and a `journal_mode` PRAGMA
+    that takes a lock, dozens of times a turn. Pooled connections pay that once and are handed
+    out EXCLUSIVELY — a borrower owns its connection for the whole `async with`, so the explicit
+    `BEGIN IMMEDIATE … COMMIT` blocks the accessors rely on are as isolated as they were on a
+    private connection. Writes queue on the single writer in-process instead of fighting over
+    SQLite's write lock, which is what used to run them into the busy timeout.
+
+    Connections open lazily up to their limit and are bound to the event loop and database path
+    they were opened for; a borrow under a different loop (each test gets its own) or a re-pointed
+    `db_path` retires the old set first.
+
+    A connection comes back in the state it left: an open transaction is rolled back and a
+    per-call busy timeout is restored to the house value. A borrower that was CANCELLED may still
+    have a statement queued on the connection's worker thread, so that connection is retired
+    rather than reused — the queued close runs after it and rolls back whatever it leaves open.
+    """
+
+    def __init__(self, readers: int, busy_timeout_ms: int):
+        self.db_path: Optional[str] = None
+        self.readers = max(1, int(readers))
+        self.busy_timeout_ms = busy_timeout_ms
+        self._limits = {"reader": self.readers, "writer": 1}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._idle: Dict[str, List[aiosqlite.Connection]] = {"reader": [], "writer": []}
+        self._open: set = set()
+        self._in_use = {"reader": 0, "writer": 0}
+        self._waiting = {"reader": 0, "writer": 0}
+        self._acquisitions = 0
+        self._waited = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._overflow = 0
+        self._retired = 0
+
+    def _bind(self, db_path: str) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is self._loop and db_path == self.db_path:
+            return
+        self.stop()
+        self._loop = loop
+        self.db_path = db_path
+        self._slots = {kind: asyncio.Semaphore(limit) for kind, limit in self._limits.items()}
+
+    async def _connect(self, db_path: str, timeout_ms: int) -> aiosqlite.Connection:
+        # `timeout=` bounds the opening statements for a capped caller — see `_stream_conn`.
+        # check_same_thread=False: each borrow sets isolation_level/row_factory from the event
+        # loop thread while the worker is idle — the borrow is exclusive, so nothing races it.
+        conn = aiosqlite.connect(db_path, isolation_level=None, timeout=timeout_ms / 1000.0,
+                                 check_same_thread=False)
+        # A pooled connection outlives every `async with`, so its worker thread must not hold
+        # the interpreter open at exit for an owner that never called close() (tests mostly).
+        worker = getattr(conn, "_thread", None)
+        if worker is not None:
+            worker.daemon = True
+        await conn
+        try:
+            await conn.execute("PRAGMA journal_mode=WAL")
+        except BaseException:
+            await conn.close()
+            raise
+        self._open.add(conn)
+        return conn
+
+    def _retire(self, conn: aiosqlite.Connection) -> None:
+        """Drop a connection without awaiting it: the close queues behind any pending work."""
+        self._open.discard(conn)
+        self._retired += 1
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Off the loop (a sync close() at shutdown), `stop()` would hand the worker a
+            # future on a loop that is already closed, and the worker thread dies noisily
+            # resolving it. Close on a short-lived loop of our own instead, bounded so a
+            # worker still busy with a cancelled borrower's statement cannot hold shutdown.
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(asyncio.wait_for(conn.close(), _RETIRE_CLOSE_TIMEOUT_S))
+            except Exception:  # noqa: BLE001
+                pass
+            finally:
+                loop.close()
+            return
+        try:
+            conn.stop()
+        except Exception:  # noqa: BLE001
+            pass
+
+    @asynccontextmanager
+    async def connection(self, db_path: str, *, write: bool, busy_timeout_ms: int,
+                         isolation_level: _IsolationLevel, row_factory: Any):
+        if _POOL_BORROWED.get():
+            self._overflow += 1
+            async with aiosqlite.connect(db_path, isolation_level=isolation_level,
+                                         timeout=busy_timeout_ms / 1000.0) as db:
+                db.row_factory = row_factory
+                await db.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+                await db.execute("PRAGMA journal_mode=WAL")
+                yield db
+            return
+
+        self._bind(db_path)
+        kind = "writer" if write else "reader"
+        slots = self._slots[kind]
+        started = time.monotonic()
+        contended = slots.locked()
+        self._waiting[kind] += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting[kind] -= 1
+        waited = time.monotonic() - started
+        self._acquisitions += 1
+        if contended:
+            self._waited += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+        idle = self._idle[kind]
+        try:
+            conn = idle.pop() if idle else await self._connect(db_path, busy_timeout_ms)
+        except BaseException:
+            slots.release()
+            raise
+        try:
+            conn.isolation_level = isolation_level
+            conn.row_factory = row_factory
+            if busy_timeout_ms != self.busy_timeout_ms:
+                await conn.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+        except BaseException:
+            self._retire(conn)
+            slots.release()
+            raise
+
+        self._in_use[kind] += 1
+        token = _POOL_BORROWED.set(True)
+        reusable = True
+        try:
+            yield conn
+        except asyncio.CancelledError:
+            reusable = False
+            raise
+        finally:
+            try:
+                _POOL_BORROWED.reset(token)
+            except ValueError:
+                pass
+            self._in_use[kind] -= 1
+            try:
+                if reusable:
+                    if conn.in_transaction:
+                        await conn.rollback()
+                    if busy_timeout_ms != self.busy_timeout_ms:
+                        await conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            except BaseException:
+                reusable = False
+                raise
+            finally:
+                if reusable and conn in self._open:
+                    idle.append(conn)
+                else:
+                    self._retire(conn)
+                slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy and wait time since the pool was created."""
+        return {
+            "readers": self.readers,
+            "open": len(self._open),
+            "readers_in_use": self._in_use["reader"],
+            "writer_in_use": self._in_use["writer"],
+            "readers_waiting": self._waiting["reader"],
+            "writer_waiting": self._waiting["writer"],
+            "acquisitions": self._acquisitions,
+            "waited": self._waited,
+            "wait_ms_total": round(self._wait_total * 1000, 1),
+            "wait_ms_max": round(self._wait_max * 1000, 1),
+            "overflow": self._overflow,
+            "retired": self._retired,
+        }
+
+    def stop(self) -> None:
+        """Close every idle connection and forget the rest (their borrowers' loop is gone)."""
+        for conn in list(self._open):
+            self._retire(conn)
+        self._idle = {"reader": [], "writer": []}
+        self._in_use = {"reader": 0, "writer": 0}
+        self._waiting = {"reader": 0, "writer": 0}
+
+    async def close(self) -> None:
+        """Close the idle connections and wait for them; borrowed ones retire on return."""
+        idle = self._idle["reader"] + self._idle["writer"]
+        self._idle = {"reader": [], "writer": []}
+        self._open.clear()
+        for conn in idle:
+            try:
+                await conn.close()
+            except Exception:  # noqa: BLE001
+                pass
+
+
+class _GroupCommitQueue:
+    """Opt-in single-writer queue that folds concurrent small writes into one transaction.
+
+    Every write it takes is an `op(db)` coroutine. The worker takes whatever has queued (at
+    most `max_rows`), optionally after waiting up to `window_ms` for company, and runs the batch
+    on the pool's writer inside ONE `BEGIN IMMEDIATE … COMMIT` — one write-lock acquisition and
+    one WAL sync where there used to be one per row. With no window the batches form on their
+    own: whatever queued while the previous batch was committing is the next batch. Each op gets its own SAVEPOINT, so a write that raises
+    is rolled back alone and its caller sees its own exception; the rest of the batch commits.
+
+    The future `submit` returns is the write's acknowledgement: it resolves only AFTER the
+    batch's COMMIT, so a caller that awaits it before a Slack-visible effect has exactly the
+    durability the per-call autocommit gave it. The worker only exists while writes are queued.
+    """
+
+    def __init__(self, manager: "DatabaseManager", window_ms: float, max_rows: int):
+        self._manager = manager
+        self.window = max(0.0, float(window_ms)) / 1000.0
+        self.max_rows = max(1, int(max_rows))
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._worker: Optional[asyncio.Task] = None
+        self._full: Optional[asyncio.Event] = None
+        self._batches = 0
+        self._writes = 0
+        self._max_batch = 0
+        self._failed_writes = 0
+        self._failed_batches = 0
+
+    def submit(self, op) -> asyncio.Future:
+        """Queue `op(db)`; the returned future resolves with its result once committed."""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and (self._worker.done() or self._worker.get_loop() is not loop):
+            self._worker = None
+        fut: asyncio.Future = loop.create_future()
+        self._pending.append((op, fut))
+        if self._worker is None:
+            self._full = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        elif len(self._pending) >= self.max_rows and self._full is not None:
+            self._full.set()
+        return fut
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far has been committed (or failed)."""
+        while self._worker is not None and not self._worker.done():
+            await asyncio.wait({self._worker})
+
+    async def _run(self) -> None:
+        # The worker is a task of its own, but it was created from a caller's context — which
+        # may be inside a pooled borrow. It holds nothing, so it must borrow the real writer.
+        _POOL_BORROWED.set(False)
+        batch: List[Tuple[Any, asyncio.Future]] = []
+        try:
+            while self._pending:
+                if len(self._pending) < self.max_rows and self.window and self._full is not None:
+                    self._full.clear()
+                    try:
+                        await asyncio.wait_for(self._full.wait(), self.window)
+                    except asyncio.TimeoutError:
+                        pass
+                batch = self._pending[:self.max_rows]
+                del self._pending[:self.max_rows]
+                await self._commit(batch)
+                batch = []
+        except BaseException as e:
+            for _, fut in batch + self._pending:
+                if not fut.done():
+                    fut.set_exception(e if isinstance(e, Exception)
+                                      else RuntimeError("group-commit worker stopped"))
+            self._pending = []
+            raise
+        finally:
+            self._worker = None
+
+    async def _commit(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        # A caller that gave up (cancelled) before its turn came is simply not written.
+        live = [(op, fut) for op, fut in batch if not fut.done()]
+        if not live:
+            return
+        outcomes: List[Tuple[asyncio.Future, Any, Optional[BaseException]]] = []
+        try:
+            async with self._manager._stream_conn(write=True) as db:
+                await db.execute("BEGIN IMMEDIATE")
+                try:
+                    for op, fut in live:
+                        await db.execute("SAVEPOINT grouped_write")
+                        try:
+                            result = await op(db)
+                        except Exception as e:  # noqa: BLE001 — this write's own failure
+                            await db.execute("ROLLBACK TO grouped_write")
+                            outcomes.append((fut, None, e))
+                        else:
+                            outcomes.append((fut, result, None))
+                        await db.execute("RELEASE grouped_write")
+                    await db.execute("COMMIT")
+                except Exception:
+                    try:
+                        await db.execute("ROLLBACK")
+                    except Exception:  # noqa: BLE001
+                        pass
+                    raise
+        except Exception as e:
+            self._failed_batches += 1
+            self._failed_writes += len(live)
+            for _, fut in live:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self._batches += 1
+        self._writes += len(live)
+        self._max_batch = max(self._max_batch, len(live))
+        for fut, result, error in outcomes:
+            if error is not None:
+                self._failed_writes += 1
+            if fut.done():
+                continue
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._pending),
+            "batches": self._batches,
+            "writes": self._writes,
+            "max_batch": self._max_batch,
+            "avg_batch": round(self._writes / self._batches, 2) if self._batches else 0.0,
+            "failed_writes": self._failed_writes,
+            "failed_batches": self._failed_batches,
+        }
+
+
+_CACHE_MISS = object()
+
+
+class _SettingsCache:
+    """In-process cache for the rows every message reads and almost nothing writes: channel
+    settings, the channel policy, channel memory and user preferences.
+
+    It is invalidated, not updated, by the writers — every write path to those tables ends in
+    `DatabaseManager._invalidate_cached`, and the next read goes back to SQLite. A kind is
+    dropped per key where the writer knows the key, and wholesale where it doesn't: a
+    workspace-scope memory row is visible from every channel, and the id-addressed memory writers
+    never learn which channel they touched. Writes are rare enough that wholesale costs nothing.
+    `ttl_s` bounds an entry's life anyway, for the edit this process never sees (an operator in
+    the sqlite3 shell); 0 turns the cache off.
+
+    A reader that loaded a row BEFORE a write committed must not store it AFTER the write's
+    invalidation. Each kind carries a generation that every invalidation bumps; a reader takes
+    the generation before it queries and `put` drops the value if it has moved since.
+
+    Callers get a deep copy on every hit — the settings dicts go on to be merged and mutated.
+    """
+
+    KINDS = ("settings", "policy", "memory", "prefs")
+
+    def __init__(self, ttl_s: float):
+        self._ttl = ttl_s
+        self._entries: Dict[str, Dict[str, Tuple[float, Any]]] = {k: {} for k in self.KINDS}
+        self._generation = dict.fromkeys(self.KINDS, 0)
+        self._hits = dict.fromkeys(self.KINDS, 0)
+        self._misses = dict.fromkeys(self.KINDS, 0)
+
+    def get(self, kind: str, key: str) -> Any:
+        entry = self._entries[kind].get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            self._hits[kind] += 1
+            return copy.deepcopy(entry[1])
+        self._misses[kind] += 1
+        return _CACHE_MISS
+
+    def generation(self, kind: str) -> int:
+        return self._generation[kind]
+
+    def put(self, kind: str, key: str, value: Any, generation: int) -> None:
+        if self._ttl <= 0 or generation != self._generation[kind]:
+            return
+        self._entries[kind][key] = (time.monotonic() + self._ttl, copy.deepcopy(value))
+
+    def invalidate(self, kind: str, key: Optional[str] = None) -> None:
+        self._generation[kind] += 1
+        if key is None:
+            self._entries[kind].clear()
+        else:
+            self._entries[kind].pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {kind: {"hits": self._hits[kind], "misses": self._misses[kind],
+                       "entries": len(self._entries[kind])}
+                for kind in self.KINDS}
+
+
+class _BackupAborted(Exception):
+    """A paced backup stopped because the database is closing."""
+
+
+class _BackupRestarted(Exception):
+    """Live writes restarted a paced backup often enough that it stops pacing."""
+
+
+# How many times a paced backup lets a foreign write restart it from page one before it starts
+# over in one unpaced step.
+_BACKUP_PACED_RESTARTS = 3
+
+
+class _LoopCallDetector:
+    """Debug (DB_LOOP_GUARD): flags statements the sync `conn` runs on an event-loop thread.
+
+    Installed as the connection's trace callback, so it sees every statement at the point
+    SQLite runs it — including ones reached through helpers several calls away from any
+    handler. A statement is flagged when the calling thread is running an event loop: every
+    such call stalls Socket Mode for as long as it waits on the write lock. Worker threads
+    (asyncio.to_thread) have no running loop and pass. Each new call site is logged once,
+    with the accessor and the first frame outside this module.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.sites: Dict[str, int] = {}
+
+    def __call__(self, statement: str) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        site = self._call_site()
+        with self._lock:
+            self.calls += 1
+            first = site not in self.sites
+            self.sites[site] = self.sites.get(site, 0) + 1
+        if first:
+            logger.warning(f"DB: sync sqlite call on the event loop from {site}: "
+                           f"{' '.join(statement.split())[:120]}")
+
+    @staticmethod
+    def _call_site() -> str:
+        accessor = None
+        frame: Optional[FrameType] = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename == __file__:
+            accessor = frame.f_code.co_name
+            frame = frame.f_back
+        if frame is None:
+            return accessor or "?"
+        where = f"{os.path.relpath(frame.f_code.co_filename)}:{frame.f_lineno}"
+        return f"{accessor} <- {where}" if accessor else where
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "sites": dict(self.sites)}
+
+
 class DatabaseManager(LoggerMixin):
     """
     Manages SQLite database operations for bot persistence.
@@ -621,17 +1175,43 @@ class DatabaseManager(LoggerMixin):
         )
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
 
+        # Freed pages go back to the filesystem in steps (reclaim_free_pages). Only takes on a
+        # brand-new file: an existing database keeps its mode until converted.
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
         # Enable WAL mode for better concurrency
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA busy_timeout=5000")  # 5 second timeout
         
-        # Initialize schema
-        self.init_schema()
+        # Initialize schema (or prove it is already current)
+        self._open_schema(verify=config.db_schema_verify)
         
         logger.info(f"Database initialized for {platform} at {self.db_path}")
 
         # For async operations, we'll create connections as needed
         self._async_db_semaphore = asyncio.Semaphore(10)  # Limit concurrent async connections
+
+        # Async accessors borrow long-lived connections instead of opening one per call
+        self._pool = _ConnectionPool(readers=config.db_reader_pool_size,
+                                     busy_timeout_ms=self.STREAM_BUSY_TIMEOUT_MS)
+
+        # Channel settings/policy/memory and user preferences, read per message, written rarely
+        self._settings_cache = _SettingsCache(ttl_s=config.db_settings_cache_ttl_seconds)
+
+        # Set on close: a paced backup running in a worker thread stops at its next step
+        self._backup_stop = threading.Event()
+
+        # Opt-in: the high-frequency small writes share group commits instead of one each
+        self._group_commit = (
+            _GroupCommitQueue(self, window_ms=config.db_group_commit_window_ms,
+                              max_rows=config.db_group_commit_max_rows)
+            if config.db_group_commit_enabled else None)
+
+        # Debug: flag sync-connection statements that run on the event-loop thread. After the
+        # schema pass on purpose — boot runs before the bot accepts a single event.
+        self._loop_calls = _LoopCallDetector() if config.db_loop_guard else None
+        if self._loop_calls is not None:
+            self.conn.set_trace_callback(self._loop_calls)
     
     def init_schema(self):
         """Create database tables if they don't exist."""
@@ -797,7 +1377,7 @@ class DatabaseManager(LoggerMixin):
         """)
 
         # Images table (no base64 storage)
-        self.conn.execute("""
+        self.conn.execute(f"""
             CREATE TABLE IF NOT EXISTS images (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 thread_id TEXT NOT NULL,
@@ -809,6 +1389,7 @@ class DatabaseManager(LoggerMixin):
                 original_analysis TEXT,
                 metadata_json TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                channel_id TEXT GENERATED ALWAYS AS ({_CHANNEL_OF_THREAD_ID_SQL}) VIRTUAL,
                 FOREIGN KEY (thread_id) REFERENCES threads(thread_id) ON DELETE CASCADE
             )
         """)
@@ -827,7 +1408,7 @@ class DatabaseManager(LoggerMixin):
         # CLAUDE.md pitfall 6a): full content is never at rest. The file lives on
         # Slack's CDN (file_id/url_private) and is re-derived in memory on demand
         # via the read_document tool.
-        self.conn.execute("""
+        self.conn.execute(f"""
             CREATE TABLE IF NOT EXISTS documents (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 thread_id TEXT NOT NULL,
@@ -842,6 +1423,7 @@ class DatabaseManager(LoggerMixin):
                 metadata_json TEXT,
                 message_ts TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                channel_id TEXT GENERATED ALWAYS AS ({_CHANNEL_OF_THREAD_ID_SQL}) VIRTUAL,
                 FOREIGN KEY (thread_id) REFERENCES threads(thread_id) ON DELETE CASCADE
             )
         """)
@@ -1248,6 +1830,84 @@ class DatabaseManager(LoggerMixin):
         # Run migrations for existing databases
         self._run_migrations()
 
+    def _open_schema(self, verify: bool = False):
+        """Run init_schema, unless the schema is provably already where it would leave it.
+
+        The fingerprint hashes database.py itself, the SQLite library version and every
+        `sqlite_master` row. The first half is what makes skipping safe without anyone having to
+        remember a version bump: ANY edit to a CREATE TABLE, a migration or the code around them
+        changes it, and the next boot runs the full pass. The second half catches the schema
+        changing under us — a restore, a hand edit in the sqlite3 shell. A full pass stores the
+        fingerprint only when every step succeeded, so a failed step is retried next boot.
+
+        The fast path still runs the settings_completed backfill: it is time-based (users older
+        than a day), not schema-based, so skipping it would stop it from ever firing again.
+        `verify=True` (DB_SCHEMA_VERIFY) always takes the full pass.
+        """
+        self._migration_timings: List[Tuple[str, float]] = []
+        self._migration_failed = False
+        started = time.perf_counter()
+        source = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        if not verify and self._stored_schema_fingerprint() == self._schema_fingerprint(source):
+            self._knowledge_fts = self._knowledge_fts_live()
+            with self._migration_step("settings_completed backfill"):
+                self._backfill_settings_completed()
+            self.log_info(f"DB: schema fingerprint current — migrations skipped "
+                          f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+            return
+
+        self.init_schema()
+        elapsed = (time.perf_counter() - started) * 1000
+        steps = sorted(self._migration_timings, key=lambda step: step[1], reverse=True)
+        ddl = elapsed - sum(ms for _, ms in steps)
+        breakdown = ", ".join(f"{name} {ms:.0f}ms" for name, ms in steps if ms >= 1)
+        self.log_info(f"DB: full schema pass in {elapsed:.0f}ms (table DDL {ddl:.0f}ms"
+                      + (f"; {breakdown}" if breakdown else "") + ")")
+        if self._migration_failed:
+            self.log_warning("DB: a migration step failed — schema fingerprint not stored, the "
+                             "full pass runs again next boot")
+            return
+        self.conn.execute(
+            "INSERT INTO bot_meta (key, value, updated_ts) VALUES (?, ?, CURRENT_TIMESTAMP) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+            "                               updated_ts = CURRENT_TIMESTAMP",
+            (_SCHEMA_FINGERPRINT_KEY, self._schema_fingerprint(source)))
+
+    def _schema_fingerprint(self, source: str) -> str:
+        """Hash of `source` (database.py's digest), the SQLite version and sqlite_master."""
+        digest = hashlib.sha256(f"{source}\0{sqlite3.sqlite_version}".encode())
+        for row in self.conn.execute(
+                "SELECT type, name, tbl_name, sql FROM sqlite_master ORDER BY type, name"):
+            digest.update(repr(tuple(row)).encode())
+        return digest.hexdigest()
+
+    def _stored_schema_fingerprint(self) -> Optional[str]:
+        """The fingerprint bot_meta holds; None on a brand-new database (no bot_meta yet)."""
+        try:
+            return self.get_meta(_SCHEMA_FINGERPRINT_KEY)
+        except sqlite3.OperationalError:
+            return None
+
+    def _knowledge_fts_live(self) -> bool:
+        """What _migrate_knowledge_fts would return, read off sqlite_master without writing."""
+        names = [f"{table}_fts{suffix}" for table in _KNOWLEDGE_FTS
+                 for suffix in ("", "_ai", "_ad", "_au")]
+        marks = ", ".join("?" for _ in names)
+        present = self.conn.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({marks})", names).fetchone()[0]
+        return present == len(names)
+
+    @contextmanager
+    def _timed_step(self, name: str):
+        """Record how long one schema step took, for _open_schema's startup breakdown."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings = getattr(self, "_migration_timings", None)
+            if timings is not None:
+                timings.append((name, (time.perf_counter() - started) * 1000))
+
     @contextmanager
     def _migration_step(self, name: str):
         """Run one migration phase in isolation.
@@ -1257,10 +1917,12 @@ class DatabaseManager(LoggerMixin):
         a single try/except, so one bad step silently skipped every later step and
         the bot then served traffic on a half-migrated schema.
         """
-        try:
-            yield
-        except Exception as e:
-            self.log_error(f"DB: Migration step '{name}' FAILED: {e}", exc_info=True)
+        with self._timed_step(name):
+            try:
+                yield
+            except Exception as e:
+                self._migration_failed = True
+                self.log_error(f"DB: Migration step '{name}' FAILED: {e}", exc_info=True)
 
     def _is_pre_v3_database(self) -> bool:
         """True when this database still has the pre-v3 (v2.x) shape.
@@ -1307,7 +1969,8 @@ class DatabaseManager(LoggerMixin):
         # BEFORE every other step, and required-critical: each step below and the running bot
         # assume the P4a schema is gone. Deliberately ahead of the pre-v3 backup — a pre-v3
         # database predates P4a entirely, so there is nothing there for this to drop.
-        self._migrate_drop_compaction_schema()
+        with self._timed_step("drop compaction schema"):
+            self._migrate_drop_compaction_schema()
 
         # Rollback path FIRST: snapshot the database before any migration writes to
         # it. The gpt-5.6 swap below bulk-overwrites every user's model/effort, and
@@ -1558,25 +2221,7 @@ class DatabaseManager(LoggerMixin):
         self._migrate_gpt56()
 
         with self._migration_step("settings_completed backfill"):
-            # One-time backfill: mark long-standing users as settings_completed.
-            # Earlier versions of the bot only flipped settings_completed=True when
-            # the user saved with "global" scope. Users who only ever saved thread-scope
-            # configs kept getting the "Please configure your settings" warning on every
-            # DM. Backfill anyone whose row was created more than 24h ago — if they've
-            # been around that long, they know the bot exists and don't need the gate.
-            cursor = self.conn.execute("""
-                UPDATE user_preferences
-                SET settings_completed = 1
-                WHERE settings_completed = 0
-                  AND created_at IS NOT NULL
-                  AND created_at < (strftime('%s', 'now') - 86400)
-            """)
-            backfilled = cursor.rowcount
-            if backfilled:
-                self.conn.commit()
-                self.log_info(
-                    f"DB: Backfilled settings_completed=1 for {backfilled} pre-existing user(s)"
-                )
+            self._backfill_settings_completed()
 
         with self._migration_step("mirror drop"):
             # Phase S one-time cleanup: drop the message mirror. Slack is the only
@@ -1680,20 +2325,57 @@ class DatabaseManager(LoggerMixin):
                 self.conn.commit()
                 self.log_info("DB: Successfully created mcp_tools table")
 
+        # Also OUTSIDE _migration_step: every channel-scoped image and document read filters on
+        # channel_id, so a database without the column would fail each of them.
+        with self._timed_step("channel_id columns"):
+            self._migrate_channel_id_columns()
+
+        # Optional: without FTS5 (or its trigram tokenizer) the knowledge search keeps its LIKE
+        # scans, so a failure here costs speed, never correctness.
+        self._knowledge_fts = False
+        with self._migration_step("knowledge fts"):
+            self._knowledge_fts = self._migrate_knowledge_fts()
+
         # Deliberately OUTSIDE _migration_step: this one must fail startup. Every later channel
         # document write depends on the index existing, and a bot running without it silently
         # accumulates one duplicate row per turn per file — which is exactly the failure the
         # index exists to prevent, made invisible.
-        self._migrate_channel_document_uniqueness()
+        with self._timed_step("channel document uniqueness"):
+            self._migrate_channel_document_uniqueness()
 
         # Also OUTSIDE _migration_step: the sweep's own accessors read the renamed columns, so
         # a database left on the old names would fail every inventory read after this boot.
-        self._migrate_coverage_to_inventory()
+        with self._timed_step("coverage to inventory"):
+            self._migrate_coverage_to_inventory()
 
         # Also OUTSIDE _migration_step (respec §6.1, REQUIRED-CRITICAL): every channel turn reads
         # these three columns, and a bot serving traffic without them would run every channel on
         # the global defaults while the modal cheerfully reported the channel's own settings.
-        self._migrate_channel_capability_columns()
+        with self._timed_step("channel capability columns"):
+            self._migrate_channel_capability_columns()
+
+    def _backfill_settings_completed(self):
+        """Mark long-standing users as settings_completed. Runs on every boot, fast path included.
+
+        Earlier versions of the bot only flipped settings_completed=True when the user saved
+        with "global" scope. Users who only ever saved thread-scope configs kept getting the
+        "Please configure your settings" warning on every DM. Backfill anyone whose row was
+        created more than 24h ago — if they've been around that long, they know the bot exists
+        and don't need the gate.
+        """
+        cursor = self.conn.execute("""
+            UPDATE user_preferences
+            SET settings_completed = 1
+            WHERE settings_completed = 0
+              AND created_at IS NOT NULL
+              AND created_at < (strftime('%s', 'now') - 86400)
+        """)
+        backfilled = cursor.rowcount
+        if backfilled:
+            self.conn.commit()
+            self.log_info(
+                f"DB: Backfilled settings_completed=1 for {backfilled} pre-existing user(s)"
+            )
 
     # ---------------------------------------------------- channel capability columns (respec §6.1)
 
@@ -1973,6 +2655,74 @@ class DatabaseManager(LoggerMixin):
             raise
         self.log_info("DB: renamed channel_coverage coverage_* columns to inventory_*")
 
+    def _migrate_channel_id_columns(self):
+        """Give `images` and `documents` their generated channel_id column, then index it with
+        created_at on those two tables and on `message_tool_usage` (a real column there already),
+        and with message_ts on the first two. FAILS STARTUP.
+
+        A VIRTUAL column costs nothing to add; the backfill happens once, as the index build
+        computes every existing row's channel.
+        """
+        for table in ("images", "documents"):
+            # table_xinfo, not table_info: the latter leaves generated columns out.
+            columns = [col[1] for col in self.conn.execute(f"PRAGMA table_xinfo({table})")]
+            if "channel_id" not in columns:
+                self.log_info(f"DB: Adding generated channel_id column to {table}")
+                self.conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN channel_id TEXT "
+                    f"GENERATED ALWAYS AS ({_CHANNEL_OF_THREAD_ID_SQL}) VIRTUAL")
+        for index, table in _CHANNEL_CREATED_INDEXES:
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} ON {table}(channel_id, created_at)")
+        for index, table in _CHANNEL_MESSAGE_INDEXES:
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} ON {table}(channel_id, message_ts)")
+        self.conn.commit()
+
+    def _migrate_knowledge_fts(self) -> bool:
+        """Create the `_KNOWLEDGE_FTS` indexes and their sync triggers. True when they are live.
+
+        Idempotent, and self-healing: a table rebuilt by an earlier migration loses its triggers
+        (they belong to the table), so any index missing a trigger is recreated and rebuilt from
+        its base table rather than trusted. Returns False — logged, not raised — when this SQLite
+        has no FTS5 or no trigram tokenizer (3.34+).
+        """
+        for table, columns in _KNOWLEDGE_FTS.items():
+            fts = f"{table}_fts"
+            cols = ", ".join(columns)
+            new_cols = ", ".join(f"new.{c}" for c in columns)
+            old_cols = ", ".join(f"old.{c}" for c in columns)
+            present = {r[0] for r in self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN (?, ?, ?, ?)",
+                (fts, f"{fts}_ai", f"{fts}_ad", f"{fts}_au"))}
+            if len(present) == 4:
+                continue
+            try:
+                self.conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                    f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')")
+            except sqlite3.OperationalError as e:
+                self.log_warning(f"DB: FTS5 trigram index unavailable ({e}) — knowledge search "
+                                 f"stays on LIKE scans")
+                return False
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+                END""")
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+                END""")
+            self.conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+                    INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+                END""")
+            self.conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            self.conn.commit()
+            self.log_info(f"DB: Built full-text index {fts} over {table}({cols})")
+        return True
+
     def _migrate_channel_document_uniqueness(self):
         """Dedup channel document rows, then make the duplication impossible. FAILS STARTUP.
 
@@ -2454,6 +3204,7 @@ class DatabaseManager(LoggerMixin):
         else:
             self.conn.execute(sql, params)
             self.conn.commit()
+        self._invalidate_cached("settings", key=channel_id)
         logger.debug(f"Saved channel_settings for {channel_id}")
 
     # --- Per-channel memory (Phase 9) ---
@@ -2504,6 +3255,7 @@ class DatabaseManager(LoggerMixin):
                 "DELETE FROM channel_memory WHERE scope = 'policy' AND channel_id = ?",
                 (channel_id,))
             self.conn.commit()
+            self._invalidate_cached("policy", key=channel_id)
             return
         # The partial unique index makes this an upsert rather than a race between readers.
         self.conn.execute(
@@ -2514,6 +3266,7 @@ class DatabaseManager(LoggerMixin):
             "              updated_ts = CURRENT_TIMESTAMP",
             (channel_id, text, author))
         self.conn.commit()
+        self._invalidate_cached("policy", key=channel_id)
 
     def add_channel_memory(self, channel_id: str, content: str, scope: str = "channel",
                            author: Optional[str] = None) -> int:
@@ -2523,6 +3276,7 @@ class DatabaseManager(LoggerMixin):
             (channel_id, scope, content, author)
         )
         self.conn.commit()
+        self._invalidate_cached("memory")
         logger.debug(f"Added channel_memory for {channel_id} (scope={scope})")
         return cast(int, cursor.lastrowid)
 
@@ -2533,11 +3287,13 @@ class DatabaseManager(LoggerMixin):
             (content, memory_id)
         )
         self.conn.commit()
+        self._invalidate_cached("memory", "policy")  # an id names a row of either kind
 
     def delete_channel_memory(self, memory_id: int):
         """Delete a memory row (manual forget / cap eviction)."""
         self.conn.execute("DELETE FROM channel_memory WHERE id = ?", (memory_id,))
         self.conn.commit()
+        self._invalidate_cached("memory", "policy")  # an id names a row of either kind
 
     # --- Response feedback (Phase H) ---
     def record_response_feedback(self, channel_id: str, thread_ts: Optional[str],
@@ -2669,8 +3425,7 @@ class DatabaseManager(LoggerMixin):
         compaction-time path can't double-record the same note. Bounded: at most `cap` addenda
         per thread (a pathological channel can't bloat the summary head). Returns True when a
         row was actually inserted."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             async with db.execute(
                 "SELECT 1 FROM thread_summary_addenda "
                 "WHERE thread_id = ? AND source_ts = ? AND kind = ? AND ref = ?",
@@ -2694,9 +3449,8 @@ class DatabaseManager(LoggerMixin):
         """Late-artifact addenda for a thread, deterministically ordered (source_ts, id) so
         every rebuild serializes the summary head identically (prompt-cache hygiene). source_ts
         is a numeric Slack ts stored as TEXT, so order by its REAL value, not string collation."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT * FROM thread_summary_addenda WHERE thread_id = ? "
                 "ORDER BY CAST(source_ts AS REAL) ASC, id ASC", (thread_id,)) as cursor:
@@ -2948,6 +3702,7 @@ class DatabaseManager(LoggerMixin):
                 defaults['vision_detail'], 0
             ))
             
+            self._invalidate_cached("prefs", key=user_id)
             self.log_info(f"DB: Created default preferences for user {user_id}")
             
         except Exception as e:
@@ -2998,6 +3753,7 @@ class DatabaseManager(LoggerMixin):
             """
             
             self.conn.execute(query, values)
+            self._invalidate_cached("prefs", key=user_id)
             self.log_info(f"DB: Updated preferences for user {user_id}")
             return True
             
@@ -3050,29 +3806,9 @@ class DatabaseManager(LoggerMixin):
                       f"summary_len={len(summary) if summary else 0}, pages={total_pages}")
 
         try:
-            self.conn.execute(f"""
-                INSERT INTO documents
-                (thread_id, filename, mime_type, summary, file_id, url_private,
-                 size_bytes, page_structure, total_pages, metadata_json, message_ts)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT (thread_id, message_ts, file_id)
-                    WHERE {_CHANNEL_DOCS_PREDICATE}
-                DO UPDATE SET
-                    filename = excluded.filename, mime_type = excluded.mime_type,
-                    summary = excluded.summary, url_private = excluded.url_private,
-                    size_bytes = excluded.size_bytes,
-                    page_structure = excluded.page_structure,
-                    total_pages = excluded.total_pages,
-                    metadata_json = excluded.metadata_json
-                WHERE NOT (? = 1
-                           AND TRIM(COALESCE(documents.summary, '')) <> ''
-                           AND documents.summary NOT LIKE ?)
-            """, (thread_id, filename, mime_type, summary, file_id, url_private,
-                  size_bytes,
-                  json.dumps(page_structure) if page_structure else None,
-                  total_pages,
-                  json.dumps(metadata) if metadata else None, message_ts,
-                  1 if is_unattended_summary(summary) else 0, _UNATTENDED_LIKE))
+            self.conn.execute(_SAVE_DOCUMENT_SQL, _save_document_params(
+                thread_id, filename, mime_type, summary, file_id, url_private, size_bytes,
+                page_structure, total_pages, metadata, message_ts))
 
             # Update thread activity
             self.update_thread_activity(thread_id)
@@ -3098,15 +3834,9 @@ class DatabaseManager(LoggerMixin):
         cycle accumulates duplicate reference rows. Returns 0 when no matching row exists — the
         caller then falls back to inserting (a genuinely legacy, never-stored document)."""
         try:
-            cursor = self.conn.execute("""
-                UPDATE documents
-                SET summary = ?, page_structure = ?, total_pages = ?,
-                    size_bytes = COALESCE(?, size_bytes),
-                    message_ts = COALESCE(?, message_ts)
-                WHERE thread_id = ? AND filename = ?
-            """, (summary,
-                  json.dumps(page_structure) if page_structure else None,
-                  total_pages, size_bytes, message_ts, thread_id, filename))
+            cursor = self.conn.execute(_RESTORE_DOCUMENT_SQL, (
+                summary, json.dumps(page_structure) if page_structure else None,
+                total_pages, size_bytes, message_ts, thread_id, filename))
             if cursor.rowcount:
                 self.update_thread_activity(thread_id)
                 self.log_info(f"DB: Re-hydrated slimmed document {filename} for thread {thread_id}")
@@ -3115,6 +3845,51 @@ class DatabaseManager(LoggerMixin):
             self.log_error(f"DB: Failed to restore document {filename} - {e}", exc_info=True)
             raise
 
+    async def save_document_async(self, thread_id: str, filename: str, mime_type: str,
+                                  summary: Optional[str] = None, file_id: Optional[str] = None,
+                                  url_private: Optional[str] = None,
+                                  size_bytes: Optional[int] = None,
+                                  page_structure: Optional[Dict] = None,
+                                  total_pages: Optional[int] = None,
+                                  metadata: Optional[Dict] = None,
+                                  message_ts: Optional[str] = None):
+        """Async version of save_document — same upgrade-in-place statement, pooled writer."""
+        self.log_debug(f"DB: Async saving document - thread={thread_id}, filename={filename}, "
+                       f"summary_len={len(summary) if summary else 0}, pages={total_pages}")
+        try:
+            async with self._async_conn(write=True) as db:
+                await db.execute(_SAVE_DOCUMENT_SQL, _save_document_params(
+                    thread_id, filename, mime_type, summary, file_id, url_private, size_bytes,
+                    page_structure, total_pages, metadata, message_ts))
+                await db.commit()
+            await self.update_thread_activity_async(thread_id)
+            self.log_info(f"DB: Successfully saved document {filename} for thread {thread_id}")
+        except Exception as e:
+            self.log_error(f"DB: Failed to save document {filename} - {e}", exc_info=True)
+            raise
+
+    async def restore_document_derived_async(self, thread_id: str, filename: str, *,
+                                             summary: Optional[str] = None,
+                                             page_structure: Optional[Dict] = None,
+                                             total_pages: Optional[int] = None,
+                                             size_bytes: Optional[int] = None,
+                                             message_ts: Optional[str] = None) -> int:
+        """Async version of restore_document_derived. Returns the rows updated (0 = no row)."""
+        try:
+            async with self._async_conn(write=True) as db:
+                cursor = await db.execute(_RESTORE_DOCUMENT_SQL, (
+                    summary, json.dumps(page_structure) if page_structure else None,
+                    total_pages, size_bytes, message_ts, thread_id, filename))
+                updated = cursor.rowcount or 0
+                await db.commit()
+            if updated:
+                await self.update_thread_activity_async(thread_id)
+                self.log_info(f"DB: Re-hydrated slimmed document {filename} for thread {thread_id}")
+            return updated
+        except Exception as e:
+            self.log_error(f"DB: Failed to restore document {filename} - {e}", exc_info=True)
+            raise
+
     def get_thread_documents(self, thread_id: str, limit: Optional[int] = None) -> List[Dict]:
         """
         Get all documents for a thread.
@@ -3191,16 +3966,21 @@ class DatabaseManager(LoggerMixin):
         though the summary head still referenced it. Slimming ages out the bulk while keeping the
         row reachable indefinitely. created_at defaults to CURRENT_TIMESTAMP (UTC), so the cutoff
         is computed IN SQL with datetime('now', …) — a Python datetime.now() cutoff would be LOCAL
-        time and skew the retention window on non-UTC hosts. Same trap as delete_old_tool_usage."""
-        cursor = self.conn.execute("""
-            UPDATE documents
-            SET summary = NULL, page_structure = NULL, metadata_json = NULL
-            WHERE created_at < datetime('now', ?)
-              AND (summary IS NOT NULL OR page_structure IS NOT NULL OR metadata_json IS NOT NULL)
-        """, (f"-{int(days)} days",))
-
-        if cursor.rowcount > 0:
-            self.log_info(f"DB: Slimmed {cursor.rowcount} documents older than {days} days "
+        time and skew the retention window on non-UTC hosts. Same trap as delete_old_tool_usage.
+
+        Batched — see _sweep_in_batches."""
+        slimmed = self._sweep_in_batches(
+            "documents",
+            "created_at < datetime('now', ?) "
+            "AND (summary IS NOT NULL OR page_structure IS NOT NULL OR metadata_json IS NOT NULL)",
+            (f"-{int(days)} days",),
+            lambda conn, marks: conn.execute(
+                f"UPDATE documents SET summary = NULL, page_structure = NULL, "
+                f"metadata_json = NULL WHERE rowid IN ({marks})"),
+            verb="slimmed")
+
+        if slimmed > 0:
+            self.log_info(f"DB: Slimmed {slimmed} documents older than {days} days "
                           "(refs kept for on-demand re-extraction, derived bulk cleared)")
 
     def delete_old_tool_usage(self, days: int = 90):
@@ -3210,14 +3990,135 @@ class DatabaseManager(LoggerMixin):
         message_tool_usage gets this explicit age sweep instead, wired into the scheduled
         cleanup worker. created_at defaults to CURRENT_TIMESTAMP (UTC), so the cutoff is
         computed in SQL with datetime('now', …) — a Python datetime.now() cutoff would be
-        LOCAL time and skew the retention window on non-UTC hosts."""
-        cursor = self.conn.execute("""
-            DELETE FROM message_tool_usage
-            WHERE created_at < datetime('now', ?)
-        """, (f"-{int(days)} days",))
+        LOCAL time and skew the retention window on non-UTC hosts. Batched — see
+        _sweep_in_batches."""
+        removed = self._sweep_in_batches(
+            "message_tool_usage", "created_at < datetime('now', ?)", (f"-{int(days)} days",),
+            self._delete_rowids("message_tool_usage"))
+
+        if removed > 0:
+            self.log_info(f"DB: Cleaned up {removed} tool-usage rows older than {days} days")
 
-        if cursor.rowcount > 0:
-            self.log_info(f"DB: Cleaned up {cursor.rowcount} tool-usage rows older than {days} days")
+    # --- batched retention sweeps ------------------------------------------------------------
+    #
+    # A retention sweep used to be ONE statement over everything eligible. After an outage or a
+    # shortened retention window that is one enormous transaction holding the write lock while
+    # every turn's writes queue behind it (and time out past busy_timeout). Each sweep now walks
+    # its eligible rows in rowid order, DB_SWEEP_BATCH_ROWS at a time, each batch its own short
+    # BEGIN IMMEDIATE … COMMIT, with DB_SWEEP_PAUSE_MS between batches for the writers to get in.
+    # The walk is keyset (rowid > last) rather than re-querying from the top, so rows a batch
+    # leaves in place (a slimmed document, an unexpired artifact) are never scanned twice.
+    #
+    # Sweeps run on a connection of their own, never `self.conn`: they run in worker threads,
+    # and a multi-statement transaction on the shared connection would absorb — and on ROLLBACK
+    # discard — whatever another thread wrote through it meanwhile.
+
+    @contextmanager
+    def _sweep_connection(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA busy_timeout=5000")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _delete_rowids(table: str):
+        """The `apply` for a plain delete sweep over `table`."""
+        return lambda conn, marks: conn.execute(f"DELETE FROM {table} WHERE rowid IN ({marks})")
+
+    def _sweep_in_batches(self, table: str, predicate: str, params: Sequence,
+                          apply, verb: str = "removed") -> int:
+        """Apply `apply(conn, marks)` to every `table` row matching `predicate`, batch by batch.
+
+        `marks` is the batch's rowids inlined as a comma list (integers straight from SQLite, at
+        most DB_SWEEP_BATCH_ROWS of them). `apply` runs inside the batch's transaction and may
+        run several statements — the ambient sweep retires addenda with its artifacts. Returns
+        the number of rows swept, and logs it with the write-lock hold time per table.
+        """
+        from config import BotConfig
+        config = BotConfig()
+        batch_rows = config.db_sweep_batch_rows
+        pause = config.db_sweep_pause_ms / 1000.0
+        last = 0
+        swept = batches = 0
+        held = longest = 0.0
+        with self._sweep_connection() as conn:
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                locked = time.perf_counter()
+                try:
+                    rowids = [r[0] for r in conn.execute(
+                        f"SELECT rowid FROM {table} WHERE rowid > ? AND ({predicate}) "
+                        f"ORDER BY rowid LIMIT ?", (last, *params, batch_rows))]
+                    if rowids:
+                        apply(conn, ", ".join(str(int(r)) for r in rowids))
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                hold = time.perf_counter() - locked
+                held += hold
+                longest = max(longest, hold)
+                if not rowids:
+                    break
+                swept += len(rowids)
+                batches += 1
+                if len(rowids) < batch_rows:
+                    break
+                last = rowids[-1]
+                if pause:
+                    time.sleep(pause)
+        if swept:
+            logger.info(f"DB sweep {table}: {verb} {swept} rows in {batches} batch(es); "
+                        f"write lock held {held * 1000:.0f}ms total, "
+                        f"{longest * 1000:.0f}ms longest")
+        return swept
+
+    def reclaim_free_pages(self) -> int:
+        """Hand the pages the sweeps freed back to the filesystem, a step at a time.
+
+        Only an `auto_vacuum=INCREMENTAL` database can do that without a full VACUUM; new
+        databases are created that way (see __init__). An older one stays at NONE — its freed
+        pages are reused but the file never shrinks — until DB_AUTO_VACUUM_CONVERT=true, which
+        converts it here with a one-time VACUUM (exclusive for its duration, so it is opt-in and
+        belongs in the nightly window). Returns the pages returned.
+        """
+        from config import BotConfig
+        config = BotConfig()
+        with self._sweep_connection() as conn:
+            mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if mode != 2:
+                if not config.db_auto_vacuum_convert:
+                    if free:
+                        logger.info(f"DB: {free} free pages stay in the file (auto_vacuum is "
+                                    f"off; DB_AUTO_VACUUM_CONVERT=true converts it once)")
+                    return 0
+                started = time.perf_counter()
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                logger.info(f"DB: converted to auto_vacuum=INCREMENTAL "
+                            f"({free} free pages returned) in {time.perf_counter() - started:.1f}s")
+                return free
+            step = config.db_vacuum_pages_per_step
+            pause = config.db_sweep_pause_ms / 1000.0
+            returned = 0
+            started = time.perf_counter()
+            while free > 0:
+                # Each result row is one freed page; the pragma only frees as it is stepped.
+                conn.execute(f"PRAGMA incremental_vacuum({int(step)})").fetchall()
+                remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if remaining >= free:
+                    break
+                returned += free - remaining
+                free = remaining
+                if free and pause:
+                    time.sleep(pause)
+            if returned:
+                logger.info(f"DB: incremental vacuum returned {returned} pages "
+                            f"in {time.perf_counter() - started:.1f}s")
+            return returned
 
     # F32: thread-scoped code-interpreter containers
     #
@@ -3739,13 +4640,12 @@ class DatabaseManager(LoggerMixin):
         try:
             cutoff = int((datetime.now() - timedelta(hours=hours)).timestamp())
 
-            cursor = self.conn.execute("""
-                DELETE FROM modal_sessions
-                WHERE created_at < ?
-            """, (cutoff,))
+            removed = self._sweep_in_batches(
+                "modal_sessions", "created_at < ?", (cutoff,),
+                self._delete_rowids("modal_sessions"))
 
-            if cursor.rowcount > 0:
-                self.log_info(f"Cleaned up {cursor.rowcount} modal sessions older than {hours} hours")
+            if removed > 0:
+                self.log_info(f"Cleaned up {removed} modal sessions older than {hours} hours")
         except Exception as e:
             self.log_error(f"Failed to cleanup modal sessions: {e}")
 
@@ -3753,7 +4653,7 @@ class DatabaseManager(LoggerMixin):
     async def create_modal_session_async(self, session_id: str, user_id: str, state: Dict, modal_type: str = 'settings') -> bool:
         """Async version of create_modal_session."""
         async with self._async_db_semaphore:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._async_conn(write=True) as db:
                 try:
                     await db.execute("""
                         INSERT INTO modal_sessions (session_id, user_id, modal_type, state)
@@ -3769,7 +4669,7 @@ class DatabaseManager(LoggerMixin):
     async def get_modal_session_async(self, session_id: str) -> Optional[Dict]:
         """Async version of get_modal_session."""
         async with self._async_db_semaphore:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._async_conn() as db:
                 try:
                     async with db.execute("""
                         SELECT state FROM modal_sessions
@@ -3786,7 +4686,7 @@ class DatabaseManager(LoggerMixin):
     async def update_modal_session_async(self, session_id: str, state: Dict) -> bool:
         """Async version of update_modal_session."""
         async with self._async_db_semaphore:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._async_conn(write=True) as db:
                 try:
                     await db.execute("""
                         UPDATE modal_sessions
@@ -3803,7 +4703,7 @@ class DatabaseManager(LoggerMixin):
     async def delete_modal_session_async(self, session_id: str) -> bool:
         """Async version of delete_modal_session."""
         async with self._async_db_semaphore:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._async_conn(write=True) as db:
                 try:
                     await db.execute("""
                         DELETE FROM modal_sessions
@@ -3816,33 +4716,147 @@ class DatabaseManager(LoggerMixin):
                     self.log_error(f"Failed to delete modal session (async): {e}")
                     return False
 
-    def backup_database(self, tag: Optional[str] = None):
+    def backup_database(self, tag: Optional[str] = None, paced: bool = False) -> str:
         """Create timestamped backup of database.
 
         Args:
             tag: Optional label inserted before the timestamp (e.g. a migration name),
                  producing {platform}_{tag}_{timestamp}.db. Kept before the timestamp so
                  cleanup_old_backups' date parsing (last two underscore parts) still works.
-        """
-        # Checkpoint WAL file before backup
-        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            paced: Copy in throttled steps from a dedicated connection instead of in one call
+                 on the shared one (see _paced_backup). For the nightly backup of a live bot;
+                 the startup migrations have the database to themselves and copy in one go.
 
+        Returns:
+            The backup's path.
+        """
         # Create timestamped backup
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         label = f"{tag}_" if tag else ""
         backup_path = f"{self.db_dir}/backups/{self.platform}_{label}{timestamp}.db"
-        
-        # Use SQLite backup API
-        backup_conn = sqlite3.connect(backup_path)
-        with backup_conn:
-            self.conn.backup(backup_conn)
-        backup_conn.close()
-        
-        logger.info(f"Created backup: {backup_path}")
-        
+
+        if paced:
+            self._paced_backup(backup_path)
+        else:
+            # Checkpoint WAL file before backup
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            # Use SQLite backup API
+            backup_conn = sqlite3.connect(backup_path)
+            with backup_conn:
+                self.conn.backup(backup_conn)
+            backup_conn.close()
+            logger.info(f"Created backup: {backup_path}")
+
         # Clean up old backups
         self.cleanup_old_backups()
-    
+        return backup_path
+
+    def _paced_backup(self, backup_path: str) -> None:
+        """Back the live database up a few pages at a time, off the shared connection.
+
+        The copy reads through its own read-only connection. Each step copies
+        DB_BACKUP_PAGES_PER_STEP pages under a read snapshot of its own and then sleeps
+        DB_BACKUP_STEP_PAUSE_MS with no snapshot held, so the copy trickles instead of saturating
+        the disk a turn is waiting on, and checkpoints keep recycling the WAL while it sleeps
+        (see _copy_in_steps). With DB_BACKUP_COMPACT the snapshot is a `VACUUM INTO` instead:
+        one unpaced statement, but a defragmented file with no free pages.
+
+        The copy is written to `<name>.partial` and renamed only when complete, so a backup
+        under its real name is always whole. An interrupted attempt (I/O error, busy source,
+        shutdown) is discarded and retried from a fresh snapshot, up to DB_BACKUP_ATTEMPTS times;
+        a `.partial` a killed process left behind is swept by cleanup_old_backups.
+        """
+        from config import BotConfig
+        config = BotConfig()
+        partial = f"{backup_path}.partial"
+        source_uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        pause = config.db_backup_step_pause_ms / 1000.0
+        started = time.monotonic()
+
+        for attempt in range(1, config.db_backup_attempts + 1):
+            self._discard_file(partial)
+            source = sqlite3.connect(source_uri, uri=True, isolation_level=None,
+                                     check_same_thread=False)
+            try:
+                source.execute("PRAGMA busy_timeout=5000")
+                if config.db_backup_compact:
+                    source.execute("VACUUM INTO ?", (partial,))
+                else:
+                    self._copy_in_steps(source, partial, config.db_backup_pages_per_step, pause)
+                break
+            except _BackupAborted:
+                self._discard_file(partial)
+                raise
+            except sqlite3.Error as e:
+                self._discard_file(partial)
+                if attempt == config.db_backup_attempts:
+                    raise
+                backoff = min(60.0, 5.0 * attempt)
+                logger.warning(f"Backup attempt {attempt} interrupted ({e}); "
+                               f"retrying from a fresh snapshot in {backoff:.0f}s")
+                if self._backup_stop.wait(backoff):
+                    raise _BackupAborted("database closing")
+            finally:
+                source.close()
+
+        os.replace(partial, backup_path)
+        size_mb = os.path.getsize(backup_path) / (1024 * 1024)
+        logger.info(f"Created backup: {backup_path} ({size_mb:.1f} MB"
+                    f"{', compacted' if config.db_backup_compact else ''}) "
+                    f"in {time.monotonic() - started:.1f}s")
+
+    def _copy_in_steps(self, source: sqlite3.Connection, partial: str,
+                       pages_per_step: int, pause: float) -> None:
+        """Online-backup `source` into `partial` `pages_per_step` pages at a time, logging each
+        tenth of the way and sleeping `pause` between steps.
+
+        `source` is in autocommit, so every step takes its own read snapshot and lets it go
+        before the pause: a checkpoint is never held up by the copy for longer than one step.
+        The price is that SQLite restarts the copy from page one when another connection writes
+        between steps. After _BACKUP_PACED_RESTARTS of those it starts over in one unpaced step,
+        which holds a single snapshot only for as long as the copy itself takes.
+        """
+        logged = [0]
+        last: List[Optional[int]] = [None]
+        restarts = [0]
+
+        def progress(status, remaining, total):
+            if self._backup_stop.is_set():
+                raise _BackupAborted("database closing")
+            # A step that left as much to copy as the one before it started over from page one.
+            if last[0] is not None and remaining >= last[0]:
+                restarts[0] += 1
+                logged[0] = 0
+                if restarts[0] >= _BACKUP_PACED_RESTARTS:
+                    raise _BackupRestarted()
+            last[0] = remaining
+            done = total - remaining
+            tenth = (done * 10) // total if total else 10
+            if tenth > logged[0] and remaining:
+                logged[0] = tenth
+                logger.info(f"Backup {tenth * 10}% ({done}/{total} pages)")
+            if remaining and pause:
+                time.sleep(pause)
+
+        target = sqlite3.connect(partial)
+        try:
+            try:
+                source.backup(target, pages=pages_per_step, progress=progress)
+            except _BackupRestarted:
+                logger.info(f"Backup restarted {restarts[0]} times by live writes; "
+                            f"finishing it in one step")
+                source.backup(target)
+        finally:
+            target.close()
+
+    @staticmethod
+    def _discard_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
     def cleanup_old_backups(self):
         """Remove SCHEDULED backups older than 7 days.
 
@@ -3859,6 +4873,9 @@ class DatabaseManager(LoggerMixin):
         scheduled = re.compile(rf"^{re.escape(self.platform)}_(\d{{8}})_(\d{{6}})\.db$")
 
         for filename in os.listdir(f"{self.db_dir}/backups"):
+            if filename.endswith(".partial"):
+                self._sweep_stale_partial(f"{self.db_dir}/backups/{filename}")
+                continue
             match = scheduled.match(filename)
             if not match:
                 continue
@@ -3871,17 +4888,25 @@ class DatabaseManager(LoggerMixin):
             except Exception as e:
                 logger.warning(f"Error processing backup file {filename}: {e}")
     
+    def _sweep_stale_partial(self, path: str) -> None:
+        """Remove a paced backup's `.partial` once it is a day old — by then the run that wrote
+        it has died (a finished run renames it, a failed one deletes it)."""
+        try:
+            if time.time() - os.path.getmtime(path) > 86400:
+                os.remove(path)
+                logger.info(f"Removed abandoned partial backup: {os.path.basename(path)}")
+        except OSError as e:
+            logger.warning(f"Error processing partial backup {path}: {e}")
+
     def cleanup_old_threads(self):
         """Remove threads older than 3 months."""
         cutoff = datetime.now() - timedelta(days=90)
         
-        cursor = self.conn.execute("""
-            DELETE FROM threads 
-            WHERE last_activity < ?
-        """, (cutoff,))
-        
-        if cursor.rowcount > 0:
-            logger.info(f"Cleaned up {cursor.rowcount} threads older than 3 months")
+        removed = self._sweep_in_batches(
+            "threads", "last_activity < ?", (cutoff,), self._delete_rowids("threads"))
+
+        if removed > 0:
+            logger.info(f"Cleaned up {removed} threads older than 3 months")
     
     # =============================
     # ASYNC VERSIONS OF CORE METHODS
@@ -3907,9 +4932,8 @@ class DatabaseManager(LoggerMixin):
 
     async def get_thread_summary_async(self, thread_id: str) -> Optional[Dict]:
         """Async version of get_thread_summary."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             async with db.execute(
                 "SELECT * FROM thread_summaries WHERE thread_id = ?", (thread_id,)
@@ -3929,9 +4953,8 @@ class DatabaseManager(LoggerMixin):
                                         refs: Optional[List[Dict]] = None,
                                         preserved_ts: Optional[List[str]] = None):
         """Async version of save_thread_summary (upsert, rolling)."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             await db.execute("""
                 INSERT INTO thread_summaries
@@ -3957,9 +4980,8 @@ class DatabaseManager(LoggerMixin):
 
     async def get_channel_summary_async(self, channel_id: str) -> Optional[Dict]:
         """The cached channel narrative row for one channel, or None. Per-channel scope only."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT channel_id, summary_text, built_through_ts, source_message_count, "
                 "generated_at, invalidated_at FROM channel_summaries WHERE channel_id = ?",
@@ -3978,8 +5000,7 @@ class DatabaseManager(LoggerMixin):
         nothing when channel_settings.ambient_memory = 0, so a build that raced a settings change
         to ambient_memory=False can never resurrect a summary for an opted-out channel. Returns
         True when a row was written/updated."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cur = await db.execute("""
                 INSERT INTO channel_summaries
                     (channel_id, summary_text, built_through_ts, source_message_count,
@@ -4012,8 +5033,7 @@ class DatabaseManager(LoggerMixin):
         """Mark the cache invalid (an in-window edit/delete touched a summarized message) so
         both agents STOP injecting it until a background rebuild clears the flag. No-op when no
         row exists. Per-channel scope only."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute(
                 "UPDATE channel_summaries SET invalidated_at = CURRENT_TIMESTAMP "
                 "WHERE channel_id = ?", (channel_id,))
@@ -4022,8 +5042,7 @@ class DatabaseManager(LoggerMixin):
     async def delete_channel_summary_async(self, channel_id: str):
         """Delete a channel's cached narrative (per-channel ambient-memory opt-out / cleanup).
         Per-channel scope only."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute("DELETE FROM channel_summaries WHERE channel_id = ?", (channel_id,))
             await db.commit()
 
@@ -4049,9 +5068,8 @@ class DatabaseManager(LoggerMixin):
         prior-status read is a same-connection SELECT before the write — informational only, so its
         (harmless) staleness under contention never affects the atomic claim."""
         owner_token = uuid.uuid4().hex
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT status FROM channel_introductions WHERE channel_id = ?", (channel_id,)
             ) as c0:
@@ -4088,8 +5106,7 @@ class DatabaseManager(LoggerMixin):
         """Record that the intro was posted (or reconciled from history): status 'posted' + the
         message ts. Idempotent — a repeat call just refreshes intro_ts/updated_at. Safe to call
         without owning the lease: finding our marker in history is itself proof it was posted."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute("""
                 INSERT INTO channel_introductions (channel_id, status, intro_ts, updated_at)
                 VALUES (?, 'posted', ?, CURRENT_TIMESTAMP)
@@ -4107,8 +5124,7 @@ class DatabaseManager(LoggerMixin):
         'posted' row (a late error can't reopen a sent intro) and never steals a CONCURRENT
         attempt's live lease (its token differs). Called only by a task that actually acquired the
         lease; a missing token matches nothing (no-op), failing safe."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute(
                 "UPDATE channel_introductions SET status = 'failed', updated_at = CURRENT_TIMESTAMP "
                 "WHERE channel_id = ? AND status = 'pending' AND owner_token IS ?",
@@ -4117,9 +5133,8 @@ class DatabaseManager(LoggerMixin):
 
     async def get_channel_intro_async(self, channel_id: str) -> Optional[Dict]:
         """The channel's intro lifecycle row (status/intro_ts/…), or None. Per-channel scope."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT channel_id, status, prepared_text, event_id, intro_ts, owner_token, "
                 "updated_at FROM channel_introductions WHERE channel_id = ?", (channel_id,)
@@ -4135,8 +5150,7 @@ class DatabaseManager(LoggerMixin):
         the newcomer is never re-DM'd. `INSERT OR IGNORE` + rowcount is the atomic test-and-set;
         there is no check-then-act race. If the send then fails, the caller rolls the claim back via
         clear_channel_onboarding_nudge_async so a later interaction can retry."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cur = await db.execute(
                 "INSERT OR IGNORE INTO channel_onboarding_nudges (slack_user_id) VALUES (?)",
                 (user_id,))
@@ -4146,8 +5160,7 @@ class DatabaseManager(LoggerMixin):
     async def clear_channel_onboarding_nudge_async(self, user_id: str) -> None:
         """Release a claimed nudge (used only when the DM send failed) so a future channel
         interaction can retry the one-time settings DM. No-op if no row exists."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute(
                 "DELETE FROM channel_onboarding_nudges WHERE slack_user_id = ?", (user_id,))
             await db.commit()
@@ -4159,17 +5172,14 @@ class DatabaseManager(LoggerMixin):
         Args:
             thread_id: Thread identifier
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-
+        async def _touch(db):
             await db.execute("""
                 UPDATE threads
                 SET last_activity = CURRENT_TIMESTAMP
                 WHERE thread_id = ?
             """, (thread_id,))
 
-            await db.commit()
+        await self._queued_write(_touch)
 
     async def save_image_metadata_async(self, thread_id: str, url: str, image_type: str,
                                        prompt: Optional[str] = None, analysis: Optional[str] = None,
@@ -4194,9 +5204,8 @@ class DatabaseManager(LoggerMixin):
                       f"prompt_len={len(prompt) if prompt else 0}")
 
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._async_conn(write=True) as db:
                 db.row_factory = aiosqlite.Row
-                await db.execute("PRAGMA journal_mode=WAL")
 
                 # Merge-preserving upsert (F1): see save_image_metadata. A later empty
                 # write (rebuild with empty caption, ledger upsert) must not erase the
@@ -4284,37 +5293,36 @@ class DatabaseManager(LoggerMixin):
         (union by tool_name, preferring a non-empty gist) rather than last-write-wins, so a
         second pass can't drop tools recorded by the first. Best-effort — the caller wraps
         this so a DB failure never blocks the reply."""
+        async def _persist(db):
+            existing: List[Dict] = []
+            async with db.execute(
+                "SELECT tools_json FROM message_tool_usage WHERE channel_id = ? AND message_ts = ?",
+                (channel_id, message_ts)
+            ) as cur:
+                row = await cur.fetchone()
+            if row and row[0]:
+                try:
+                    parsed = json.loads(row[0])
+                    if isinstance(parsed, list):
+                        existing = parsed
+                except (json.JSONDecodeError, TypeError, ValueError):
+                    existing = []
+            merged = self._merge_tool_provenance(existing, tools)
+            await db.execute("""
+                INSERT INTO message_tool_usage
+                    (channel_id, message_ts, thread_key, tools_json)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(channel_id, message_ts) DO UPDATE SET
+                    thread_key = excluded.thread_key,
+                    tools_json = excluded.tools_json
+            """, (channel_id, message_ts, thread_key, json.dumps(merged)))
+
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("PRAGMA journal_mode=WAL")
-                # BEGIN IMMEDIATE takes the write lock up front so the read-modify-write
-                # (SELECT existing → merge → UPSERT) is atomic against a concurrent
-                # persist for the same reply — otherwise two passes could each read the
-                # old row and the second would clobber the first's merged tools.
-                await db.execute("BEGIN IMMEDIATE")
-                existing: List[Dict] = []
-                async with db.execute(
-                    "SELECT tools_json FROM message_tool_usage WHERE channel_id = ? AND message_ts = ?",
-                    (channel_id, message_ts)
-                ) as cur:
-                    row = await cur.fetchone()
-                if row and row[0]:
-                    try:
-                        parsed = json.loads(row[0])
-                        if isinstance(parsed, list):
-                            existing = parsed
-                    except (json.JSONDecodeError, TypeError, ValueError):
-                        existing = []
-                merged = self._merge_tool_provenance(existing, tools)
-                await db.execute("""
-                    INSERT INTO message_tool_usage
-                        (channel_id, message_ts, thread_key, tools_json)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(channel_id, message_ts) DO UPDATE SET
-                        thread_key = excluded.thread_key,
-                        tools_json = excluded.tools_json
-                """, (channel_id, message_ts, thread_key, json.dumps(merged)))
-                await db.commit()
+            # Atomic, and under the write lock from the start, so the read-modify-write
+            # (SELECT existing → merge → UPSERT) can't interleave with a concurrent persist
+            # for the same reply — otherwise two passes could each read the old row and the
+            # second would clobber the first's merged tools.
+            await self._queued_write(_persist, atomic=True)
         except Exception as e:
             self.log_debug(f"DB: save_tool_usage_async failed (non-fatal): {e}")
 
@@ -4325,9 +5333,8 @@ class DatabaseManager(LoggerMixin):
         table / read failure degrades to no annotations rather than breaking the rebuild."""
         result: Dict[str, List[Dict]] = {}
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._async_conn() as db:
                 db.row_factory = aiosqlite.Row
-                await db.execute("PRAGMA journal_mode=WAL")
                 async with db.execute(
                     "SELECT message_ts, tools_json FROM message_tool_usage WHERE thread_key = ?",
                     (thread_key,)
@@ -4351,9 +5358,8 @@ class DatabaseManager(LoggerMixin):
             thread_id: Thread identifier
             config: Configuration dictionary
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             await db.execute("""
                 UPDATE threads
@@ -4364,15 +5370,49 @@ class DatabaseManager(LoggerMixin):
             await db.commit()
             logger.debug(f"Saved config for thread {thread_id} (async)")
 
+    async def _cached_read(self, kind: str, key: str, load):
+        """`load()`'s result for (kind, key), from `_settings_cache` when it holds one. Called
+        AFTER the epoch-overlay check: a fenced channel is always served by its overlay."""
+        cache = getattr(self, "_settings_cache", None)
+        if cache is None:
+            return await load()
+        cached = cache.get(kind, key)
+        if cached is not _CACHE_MISS:
+            return cached
+        generation = cache.generation(kind)
+        value = await load()
+        cache.put(kind, key, value, generation)
+        return value
+
+    def _invalidate_cached(self, *kinds: str, key: Optional[str] = None) -> None:
+        """Drop cached rows after a write to their table; no key drops the whole kind."""
+        cache = getattr(self, "_settings_cache", None)
+        if cache is not None:
+            for kind in kinds:
+                cache.invalidate(kind, key)
+
+    def get_settings_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/entry counts per cached kind (settings, policy, memory, prefs)."""
+        cache = getattr(self, "_settings_cache", None)
+        return cache.stats() if cache is not None else {}
+
+    def get_loop_call_stats(self) -> Optional[Dict[str, Any]]:
+        """Sync statements run on the event loop, by call site; None unless DB_LOOP_GUARD."""
+        detector = getattr(self, "_loop_calls", None)
+        return detector.stats() if detector is not None else None
+
     async def get_channel_settings_async(self, channel_id: str) -> Optional[Dict]:
-        """Async version of get_channel_settings."""
+        """Async version of get_channel_settings. Served from `_settings_cache` when warm."""
         overlay = _epoch_overlay(channel_id)
         if overlay is not None:
             store, key = overlay
             return store.channel_settings(key)
-        async with aiosqlite.connect(self.db_path) as db:
+        return await self._cached_read(
+            "settings", channel_id, lambda: self._load_channel_settings_async(channel_id))
+
+    async def _load_channel_settings_async(self, channel_id: str) -> Optional[Dict]:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT response_mode, reply_in_channel, participation_level, "
                 "snoozed_until, muted_threads, model, reasoning_effort, verbosity, "
@@ -4445,8 +5485,7 @@ class DatabaseManager(LoggerMixin):
         if built is None:
             return
         sql, params = built
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute(sql, params)
             # Track 1: turning ambient_memory OFF purges the derived channel narrative in the SAME
             # transaction, so an in-flight summary build can't leave a row behind for a channel that
@@ -4455,7 +5494,8 @@ class DatabaseManager(LoggerMixin):
                 await db.execute(
                     "DELETE FROM channel_summaries WHERE channel_id = ?", (channel_id,))
             await db.commit()
-            logger.debug(f"Saved channel_settings for {channel_id} (async)")
+        self._invalidate_cached("settings", key=channel_id)
+        logger.debug(f"Saved channel_settings for {channel_id} (async)")
 
     async def set_channel_settings_and_policy_async(self, channel_id: str,
                                                     policy: Optional[str],
@@ -4481,9 +5521,7 @@ class DatabaseManager(LoggerMixin):
             return
         built = _build_channel_settings_write(channel_id, updated_by=author, **settings)
         text = (policy or "").strip()
-        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=5000")
+        async with self._async_conn(write=True, isolation_level=None) as db:
             await db.execute("BEGIN IMMEDIATE")
             try:
                 if built is not None:
@@ -4505,6 +5543,7 @@ class DatabaseManager(LoggerMixin):
             except Exception:
                 await db.execute("ROLLBACK")
                 raise
+        self._invalidate_cached("settings", "policy", key=channel_id)
         logger.debug(f"Saved channel_settings + policy for {channel_id} (async)")
 
     # --- Per-channel memory (Phase 9), async variants ---
@@ -4514,9 +5553,12 @@ class DatabaseManager(LoggerMixin):
         if overlay is not None:
             store, key = overlay
             return store.memory(key)
-        async with aiosqlite.connect(self.db_path) as db:
+        return await self._cached_read(
+            "memory", channel_id, lambda: self._load_channel_memory_async(channel_id))
+
+    async def _load_channel_memory_async(self, channel_id: str) -> List[Dict]:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT id, channel_id, scope, content, author, created_ts, updated_ts "
                 "FROM channel_memory WHERE (scope = 'channel' AND channel_id = ?) OR scope = 'workspace' "
@@ -4532,9 +5574,12 @@ class DatabaseManager(LoggerMixin):
         if overlay is not None:
             store, key = overlay
             return store.steering_row(key)
-        async with aiosqlite.connect(self.db_path) as db:
+        return await self._cached_read(
+            "policy", channel_id, lambda: self._load_channel_policy_async(channel_id))
+
+    async def _load_channel_policy_async(self, channel_id: str) -> Optional[Dict]:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT id, channel_id, scope, content, author, created_ts, updated_ts "
                 "FROM channel_memory WHERE scope = 'policy' AND channel_id = ? LIMIT 1",
@@ -4557,8 +5602,7 @@ class DatabaseManager(LoggerMixin):
             store.set_steering(key, content)
             return
         text = (content or "").strip()
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             if not text:
                 await db.execute(
                     "DELETE FROM channel_memory WHERE scope = 'policy' AND channel_id = ?",
@@ -4573,6 +5617,7 @@ class DatabaseManager(LoggerMixin):
                     "              updated_ts = CURRENT_TIMESTAMP",
                     (channel_id, text, author))
             await db.commit()
+        self._invalidate_cached("policy", key=channel_id)
 
     async def set_channel_policy_if_unchanged_async(self, channel_id: str,
                                                     expected_hash: Optional[str],
@@ -4599,10 +5644,8 @@ class DatabaseManager(LoggerMixin):
                                                    hasher=memory_content_hash)
         expected = expected_hash or ""
         text = (content or "").strip()
-        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
+        async with self._async_conn(write=True, isolation_level=None) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=5000")
             # IMMEDIATE, not deferred: the write lock is taken before the read, so a concurrent
             # writer serializes behind this rather than racing inside it.
             await db.execute("BEGIN IMMEDIATE")
@@ -4638,6 +5681,7 @@ class DatabaseManager(LoggerMixin):
                         "              updated_ts = CURRENT_TIMESTAMP",
                         (channel_id, text, author))
                 await db.execute("COMMIT")
+                self._invalidate_cached("policy", key=channel_id)
                 return True
             except Exception:
                 try:
@@ -4655,10 +5699,8 @@ class DatabaseManager(LoggerMixin):
         blank `content` is NOT a clear — a writer that cannot see the policy cannot mean "delete
         it". Returns the stored text afterwards (None if there was and is nothing).
         """
-        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
+        async with self._async_conn(write=True, isolation_level=None) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=5000")
             await db.execute("BEGIN IMMEDIATE")
             try:
                 async with db.execute(
@@ -4678,6 +5720,7 @@ class DatabaseManager(LoggerMixin):
                         "              updated_ts = CURRENT_TIMESTAMP",
                         (channel_id, merged, author))
                 await db.execute("COMMIT")
+                self._invalidate_cached("policy", key=channel_id)
                 return merged
             except Exception:
                 try:
@@ -4695,8 +5738,7 @@ class DatabaseManager(LoggerMixin):
         hallucination or stale. A policy row or one of the gate's preference markers matches
         nothing here, so the write is a no-op rather than a silent overwrite of steering.
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             from message_processor.channel_steering import PREF_AUTHOR_PREFIX
             cursor = await db.execute(
                 "UPDATE channel_memory SET content = ?, updated_ts = CURRENT_TIMESTAMP "
@@ -4704,7 +5746,8 @@ class DatabaseManager(LoggerMixin):
                 "AND (author IS NULL OR author NOT LIKE ? || '%')",
                 (content, memory_id, PREF_AUTHOR_PREFIX))
             await db.commit()
-            return (cursor.rowcount or 0) > 0
+        self._invalidate_cached("memory")
+        return (cursor.rowcount or 0) > 0
 
     async def migrate_channel_directives_to_policy_async(self) -> tuple:
         """Move every nonempty `channel_settings.directives` into its channel's policy row.
@@ -4725,9 +5768,8 @@ class DatabaseManager(LoggerMixin):
         caller aborts on it — see main.ChatBotV2.initialize."""
         migrated = 0
         failed = 0
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT channel_id, directives FROM channel_settings "
                 "WHERE directives IS NOT NULL AND TRIM(directives) != ''"
@@ -4774,6 +5816,7 @@ class DatabaseManager(LoggerMixin):
                         f"DB: directives→policy migration failed for {channel_id} "
                         f"({type(e).__name__}); its directives are untouched and its operator "
                         f"rule will NOT be obeyed until this succeeds")
+        self._invalidate_cached("settings", "policy")
         if migrated:
             logger.info(
                 f"DB: migrated channel directives to policy rows for {migrated} channel(s)")
@@ -4805,9 +5848,8 @@ class DatabaseManager(LoggerMixin):
         placeholders = ", ".join("?" for _ in _LEGACY_PARTICIPATION_LEVELS)
         migrated = 0
         failed = 0
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             # LOWER(TRIM(...)) on both sides: the modal only ever wrote these lowercase, but a
             # value hand-edited into the DB is exactly the kind of row that would otherwise be
             # left behind to fall back to the global default.
@@ -4839,6 +5881,7 @@ class DatabaseManager(LoggerMixin):
                         f"({type(e).__name__}); it is still on "
                         f"'{row['participation_level']}', which the binary gate cannot read and "
                         f"will treat as the global default")
+        self._invalidate_cached("settings")
         if migrated:
             logger.info(
                 f"DB: collapsed legacy participation levels to "
@@ -4884,10 +5927,8 @@ class DatabaseManager(LoggerMixin):
         # deliberately NOT in the predicate for the same reason.
         migrated = 0
         failed = 0
-        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
+        async with self._async_conn(write=True, isolation_level=None) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=5000")
             # An enumeration pass, and ONLY that: which channels have work. Every value this
             # migration actually merges is re-read inside the per-channel lock below, because
             # between this scan and that write a person can save the settings modal or the model
@@ -4969,6 +6010,7 @@ class DatabaseManager(LoggerMixin):
                         f"({type(e).__name__}); its preference rows are untouched, and nothing "
                         f"renders them any more, so those instructions will NOT be obeyed until "
                         f"this succeeds")
+        self._invalidate_cached("policy", "memory")
         if migrated:
             logger.info(
                 f"DB: migrated legacy participation preferences into policy rows for "
@@ -4982,14 +6024,14 @@ class DatabaseManager(LoggerMixin):
         if overlay is not None:
             store, key = overlay
             return store.add_memory(key, content, scope=scope, author=author)
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute(
                 "INSERT INTO channel_memory (channel_id, scope, content, author) VALUES (?, ?, ?, ?)",
                 (channel_id, scope, content, author)
             )
             await db.commit()
-            return cast(int, cursor.lastrowid)
+        self._invalidate_cached("memory")
+        return cast(int, cursor.lastrowid)
 
     async def update_channel_memory_async(self, memory_id: int, content: str):
         """Async version of update_channel_memory."""
@@ -5001,13 +6043,13 @@ class DatabaseManager(LoggerMixin):
         if _epoch_fence_up():
             _epoch_refuse_production_write(
                 await self._channel_of_memory_row(memory_id), "update_channel_memory")
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute(
                 "UPDATE channel_memory SET content = ?, updated_ts = CURRENT_TIMESTAMP WHERE id = ?",
                 (content, memory_id)
             )
             await db.commit()
+        self._invalidate_cached("memory", "policy")  # an id names a row of either kind
 
     async def delete_channel_memory_async(self, memory_id: int):
         """Async version of delete_channel_memory."""
@@ -5019,10 +6061,10 @@ class DatabaseManager(LoggerMixin):
         if _epoch_fence_up():
             _epoch_refuse_production_write(
                 await self._channel_of_memory_row(memory_id), "delete_channel_memory")
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute("DELETE FROM channel_memory WHERE id = ?", (memory_id,))
             await db.commit()
+        self._invalidate_cached("memory", "policy")  # an id names a row of either kind
 
     async def upsert_channel_pref_memory(self, channel_id: str, marker_author: str,
                                          content: str, max_rows: Optional[int] = None
@@ -5061,9 +6103,7 @@ class DatabaseManager(LoggerMixin):
                     store.update_memory(key, row["id"], content)
                     return row["id"]
             return store.add_memory(key, content, scope="channel", author=marker_author)
-        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=5000")
+        async with self._async_conn(write=True, isolation_level=None) as db:
             await db.execute("BEGIN IMMEDIATE")
             try:
                 async with db.execute(
@@ -5080,6 +6120,7 @@ class DatabaseManager(LoggerMixin):
                         (content, row_id),
                     )
                     await db.execute("COMMIT")
+                    self._invalidate_cached("memory")
                     return row_id
                 if max_rows is not None:
                     # ORDINARY facts only. The cap exists to stop remembered facts from crowding
@@ -5103,6 +6144,7 @@ class DatabaseManager(LoggerMixin):
                     (channel_id, content, marker_author),
                 )
                 await db.execute("COMMIT")
+                self._invalidate_cached("memory")
                 return cur.lastrowid
             except Exception:
                 await db.execute("ROLLBACK")
@@ -5190,10 +6232,8 @@ class DatabaseManager(LoggerMixin):
                 result["added"].append(line)
             return result
 
-        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
+        async with self._async_conn(write=True, isolation_level=None) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=5000")
             await db.execute("BEGIN IMMEDIATE")
             try:
                 # 1. Snapshot the current ORDINARY channel-scope rows → {id: content}.
@@ -5258,6 +6298,7 @@ class DatabaseManager(LoggerMixin):
                     remaining += 1
 
                 await db.execute("COMMIT")
+                self._invalidate_cached("memory")
                 result["deleted"] = deleted_ids
                 result["added"] = added
                 return result
@@ -5280,9 +6321,8 @@ class DatabaseManager(LoggerMixin):
         """This user's durable facts, oldest-updated first (same order as the channel twin)."""
         if not user_id:
             return []
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT id, user_id, content, author, created_ts, updated_ts "
                 "FROM user_memory WHERE user_id = ? ORDER BY updated_ts ASC",
@@ -5294,8 +6334,7 @@ class DatabaseManager(LoggerMixin):
     async def add_user_memory_async(self, user_id: str, content: str,
                                     author: Optional[str] = None) -> int:
         """Insert one user fact; returns the new id."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute(
                 "INSERT INTO user_memory (user_id, content, author) VALUES (?, ?, ?)",
                 (user_id, content, author)
@@ -5310,8 +6349,7 @@ class DatabaseManager(LoggerMixin):
         reason `update_channel_fact_async` puts scope there: the id comes from a model, and an id
         it never saw is either a hallucination or another person's row. A mismatch updates nothing.
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute(
                 "UPDATE user_memory SET content = ?, updated_ts = CURRENT_TIMESTAMP "
                 "WHERE id = ? AND user_id = ?",
@@ -5321,8 +6359,7 @@ class DatabaseManager(LoggerMixin):
 
     async def delete_user_memory_async(self, user_id: str, memory_id: int) -> bool:
         """Delete one of THIS user's facts. Returns True when a row was actually removed."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute(
                 "DELETE FROM user_memory WHERE id = ? AND user_id = ?", (memory_id, user_id))
             await db.commit()
@@ -5338,8 +6375,7 @@ class DatabaseManager(LoggerMixin):
         """
         if not user_id:
             return 0
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute("DELETE FROM user_memory WHERE user_id = ?", (user_id,))
             await db.commit()
             return cursor.rowcount or 0
@@ -5380,10 +6416,8 @@ class DatabaseManager(LoggerMixin):
 
         cap = max(1, int(max_rows)) if max_rows is not None else None
 
-        async with aiosqlite.connect(self.db_path, isolation_level=None) as db:
+        async with self._async_conn(write=True, isolation_level=None) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA busy_timeout=5000")
             await db.execute("BEGIN IMMEDIATE")
             try:
                 async with db.execute(
@@ -5454,8 +6488,7 @@ class DatabaseManager(LoggerMixin):
                 user_id=user_id, signal=int(signal), source=source,
                 created_ts=f"{time.time():.6f}"))
             return
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute("""
                 INSERT INTO response_feedback (channel_id, thread_ts, message_ts, user_id, signal, source)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -5476,8 +6509,7 @@ class DatabaseManager(LoggerMixin):
             _epoch_refuse_production_write(
                 await self._channel_of_feedback_row(message_ts, user_id, source),
                 "delete_response_feedback")
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             await db.execute(
                 "DELETE FROM response_feedback WHERE message_ts = ? AND user_id = ? AND source = ?",
                 (message_ts, user_id, source)
@@ -5494,9 +6526,8 @@ class DatabaseManager(LoggerMixin):
             negative = sum(1 for r in rows if r.signal < 0)
             total = positive + negative
             return positive, negative, (positive / total if total else None)
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT "
                 "  SUM(CASE WHEN signal > 0 THEN 1 ELSE 0 END) AS positive, "
@@ -5522,9 +6553,8 @@ class DatabaseManager(LoggerMixin):
         Returns:
             User data dictionary
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             # Try to get existing user
             async with db.execute(
@@ -5568,9 +6598,8 @@ class DatabaseManager(LoggerMixin):
         Returns:
             User info dictionary or None
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             async with db.execute(
                 "SELECT * FROM users WHERE user_id = ?",
@@ -5587,9 +6616,8 @@ class DatabaseManager(LoggerMixin):
         if not ids:
             return {}
         out: Dict[str, Dict] = {}
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             for i in range(0, len(ids), 500):  # under SQLite's ~999 variable cap
                 chunk = ids[i:i + 500]
                 placeholders = ",".join("?" for _ in chunk)
@@ -5601,14 +6629,42 @@ class DatabaseManager(LoggerMixin):
                         out[d["user_id"]] = d
         return out
 
+    async def save_user_infos_async(self, users) -> int:
+        """Bulk upsert of user_info rows — the user-directory sweep's write path.
+
+        One write connection and one transaction for the whole batch, where a sweep through
+        `save_user_info_async` would open one per user (and that method only UPDATEs, so a user
+        the bot had never seen would be dropped). Each item carries `user_id` plus any of
+        username/real_name/email/timezone/tz_label/tz_offset. `last_seen` is left alone: a
+        directory sweep is not a sighting, and an email the item lacks keeps the stored one:
+        users.list omits it without the users:read.email scope. Returns the number of rows
+        written.
+        """
+        rows = [(u["user_id"], u.get("username"), u.get("real_name"), u.get("email"),
+                 u.get("timezone") or "UTC", u.get("tz_label"), u.get("tz_offset") or 0)
+                for u in users if u.get("user_id")]
+        if not rows:
+            return 0
+        async with self._async_conn(write=True) as db:
+            await db.executemany("""
+                INSERT INTO users (user_id, username, real_name, email, timezone, tz_label,
+                                   tz_offset)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    username = excluded.username, real_name = excluded.real_name,
+                    email = COALESCE(excluded.email, users.email), timezone = excluded.timezone,
+                    tz_label = excluded.tz_label, tz_offset = excluded.tz_offset
+            """, rows)
+            await db.commit()
+        return len(rows)
+
     async def get_all_users_async(self) -> list:
         """F29: all persisted user_info rows (user_id/username/real_name/email/tz), for
         resolving a name → id when lookup_user is called with a name rather than a Slack id.
         Read-only; returns a list of dicts (empty on any failure)."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._async_conn() as db:
                 db.row_factory = aiosqlite.Row
-                await db.execute("PRAGMA journal_mode=WAL")
                 async with db.execute(
                     "SELECT user_id, username, real_name, email, timezone, tz_label "
                     "FROM users"
@@ -5629,9 +6685,12 @@ class DatabaseManager(LoggerMixin):
         Returns:
             User preferences dictionary or None
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        return await self._cached_read(
+            "prefs", user_id, lambda: self._load_user_preferences_async(user_id))
+
+    async def _load_user_preferences_async(self, user_id: str) -> Optional[Dict]:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             async with db.execute(
                 "SELECT * FROM user_preferences WHERE slack_user_id = ?",
@@ -5662,9 +6721,8 @@ class DatabaseManager(LoggerMixin):
         from config import BotConfig
         config = BotConfig()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             # Create default preferences
             await db.execute("""
@@ -5688,6 +6746,7 @@ class DatabaseManager(LoggerMixin):
             ))
 
             await db.commit()
+            self._invalidate_cached("prefs", key=user_id)
 
             # Return the created preferences
             async with db.execute(
@@ -5707,9 +6766,8 @@ class DatabaseManager(LoggerMixin):
 
     async def find_thread_images_async(self, thread_id: str, image_type: Optional[str] = None) -> List[Dict]:
         """Async version of find_thread_images."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             params: Tuple[Any, ...]
             if image_type:
@@ -5732,9 +6790,8 @@ class DatabaseManager(LoggerMixin):
 
     async def get_images_by_message_async(self, thread_id: str, message_ts: str) -> List[Dict]:
         """Async version of get_images_by_message."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             async with db.execute(
                 "SELECT * FROM images WHERE thread_id = ? AND message_ts = ? ORDER BY created_at ASC",
@@ -5764,9 +6821,8 @@ class DatabaseManager(LoggerMixin):
         (channel_id, source_ts, kind, ref): a re-offer of the same occurrence does NOT clobber an
         existing row (singleflight — a ready summary survives). Returns the row as it stands AFTER
         the call (dict), so the caller can see whether it is already `ready`/`pending`/etc."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn(write=True) as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             await db.execute("""
                 INSERT INTO ambient_artifacts
                     (channel_id, source_ts, conversation_ts, kind, ref, status,
@@ -5791,8 +6847,7 @@ class DatabaseManager(LoggerMixin):
     ) -> None:
         """Mark an artifact ready with its derived summary. Only writes a row that exists (the
         pending occurrence was claimed first) — status flips to `ready`, fetched_at stamped."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async def _ready(db):
             await db.execute("""
                 UPDATE ambient_artifacts
                 SET status = 'ready', title = ?, summary = ?, model = ?,
@@ -5802,7 +6857,8 @@ class DatabaseManager(LoggerMixin):
                 WHERE channel_id = ? AND source_ts = ? AND kind = ? AND ref = ?
             """, (title, summary, model, derivation_source, content_type, expires_at,
                   channel_id, source_ts, kind, ref))
-            await db.commit()
+
+        await self._queued_write(_ready)
 
     async def set_ambient_artifact_status(
         self, *, channel_id: str, source_ts: str, kind: str, ref: str,
@@ -5812,8 +6868,8 @@ class DatabaseManager(LoggerMixin):
         """Persist a terminal/interim status (failed/blocked/omitted/pending) with an honest
         error_code — the house rule is no silent drops."""
         attempt_sql = "attempt_count = attempt_count + 1," if increment_attempt else ""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+
+        async def _status(db):
             await db.execute(f"""
                 UPDATE ambient_artifacts
                 SET status = ?, error_code = ?, {attempt_sql}
@@ -5822,7 +6878,8 @@ class DatabaseManager(LoggerMixin):
                 WHERE channel_id = ? AND source_ts = ? AND kind = ? AND ref = ?
             """, (status, error_code, derivation_source,
                   channel_id, source_ts, kind, ref))
-            await db.commit()
+
+        await self._queued_write(_status)
 
     async def get_ambient_artifacts_for_messages(
         self, channel_id: str, source_ts_list: List[str],
@@ -5843,9 +6900,8 @@ class DatabaseManager(LoggerMixin):
             status_filter = f" AND status IN ({','.join('?' for _ in statuses)})"
             params.extend(statuses)
         out: Dict[str, List[Dict]] = {}
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(f"""
                 SELECT * FROM ambient_artifacts
                 WHERE channel_id = ? AND source_ts IN ({placeholders}){status_filter}
@@ -5856,14 +6912,28 @@ class DatabaseManager(LoggerMixin):
                     out.setdefault(r["source_ts"], []).append(r)
         return out
 
+    async def search_channel_ambient_artifacts_async(self, channel_id: str, query: str,
+                                                     limit: int = 10) -> List[Dict]:
+        """READY ambient artifacts in a channel whose TITLE or SUMMARY contains `query`, BEST
+        MATCH FIRST. Same-channel only, like every ambient read; pending/failed rows have no
+        summary to match and are never returned."""
+        if not channel_id or not (query or "").strip():
+            return []
+        sql, params = self._knowledge_search_sql(
+            "ambient_artifacts", "t.channel_id = ? AND t.status = 'ready'", (channel_id,),
+            query.strip(), limit)
+        async with self._async_conn() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(sql, params) as cursor:
+                return [dict(row) async for row in cursor]
+
     async def find_reusable_ambient_summary(
         self, channel_id: str, kind: str, ref: str, *, fresh_after: Optional[str] = None,
     ) -> Optional[Dict]:
         """A ready summary for the same ref IN THE SAME CHANNEL, optionally requiring
         fetched_at >= fresh_after (ISO/SQL datetime) so a stale link re-fetches. Newest first."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             query = ("SELECT * FROM ambient_artifacts WHERE channel_id = ? AND kind = ? "
                      "AND ref = ? AND status = 'ready' AND summary IS NOT NULL")
             params: List[Any] = [channel_id, kind, ref]
@@ -5882,8 +6952,7 @@ class DatabaseManager(LoggerMixin):
         (marked metadata `{"ambient": true}`, message_ts == source_ts, thread_id under this
         channel). Without this the deleted/edited image's description survives in the ledger and
         keeps being injected — the exact leak the retention/deletion path is meant to close."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute(
                 "DELETE FROM ambient_artifacts WHERE channel_id = ? AND source_ts = ?",
                 (channel_id, source_ts))
@@ -5906,8 +6975,7 @@ class DatabaseManager(LoggerMixin):
 
     async def delete_ambient_artifacts_by_ref(self, channel_id: str, kind: str, ref: str) -> int:
         """Purge artifacts for a specific ref (file_deleted lifecycle — a Slack file removed)."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute(
                 "DELETE FROM ambient_artifacts WHERE channel_id = ? AND kind = ? AND ref = ?",
                 (channel_id, kind, ref))
@@ -5922,8 +6990,7 @@ class DatabaseManager(LoggerMixin):
         A file id is globally unique, so no channel scope is needed."""
         if not file_id:
             return 0
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
             cursor = await db.execute(
                 "DELETE FROM ambient_artifacts WHERE ref = ? AND kind IN ('image','file')",
                 (file_id,))
@@ -5943,9 +7010,8 @@ class DatabaseManager(LoggerMixin):
 
     async def get_pending_ambient_artifacts(self, limit: int = 200) -> List[Dict]:
         """Rows still `pending` — interrupted work to resume on restart. Oldest first."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 "SELECT * FROM ambient_artifacts WHERE status = 'pending' "
                 "ORDER BY created_at ASC LIMIT ?", (int(limit),)) as cursor:
@@ -5964,53 +7030,48 @@ class DatabaseManager(LoggerMixin):
         # F51c: retire the aged artifacts' late-artifact addenda in the SAME operation. A row's
         # derived note otherwise lingers indefinitely in the summary head after its artifact ages
         # out — and keeps occupying one of the per-thread addenda cap slots. Match on the artifact
-        # identity (channel_id + source_ts + kind + ref); the row-value IN subquery uses the SAME
-        # cutoff predicate and MUST run BEFORE the artifacts are deleted (afterwards the subquery
-        # would find nothing to match).
-        # Capture the affected thread keys BEFORE the delete — the same identity subquery finds
-        # nothing once the artifacts are gone. thread_summary_addenda.thread_id is already stored
-        # as the full `channel_id:thread_ts` key, so it is the mark_needs_refresh key verbatim.
-        affected = self.conn.execute("""
-            SELECT DISTINCT thread_id FROM thread_summary_addenda
-            WHERE (channel_id, source_ts, kind, ref) IN (
-                SELECT channel_id, source_ts, kind, ref FROM ambient_artifacts
-                WHERE (expires_at IS NOT NULL AND expires_at < datetime('now'))
-                   OR (expires_at IS NULL AND created_at < datetime('now', ?))
-            )
-        """, (f"-{int(days)} days",)).fetchall()
-        affected_thread_keys = [row[0] for row in affected]
-        self.conn.execute("""
-            DELETE FROM thread_summary_addenda
-            WHERE (channel_id, source_ts, kind, ref) IN (
-                SELECT channel_id, source_ts, kind, ref FROM ambient_artifacts
-                WHERE (expires_at IS NOT NULL AND expires_at < datetime('now'))
-                   OR (expires_at IS NULL AND created_at < datetime('now', ?))
-            )
-        """, (f"-{int(days)} days",))
-        cursor = self.conn.execute("""
-            DELETE FROM ambient_artifacts
-            WHERE (expires_at IS NOT NULL AND expires_at < datetime('now'))
-               OR (expires_at IS NULL AND created_at < datetime('now', ?))
-        """, (f"-{int(days)} days",))
+        # identity (channel_id + source_ts + kind + ref), batch by batch, in the batch's own
+        # transaction, and BEFORE the batch's artifacts are deleted (afterwards the identity
+        # subquery would find nothing to match). The affected thread keys are captured first for
+        # the same reason; thread_summary_addenda.thread_id is already stored as the full
+        # `channel_id:thread_ts` key, so it is the mark_needs_refresh key verbatim.
+        age = f"-{int(days)} days"
+        affected: List[str] = []
+
+        def retire(conn, marks):
+            identity = (f"SELECT channel_id, source_ts, kind, ref FROM ambient_artifacts "
+                        f"WHERE rowid IN ({marks})")
+            affected.extend(row[0] for row in conn.execute(
+                f"SELECT DISTINCT thread_id FROM thread_summary_addenda "
+                f"WHERE (channel_id, source_ts, kind, ref) IN ({identity})"))
+            conn.execute(f"DELETE FROM thread_summary_addenda "
+                         f"WHERE (channel_id, source_ts, kind, ref) IN ({identity})")
+            conn.execute(f"DELETE FROM ambient_artifacts WHERE rowid IN ({marks})")
+
+        removed = self._sweep_in_batches(
+            "ambient_artifacts",
+            "(expires_at IS NOT NULL AND expires_at < datetime('now')) "
+            "OR (expires_at IS NULL AND created_at < datetime('now', ?))",
+            (age,), retire)
         # Retention must also reach the dual-written ambient image analyses (metadata
         # `{"ambient": true}`) — they have no expires_at column, so age them by created_at with
         # the same window. Addressed uploads (no ambient marker) are untouched.
-        img_cursor = self.conn.execute("""
-            DELETE FROM images
-            WHERE metadata_json IS NOT NULL AND json_valid(metadata_json)
-              AND json_extract(metadata_json, '$.ambient') = 1
-              AND created_at < datetime('now', ?)
-        """, (f"-{int(days)} days",))
-        if cursor.rowcount > 0 or img_cursor.rowcount > 0:
-            self.log_info(f"DB: Cleaned up {cursor.rowcount} ambient artifacts + "
-                          f"{img_cursor.rowcount} ambient image analyses (retention {days}d)")
-        return affected_thread_keys
+        removed_images = self._sweep_in_batches(
+            "images",
+            "metadata_json IS NOT NULL AND json_valid(metadata_json) "
+            "AND json_extract(metadata_json, '$.ambient') = 1 "
+            "AND created_at < datetime('now', ?)",
+            (age,), self._delete_rowids("images"))
+        if removed > 0 or removed_images > 0:
+            self.log_info(f"DB: Cleaned up {removed} ambient artifacts + "
+                          f"{removed_images} ambient image analyses (retention {days}d)")
+        # DISTINCT across batches, first-seen order.
+        return list(dict.fromkeys(affected))
 
     async def get_thread_documents_async(self, thread_id: str, limit: Optional[int] = None) -> List[Dict]:
         """Async version of get_thread_documents."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             query = "SELECT * FROM documents WHERE thread_id = ? ORDER BY created_at ASC"
             if limit:
@@ -6038,20 +7099,19 @@ class DatabaseManager(LoggerMixin):
         send a picture, then ask about it in the next message, and the picture is in another
         "thread".
 
-        Same privacy boundary as the document lookup: a prefix LIKE on ``channel_id + ':'``, and
-        channel ids are alphanumeric (no LIKE metacharacters), so this cannot escape the channel.
+        Same privacy boundary as the document lookup: equality on the generated channel_id column
+        (the key up to its first colon), so this cannot escape the channel.
         `within_hours` bounds it in time; None means no bound.
         """
-        params: List[Any] = [f"{channel_id}:%"]
-        where = "thread_id LIKE ?"
+        params: List[Any] = [channel_id]
+        where = "channel_id = ?"
         if within_hours is not None:
             where += " AND created_at >= datetime('now', ?)"
             params.append(f"-{int(within_hours)} hours")
         params.append(int(limit))
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 f"SELECT * FROM images WHERE {where} ORDER BY created_at DESC LIMIT ?",
                 tuple(params),
@@ -6069,16 +7129,15 @@ class DatabaseManager(LoggerMixin):
         """All documents shared anywhere in a channel (F22 channel-wide access).
 
         thread_id is stored as "channel:thread"; a channel's documents are every row
-        whose thread_id starts with ``channel_id + ':'``. Channel ids are alphanumeric
-        (no LIKE metacharacters), so a plain prefix LIKE is safe and cannot escape the
-        channel — the privacy boundary is same-channel-only. Same row shape and
-        created_at ASC ordering as get_thread_documents_async."""
-        async with aiosqlite.connect(self.db_path) as db:
+        whose generated channel_id (the key up to its first colon) equals ``channel_id`` —
+        an indexed lookup that cannot escape the channel, so the privacy boundary is
+        same-channel-only. Same row shape and created_at ASC ordering as
+        get_thread_documents_async."""
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
-                "SELECT * FROM documents WHERE thread_id LIKE ? ORDER BY created_at ASC",
-                (f"{channel_id}:%",),
+                "SELECT * FROM documents WHERE channel_id = ? ORDER BY created_at ASC",
+                (channel_id,),
             ) as cursor:
                 documents = []
                 async for row in cursor:
@@ -6102,14 +7161,51 @@ class DatabaseManager(LoggerMixin):
         escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
         return f"%{escaped}%"
 
+    @staticmethod
+    def _fts_phrase(term: str) -> Optional[str]:
+        """An FTS5 MATCH expression that finds `term` as a literal substring, or None when the
+        term is too short for a trigram and the caller must use `_like_contains` instead.
+
+        One double-quoted phrase with its inner quotes doubled, so nothing the model types is
+        read as FTS syntax — no column filters, no NEAR, no AND/OR, no `*` prefix queries.
+        """
+        if len(term) < _FTS_MIN_QUERY_CHARS:
+            return None
+        return '"' + term.replace('"', '""') + '"'
+
+    def _knowledge_search_sql(self, table: str, scope_sql: str, scope_params: Tuple[Any, ...],
+                              term: str, limit: int) -> Tuple[str, Tuple[Any, ...]]:
+        """The statement behind the channel knowledge searches: `term` as a substring of any of
+        `table`'s `_KNOWLEDGE_FTS` columns, inside `scope_sql` (over alias `t`).
+
+        Through `<table>_fts` it is an index lookup ranked by BM25, newest first among equals.
+        A term too short for a trigram — or a database without the index — takes the escaped
+        LIKE scan, newest first, so both paths match exactly the same rows.
+        """
+        columns = _KNOWLEDGE_FTS[table]
+        limit = max(1, int(limit))
+        phrase = self._fts_phrase(term) if getattr(self, "_knowledge_fts", False) else None
+        if phrase is None:
+            pattern = self._like_contains(term)
+            matches = " OR ".join(f"t.{c} LIKE ? ESCAPE '\\'" for c in columns)
+            return (f"SELECT t.* FROM {table} t WHERE {scope_sql} AND ({matches}) "
+                    f"ORDER BY t.created_at DESC, t.id DESC LIMIT ?",
+                    (*scope_params, *([pattern] * len(columns)), limit))
+        fts = f"{table}_fts"
+        return (f"SELECT t.* FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+                f"WHERE {fts} MATCH ? AND {scope_sql} "
+                f"ORDER BY bm25({fts}), t.created_at DESC, t.id DESC LIMIT ?",
+                (phrase, *scope_params, limit))
+
     async def search_channel_documents_async(self, channel_id: str, query: str,
                                              limit: int = 10) -> List[Dict]:
-        """Documents in a channel whose FILENAME or SUMMARY contains `query`, NEWEST FIRST.
+        """Documents in a channel whose FILENAME or SUMMARY contains `query`, BEST MATCH FIRST
+        (BM25 over the full-text index; newest first among equals).
 
         The search half of get_channel_documents_async, and it inherits that method's privacy
-        boundary verbatim: thread_id is stored as "channel:thread", so a channel's rows are the
-        ones whose thread_id starts with ``channel_id + ':'``, and channel ids are alphanumeric
-        (no LIKE metacharacters) so the prefix match cannot escape the channel.
+        boundary verbatim: thread_id is stored as "channel:thread", and a channel's rows are the
+        ones whose generated channel_id — the key up to its first colon — equals ``channel_id``,
+        so the match cannot escape the channel.
 
         SUMMARY, not content: the documents table holds a summary + metadata + the Slack ref and
         never the body (CLAUDE.md pitfall 6a). A row that does not match here may still say the
@@ -6117,17 +7213,11 @@ class DatabaseManager(LoggerMixin):
         """
         if not channel_id or not (query or "").strip():
             return []
-        pattern = self._like_contains(query.strip())
-        async with aiosqlite.connect(self.db_path) as db:
+        sql, params = self._knowledge_search_sql(
+            "documents", "t.channel_id = ?", (channel_id,), query.strip(), limit)
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-            async with db.execute(
-                r"""SELECT * FROM documents
-                    WHERE thread_id LIKE ?
-                      AND (filename LIKE ? ESCAPE '\' OR summary LIKE ? ESCAPE '\')
-                    ORDER BY created_at DESC, id DESC LIMIT ?""",
-                (f"{channel_id}:%", pattern, pattern, max(1, int(limit))),
-            ) as cursor:
+            async with db.execute(sql, params) as cursor:
                 documents = []
                 async for row in cursor:
                     doc = dict(row)
@@ -6141,9 +7231,9 @@ class DatabaseManager(LoggerMixin):
 
     async def search_channel_image_analyses_async(self, channel_id: str, query: str,
                                                   limit: int = 10) -> List[Dict]:
-        """Images in a channel whose ANALYSIS text contains `query`, NEWEST FIRST.
+        """Images in a channel whose ANALYSIS text contains `query`, BEST MATCH FIRST.
 
-        The image twin of search_channel_documents_async, same channel-prefix boundary as
+        The image twin of search_channel_documents_async, same channel_id boundary as
         find_channel_images_async. `original_analysis` (an edited image's pre-edit description)
         is searched too — it describes a picture this conversation actually saw.
 
@@ -6153,17 +7243,11 @@ class DatabaseManager(LoggerMixin):
         """
         if not channel_id or not (query or "").strip():
             return []
-        pattern = self._like_contains(query.strip())
-        async with aiosqlite.connect(self.db_path) as db:
+        sql, params = self._knowledge_search_sql(
+            "images", "t.channel_id = ?", (channel_id,), query.strip(), limit)
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
-            async with db.execute(
-                r"""SELECT * FROM images
-                    WHERE thread_id LIKE ?
-                      AND (analysis LIKE ? ESCAPE '\' OR original_analysis LIKE ? ESCAPE '\')
-                    ORDER BY created_at DESC, id DESC LIMIT ?""",
-                (f"{channel_id}:%", pattern, pattern, max(1, int(limit))),
-            ) as cursor:
+            async with db.execute(sql, params) as cursor:
                 images = []
                 async for row in cursor:
                     img = dict(row)
@@ -6175,9 +7259,8 @@ class DatabaseManager(LoggerMixin):
 
     async def get_document_by_filename_async(self, thread_id: str, filename: str) -> Optional[Dict]:
         """Async version of get_document_by_filename (newest matching row)."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
             async with db.execute(
                 """SELECT * FROM documents
                    WHERE thread_id = ? AND filename = ?
@@ -6206,9 +7289,8 @@ class DatabaseManager(LoggerMixin):
         replaying: the Slack file_id (exact, survives same-name collisions), else the
         nearest upload at/before this message's ts. Falls back to newest-by-filename so a
         legacy row (no file_id, no message_ts) still resolves as before."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             row = None
             # 1. Exact Slack file_id — one upload, one row (renames don't fool it).
@@ -6263,19 +7345,8 @@ class DatabaseManager(LoggerMixin):
         return await asyncio.to_thread(self.get_or_create_thread, thread_id, channel_id, user_id)
 
     async def cleanup_old_modal_sessions_async(self, hours: int = 24):
-        """Async version of cleanup_old_modal_sessions."""
-        try:
-            cutoff = int((datetime.now() - timedelta(hours=hours)).timestamp())
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("PRAGMA journal_mode=WAL")
-                cursor = await db.execute(
-                    "DELETE FROM modal_sessions WHERE created_at < ?", (cutoff,)
-                )
-                await db.commit()
-                if cursor.rowcount > 0:
-                    self.log_info(f"Cleaned up {cursor.rowcount} modal sessions older than {hours} hours")
-        except Exception as e:
-            self.log_error(f"Failed to cleanup modal sessions: {e}")
+        """Async version of cleanup_old_modal_sessions: the same batched sweep, off the loop."""
+        await asyncio.to_thread(self.cleanup_old_modal_sessions, hours)
 
     # F32 container async wrappers. asyncio.to_thread over the sync methods, matching
     # get_or_create_thread_async — these run on the message path, so they must not block
@@ -6320,9 +7391,8 @@ class DatabaseManager(LoggerMixin):
         Returns:
             Timezone string or None
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             async with db.execute(
                 "SELECT timezone FROM users WHERE user_id = ?",
@@ -6346,8 +7416,7 @@ class DatabaseManager(LoggerMixin):
             tz_label: Optional timezone label
             tz_offset: Optional timezone offset
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
 
             await db.execute("""
                 UPDATE users
@@ -6368,8 +7437,7 @@ class DatabaseManager(LoggerMixin):
         Returns:
             True if update successful
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("PRAGMA journal_mode=WAL")
+        async with self._async_conn(write=True) as db:
 
             # Build dynamic update query
             update_fields = []
@@ -6402,6 +7470,7 @@ class DatabaseManager(LoggerMixin):
 
             await db.execute(query, values)
             await db.commit()
+            self._invalidate_cached("prefs", key=user_id)
             return True
 
     async def get_thread_config_async(self, thread_id: str) -> Optional[Dict]:
@@ -6414,9 +7483,8 @@ class DatabaseManager(LoggerMixin):
         Returns:
             Thread config dictionary or None
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._async_conn() as db:
             db.row_factory = aiosqlite.Row
-            await db.execute("PRAGMA journal_mode=WAL")
 
             async with db.execute(
                 "SELECT config_json FROM threads WHERE thread_id = ?",
@@ -6445,31 +7513,103 @@ class DatabaseManager(LoggerMixin):
     STREAM_BUSY_TIMEOUT_MS = 5000
 
     @asynccontextmanager
-    async def _stream_conn(self, *, busy_timeout_ms: Optional[int] = None):
-        """Per-call connection with the house pragmas: autocommit, WAL, 5s busy timeout.
+    async def _stream_conn(self, *, busy_timeout_ms: Optional[int] = None, write: bool = False):
+        """Pooled connection with the house pragmas: autocommit, WAL, 5s busy timeout, Row rows.
+
+        `write=True` borrows the pool's single writer; everything else shares the readers.
 
         `busy_timeout_ms` CAPS THE LOCK WAIT for a caller that is running against a deadline.
         Cancelling such a read from outside is not enough: `asyncio.wait_for` cancels the
         coroutine and then waits for it to unwind, and unwinding drains whatever SQLite work is
         already queued — so a read blocked on a lock can overshoot its caller's deadline by the
-        whole busy timeout (codex verify, P2). The bound has to be inside the connection.
+        whole busy timeout (codex verify, P2). The bound has to be inside the connection, so the
+        pool sets it for the borrow and restores the house value on return. Waiting for a free
+        pool slot needs no such cap: that wait is a plain asyncio wait and cancels immediately.
         Coerced through `int()` because a PRAGMA cannot take a bound parameter.
         """
         timeout_ms = (self.STREAM_BUSY_TIMEOUT_MS if busy_timeout_ms is None
                       else max(0, int(busy_timeout_ms)))
-        # THE CONNECT TIMEOUT AND THE PRAGMA, IN THAT ORDER, AND BOTH ARE NEEDED. `sqlite3`
-        # applies its own 5-second default busy timeout the moment the connection opens, so the
-        # FIRST statement — `journal_mode`, which takes a lock — would wait five seconds on a
-        # locked database however small the PRAGMA that follows it. Measured: capping only the
-        # pragma left a 0.3s-budgeted read blocking for 5.004s. `timeout=` bounds the opening
-        # statements, the PRAGMA bounds every statement after them.
-        async with aiosqlite.connect(self.db_path, isolation_level=None,
-                                     timeout=timeout_ms / 1000.0) as db:
-            db.row_factory = aiosqlite.Row
-            await db.execute(f"PRAGMA busy_timeout={timeout_ms}")
-            await db.execute("PRAGMA journal_mode=WAL")
+        # A connection the pool has to OPEN for this borrow is opened with `timeout=` as well as
+        # the PRAGMA: `sqlite3` applies its own 5-second default busy timeout the moment the
+        # connection opens, so the first statement — `journal_mode`, which takes a lock — would
+        # otherwise wait five seconds on a locked database however small the cap. Measured:
+        # capping only the pragma left a 0.3s-budgeted read blocking for 5.004s.
+        async with self._connection_pool().connection(self.db_path, write=write,
+                                                      busy_timeout_ms=timeout_ms,
+                                                      isolation_level=None,
+                                                      row_factory=aiosqlite.Row) as db:
+            yield db
+
+    @asynccontextmanager
+    async def _async_conn(self, *, write: bool = False,
+                          isolation_level: _IsolationLevel = "DEFERRED"):
+        """Pooled stand-in for a bare `aiosqlite.connect(self.db_path)`.
+
+        Same defaults as the bare connect — implicit (deferred) transactions and tuple rows — so
+        the accessors written against one keep their `commit()` and `row[0]` semantics.
+        """
+        async with self._connection_pool().connection(self.db_path, write=write,
+                                                      busy_timeout_ms=self.STREAM_BUSY_TIMEOUT_MS,
+                                                      isolation_level=isolation_level,
+                                                      row_factory=None) as db:
             yield db
 
+    def _connection_pool(self) -> "_ConnectionPool":
+        # A manager assembled with __new__ (the migration tests build one around a hand-made
+        # file) never ran __init__; give it a default-sized pool rather than an AttributeError.
+        pool = getattr(self, "_pool", None)
+        if pool is None:
+            pool = self._pool = _ConnectionPool(readers=4,
+                                                busy_timeout_ms=self.STREAM_BUSY_TIMEOUT_MS)
+        return pool
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection-pool occupancy and wait time (see `_ConnectionPool.stats`)."""
+        stats = self._connection_pool().stats()
+        queue = getattr(self, "_group_commit", None)
+        if queue is not None:
+            stats["group_commit"] = queue.stats()
+        return stats
+
+    async def close_pool_async(self) -> None:
+        """Commit anything still queued, then close the pooled async connections. The pool
+        reopens lazily if used again."""
+        await self.flush_writes_async()
+        await self._connection_pool().close()
+
+    async def _queued_write(self, op, *, atomic: bool = False):
+        """Run one write `op(db)` on the writer, through the group-commit queue when it is on.
+
+        Returns only once the write is COMMITTED either way — the await IS the acknowledgement,
+        so a caller about to do something Slack-visible on the strength of it still can.
+        `atomic` wraps a multi-statement op in `BEGIN IMMEDIATE … COMMIT` on the direct path;
+        queued, the op is already inside the batch's transaction under its own SAVEPOINT.
+        """
+        queue = getattr(self, "_group_commit", None)
+        # Inside a borrow the writer may be ours already: the worker would queue behind us.
+        if queue is not None and not _POOL_BORROWED.get():
+            return await queue.submit(op)
+        async with self._stream_conn(write=True) as db:
+            if not atomic:
+                return await op(db)
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                result = await op(db)
+            except Exception:
+                try:
+                    await db.execute("ROLLBACK")
+                except Exception:  # noqa: BLE001
+                    pass
+                raise
+            await db.execute("COMMIT")
+            return result
+
+    async def flush_writes_async(self) -> None:
+        """Wait for every queued group-commit write to land. A no-op when the queue is off."""
+        queue = getattr(self, "_group_commit", None)
+        if queue is not None:
+            await queue.flush()
+
     # --- bot_meta -----------------------------------------------------------------------
 
     def get_meta(self, key: str) -> Optional[str]:
@@ -6487,7 +7627,7 @@ class DatabaseManager(LoggerMixin):
 
     async def set_meta_async(self, key: str, value: str) -> None:
         """Upsert a bot_meta value. NOT for epoch-class keys — see set_meta_if_absent_async."""
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             await db.execute(
                 "INSERT INTO bot_meta (key, value, updated_ts) "
                 "VALUES (?, ?, CURRENT_TIMESTAMP) "
@@ -6501,7 +7641,7 @@ class DatabaseManager(LoggerMixin):
         The only legal writer for epoch-class keys: rewriting the receipts epoch would
         re-grandfather every own-message posted since the first boot.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "INSERT OR IGNORE INTO bot_meta (key, value) VALUES (?, ?)", (key, value))
             return bool(cursor.rowcount)
@@ -6537,111 +7677,99 @@ class DatabaseManager(LoggerMixin):
             raise ValueError(f"invalid receipt state: {state!r}")
         _check_receipt_class(receipt_class)
         key = (team_id, channel_id, message_ts)
-        async with self._stream_conn() as db:
-            await db.execute("BEGIN IMMEDIATE")
-            try:
-                async with db.execute(
-                    "SELECT turn_id, state, thread_root_ts, receipt_class "
-                    "FROM outbound_receipts "
-                    "WHERE team_id = ? AND channel_id = ? AND message_ts = ?", key
-                ) as cursor:
-                    row = await cursor.fetchone()
 
-                if row is None:
-                    await db.execute(
-                        "INSERT INTO outbound_receipts "
-                        "(team_id, channel_id, message_ts, turn_id, state, thread_root_ts, "
-                        " receipt_class, finalized_ts) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, "
-                        "        CASE WHEN ? = 'finalized' THEN CURRENT_TIMESTAMP END)",
-                        (*key, turn_id, state, thread_root_ts, receipt_class, state))
-                    await db.execute("COMMIT")
-                    self.log_debug(f"Receipt {channel_id}/{message_ts} → {state} "
-                                   f"[{receipt_class}] ({turn_id})")
-                    return TransitionResult(True, "absent", state, "inserted")
-
-                current = row["state"]
-                current_class = row["receipt_class"]
-
-                # Class arbitration BEFORE anything else, so a refused registration changes
-                # nothing but the class itself — not the root fill below, not the state. The
-                # one sanctioned change is the placeholder promotion: a stored `chrome` class
-                # becoming the answer. NULL is IMMUTABLE (spec §11.2): a NULL row promotes
-                # with class still NULL, so a legacy row can never become editable.
-                promotion = (current == "chrome" and state == "in_flight"
-                             and receipt_class == "assistant_reply"
-                             and current_class == "chrome")
-                if (receipt_class is not None and current_class is not None
-                        and receipt_class != current_class and not promotion):
-                    # Spec §11.1: a conflict fails closed to NULL — the ineligible terminal
-                    # state. Nothing editable can be produced by a conflict.
-                    await db.execute(
-                        "UPDATE outbound_receipts SET receipt_class = NULL "
-                        "WHERE team_id = ? AND channel_id = ? AND message_ts = ?", key)
-                    await db.execute("COMMIT")
-                    self.log_error(
-                        f"Receipt {channel_id}/{message_ts} class conflict: row was "
-                        f"{current_class!r}, {turn_id} claimed {receipt_class!r} — class "
-                        f"NULLed (ineligible), registration refused")
-                    return TransitionResult(False, current, current, "class_conflict")
-
-                # A message's destination root is a property of the message, not of the owner,
-                # so a later observation may FILL a NULL — it may never clear a known one.
-                if thread_root_ts and not row["thread_root_ts"]:
-                    await db.execute(
-                        "UPDATE outbound_receipts SET thread_root_ts = ? "
-                        "WHERE team_id = ? AND channel_id = ? AND message_ts = ?",
-                        (thread_root_ts, *key))
+        async def _register(db) -> TransitionResult:
+            async with db.execute(
+                "SELECT turn_id, state, thread_root_ts, receipt_class "
+                "FROM outbound_receipts "
+                "WHERE team_id = ? AND channel_id = ? AND message_ts = ?", key
+            ) as cursor:
+                row = await cursor.fetchone()
 
-                if current == "finalized":
-                    await db.execute("COMMIT")
-                    self.log_debug(
-                        f"Receipt {channel_id}/{message_ts} already finalized; "
-                        f"{state} registration by {turn_id} absorbed")
-                    return TransitionResult(
-                        False, "finalized", "finalized", "absorbed_finalized")
-                if row["turn_id"] != turn_id:
-                    await db.execute("COMMIT")
-                    self.log_warning(
-                        f"Receipt {channel_id}/{message_ts} is held by {row['turn_id']} "
-                        f"({current}); refusing {state} registration by {turn_id}")
-                    return TransitionResult(False, current, current, "foreign_owner")
-                if current == "in_flight" and state == "chrome":
-                    await db.execute("COMMIT")
-                    self.log_warning(
-                        f"Receipt {channel_id}/{message_ts} in_flight; chrome registration by "
-                        f"{turn_id} refused (demote_receipt_chrome_async is the only path down)")
-                    return TransitionResult(
-                        False, "in_flight", "in_flight", "chrome_over_in_flight")
-                # The class this row ends the call with: a promotion rewrites it WITH the
-                # state (atomically — same transaction); otherwise the stored value —
-                # including an immutable NULL (spec §11.2, no same-owner fill) — is never
-                # touched.
-                class_to_write = receipt_class if promotion else current_class
-                if class_to_write != current_class:
-                    await db.execute(
-                        "UPDATE outbound_receipts SET receipt_class = ? "
-                        "WHERE team_id = ? AND channel_id = ? AND message_ts = ?",
-                        (class_to_write, *key))
-                if current != state:
-                    await db.execute(
-                        "UPDATE outbound_receipts SET state = ?, finalized_ts = "
-                        "  CASE WHEN ? = 'finalized' THEN CURRENT_TIMESTAMP ELSE finalized_ts END "
-                        "WHERE team_id = ? AND channel_id = ? AND message_ts = ?",
-                        (state, state, *key))
-                    self.log_debug(
-                        f"Receipt {channel_id}/{message_ts} {current}→{state} "
-                        f"[{class_to_write}] ({turn_id})")
-                    await db.execute("COMMIT")
-                    return TransitionResult(True, current, state, "transitioned")
-                await db.execute("COMMIT")
-                return TransitionResult(True, current, state, "unchanged")
-            except Exception:
-                try:
-                    await db.execute("ROLLBACK")
-                except Exception:
-                    pass
-                raise
+            if row is None:
+                await db.execute(
+                    "INSERT INTO outbound_receipts "
+                    "(team_id, channel_id, message_ts, turn_id, state, thread_root_ts, "
+                    " receipt_class, finalized_ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, "
+                    "        CASE WHEN ? = 'finalized' THEN CURRENT_TIMESTAMP END)",
+                    (*key, turn_id, state, thread_root_ts, receipt_class, state))
+                self.log_debug(f"Receipt {channel_id}/{message_ts} → {state} "
+                               f"[{receipt_class}] ({turn_id})")
+                return TransitionResult(True, "absent", state, "inserted")
+
+            current = row["state"]
+            current_class = row["receipt_class"]
+
+            # Class arbitration BEFORE anything else, so a refused registration changes
+            # nothing but the class itself — not the root fill below, not the state. The
+            # one sanctioned change is the placeholder promotion: a stored `chrome` class
+            # becoming the answer. NULL is IMMUTABLE (spec §11.2): a NULL row promotes
+            # with class still NULL, so a legacy row can never become editable.
+            promotion = (current == "chrome" and state == "in_flight"
+                         and receipt_class == "assistant_reply"
+                         and current_class == "chrome")
+            if (receipt_class is not None and current_class is not None
+                    and receipt_class != current_class and not promotion):
+                # Spec §11.1: a conflict fails closed to NULL — the ineligible terminal
+                # state. Nothing editable can be produced by a conflict.
+                await db.execute(
+                    "UPDATE outbound_receipts SET receipt_class = NULL "
+                    "WHERE team_id = ? AND channel_id = ? AND message_ts = ?", key)
+                self.log_error(
+                    f"Receipt {channel_id}/{message_ts} class conflict: row was "
+                    f"{current_class!r}, {turn_id} claimed {receipt_class!r} — class "
+                    f"NULLed (ineligible), registration refused")
+                return TransitionResult(False, current, current, "class_conflict")
+
+            # A message's destination root is a property of the message, not of the owner,
+            # so a later observation may FILL a NULL — it may never clear a known one.
+            if thread_root_ts and not row["thread_root_ts"]:
+                await db.execute(
+                    "UPDATE outbound_receipts SET thread_root_ts = ? "
+                    "WHERE team_id = ? AND channel_id = ? AND message_ts = ?",
+                    (thread_root_ts, *key))
+
+            if current == "finalized":
+                self.log_debug(
+                    f"Receipt {channel_id}/{message_ts} already finalized; "
+                    f"{state} registration by {turn_id} absorbed")
+                return TransitionResult(
+                    False, "finalized", "finalized", "absorbed_finalized")
+            if row["turn_id"] != turn_id:
+                self.log_warning(
+                    f"Receipt {channel_id}/{message_ts} is held by {row['turn_id']} "
+                    f"({current}); refusing {state} registration by {turn_id}")
+                return TransitionResult(False, current, current, "foreign_owner")
+            if current == "in_flight" and state == "chrome":
+                self.log_warning(
+                    f"Receipt {channel_id}/{message_ts} in_flight; chrome registration by "
+                    f"{turn_id} refused (demote_receipt_chrome_async is the only path down)")
+                return TransitionResult(
+                    False, "in_flight", "in_flight", "chrome_over_in_flight")
+            # The class this row ends the call with: a promotion rewrites it WITH the
+            # state (atomically — same transaction); otherwise the stored value —
+            # including an immutable NULL (spec §11.2, no same-owner fill) — is never
+            # touched.
+            class_to_write = receipt_class if promotion else current_class
+            if class_to_write != current_class:
+                await db.execute(
+                    "UPDATE outbound_receipts SET receipt_class = ? "
+                    "WHERE team_id = ? AND channel_id = ? AND message_ts = ?",
+                    (class_to_write, *key))
+            if current != state:
+                await db.execute(
+                    "UPDATE outbound_receipts SET state = ?, finalized_ts = "
+                    "  CASE WHEN ? = 'finalized' THEN CURRENT_TIMESTAMP ELSE finalized_ts END "
+                    "WHERE team_id = ? AND channel_id = ? AND message_ts = ?",
+                    (state, state, *key))
+                self.log_debug(
+                    f"Receipt {channel_id}/{message_ts} {current}→{state} "
+                    f"[{class_to_write}] ({turn_id})")
+                return TransitionResult(True, current, state, "transitioned")
+            return TransitionResult(True, current, state, "unchanged")
+
+        return await self._queued_write(_register, atomic=True)
 
     async def register_chrome_async(self, team_id: str, channel_id: str, message_ts: str,
                                     owner_turn_id: str,
@@ -6665,7 +7793,7 @@ class DatabaseManager(LoggerMixin):
         The state never moves, so both ends of the transition are `chrome` — what changes is
         the owner, which the event carries separately.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "UPDATE outbound_receipts SET turn_id = ? "
                 "WHERE team_id = ? AND channel_id = ? AND message_ts = ? "
@@ -6713,7 +7841,7 @@ class DatabaseManager(LoggerMixin):
         for _ts, _root, cls in given:
             _check_receipt_class(cls)
         results: List[TransitionResult] = []
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             await db.execute("BEGIN IMMEDIATE")
             try:
                 for ts, root, cls in given:
@@ -6811,7 +7939,7 @@ class DatabaseManager(LoggerMixin):
         the state — but only when a class was ever stamped. A legacy NULL stays NULL: the
         demotion is a mapping-back, never a first stamping.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "UPDATE outbound_receipts SET state = 'chrome', "
                 "  receipt_class = CASE WHEN receipt_class IS NULL THEN NULL "
@@ -6833,7 +7961,7 @@ class DatabaseManager(LoggerMixin):
         state this call actually removed rather than whatever a separate read happened to see.
         """
         key = (team_id, channel_id, message_ts)
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             await db.execute("BEGIN IMMEDIATE")
             try:
                 async with db.execute(
@@ -6917,7 +8045,7 @@ class DatabaseManager(LoggerMixin):
         these rows describe messages Slack itself has aged out, so there is no state to report and
         nothing downstream that could act on one.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "DELETE FROM outbound_receipts "
                 "WHERE team_id = ? AND channel_id = ? "
@@ -6939,7 +8067,7 @@ class DatabaseManager(LoggerMixin):
         prefix = f"{live_session_id}:"
         predicate = "state = 'in_flight' AND substr(turn_id, 1, ?) <> ?"
         params = (len(prefix), prefix)
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             await db.execute("BEGIN IMMEDIATE")
             try:
                 async with db.execute(
@@ -6978,7 +8106,7 @@ class DatabaseManager(LoggerMixin):
         second claim names a DIFFERENT class, that conflict is detected and ERROR-logged
         (spec §11.1); the first claim stands untouched."""
         _check_receipt_class(receipt_class)
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "INSERT OR IGNORE INTO pending_share_receipts "
                 "(team_id, channel_id, file_id, owner_turn_id, thread_root_ts, receipt_class) "
@@ -7009,7 +8137,7 @@ class DatabaseManager(LoggerMixin):
         the next boot, and a delete that committed without the finalize would strand the share
         outside the stream forever. Idempotent — an already-resolved file is a no-op success.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             await db.execute("BEGIN IMMEDIATE")
             try:
                 async with db.execute(
@@ -7094,7 +8222,7 @@ class DatabaseManager(LoggerMixin):
         A resolution failure — auth error, file_not_found race, timeout, exhausted polling —
         must RETAIN the row so boot recovery can retry it.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "DELETE FROM pending_share_receipts "
                 "WHERE team_id = ? AND channel_id = ? AND file_id = ?",
@@ -7130,9 +8258,12 @@ class DatabaseManager(LoggerMixin):
         """
         params = _activity_upsert_params(team_id, channel_id, root_ts, reply_ts, reply_count,
                                          event_ts, mark_dirty)
-        async with self._stream_conn() as db:
+
+        async def _upsert(db):
             await db.execute(_ACTIVITY_UPSERT_SQL, params)
 
+        await self._queued_write(_upsert)
+
     async def clear_thread_dirty_async(self, team_id: str, channel_id: str, root_ts: str,
                                        if_event_ts_equals: Optional[str]) -> bool:
         """Compare-and-clear: only clears if no newer event landed since the reader looked.
@@ -7140,7 +8271,7 @@ class DatabaseManager(LoggerMixin):
         `IS` compares NULL-safely, so a row that has never carried an event ts clears against
         an explicit None.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "UPDATE channel_thread_activity SET dirty = 0, updated_ts = CURRENT_TIMESTAMP "
                 "WHERE team_id = ? AND channel_id = ? AND root_ts = ? "
@@ -7170,7 +8301,7 @@ class DatabaseManager(LoggerMixin):
         against an explicit None. The delete is recoverable by construction: any future event on
         the root re-creates the row through the index.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "DELETE FROM channel_thread_activity "
                 "WHERE team_id = ? AND channel_id = ? AND root_ts = ? "
@@ -7227,7 +8358,7 @@ class DatabaseManager(LoggerMixin):
     async def seed_channel_coverage_async(self, team_id: str, channel_id: str,
                                           start_ts: str) -> bool:
         """Create the coverage row with a concrete horizon. Never moves an existing one."""
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "INSERT OR IGNORE INTO channel_coverage "
                 "(team_id, channel_id, inventory_start_ts, bootstrap_status) "
@@ -7243,7 +8374,7 @@ class DatabaseManager(LoggerMixin):
         (>10 min). `complete`/`limited` rows are finished — recompaction and refresh are not
         P1 — so the predicate excludes them and a claim can never be resurrected by a restart.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 f"""
                 UPDATE channel_coverage
@@ -7266,7 +8397,7 @@ class DatabaseManager(LoggerMixin):
         A worker parked on a page ceiling or a Retry-After sleep still holds its claim; without
         this its heartbeat would go stale and another worker would take the channel from it.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 "UPDATE channel_coverage SET heartbeat_ts = CURRENT_TIMESTAMP "
                 "WHERE team_id = ? AND channel_id = ? AND sweep_token = ?",
@@ -7285,7 +8416,7 @@ class DatabaseManager(LoggerMixin):
         """
         if status not in ("pending", "running", "complete", "limited"):
             raise ValueError(f"invalid bootstrap_status: {status!r}")
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 """
                 UPDATE channel_coverage SET
@@ -7325,7 +8456,7 @@ class DatabaseManager(LoggerMixin):
         sweep_token here is exactly the takeover. inventory_start_ts is left alone so an
         interrupted backward walk resumes where it stopped.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 """
                 UPDATE channel_coverage
@@ -7396,7 +8527,7 @@ class DatabaseManager(LoggerMixin):
             # battery's first turn would render a window shaped by the previous run.
             store, key = overlay
             return store.advance_window_anchor(key, floor_ts, selection_version)
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 """
                 INSERT INTO channel_window_anchor
@@ -7609,7 +8740,6 @@ class DatabaseManager(LoggerMixin):
                 payload["receipt_feature_epoch_ts"] = row["value"] if row else None
 
                 if ids:
-                    thread_prefix = f"{channel_id}:%"
                     receipts: List[Dict] = []
                     images: List[Dict] = []
                     documents: List[Dict] = []
@@ -7631,9 +8761,9 @@ class DatabaseManager(LoggerMixin):
                             f"SELECT id, thread_id, message_ts, url, image_type, analysis, "
                             f"       metadata_json "
                             f"FROM images "
-                            f"WHERE thread_id LIKE ? AND message_ts IN ({marks}) "
+                            f"WHERE channel_id = ? AND message_ts IN ({marks}) "
                             f"ORDER BY CAST(message_ts AS REAL), id",
-                            (thread_prefix, *chunk)
+                            (channel_id, *chunk)
                         ) as cursor:
                             for r in await cursor.fetchall():
                                 row_dict = dict(r)
@@ -7648,9 +8778,9 @@ class DatabaseManager(LoggerMixin):
                             f"SELECT id, thread_id, message_ts, filename, mime_type, file_id, "
                             f"       summary "
                             f"FROM documents "
-                            f"WHERE thread_id LIKE ? AND message_ts IN ({marks}) "
+                            f"WHERE channel_id = ? AND message_ts IN ({marks}) "
                             f"ORDER BY CAST(message_ts AS REAL), id",
-                            (thread_prefix, *chunk)
+                            (channel_id, *chunk)
                         ) as cursor:
                             documents.extend(dict(r) for r in await cursor.fetchall())
 
@@ -7766,7 +8896,7 @@ class DatabaseManager(LoggerMixin):
         columns = (thread_id, filename, mime_type, summary, file_id, url_private, size_bytes,
                    json.dumps(page_structure) if page_structure else None, total_pages,
                    json.dumps(metadata) if metadata else None, message_ts)
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             if file_id is None:
                 await db.execute("BEGIN IMMEDIATE")
                 try:
@@ -7920,7 +9050,7 @@ class DatabaseManager(LoggerMixin):
 
     async def ensure_epoch_fence_schema_async(self) -> None:
         """Create the fence lease table. Called only by the flag-gated watcher."""
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS epoch_fence_lease (
                     team_id       TEXT NOT NULL,
@@ -7959,7 +9089,7 @@ class DatabaseManager(LoggerMixin):
         REWRITES created_ts: a takeover mints a new lease_id, so it IS a new lease and carrying the
         displaced lease's creation time forward would misdate it.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 """
                 INSERT INTO epoch_fence_lease
@@ -7990,7 +9120,7 @@ class DatabaseManager(LoggerMixin):
         the dead-man's switch and reviving past it would let a harness that came back from the
         dead resume a battery whose overlays are gone.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 """
                 UPDATE epoch_fence_lease
@@ -8008,7 +9138,7 @@ class DatabaseManager(LoggerMixin):
                                            test_epoch_id: str, start_ts: str, expiry_ts: str,
                                            command_id: Optional[int] = None) -> bool:
         """Install a new case. CAS on `owner_token` AND a live, unexpired, non-invalidated row."""
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 """
                 UPDATE epoch_fence_lease
@@ -8031,7 +9161,7 @@ class DatabaseManager(LoggerMixin):
         A release from 'invalidated' is the ONLY way out of that state, and it is deliberate: a
         human must look at an invalidated battery before the channel takes another one.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             cursor = await db.execute(
                 """
                 UPDATE epoch_fence_lease
@@ -8059,7 +9189,7 @@ class DatabaseManager(LoggerMixin):
         means a battery whose overlays died with the previous process. An EXPIRED row is left
         alone — it is already reacquirable and needs no human.
         """
-        async with self._stream_conn() as db:
+        async with self._stream_conn(write=True) as db:
             async with db.execute(
                 """
                 SELECT * FROM epoch_fence_lease
@@ -8078,6 +9208,8 @@ class DatabaseManager(LoggerMixin):
 
     def close(self):
         """Close database connection."""
+        self._backup_stop.set()  # a paced backup in flight gives up at its next step
+        self._connection_pool().stop()
         if self.conn:
             self.conn.close()
             logger.info(f"Database connection closed for {self.platform}")
\ No newline at end of file
@@ -14,6 +14,7 @@ from logger import log_session_start, log_session_end, main_logger
 from message_processor.base import MessageProcessor
 from message_processor import (channel_steering, outbound_receipts,
                                participation_telemetry, routing_facts)
+from message_processor.history_prefetch import prefetcher as history_prefetcher
 from message_processor.destination_tools import consume_destination_marker
 from message_processor.participation import (ParticipationEngine,
                                              resolve_participation_level)
@@ -27,7 +28,8 @@ from message_processor.turn_runtime import (DEST_KIND_CORRECTION_ANNOUNCEMENT,
 from message_processor import thread_files
 import message_processor.token_counter as token_counter
 from message_processor.client_contract import BaseClient, Message
-from slack_client import admission_watermark
+from slack_client import admission_watermark, rate_scheduler, single_flight
+from slack_client.channel_index import channel_index
 from slack_client.event_handlers import registration
 from slack_client.utilities import is_dm_conversation
 
@@ -364,6 +366,13 @@ class ChatBotV2:
                     lambda t: t.cancelled() or (t.exception() and main_logger.warning(
                         f"Scheduled-delivery rehydrate error: {t.exception()}")))
 
+        # Open the OpenAI connections now, so the first turn does not pay TCP and TLS setup,
+        # and keep one warm through quiet hours. Started, not awaited — the same reasoning as the
+        # tokenizer above — and owned by the OpenAI client, whose close() stops it.
+        openai_client = getattr(self.processor, "openai_client", None)
+        if openai_client is not None:
+            openai_client.start_connection_warming()
+
         # Set up signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -609,6 +618,11 @@ class ChatBotV2:
             # another message in this stream can arrive or the arrival map can evict the stream;
             # asking again down there would judge this message on somebody else's moment.
             arrival = engine.note_arrival(channel_id, ts, message.thread_id, message.user_id)
+            # The turn's first Slack reads, started now so the debounce and the classifier call
+            # below hide them. Speculative and cancelled on every way out that is not a wake;
+            # a newer arrival in the channel supersedes it on its own.
+            history_prefetcher.start(client, self.processor.db, channel_id, ts,
+                                     message.thread_id)
 
             # THE channel-steering read for this turn — the only one. It is rendered once and
             # STAMPED on the message, so if this gate wakes, the responder builds its prompt from
@@ -670,6 +684,8 @@ class ChatBotV2:
                 main_logger.debug(
                     f"Wake gate: nothing to act on "
                     f"({evaluation.decline_cause or 'no_decision'}) — silent")
+                history_prefetcher.cancel(channel_id, ts,
+                                          reason=evaluation.decline_cause or "no_decision")
                 participation_telemetry.finish_attempt(
                     message, "none", ended_by="gate", cause=evaluation.decline_cause,
                     gate_ms=gate_latency_ms, classifier_ms=evaluation.classifier_ms)
@@ -691,6 +707,7 @@ class ChatBotV2:
                 # And no `silence_reason` either. That eight-value enum belongs to the RESPONDER,
                 # which can say why it chose to stay quiet after seeing everything; the gate knows
                 # only that it did not open.
+                history_prefetcher.cancel(channel_id, ts, reason="silence")
                 participation_telemetry.finish_attempt(message, "silence", ended_by="gate")
                 return None
 
@@ -724,6 +741,9 @@ class ChatBotV2:
             # decline would report the model as unable to judge when its judgment is on record
             # two lines above.
             cause = "action_error" if decision_recorded else "error"
+            history_prefetcher.cancel(
+                message.channel_id, (message.metadata or {}).get("ts") or message.thread_id,
+                reason=cause)
             participation_telemetry.gate_declined(
                 message.channel_id, (message.metadata or {}).get("ts") or message.thread_id,
                 cause=cause, attempt_id=attempt_id, detail=type(e).__name__)
@@ -1809,6 +1829,9 @@ class ChatBotV2:
             from croniter import croniter
             import datetime
 
+            # The retention sweeps below call Slack too; they yield to turn traffic.
+            rate_scheduler.mark_background()
+
             try:
                 # Validate cron expression
                 cron = croniter(config.cleanup_schedule, datetime.datetime.now())
@@ -1848,9 +1871,11 @@ class ChatBotV2:
 
                             # F7: sweep aged tool-use provenance rows (no FK cascade —
                             # PRAGMA foreign_keys is never enabled, so these need their own
-                            # age sweep, same as documents).
+                            # age sweep, same as documents). Batched, with pauses between
+                            # batches, so off the event loop like the other sweeps.
                             try:
-                                self.processor.db.delete_old_tool_usage(
+                                await asyncio.to_thread(
+                                    self.processor.db.delete_old_tool_usage,
                                     days=config.tool_usage_retention_days)
                             except Exception as e:
                                 main_logger.debug(f"Tool-usage sweep skipped: {e}")
@@ -1860,7 +1885,8 @@ class ChatBotV2:
                             # row is kept, so read_document and rebuilds re-extract on demand and a
                             # file older than the window stays resolvable indefinitely.
                             try:
-                                self.processor.db.delete_old_documents(
+                                await asyncio.to_thread(
+                                    self.processor.db.delete_old_documents,
                                     days=config.document_retention_days)
                             except Exception as e:
                                 main_logger.debug(f"Document sweep skipped: {e}")
@@ -1914,6 +1940,14 @@ class ChatBotV2:
                             except Exception as e:
                                 main_logger.debug(f"Receipt retention sweep skipped: {e}")
 
+                            # Hand the pages the sweeps above freed back to the filesystem
+                            # (incremental auto-vacuum, a step at a time) before the backup
+                            # copies them.
+                            try:
+                                await asyncio.to_thread(self.processor.db.reclaim_free_pages)
+                            except Exception as e:
+                                main_logger.debug(f"Free-page reclaim skipped: {e}")
+
                             # Scheduled database backup. Until now backup_database()
                             # was only ever called by the one-time migrations, so a
                             # steady-state bot took no backups at all despite the
@@ -1923,13 +1957,35 @@ class ChatBotV2:
                             # Isolated — a failed backup must never kill the cleanup
                             # worker or the bot.
                             try:
-                                # Off the event loop: conn.backup() can take hundreds of ms
-                                # and would otherwise freeze the bot for its duration.
-                                await asyncio.to_thread(self.processor.db.backup_database)
+                                # Off the event loop, and paced: a throttled copy from its
+                                # own connection, so a multi-GB database neither freezes the
+                                # bot nor floods the disk live turns are reading from.
+                                await asyncio.to_thread(self.processor.db.backup_database,
+                                                        paced=True)
                                 main_logger.info("Scheduled database backup complete (7-day retention)")
                             except Exception as e:
                                 main_logger.error(f"Scheduled database backup FAILED: {e}")
 
+                            main_logger.info(
+                                f"Database pool: {self.processor.db.get_pool_stats()}")
+                            main_logger.info(
+                                f"Settings cache: {self.processor.db.get_settings_cache_stats()}")
+                            main_logger.info(
+                                f"Slack rate scheduler: {rate_scheduler.scheduler.stats()}")
+                            main_logger.info(
+                                f"Slack single-flight: {single_flight.single_flight.stats()}")
+                            main_logger.info(f"Channel search index: {channel_index.stats()}")
+                            main_logger.info(f"Wake-gate prefetch: {history_prefetcher.stats()}")
+                            tool_registry = getattr(self.client, "tool_registry", None)
+                            if tool_registry is not None:
+                                main_logger.info(f"Tool dispatch: {tool_registry.stats()}")
+                            if self.coverage_bootstrap is not None:
+                                main_logger.info(
+                                    f"Coverage sweep: {self.coverage_bootstrap.stats()}")
+                            loop_calls = self.processor.db.get_loop_call_stats()
+                            if loop_calls is not None:
+                                main_logger.info(f"Sync DB calls on the event loop: {loop_calls}")
+
                         stats = self.processor.get_stats()
                         main_logger.info(f"Cleanup complete. Stats: {stats}")
                 except asyncio.CancelledError:
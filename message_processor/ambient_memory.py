@@ -778,6 +778,8 @@ class AmbientArtifactService:
                                               self.config.utility_reasoning_effort),
                 verbosity=self.config.utility_verbosity,
                 max_tokens=max(256, int(self.config.utility_max_tokens)),
+                # The same link or file posted in two channels is summarized once.
+                memo_operation="ambient_summary",
             )
         except Exception as e:  # noqa: BLE001
             logger.debug(f"ambient summarize failed: {e}")
@@ -444,7 +444,7 @@ async def _persist(db: Any, *, ext: str, filename: str, thread_key: str,
                 metadata={"source": "code_interpreter", "filename": filename},
             )
         else:
-            db.save_document(
+            await db.save_document_async(
                 thread_id=thread_key,
                 filename=filename,
                 mime_type=_EXT_MIME.get(ext, "application/octet-stream"),
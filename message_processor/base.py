@@ -11,7 +11,7 @@ from message_processor.thread_manager import AsyncThreadStateManager
 from openai_client import OpenAIClient
 from config import config, pipeline_status
 from logger import LoggerMixin
-from slack_client import admission_watermark
+from slack_client import admission_watermark, page_cache
 from . import channel_steering, image_catalog, participation_telemetry, routing_facts
 from .containers import ContainerManager
 from .message_timestamps import stamp_content
@@ -183,6 +183,9 @@ class MessageProcessor(ThreadManagementMixin,
 
         channel_turn = TextHandlerMixin._turn_surface(message) == SURFACE_CHANNEL
         h_pin = None
+        # Every conversations.history/replies page this turn asks for, and how many of them the
+        # shared page cache answered instead of Slack.
+        page_tally = page_cache.begin_turn()
 
         try:
             # H, pinned HERE and never refreshed (spec §1). This is the first instant at which the
@@ -1068,6 +1071,10 @@ class MessageProcessor(ThreadManagementMixin,
                 content=error_message
             )
         finally:
+            # Closed BEFORE the drain: a drained batch is its own turn with its own tally.
+            tally = page_cache.end_turn(page_tally)
+            if tally is not None:
+                self.log_info(f"Slack pages | Thread: {thread_key} | {tally.summary()}")
             # Phase Q drain hook — runs while we STILL HOLD the lock so that (a) no new
             # message can jump ahead of the queued backlog and (b) stragglers arriving
             # during the linger enqueue (lock held) and join the same batch. Must never
@@ -1159,6 +1166,7 @@ class MessageProcessor(ThreadManagementMixin,
                                                        origin_participants_from_slice,
                                                        origin_slice_messages, tool_schema_version)
         from message_processor.channel_stream import build_channel_stream
+        from message_processor.history_prefetch import prefetcher as history_prefetcher
         from message_processor.utilities import reach_tools_for
 
         team_id = getattr(client, "self_team_id", None) or ""
@@ -1172,12 +1180,18 @@ class MessageProcessor(ThreadManagementMixin,
         # NO budgets are constructed here. The BUILDER owns the shared absolute deadline and
         # builds all three itself — constructing them out here is what produced three
         # independently started windows, and a turn that could spend three times its budget.
+        # A prefetch the wake gate started for this message is already asking the questions
+        # the build is about to ask: let it finish, then read its answers from the page cache.
+        await history_prefetcher.claim(message.channel_id,
+                                       (message.metadata or {}).get("ts") or message.thread_id)
         result = await self._channel_stream_call(
             build_channel_stream, message, client, turn, h_pin, thread_config, registry,
             team_id=team_id, origin_root_ts=message.thread_id,
             reach_tools=reach_tools_for(),
             capability_profile_hash=capability_profile_hash,
             tool_schema_version=tool_schema_version)
+        # What the gate's prefetch bought this wake, for the prefetcher's saved-vs-wasted account.
+        history_prefetcher.credit(page_cache.current_tally())
         # THE CARRIER, not a bare stream: the two booleans and the three page counts went to the
         # telemetry emitter inside the builder, and everything downstream takes `.stream`.
         stream = result.stream
@@ -1875,6 +1889,12 @@ class MessageProcessor(ThreadManagementMixin,
         # Close thread manager resources if needed
         if hasattr(self.thread_manager, 'cleanup'):
             await self.thread_manager.cleanup()
+        # Last: every service above reads and writes through the pooled connections.
+        if self.db is not None:
+            try:
+                await self.db.close_pool_async()
+            except Exception as e:  # noqa: BLE001
+                self.log_debug(f"Database pool close error: {e}")
         self.log_info("MessageProcessor cleanup completed")
     
 
@@ -31,7 +31,8 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 
 from logger import setup_logger
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import (CONCURRENCY_SLACK_READ, CONCURRENCY_SLACK_WRITE,
+                                             ToolContext, ToolRegistry)
 
 logger = setup_logger(name="slack_bot.BookmarkTools")
 
@@ -276,6 +277,9 @@ def register_bookmark_tools(registry: ToolRegistry) -> None:
     Registered ungated, like `pin_message`: there is no feature flag for these, and the
     request-only policy for the two writes lives in their descriptions.
     """
-    registry.register(get_list_bookmarks_schema(), execute_list_bookmarks)
-    registry.register(get_add_bookmark_schema(), execute_add_bookmark)
-    registry.register(get_remove_bookmark_schema(), execute_remove_bookmark)
+    registry.register(get_list_bookmarks_schema(), execute_list_bookmarks,
+                      concurrency=CONCURRENCY_SLACK_READ)
+    registry.register(get_add_bookmark_schema(), execute_add_bookmark,
+                      concurrency=CONCURRENCY_SLACK_WRITE)
+    registry.register(get_remove_bookmark_schema(), execute_remove_bookmark,
+                      concurrency=CONCURRENCY_SLACK_WRITE)
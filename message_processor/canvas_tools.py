@@ -51,7 +51,8 @@ from typing import Any, Dict, List, Optional, Set, cast
 from message_processor.canvas_content import CANVAS_MARKER, html_to_markdown
 from config import config
 from logger import setup_logger
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import (CONCURRENCY_SLACK_READ, CONCURRENCY_SLACK_WRITE,
+                                             ToolContext, ToolRegistry)
 
 logger = setup_logger(name="slack_bot.CanvasTools")
 
@@ -1540,15 +1541,17 @@ def register_canvas_tools(registry: ToolRegistry) -> None:
     registry.register(get_create_channel_canvas_schema, execute_create_channel_canvas,
                       enabled=_enabled, name="create_channel_canvas", dynamic=True,
                       channel_schema=get_create_channel_canvas_schema_static,
-                      channel_enabled=_enabled)
+                      channel_enabled=_enabled, concurrency=CONCURRENCY_SLACK_WRITE)
     registry.register(get_list_canvases_schema(), execute_list_canvases, enabled=_enabled,
-                      channel_enabled=_enabled)
+                      channel_enabled=_enabled, concurrency=CONCURRENCY_SLACK_READ)
     registry.register(get_read_canvas_schema, execute_read_canvas,
                       enabled=_enabled, name="read_canvas", dynamic=True,
-                      channel_schema=get_read_canvas_schema_static, channel_enabled=_enabled)
+                      channel_schema=get_read_canvas_schema_static, channel_enabled=_enabled,
+                      concurrency=CONCURRENCY_SLACK_READ)
     registry.register(get_edit_canvas_schema, execute_edit_canvas,
                       enabled=_enabled, name="edit_canvas", dynamic=True,
-                      channel_schema=get_edit_canvas_schema_static, channel_enabled=_enabled)
+                      channel_schema=get_edit_canvas_schema_static, channel_enabled=_enabled,
+                      concurrency=CONCURRENCY_SLACK_WRITE)
     # The channel gate is the config pair only — the per-message authorization the DM gate reads
     # cannot survive on a cache-stable surface, so `execute_delete_canvas` enforces it instead
     # (ctx.canvas_delete_authorized), on BOTH surfaces.
@@ -1557,4 +1560,5 @@ def register_canvas_tools(registry: ToolRegistry) -> None:
                       channel_schema=get_delete_canvas_schema_static,
                       channel_enabled=lambda cfg: bool(
                           getattr(config, "enable_canvas_tools", True)
-                          and getattr(config, "enable_canvas_delete", True)))
+                          and getattr(config, "enable_canvas_delete", True)),
+                      concurrency=CONCURRENCY_SLACK_WRITE)
@@ -28,7 +28,7 @@ from __future__ import annotations
 from typing import Any, Dict, Optional, Tuple
 
 from logger import setup_logger
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import CONCURRENCY_SLACK_WRITE, ToolContext, ToolRegistry
 
 logger = setup_logger(name="slack_bot.ChannelAdminTools")
 
@@ -292,6 +292,6 @@ def register_channel_admin_tools(registry: ToolRegistry) -> None:
     structurally cannot see. The executors hold it instead, on both surfaces.
     """
     registry.register(get_set_channel_topic_schema(), execute_set_channel_topic,
-                      enabled=lambda _cfg: False)
+                      enabled=lambda _cfg: False, concurrency=CONCURRENCY_SLACK_WRITE)
     registry.register(get_set_channel_purpose_schema(), execute_set_channel_purpose,
-                      enabled=lambda _cfg: False)
+                      enabled=lambda _cfg: False, concurrency=CONCURRENCY_SLACK_WRITE)
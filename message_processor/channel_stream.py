@@ -52,7 +52,7 @@ from message_processor.turn_runtime import (AuthorizedEditTarget,
 from message_processor.utilities import api_part
 from openai_client.base import attach_cache_breakpoint
 from slack_client import actor_tail as actor_tail_module
-from slack_client import admission_watermark
+from slack_client import admission_watermark, page_cache
 from slack_sdk.errors import SlackApiError
 
 from slack_client.history_fetch import (FetchBudget, HistoryPageError, iter_pages,
@@ -190,6 +190,10 @@ MARKER_KIND_DOCUMENT = "document"
 MARKER_KIND_IMAGE = "image_analysis"
 MARKER_KIND_TOOL = "tool_provenance"
 
+# `stream_render.item_digests`: hex characters kept per item. Enough to tell one channel's items
+# apart; short enough that a several-hundred-item window stays a modest ledger line.
+ITEM_DIGEST_CHARS = 12
+
 ROLE_USER = "user"
 ROLE_ASSISTANT = "assistant"
 
@@ -958,6 +962,30 @@ class ChannelStream:
                  "_origin": True}
                 for item in (*sequence, *self.origin_items)]
 
+    def item_digests(self) -> List[str]:
+        """One `<key>:<digest>` per canonical item, in order — `stream_sha256` taken apart.
+
+        The whole-stream hash says THAT two consecutive builds differ; this says WHERE, which is
+        the question a cache miss raises: the provider caches the longest shared prefix, so a
+        change at item 3 costs everything below it and a change at the end marker costs nothing
+        the previous turn paid for. The key is the message ts, or `horizon` / `orphan` / `end`
+        for the framing items, so the first divergent key names the message that moved. The
+        digest is over the same framed bytes the stream hash is fed, truncated — it identifies
+        an item within one channel's stream, not across the corpus.
+        """
+        last = len(self.items) - 1
+        out: List[str] = []
+        for index, item in enumerate(self.items):
+            if index == 0:
+                key = "horizon"
+            elif index == last:
+                key = "end"
+            else:
+                key = str(item.metadata.get("ts") or "orphan")
+            digest = hashlib.sha256(_item_bytes(item)).hexdigest()
+            out.append(f"{key}:{digest[:ITEM_DIGEST_CHARS]}")
+        return out
+
     def stream_render_fields(self) -> Dict[str, Any]:
         """The stream_render telemetry payload, minus the per-turn identifiers the caller owns
         (turn_id, origin_thread_ts, trigger_ts)."""
@@ -986,6 +1014,7 @@ class ChannelStream:
             "receipts_included_count": len(self.receipts_included),
             "receipts_excluded_count": len(self.receipts_excluded),
             "receipts_membership_hash": self.receipts_membership_hash,
+            "item_digests": self.item_digests(),
         }
 
 
@@ -1484,6 +1513,11 @@ def _render_message_item(message: NormalizedMessage, *, role: str, actor_names:
         })
 
 
+def _item_bytes(item: StreamItem) -> bytes:
+    """One item as the stream hashes frame it: role, newline, content, NUL."""
+    return f"{item.role}\n{item.content}\x00".encode("utf-8")
+
+
 def serialize_stream(pinned: PinnedTuple) -> ChannelStream:
     """The pinned tuple → the exact bytes the model sees, BOTH BLOCKS.
 
@@ -1608,7 +1642,7 @@ def serialize_stream(pinned: PinnedTuple) -> ChannelStream:
     def _feed(digest, sequence) -> int:
         total = 0
         for item in sequence:
-            digest.update(f"{item.role}\n{item.content}\x00".encode("utf-8"))
+            digest.update(_item_bytes(item))
             total += len(item.content.encode("utf-8"))
         return total
 
@@ -1886,12 +1920,19 @@ def _emit_stream_render(result: StreamBuildResult, *, turn_id: Optional[str],
         return
     from message_processor import participation_telemetry
 
+    # What the wake gate's debounce-window prefetch did for this build, when it did anything.
+    # OPTIONAL fields, omitted (None) on every build no prefetch touched.
+    tally = page_cache.current_tally()
+    prefetch = tally if tally is not None and (tally.prefetched or tally.prefetch_wait_ms) else None
     try:
         participation_telemetry.stream_render(
             turn_id=turn_id, origin_thread_ts=origin_root_ts, trigger_ts=trigger_ts,
             reselected=result.reselected, anchor_advanced=result.anchor_advanced,
             history_pages=result.pages.history, reply_pages=result.pages.reply,
             origin_pages=result.pages.origin,
+            prefetch_pages=prefetch.prefetched if prefetch is not None else None,
+            prefetch_saved_ms=int(prefetch.prefetch_saved_ms) if prefetch is not None else None,
+            prefetch_wait_ms=int(prefetch.prefetch_wait_ms) if prefetch is not None else None,
             **result.stream.stream_render_fields())
     except Exception as e:  # noqa: BLE001
         logger.debug(f"stream_render telemetry not emitted: {e}")
@@ -1915,6 +1956,104 @@ def guaranteed_eligible_root(m: NormalizedMessage, chrome_ts: FrozenSet[str]) ->
             and m.ts not in chrome_ts)
 
 
+def _anchor_floor(anchor: Optional[Dict[str, Any]]) -> Optional[str]:
+    """The stored window floor F, when the anchor row was written by this selection version."""
+    if not anchor or int(anchor.get("selection_version", -1)) != SELECTION_VERSION:
+        return None
+    raw_floor = str(anchor.get("floor_ts") or "") or None
+    # CHECKED HERE, where the row is read. An unparseable stored floor otherwise reaches a
+    # raw `parse_ts` deep in selection and raises the normalizer's `TimestampError`, which
+    # is not a `ChannelStreamError` — so the turn takes the generic handler and tells the
+    # user "something went wrong" instead of the honest `stream_data_invalid` notice, and
+    # the ledger records no code at all. A malformed floor is a malformed record of ours.
+    return _checked_ts(raw_floor, "persisted window anchor floor") if raw_floor else None
+
+
+async def prefetch_channel_turn_pages(*, client: Any, db: Any, team_id: str, channel_id: str,
+                                      h: str, origin_root_ts: Optional[str],
+                                      budget: FetchBudget) -> int:
+    """Speculatively read the pages a turn pinned at `h` would read first. Returns pages read.
+
+    This BUILDS NOTHING. It asks Slack the exact questions `build_channel_pin`'s history walk and
+    `fetch_origin_thread` will ask — same method, same floor, same H, same page size — so the
+    answers land in `page_cache` and the turn, if one follows, is served from there. No drain,
+    no pin, no write: a prefetch is never evidence of anything, and a turn that finds nothing
+    cached simply fetches as it always has. A stale answer cannot leak into a turn either — any
+    message event in the channel evicts these pages, and moves the H a turn would pin.
+
+    Bounded by `budget` alone; hitting its ceiling or deadline ends the prefetch quietly.
+    """
+    anchor_payload = await db.read_channel_window_anchor_async(team_id, channel_id)
+    floor_read = _anchor_floor((anchor_payload or {}).get("anchor") or None)
+    if floor_read and parse_ts(floor_read) > parse_ts(h):
+        return 0  # an inverted window: the turn fetches no history either
+
+    async def origin() -> None:
+        method = _web(client, "conversations_replies")
+        if origin_root_ts and method is not None:
+            await page_messages(method, channel_id=channel_id, latest=h, inclusive=True,
+                                budget=budget, label="origin prefetch",
+                                extra_params={"ts": str(origin_root_ts)})
+
+    async def periphery() -> None:
+        method = _web(client, "conversations_history")
+        if method is not None:
+            async for _ in iter_pages(method, channel_id=channel_id, oldest=floor_read,
+                                      latest=h, inclusive=True, budget=budget,
+                                      label="channel history prefetch"):
+                pass
+
+    results = await asyncio.gather(origin(), periphery(), return_exceptions=True)
+    for outcome in results:
+        if isinstance(outcome, BaseException) and not isinstance(outcome, HistoryFetchError):
+            logger.debug(f"history prefetch for {channel_id} stopped: {outcome!r}")
+    return budget.pages_used
+
+
+async def prefetch_channel_turn_stream(*, client: Any, db: Any, team_id: str, channel_id: str,
+                                       h: str, frontier: int = 0,
+                                       origin_root_ts: Optional[str],
+                                       trigger_ts: Optional[str], budget: FetchBudget,
+                                       drain_timeout: Optional[float] = None) -> int:
+    """The `stream` prefetch: the whole build a turn pinned at `h` would run, thrown away.
+
+    Where `prefetch_channel_turn_pages` asks only the first questions, this asks all of them —
+    the history walk, the reply fan-out over the window's threads, the origin thread and the
+    actor names — through the same phase methods `build_channel_stream` composes, so every page
+    lands in `page_cache` and every name in the resolver's cache. Composed like
+    `build_reconsideration_snapshot` and as pure: `probe=True`, no dev barrier, no anchor write,
+    no actor-tail reconcile, no telemetry. The result is DISCARDED, unserialized. The turn still
+    builds its own stream, from its own pin, after its own drain; a prefetch is never evidence.
+
+    ONE budget bounds all of it, the watermark drain included: a prefetch must not sit in the
+    drain past the window it hides in. Its ceiling or deadline ends the prefetch quietly, with
+    the pages read so far still cached. Returns pages read.
+    """
+    remaining = max(0.0, budget.remaining_seconds())
+    deadline_at = (budget.deadline_at if budget.deadline_at is not None
+                   else time.monotonic() + remaining)
+    drain_limit = (admission_watermark.drain_timeout_seconds() if drain_timeout is None
+                   else float(drain_timeout))
+    prepared = await prepare_channel_turn(
+        client=client, db=db, team_id=team_id, channel_id=channel_id, h=h, frontier=frontier,
+        drain_timeout=min(drain_limit, remaining), skip_dev_barrier=True)
+    # gather, not `_gather_or_cancel`: a speculative origin that fails must not stop a periphery
+    # whose pages are still worth having, and the reverse.
+    shared, origin_fetch = await asyncio.gather(
+        build_channel_pin(prepared, client=client, db=db, probe=True,
+                          deadline_at=deadline_at, history_budget=budget,
+                          reply_budget=budget),
+        fetch_origin_thread(client, channel_id, origin_root_ts, h, budget, trigger_ts),
+        return_exceptions=True)
+    if isinstance(shared, BaseException) or isinstance(origin_fetch, BaseException):
+        for outcome in (shared, origin_fetch):
+            if isinstance(outcome, BaseException):
+                logger.debug(f"stream prefetch for {channel_id} stopped: {outcome!r}")
+        return budget.pages_used
+    await build_origin_pin(shared, origin_fetch, db=db, client=client)
+    return budget.pages_used
+
+
 async def prepare_channel_turn(*, client: Any, db: Any, team_id: str, channel_id: str, h: str,
                                frontier: int = 0, drain_timeout: Optional[float] = None,
                                barrier_context: Optional[Dict[str, Any]] = None,
@@ -1957,15 +2096,7 @@ async def prepare_channel_turn(*, client: Any, db: Any, team_id: str, channel_id
             status=str(inventory_row.get("bootstrap_status") or ""),
             reason=inventory_row.get("reason"))
 
-    floor_read = None
-    if anchor and int(anchor.get("selection_version", -1)) == SELECTION_VERSION:
-        raw_floor = str(anchor.get("floor_ts") or "") or None
-        # CHECKED HERE, where the row is read. An unparseable stored floor otherwise reaches a
-        # raw `parse_ts` deep in selection and raises the normalizer's `TimestampError`, which
-        # is not a `ChannelStreamError` — so the turn takes the generic handler and tells the
-        # user "something went wrong" instead of the honest `stream_data_invalid` notice, and
-        # the ledger records no code at all. A malformed floor is a malformed record of ours.
-        floor_read = _checked_ts(raw_floor, "persisted window anchor floor") if raw_floor else None
+    floor_read = _anchor_floor(anchor)
 
     # CAPTURED BEFORE THE FETCH, and the ordering is the whole point: `reconcile_window` returns
     # False without touching anything when the channel's generation has MOVED, so capturing it
@@ -3,7 +3,7 @@ Base Client Abstract Class
 Defines the interface that all chat clients must implement
 """
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from logger import LoggerMixin
 
@@ -253,6 +253,15 @@ class BaseClient(ABC, LoggerMixin):
         """Add an emoji reaction to a message (optional capability; default no-op)."""
         return False
 
+    async def get_thread_reply_counters(self, channel_id: str,
+                                        thread_id: str) -> Optional[Tuple[int, Optional[str]]]:
+        """The thread root's (reply_count, latest_reply), read fresh (optional capability).
+
+        The cheap consistency check behind incremental ThreadState updates. The default None
+        means "cannot tell", and the caller falls back to a full rebuild.
+        """
+        return None
+
     @abstractmethod
     async def get_thread_history(self, channel_id: str, thread_id: str, limit: Optional[int] = None,
                                  oldest: Optional[str] = None) -> List[Message]:
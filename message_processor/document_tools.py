@@ -21,7 +21,7 @@ from typing import Any, Awaitable, Callable, Dict, List, Optional, cast
 from message_processor.canvas_content import CANVAS_MIMETYPE
 from config import config
 from message_processor.ingestion.document_handler import DocumentHandler
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import CONCURRENCY_CPU_EXTRACT, ToolContext, ToolRegistry
 
 # One slice of document text per tool round — big enough to be useful,
 # bounded so a huge doc can't blow the tool-result cap.
@@ -428,4 +428,4 @@ def register_document_tools(registry: ToolRegistry) -> None:
     # Longer per-tool timeout than the generic 20s: a scanned-PDF read may download +
     # render + OCR, which the shared cap would abort before the ExtractionCache ever fills.
     registry.register(get_read_document_schema(), execute_read_document,
-                      timeout=config.read_document_timeout)
+                      timeout=config.read_document_timeout, concurrency=CONCURRENCY_CPU_EXTRACT)
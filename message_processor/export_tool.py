@@ -17,17 +17,25 @@ Three properties are load-bearing:
   the requester and the bot in the conversation), and a refusal is the one canonical
   `ACCESS_DENIED_MESSAGE` — never a variant that says which of the reasons applied.
 * **Nothing touches disk and nothing touches the DB.** Slack stays the only transcript; the
-  export exists in memory on the way to the container and nowhere else.
+  export exists in memory on the way to the container and nowhere else — and only a part at a
+  time: pages are serialized as they arrive and each part is staged as soon as it fills, so a
+  channel of any size costs the bot a few parts of memory, not the channel.
 * **Complete or refused, never quietly partial.** Messages are deduped globally by ts, a bounded
   export walks the threads whose replies fall in range even when their root does not, and an
-  export larger than one transfer is CHUNKED rather than truncated.
+  export larger than one transfer is CHUNKED rather than truncated. A walk that fails part-way
+  takes back the parts it already staged.
+
+Thread replies are walked by a few workers while history is still paging, and one call may name
+several channels (`channel_ids`), each walked on its own and gated on its own. The shared Slack
+rate scheduler paces every page, so the concurrency overlaps round trips rather than raising the
+request rate.
 """
 from __future__ import annotations
 
 import asyncio
 import json
 import time
-from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from message_processor.client_contract import HistoryFetchError
 from config import config
@@ -35,7 +43,7 @@ from logger import setup_logger
 from message_processor import file_mount
 from slack_client.history_fetch import iter_pages
 from slack_client.utilities import ACTOR_REMOTE_LOOKUP_DEFAULT
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import CONCURRENCY_SLACK_READ, ToolContext, ToolRegistry
 
 logger = setup_logger(name="slack_bot.ExportTool")
 
@@ -48,12 +56,31 @@ EXPORT_TIMEOUT_S = 600.0
 _PAGE_LIMIT = 200
 
 # Between pages. The pacing that ran two channels end to end without a single 429; the retry
-# ladder in `fetch_page` honors Retry-After when one arrives anyway.
+# ladder in `fetch_page` honors Retry-After when one arrives anyway. Only used with the shared
+# rate scheduler off — on, it already paces each method at its tier.
 _PAGE_PAUSE_S = 1.2
 
 # One transfer's ceiling is `artifact_max_mb` (the same bound `mount_file` moves bytes under),
-# so a bigger export becomes several parts.
+# so a bigger export becomes several parts. A part is staged as soon as it fills, so
+# `export_part_mb` bounds what the bot holds while it walks.
 _PART_TEMPLATE = "export-part-{:03d}.jsonl"
+# With several channels in one call, each channel's parts carry its ID.
+_MULTI_PART_TEMPLATE = "export-{channel}-part-{:03d}.jsonl"
+
+# Channels one call may name. Each is a walk of minutes; past this the job wants splitting.
+_MAX_CHANNELS = 10
+
+# How often a long walk logs its progress and rate.
+_PROGRESS_EVERY_S = 15.0
+
+_NOTE = (
+    "Read the file(s) with code — one JSON object per line, fields: ts, thread_ts, user, "
+    "sender ('human' | 'other_bot' | 'self'), text, and reactions/files where the message has "
+    "them. Each part is oldest first; parts are written as the walk collects them, so sort on "
+    "ts across parts when order matters. Everything in the range is here; it has NOT been "
+    "posted to the user.")
+_GZIP_NOTE = (" A part marked gzipped is GZIP-COMPRESSED in the container — open those with "
+              "the `gzip` module rather than as plain text.")
 
 
 def _err(code: str, message: str, **extra: Any) -> Dict[str, Any]:
@@ -64,6 +91,10 @@ def _max_transfer_bytes() -> int:
     return int(config.artifact_max_mb) * 1024 * 1024
 
 
+def _part_bytes() -> int:
+    return min(_max_transfer_bytes(), int(config.export_part_mb) * 1024 * 1024)
+
+
 def _web(client: Any, name: str) -> Optional[Callable[..., Any]]:
     """The Slack web method off a client that may be the bot or a bare web client (tests)."""
     app = getattr(client, "app", None)
@@ -104,7 +135,8 @@ def get_export_conversation_schema() -> Dict[str, Any]:
             "Export a Slack conversation's FULL history into the code sandbox as a JSONL file "
             "(one message per line: ts, thread_ts, author, sender type, text, reactions, file "
             "names) so your code can read every message rather than a recent window. Returns the "
-            "/mnt/data path(s), how many messages and threads it holds, and the date span.\n\n"
+            "/mnt/data path(s), how many messages and threads it holds, and the date span. "
+            "Several channels can be exported in one call with channel_ids.\n\n"
             "Use it when a task needs complete coverage of a conversation — an incident report, "
             "an audit, activity over a period, counting or ranking anything across a channel. "
             "Analyse the file with code; do not page history into your context and do not answer "
@@ -123,6 +155,14 @@ def get_export_conversation_schema() -> Dict[str, Any]:
                     "description": ("Slack channel ID. Omit for the CURRENT conversation; never "
                                     "guess an ID you have not seen."),
                 },
+                "channel_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": ("Several Slack channel IDs to export in one go (up to 10), "
+                                    "each into its own file(s). Use instead of channel_id when a "
+                                    "task spans channels; each is checked for access on its "
+                                    "own."),
+                },
                 "oldest": {
                     "type": "string",
                     "description": ("Only messages at or after this Slack ts (e.g. "
@@ -159,9 +199,7 @@ async def execute_export_conversation(ctx: ToolContext, args: Dict[str, Any]) ->
 async def _export(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
     from slack_client.history_tool import ACCESS_DENIED_MESSAGE
 
-    raw_channel = args.get("channel_id")
-    channel_id = (raw_channel.strip() if isinstance(raw_channel, str) and raw_channel.strip()
-                  else getattr(ctx, "channel_id", None))
+    channel_ids = _channels_arg(args, getattr(ctx, "channel_id", None))
     oldest = _ts_arg(args.get("oldest"))
     latest = _ts_arg(args.get("latest"))
     raw_threads = args.get("include_threads", True)
@@ -176,13 +214,19 @@ async def _export(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
     # THE gate — the canonical one, so this tool cannot become the loose door into a conversation
     # the requester may not read. A DENY and a REDIRECT are byte-identical to the model on
     # purpose (see history_tool): a refusal that varied would answer "does this channel exist?".
+    # Every channel named is asked about on its own; one refusal does not sink the others.
     authorize = getattr(client, "_authorize_channel_read", None)
     if not callable(authorize):
         return _err("unavailable", "Exporting isn't available right now.")
-    verdict, reason = await authorize(channel_id, ctx)
-    if verdict != "ALLOW":
-        logger.warning(f"export_conversation {verdict.lower()} for "
-                       f"channel={channel_id or '-'} reason={reason}")
+    allowed: List[Optional[str]] = []
+    for channel_id in channel_ids:
+        verdict, reason = await authorize(channel_id, ctx)
+        if verdict == "ALLOW":
+            allowed.append(channel_id)
+        else:
+            logger.warning(f"export_conversation {verdict.lower()} for "
+                           f"channel={channel_id or '-'} reason={reason}")
+    if not allowed:
         return {"ok": False, "error": "not_accessible", "message": ACCESS_DENIED_MESSAGE}
 
     history = _web(client, "conversations_history")
@@ -209,72 +253,264 @@ async def _export(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
         except Exception:  # noqa: BLE001 — presentation never breaks the export
             pass
 
+    writers: List[_PartWriter] = []
+
+    def _one(channel_id: Optional[str], template: str) -> Awaitable[Dict[str, Any]]:
+        return _export_channel(ctx, client, history, replies, container_id, str(channel_id),
+                               oldest=oldest, latest=latest, include_threads=include_threads,
+                               template=template, writers=writers)
+
+    if len(channel_ids) == 1:
+        return await _one(allowed[0], _PART_TEMPLATE)
+
+    # Several channels: each is its own walk into its own parts, a bounded number at once. The
+    # rate scheduler paces the Slack methods they share, so concurrency overlaps latency rather
+    # than multiplying the request rate.
     started = time.monotonic()
+    gate = asyncio.Semaphore(max(1, int(config.export_channel_concurrency)))
+
+    async def _bounded(channel_id: Optional[str]) -> Dict[str, Any]:
+        # Only the ID's letters and digits reach the template: it is model input, and a brace
+        # in it would be a format field.
+        label = "".join(c for c in str(channel_id) if c.isalnum()) or "channel"
+        async with gate:
+            result = await _one(channel_id, _MULTI_PART_TEMPLATE.replace("{channel}", label))
+        return {"channel": channel_id, **result}
+
+    tasks = [asyncio.ensure_future(_bounded(c)) for c in allowed]
     try:
-        messages, thread_roots = await _collect(
-            history, replies, channel_id=str(channel_id), oldest=oldest, latest=latest,
-            include_threads=include_threads)
+        done = await asyncio.gather(*tasks)
+    except BaseException:
+        # One channel failed some way nobody planned for, or the turn was cancelled. The export
+        # is all or nothing: stop the channels still walking (each takes back its own parts),
+        # then take back the parts of the ones that had finished.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for writer in writers:
+            await writer.discard()
+        raise
+    by_channel = {r["channel"]: r for r in done}
+    results = [by_channel.get(c) or {"channel": c, "ok": False, "error": "not_accessible",
+                                     "message": ACCESS_DENIED_MESSAGE}
+               for c in channel_ids]
+    exported = [r for r in results if r.get("ok")]
+    if not exported:
+        return {"ok": False, "error": "export_failed",
+                "message": "None of those conversations could be exported.",
+                "channels": results}
+    for r in exported:
+        r.pop("message", None)
+    elapsed = time.monotonic() - started
+    total = sum(r["message_count"] for r in exported)
+    note = _NOTE + " Each channel has its own parts, named after its channel ID."
+    if any(f["gzipped"] for r in exported for f in r["files"]):
+        note += _GZIP_NOTE
+    if len(exported) < len(results):
+        note += " Channels marked ok: false were NOT exported; say so rather than guessing."
+    return {
+        "ok": True,
+        "channels": results,
+        "paths": [p for r in exported for p in r["paths"]],
+        "format": "jsonl",
+        "message_count": total,
+        "thread_count": sum(r["thread_count"] for r in exported),
+        "size_bytes": sum(r["size_bytes"] for r in exported),
+        "elapsed_s": round(elapsed, 1),
+        "messages_per_second": round(total / elapsed, 1) if elapsed > 0 else float(total),
+        "message": note,
+    }
+
+
+def _channels_arg(args: Dict[str, Any], current: Optional[str]) -> List[Optional[str]]:
+    """The channels to export: `channel_ids` when given, else `channel_id`, else this one."""
+    raw_many = args.get("channel_ids")
+    if isinstance(raw_many, list):
+        many: List[Optional[str]] = [c.strip() for c in raw_many
+                                     if isinstance(c, str) and c.strip()]
+        if many:
+            return list(dict.fromkeys(many))[:_MAX_CHANNELS]
+    raw_channel = args.get("channel_id")
+    return [raw_channel.strip() if isinstance(raw_channel, str) and raw_channel.strip()
+            else current]
+
+
+async def _export_channel(ctx: ToolContext, client: Any, history: Callable[..., Any],
+                          replies: Optional[Callable[..., Any]], container_id: str,
+                          channel_id: str, *, oldest: Optional[str], latest: Optional[str],
+                          include_threads: bool, template: str,
+                          writers: Optional[List["_PartWriter"]] = None) -> Dict[str, Any]:
+    """One channel walked, serialized and staged part by part as it arrives. `writers`, when
+    given, collects the channel's writer so a failed multi-channel export can take it back."""
+    started = time.monotonic()
+    writer = _PartWriter(ctx, container_id, template=template,
+                         source_id=f"export:{channel_id}", started=started)
+    if writers is not None:
+        writers.append(writer)
+    names: Dict[str, str] = {}
+    asked: Set[str] = set()
+    logged = started
+
+    async def _sink(messages: List[Dict[str, Any]]) -> None:
+        nonlocal logged
+        await _resolve_authors(client, messages, names, asked)
+        await writer.add([(m.get("ts"), _serialize(client, m, names, channel_id))
+                          for m in messages])
+        now = time.monotonic()
+        if now - logged >= _PROGRESS_EVERY_S:
+            logged = now
+            logger.info(f"export_conversation: {channel_id} {writer.message_count} messages, "
+                        f"{len(writer.staged)} part(s) staged, "
+                        f"{writer.message_count / (now - started):.0f} msg/s")
+
+    try:
+        thread_roots = await _collect(
+            history, replies, channel_id=channel_id, oldest=oldest, latest=latest,
+            include_threads=include_threads, sink=_sink)
+        await writer.close()
     except HistoryFetchError as e:
         logger.warning(f"export_conversation paging failed for {channel_id}: {e}")
+        await writer.discard()
         return _err("history_unavailable",
                     "Slack stopped returning history part-way through, so the export would have "
-                    "been incomplete. Nothing was staged — try again.")
+                    "been incomplete. Nothing was left in the sandbox — try again.")
+    except _StageFailed as e:
+        await writer.discard()
+        return _err("stage_failed",
+                    f"Collected {writer.message_count} messages but could not place "
+                    f"{e.filename} in the sandbox.")
+    except BaseException:
+        # Cancelled (the turn was superseded or timed out), or failed some way nobody planned
+        # for: the parts staged so far would read as a finished export.
+        await writer.discard()
+        raise
 
-    if not messages:
+    if not writer.message_count:
         return _err("empty_export",
                     "That conversation has no messages in the range asked for.")
 
-    names = await _resolve_authors(client, messages)
-    lines = [_serialize(client, m, names, str(channel_id)) for m in messages]
-    parts = _chunk(lines, _max_transfer_bytes())
-
-    staged: List[Dict[str, Any]] = []
-    for index, blob in enumerate(parts, 1):
-        filename = _PART_TEMPLATE.format(index)
-        record = await file_mount.stage_bytes(
-            ctx, container_id, filename, blob,
-            source_id=f"export:{channel_id}:{index}:{int(started)}")
-        if record is None:
-            return _err("stage_failed",
-                        f"Collected {len(messages)} messages but could not place "
-                        f"{filename} in the sandbox.")
-        staged.append({"path": record["path"], "filename": record["filename"],
-                       "size_bytes": len(blob), "gzipped": bool(record.get("gzipped"))})
-
+    elapsed = time.monotonic() - started
+    staged = writer.staged
     total_bytes = sum(p["size_bytes"] for p in staged)
-    span_oldest = messages[0].get("ts")
-    span_latest = messages[-1].get("ts")
-    logger.info(f"export_conversation staged {len(messages)} messages "
+    rate = writer.message_count / elapsed if elapsed > 0 else float(writer.message_count)
+    logger.info(f"export_conversation staged {writer.message_count} messages "
                 f"({len(thread_roots)} threads, {total_bytes} bytes, {len(staged)} part(s)) "
-                f"from {channel_id} in {time.monotonic() - started:.1f}s")
+                f"from {channel_id} in {elapsed:.1f}s ({rate:.0f} msg/s)")
 
-    note = (
-        "Read the file(s) with code — one JSON object per line, oldest first, fields: ts, "
-        "thread_ts, user, sender ('human' | 'other_bot' | 'self'), text, and reactions/files "
-        "where the message has them. Everything in the range is here; it has NOT been posted "
-        "to the user.")
+    note = _NOTE
     if any(p["gzipped"] for p in staged):
-        note += (" A part marked gzipped is GZIP-COMPRESSED in the container — open those with "
-                 "the `gzip` module rather than as plain text.")
+        note += _GZIP_NOTE
     return {
         "ok": True,
         "channel": channel_id,
         "paths": [p["path"] for p in staged],
         "files": staged,
         "format": "jsonl",
-        "message_count": len(messages),
+        "message_count": writer.message_count,
         "thread_count": len(thread_roots),
-        "oldest_ts": span_oldest,
-        "latest_ts": span_latest,
+        "oldest_ts": writer.oldest_ts,
+        "latest_ts": writer.latest_ts,
         "size_bytes": total_bytes,
+        "elapsed_s": round(elapsed, 1),
+        "messages_per_second": round(rate, 1),
         "message": note,
     }
 
 
+class _StageFailed(Exception):
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self.filename = filename
+
+
+class _PartWriter:
+    """Serialized lines packed into transfer-sized parts, each staged the moment it fills.
+
+    The bot never holds the channel: one part filling, plus at most one waiting per walker while
+    the part ahead of it uploads (uploads go one at a time, which is the backpressure). Each part
+    is sorted oldest-first before it goes; across parts, lines are in the order they were
+    collected. Like `_chunk`, a line longer than the bound is its own part, never truncated.
+    """
+
+    def __init__(self, ctx: ToolContext, container_id: str, *, template: str, source_id: str,
+                 started: float):
+        self._ctx = ctx
+        self._container_id = container_id
+        self._template = template
+        self._source_id = source_id
+        self._started = started
+        self._max_bytes = _part_bytes()
+        self._buffer: List[Tuple[float, bytes]] = []
+        self._size = 0
+        self._upload = asyncio.Lock()
+        self._failed: Optional[_StageFailed] = None
+        self._records: List[Dict[str, Any]] = []
+        self._oldest: Optional[Tuple[float, Any]] = None
+        self._latest: Optional[Tuple[float, Any]] = None
+        self.staged: List[Dict[str, Any]] = []
+        self.message_count = 0
+
+    @property
+    def oldest_ts(self) -> Any:
+        return self._oldest[1] if self._oldest else None
+
+    @property
+    def latest_ts(self) -> Any:
+        return self._latest[1] if self._latest else None
+
+    async def add(self, lines: Sequence[Tuple[Any, bytes]]) -> None:
+        """Buffer `(ts, line)` pairs, staging the part in hand whenever the next line won't fit."""
+        for ts, line in lines:
+            if self._buffer and self._size + len(line) > self._max_bytes:
+                await self._flush()
+            value = _ts_float(ts) or 0.0
+            self._buffer.append((value, line))
+            self._size += len(line)
+            self.message_count += 1
+            if self._oldest is None or value < self._oldest[0]:
+                self._oldest = (value, ts)
+            if self._latest is None or value > self._latest[0]:
+                self._latest = (value, ts)
+
+    async def close(self) -> None:
+        if self._buffer:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        batch, self._buffer, self._size = self._buffer, [], 0
+        batch.sort(key=lambda item: item[0])
+        blob = b"".join(line for _, line in batch)
+        del batch
+        async with self._upload:
+            if self._failed is not None:
+                raise self._failed
+            index = len(self.staged) + 1
+            filename = self._template.format(index)
+            record = await file_mount.stage_bytes(
+                self._ctx, self._container_id, filename, blob,
+                source_id=f"{self._source_id}:{index}:{int(self._started)}")
+            if record is None:
+                self._failed = _StageFailed(filename)
+                raise self._failed
+            self._records.append(record)
+            self.staged.append({"path": record["path"], "filename": record["filename"],
+                                "size_bytes": len(blob), "gzipped": bool(record.get("gzipped"))})
+
+    async def discard(self) -> None:
+        """Take back the parts already staged: an abandoned export must not look complete."""
+        self._buffer, self._size = [], 0
+        async with self._upload:
+            for record in self._records:
+                await file_mount.unstage(self._ctx, self._container_id, record)
+            self._records.clear()
+            self.staged.clear()
+
+
 async def _collect(history: Callable[..., Any], replies: Optional[Callable[..., Any]], *,
                    channel_id: str, oldest: Optional[str], latest: Optional[str],
-                   include_threads: bool) -> Tuple[List[Dict[str, Any]], Set[str]]:
-    """Every message in the window, deduped by ts and sorted oldest-first.
+                   include_threads: bool,
+                   sink: Callable[[List[Dict[str, Any]]], Awaitable[None]]) -> Set[str]:
+    """Every message in the window, deduped by ts, handed to `sink` a page at a time.
 
     Two things make this complete rather than nearly complete. Messages are deduped GLOBALLY:
     `conversations.replies` re-includes the thread root, which history already returned, and a
@@ -283,10 +519,12 @@ async def _collect(history: Callable[..., Any], replies: Optional[Callable[...,
     a root from last year, and a bounded history call cannot see that root at all. Any root whose
     `latest_reply` lands in range is walked; the window predicate then keeps only the replies
     that belong.
+
+    Threads are walked while history is still paging, by `export_reply_concurrency` workers fed
+    from a queue of roots. A walker that fails ends the whole collection — complete or nothing.
+    Returns the roots whose replies contributed at least one message.
     """
     seen: Set[str] = set()
-    collected: List[Dict[str, Any]] = []
-    roots: List[str] = []
     thread_roots: Set[str] = set()
     low = _ts_float(oldest)
     high = _ts_float(latest)
@@ -299,46 +537,85 @@ async def _collect(history: Callable[..., Any], replies: Optional[Callable[...,
             return False
         return not (high is not None and value > high)
 
-    def _keep(msg: Dict[str, Any]) -> None:
-        ts = msg.get("ts")
-        if not isinstance(ts, str) or ts in seen or not _in_window(ts):
-            return
-        seen.add(ts)
-        collected.append(msg)
-
-    # `oldest` is withheld from the API only when the thread walk needs the older roots; with
-    # include_threads off there is nothing to rescue and the cheap bounded walk is correct.
-    api_oldest = None if (oldest and include_threads) else oldest
-    pages = 0
-    async for page in iter_pages(history, channel_id=channel_id, oldest=api_oldest,
-                                 latest=latest, inclusive=True, limit=_PAGE_LIMIT,
-                                 label="export history"):
-        pages += 1
+    def _keep(page: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        kept: List[Dict[str, Any]] = []
         for msg in page:
-            _keep(msg)
-            if include_threads and msg.get("reply_count") and _thread_touches(msg, low):
-                ts = msg.get("ts")
-                if isinstance(ts, str):
-                    roots.append(ts)
-        logger.debug(f"export_conversation: {channel_id} history page {pages} "
-                     f"({len(collected)} kept, {len(roots)} threads queued)")
-        await asyncio.sleep(_PAGE_PAUSE_S)
-
-    if include_threads and replies is not None:
-        for root_ts in roots:
+            ts = msg.get("ts")
+            if not isinstance(ts, str) or ts in seen or not _in_window(ts):
+                continue
+            seen.add(ts)
+            kept.append(msg)
+        return kept
+
+    walk_threads = include_threads and replies is not None
+    roots: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+    async def _walk_replies() -> None:
+        if replies is None:
+            return
+        while True:
+            root_ts = await roots.get()
+            if root_ts is None:
+                return
             async for page in iter_pages(replies, channel_id=channel_id, oldest=oldest,
                                          latest=latest, inclusive=True, limit=_PAGE_LIMIT,
                                          extra_params={"ts": root_ts},
                                          label="export replies"):
+                kept = _keep(page)
+                if kept:
+                    thread_roots.add(root_ts)
+                    await sink(kept)
+                await asyncio.sleep(_page_pause())
+
+    workers = ([asyncio.create_task(_walk_replies())
+                for _ in range(max(1, int(config.export_reply_concurrency)))]
+               if walk_threads else [])
+    try:
+        # `oldest` is withheld from the API only when the thread walk needs the older roots;
+        # with include_threads off there is nothing to rescue and the cheap bounded walk is
+        # correct.
+        api_oldest = None if (oldest and include_threads) else oldest
+        pages = 0
+        queued = 0
+        async for page in iter_pages(history, channel_id=channel_id, oldest=api_oldest,
+                                     latest=latest, inclusive=True, limit=_PAGE_LIMIT,
+                                     label="export history"):
+            pages += 1
+            kept = _keep(page)
+            if walk_threads:
                 for msg in page:
-                    before = len(collected)
-                    _keep(msg)
-                    if len(collected) > before:
-                        thread_roots.add(root_ts)
-                await asyncio.sleep(_PAGE_PAUSE_S)
-
-    collected.sort(key=lambda m: _ts_float(m.get("ts")) or 0.0)
-    return collected, thread_roots
+                    ts = msg.get("ts")
+                    if msg.get("reply_count") and isinstance(ts, str) and _thread_touches(msg, low):
+                        roots.put_nowait(ts)
+                        queued += 1
+            if kept:
+                await sink(kept)
+            _raise_failed(workers)
+            logger.debug(f"export_conversation: {channel_id} history page {pages} "
+                         f"({len(seen)} kept, {queued} threads queued)")
+            await asyncio.sleep(_page_pause())
+        for _ in workers:
+            roots.put_nowait(None)
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            if not worker.done():
+                worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+    return thread_roots
+
+
+def _raise_failed(workers: Sequence["asyncio.Task[None]"]) -> None:
+    """Surface a thread walker's failure now rather than after history finishes paging."""
+    for worker in workers:
+        if worker.done() and not worker.cancelled() and worker.exception() is not None:
+            raise worker.exception()  # type: ignore[misc]
+
+
+def _page_pause() -> float:
+    """The courtesy pause between pages — unless the shared rate scheduler already paces them."""
+    return 0.0 if getattr(config, "slack_rate_scheduler", False) else _PAGE_PAUSE_S
 
 
 def _thread_touches(msg: Dict[str, Any], low: Optional[float]) -> bool:
@@ -349,21 +626,25 @@ def _thread_touches(msg: Dict[str, Any], low: Optional[float]) -> bool:
     return newest is not None and newest >= low
 
 
-async def _resolve_authors(client: Any, messages: Sequence[Dict[str, Any]]) -> Dict[str, str]:
+async def _resolve_authors(client: Any, messages: Sequence[Dict[str, Any]],
+                           names: Dict[str, str], asked: Set[str]) -> None:
     """Display names for the human authors, read-only and in the resolver's own batch size.
 
     Reading history must not create user rows or bump `last_seen`, which is exactly what
-    `resolve_usernames` guarantees. Its remote budget is per CALL, so an export with more
+    `resolve_usernames` guarantees. Its remote budget is per CALL, so a page with more new
     speakers than one batch is resolved in successive batches (each hit is cached in the client
-    for the ones after it) rather than leaving the overflow as raw ids.
+    for the ones after it) rather than leaving the overflow as raw ids. Called once per page:
+    `names` collects the answers and `asked` the ids already tried, so a speaker is looked up
+    once per export however many pages they appear on.
     """
     resolver = getattr(client, "resolve_usernames", None)
     if not callable(resolver):
-        return {}
+        return
     api_client = getattr(getattr(client, "app", None), "client", None)
-    ids = list(dict.fromkeys(
-        m.get("user") for m in messages if m.get("user") and not m.get("bot_id")))
-    names: Dict[str, str] = {}
+    ids: List[str] = list(dict.fromkeys(
+        m["user"] for m in messages
+        if m.get("user") and not m.get("bot_id") and m["user"] not in asked))
+    asked.update(ids)
     for start in range(0, len(ids), ACTOR_REMOTE_LOOKUP_DEFAULT):
         batch = ids[start:start + ACTOR_REMOTE_LOOKUP_DEFAULT]
         try:
@@ -371,7 +652,6 @@ async def _resolve_authors(client: Any, messages: Sequence[Dict[str, Any]]) -> D
         except Exception as e:  # noqa: BLE001 — an unresolved id stays raw, which is honest
             logger.debug(f"export_conversation: name resolution failed: {e}")
             break
-    return names
 
 
 def _serialize(client: Any, msg: Dict[str, Any], names: Dict[str, str],
@@ -443,4 +723,4 @@ def register_export_tool(registry: ToolRegistry) -> None:
     registry.register(get_export_conversation_schema(), execute_export_conversation,
                       enabled=file_mount.sandbox_enabled,
                       channel_enabled=file_mount.sandbox_enabled,
-                      timeout=EXPORT_TIMEOUT_S)
+                      timeout=EXPORT_TIMEOUT_S, concurrency=CONCURRENCY_SLACK_READ)
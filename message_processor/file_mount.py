@@ -373,6 +373,29 @@ async def stage_bytes(ctx: ToolContext, container_id: str, filename: str, data:
     return record
 
 
+async def unstage(ctx: ToolContext, container_id: str, record: Dict[str, Any]) -> bool:
+    """Best-effort removal of a file ``stage_bytes`` placed, for a caller abandoning its output.
+
+    The streaming export stages parts as they fill, so a walk that fails part-way has already
+    placed some of them; leaving them would hand the model a file that looks complete. The
+    digest stays on ``ctx.mounted_files`` unless the delete went through — bytes still in the
+    container are still an ingredient the publisher must not post.
+    """
+    file_id = record.get("container_file_id")
+    processor = getattr(ctx, "processor", None)
+    if not file_id or processor is None:
+        return False
+    try:
+        await processor.openai_client.client.containers.files.delete(
+            file_id, container_id=container_id)
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Could not remove staged {record.get('filename')} ({container_id}): {e}")
+        return False
+    if ctx.mounted_files:
+        ctx.mounted_files[:] = [m for m in ctx.mounted_files if m is not record]
+    return True
+
+
 async def _upload(raw: Any, container_id: str, filename: str, payload: bytes) -> Any:
     buf = io.BytesIO(payload)
     buf.name = filename
@@ -1612,7 +1612,7 @@ class TextHandlerMixin(_Host):
 
         # Feed any mcp_list_tools discovery payloads into the informational cache
         for _label, _tools_payload in mcp_discovered.items():
-            self.mcp_manager.cache_discovered_tools_payload(_label, _tools_payload)
+            await self.mcp_manager.cache_discovered_tools_payload_async(_label, _tools_payload)
 
         # §5.4a — BEFORE THE ENDING CASCADE, because every branch below it is a way for this turn
         # to end and a cross-thread post has to carry its provenance out of ALL of them. See
@@ -3381,7 +3381,7 @@ class TextHandlerMixin(_Host):
 
             # Feed any mcp_list_tools discovery payloads into the informational cache
             for _label, _tools_payload in mcp_discovered.items():
-                self.mcp_manager.cache_discovered_tools_payload(_label, _tools_payload)
+                await self.mcp_manager.cache_discovered_tools_payload_async(_label, _tools_payload)
 
             # Ensure progress updater is cancelled if still running
             if progress_task and not progress_task.done():
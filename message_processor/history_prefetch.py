@@ -0,0 +1,267 @@
+"""Speculative Slack history reads while the wake gate is still deciding.
+
+An unprompted channel message spends its debounce window and its classifier call before the
+turn exists, and only then does the turn start asking Slack for the channel's history and the
+origin thread. That is dead time on the critical path of the first token. So the gate starts the
+turn's first reads the moment the message arrives (`start`), into the shared page cache, and the
+turn — if the gate wakes one — finds them already answered.
+
+THE PAGES ARE THE TURN'S OWN QUESTIONS, asked early: `channel_stream.prefetch_channel_turn_pages`
+uses the same floor, the same H and the same page size the turn will, so the cache keys match.
+Nothing here builds a window or decides anything, and nothing is written anywhere but the
+process-local cache, under its TTL, evicted by any message event in the channel.
+
+BOUNDED, because a decline throws the work away:
+  * one live prefetch per channel — a newer arrival cancels the older one, whose H it has moved;
+  * `participation_prefetch_pages` pages per prefetch, and no more than
+    `participation_prefetch_pages_per_minute` pages per channel across a rolling minute, so a
+    busy channel the gate keeps declining cannot spend its Slack rate limit on speculation;
+  * cancelled outright when the gate declines (`cancel`).
+
+A woken turn calls `claim` before it builds its stream: a prefetch still in flight is awaited
+rather than raced, since it is already asking the very questions the turn is about to ask. The
+wait lands in the turn's page tally next to what the prefetched pages saved, and both reach the
+turn's `stream_render` line.
+
+TWO MODES (`participation_prefetch_mode`). `pages` asks the turn's first questions only: the
+history walk and the origin thread. `stream` runs the turn's whole stream build speculatively —
+reply fan-out and actor names included — concurrently with the classifier, and throws the result
+away (`channel_stream.prefetch_channel_turn_stream`). It hides more of a woken turn and wastes
+more on a declined one, so `stats()` reports both sides: the wall clock prefetched pages saved
+the turns that woke, and the pages spent on prefetches nobody claimed.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from config import config
+from logger import setup_logger
+from slack_client import admission_watermark, page_cache, rate_scheduler
+from slack_client.history_fetch import FetchBudget
+from slack_client.normalizer import parse_ts
+
+logger = setup_logger(name="slack_bot.HistoryPrefetch")
+
+_WINDOW_S = 60.0
+
+MODE_PAGES = "pages"
+MODE_STREAM = "stream"
+
+
+def prefetch_mode() -> str:
+    """The configured mode; anything unrecognised reads as `pages`, what this did before."""
+    mode = str(getattr(config, "participation_prefetch_mode", MODE_PAGES) or "").strip().lower()
+    return MODE_STREAM if mode == MODE_STREAM else MODE_PAGES
+
+
+@dataclass
+class _Prefetch:
+    ts: str
+    task: "asyncio.Task[int]"
+    budget: FetchBudget
+    started_at: float
+    # Set once, by whichever comes first: a turn claiming it, or a decline/newer arrival
+    # retiring it. Its pages are counted as used or wasted at that moment.
+    outcome: Optional[str] = None
+
+
+class HistoryPrefetcher:
+    """One speculative read per channel, with a per-channel page allowance."""
+
+    def __init__(self, *, clock=time.monotonic):
+        self._clock = clock
+        self._live: Dict[str, _Prefetch] = {}
+        # The channel's newest prefetch once it has finished, kept until a turn claims it or the
+        # gate declines it — a prefetch that beat the classifier is the common case, and without
+        # this its pages could be attributed to neither.
+        self._finished: Dict[str, _Prefetch] = {}
+        self._spent: Dict[str, Deque[Tuple[float, int]]] = {}
+        self._stats = {"started": 0, "cancelled": 0, "claimed": 0, "skipped_budget": 0,
+                       "pages": 0, "declined": 0, "pages_claimed": 0, "pages_wasted": 0,
+                       "woken_turns": 0}
+        self._saved_ms = 0.0
+
+    def _allowance(self, channel_id: str) -> int:
+        per_prefetch = int(getattr(config, "participation_prefetch_pages", 0))
+        per_minute = int(getattr(config, "participation_prefetch_pages_per_minute", 0))
+        spent = self._spent.get(channel_id)
+        now = self._clock()
+        while spent and now - spent[0][0] > _WINDOW_S:
+            spent.popleft()
+        used = sum(pages for _, pages in spent) if spent else 0
+        # A live prefetch has not reported yet; count its whole ceiling against the minute.
+        live = self._live.get(channel_id)
+        if live is not None:
+            used += int(getattr(config, "participation_prefetch_pages", 0))
+        return max(0, min(per_prefetch, per_minute - used))
+
+    def start(self, client: Any, db: Any, channel_id: str, ts: Optional[str],
+              origin_root_ts: Optional[str] = None) -> bool:
+        """Begin reading what a turn woken by `ts` would read first. SYNCHRONOUS; never raises.
+
+        False when nothing was started: prefetch off, the page cache off (nowhere to put the
+        answers), an older arrival than the one already prefetching, or the channel's
+        allowance spent.
+        """
+        try:
+            if not channel_id or not ts or db is None or client is None:
+                return False
+            if int(getattr(config, "participation_prefetch_pages", 0)) <= 0:
+                return False
+            if not page_cache.page_cache.enabled:
+                return False
+            live = self._live.get(channel_id)
+            if live is not None:
+                if parse_ts(ts) <= parse_ts(live.ts):
+                    return False
+                self._stop(channel_id, live, reason="superseded")
+                self._retire(live, "superseded")
+            finished = self._finished.pop(channel_id, None)
+            if finished is not None:
+                self._retire(finished, "superseded")
+            pages = self._allowance(channel_id)
+            if pages <= 0:
+                self._stats["skipped_budget"] += 1
+                logger.debug(f"History prefetch for {channel_id}/{ts} skipped: "
+                             f"per-minute page allowance spent")
+                return False
+            pin = admission_watermark.pin(channel_id, ts)
+            # Long enough to outlast the window it hides in, and no longer: past that the turn
+            # is fetching for itself and a straggling prefetch is only a second caller.
+            debounce = max(0.0, float(getattr(config, "participation_debounce_seconds", 3.0)))
+            budget = FetchBudget(deadline_at=self._clock() + debounce + 5.0, page_ceiling=pages,
+                                 clock=self._clock)
+            task = asyncio.create_task(self._run(client, db, channel_id, pin.h, pin.frontier,
+                                                 origin_root_ts, str(ts), budget))
+            entry = _Prefetch(ts=str(ts), task=task, budget=budget, started_at=self._clock())
+            self._live[channel_id] = entry
+            task.add_done_callback(functools.partial(self._settle, channel_id, entry))
+            self._stats["started"] += 1
+            return True
+        except Exception as e:  # noqa: BLE001 — speculation must never cost the gate
+            logger.debug(f"History prefetch for {channel_id}/{ts} not started: {e}")
+            return False
+
+    @staticmethod
+    async def _run(client: Any, db: Any, channel_id: str, h: str, frontier: int,
+                   origin_root_ts: Optional[str], trigger_ts: str, budget: FetchBudget) -> int:
+        from message_processor.channel_stream import (prefetch_channel_turn_pages,
+                                                      prefetch_channel_turn_stream)
+
+        page_cache.mark_prefetch()
+        # Speculation is never worth a turn's Slack allowance: it yields to turn traffic.
+        rate_scheduler.mark_background()
+        team_id = getattr(client, "self_team_id", None) or ""
+        try:
+            if prefetch_mode() == MODE_STREAM:
+                return await prefetch_channel_turn_stream(
+                    client=client, db=db, team_id=team_id, channel_id=channel_id, h=h,
+                    frontier=frontier, origin_root_ts=origin_root_ts, trigger_ts=trigger_ts,
+                    budget=budget,
+                    drain_timeout=getattr(config, "index_drain_timeout_seconds", None))
+            return await prefetch_channel_turn_pages(
+                client=client, db=db, team_id=team_id,
+                channel_id=channel_id, h=h, origin_root_ts=origin_root_ts, budget=budget)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"History prefetch for {channel_id} failed: {e}")
+            return budget.pages_used
+
+    def _settle(self, channel_id: str, entry: _Prefetch, _task: asyncio.Task) -> None:
+        """Done callback: charge what it actually spent, and retire it if it is still ours."""
+        pages = entry.budget.pages_used
+        self._spent.setdefault(channel_id, deque()).append((self._clock(), pages))
+        self._stats["pages"] += pages
+        if self._live.get(channel_id) is entry:
+            del self._live[channel_id]
+            if entry.outcome is None:
+                self._finished[channel_id] = entry
+        if not self._spent[channel_id]:
+            del self._spent[channel_id]
+
+    def _retire(self, entry: _Prefetch, outcome: str) -> None:
+        """Attribute a prefetch's pages, once: to the turn that claimed it, or to waste."""
+        if entry.outcome is not None:
+            return
+        entry.outcome = outcome
+        pages = entry.budget.pages_used
+        if outcome == "claimed":
+            self._stats["pages_claimed"] += pages
+        else:
+            # A supersession is the gate's cohort collapse, a decline like any other.
+            self._stats["pages_wasted"] += pages
+            self._stats["declined"] += 1
+
+    def _stop(self, channel_id: str, entry: _Prefetch, *, reason: str) -> None:
+        if not entry.task.done():
+            entry.task.cancel()
+            self._stats["cancelled"] += 1
+            logger.debug(f"History prefetch for {channel_id}/{entry.ts} cancelled ({reason})")
+        if self._live.get(channel_id) is entry:
+            del self._live[channel_id]
+
+    def cancel(self, channel_id: Optional[str], ts: Optional[str], *, reason: str) -> None:
+        """The gate declined `ts`: drop its prefetch, if it is still the live one."""
+        live = self._live.get(channel_id or "")
+        if live is not None and live.ts == str(ts):
+            self._stop(channel_id or "", live, reason=reason)
+            self._retire(live, reason)
+        finished = self._finished.get(channel_id or "")
+        if finished is not None and finished.ts == str(ts):
+            del self._finished[channel_id or ""]
+            self._retire(finished, reason)
+
+    async def claim(self, channel_id: Optional[str], ts: Optional[str]) -> float:
+        """A turn for `ts` is about to read: let its prefetch finish first. Returns ms waited.
+
+        Bounded by the prefetch's own deadline. The wait is charged to the current turn's page
+        tally, so what the prefetch saved is always reported net of it.
+        """
+        live = self._live.get(channel_id or "")
+        if live is None or live.ts != str(ts):
+            finished = self._finished.get(channel_id or "")
+            if finished is not None and finished.ts == str(ts):
+                del self._finished[channel_id or ""]
+                self._stats["claimed"] += 1
+                self._retire(finished, "claimed")
+            return 0.0
+        self._stats["claimed"] += 1
+        started = self._clock()
+        if not live.task.done():
+            remaining = max(0.0, live.budget.remaining_seconds())
+            await asyncio.wait({live.task}, timeout=remaining)
+            if not live.task.done():
+                self._stop(channel_id or "", live, reason="outlived its claim")
+        self._finished.pop(channel_id or "", None)
+        self._retire(live, "claimed")
+        waited_ms = (self._clock() - started) * 1000.0
+        tally = page_cache.current_tally()
+        if tally is not None:
+            tally.prefetch_wait_ms += waited_ms
+        return waited_ms
+
+    def credit(self, tally: Optional[page_cache.TurnTally]) -> None:
+        """A woken turn's build is done: add what its prefetched pages saved, net of its wait."""
+        if tally is None or not (tally.prefetched or tally.prefetch_wait_ms):
+            return
+        self._stats["woken_turns"] += 1
+        self._saved_ms += tally.prefetch_net_ms
+
+    def stats(self) -> Dict[str, Any]:
+        woken, declined = self._stats["woken_turns"], self._stats["declined"]
+        return dict(
+            self._stats, mode=prefetch_mode(), live=len(self._live),
+            saved_ms=round(self._saved_ms),
+            # The trade the mode is chosen on: what a wake gained against what a decline threw away.
+            saved_ms_per_woken_turn=round(self._saved_ms / woken, 1) if woken else None,
+            wasted_pages_per_declined_turn=(round(self._stats["pages_wasted"] / declined, 2)
+                                            if declined else None))
+
+
+prefetcher = HistoryPrefetcher()
@@ -39,6 +39,7 @@ from message_processor.ingestion.image_validation import (
 )
 from logger import setup_logger
 from message_processor import image_catalog
+from message_processor.tool_registry import CONCURRENCY_OPENAI
 from message_processor.turn_runtime import (EffectRevoked, LaunchNotRecorded,
                                             mark_tool_launched as _mark_launched,
                                             run_effect as _run_effect)
@@ -1178,8 +1179,8 @@ def register_image_tools(registry) -> None:
                       enabled=_asset_tool_enabled, timeout=sync_timeout,
                       name="create_image_asset", dynamic=True,
                       channel_schema=get_create_image_asset_schema_static,
-                      channel_enabled=_asset_tool_enabled)
+                      channel_enabled=_asset_tool_enabled, concurrency=CONCURRENCY_OPENAI)
     registry.register(get_edit_image_schema, execute_edit_image,
                       enabled=_tools_enabled, timeout=sync_timeout, name="edit_image",
                       dynamic=True, channel_schema=get_edit_image_schema_static,
-                      channel_enabled=_tools_enabled)
+                      channel_enabled=_tools_enabled, concurrency=CONCURRENCY_OPENAI)
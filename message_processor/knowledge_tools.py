@@ -1,7 +1,8 @@
 """``search_stored_knowledge`` — what this conversation ALREADY worked out, looked up by keyword.
 
 Every document read and every image analysed in a channel leaves a derived row behind: a summary
-in `documents`, a description in `images`. Until now nothing could ASK those rows a question. The
+in `documents`, a description in `images` — and ambient memory's summaries of the links, images
+and files people shared in passing, in `ambient_artifacts`. Until now nothing could ASK those rows a question. The
 model could only meet them by accident — if the pinned window happened to render the right
 message, or if someone re-uploaded the file. "Which screenshot showed the 500 error?" and "that
 pricing sheet from March" therefore dead-ended in a channel that demonstrably held the answer.
@@ -126,6 +127,35 @@ def _document_hit(row: Dict[str, Any], query: str, channel_id: str) -> Dict[str,
     return hit
 
 
+def _ambient_hit(row: Dict[str, Any], query: str) -> Dict[str, Any]:
+    # Ambient memory's summary of something shared in passing. INFORMATIONAL, like an image
+    # hit: `ref` is a URL or a Slack file id from a message nobody asked the assistant about, and
+    # no file tool resolves it from here — so a link hands back its URL and nothing else does.
+    title = row.get("title")
+    summary = row.get("summary")
+    matched_summary = _contains(summary, query)
+    kind = row.get("kind") or "link"
+    hit: Dict[str, Any] = {
+        "kind": kind,
+        "source": "shared in passing",
+        "matched_in": "summary" if matched_summary or not _contains(title, query) else "title",
+        "shared_at": row.get("created_at"),
+    }
+    if title:
+        hit["title"] = title
+    if kind == "link" and row.get("ref"):
+        hit["url"] = row["ref"]
+    conversation_ts = row.get("conversation_ts")
+    if conversation_ts and conversation_ts != row.get("source_ts"):
+        hit["thread_ts"] = conversation_ts
+    if row.get("source_ts"):
+        hit["message_ts"] = row["source_ts"]
+    snippet = _snippet(summary, query) if hit["matched_in"] == "summary" else None
+    if snippet:
+        hit["summary_snippet"] = snippet
+    return hit
+
+
 def _image_hit(row: Dict[str, Any], query: str, channel_id: str) -> Dict[str, Any]:
     # QUOTE THE COLUMN THAT MATCHED. The query hit `analysis` OR `original_analysis` (an edited
     # image's pre-edit description), so preferring `analysis` unconditionally would hand back a
@@ -189,8 +219,9 @@ def get_search_stored_knowledge_schema() -> Dict[str, Any]:
         "name": "search_stored_knowledge",
         "description": (
             "Keyword-search what you have ALREADY read or looked at in this conversation: the "
-            "SUMMARIES and filenames of documents shared here, and the DESCRIPTIONS of images "
-            "and screenshots shared here. Covers the whole current channel (in a DM, that DM) "
+            "SUMMARIES and filenames of documents shared here, the DESCRIPTIONS of images "
+            "and screenshots shared here, and the summaries of links, images and files people "
+            "shared in passing without asking you about them. Covers the whole current channel (in a DM, that DM) "
             "across every thread in it, newest first — including files from conversations that "
             "are no longer in front of you.\n\n"
             "Reach for it whenever the history suggests the answer already exists rather than "
@@ -208,7 +239,8 @@ def get_search_stored_knowledge_schema() -> Dict[str, Any]:
             "on the turn itself, so what you get back here will not open one. Image hits are "
             "INFORMATIONAL: they give you the stored description "
             "and a link to the message, and there is no id to view the picture with, so answer "
-            "from the description or point the person at the link."
+            "from the description or point the person at the link. Hits marked 'shared in "
+            "passing' are informational the same way; a link hit also carries its URL."
         ),
         "parameters": {
             "type": "object",
@@ -267,20 +299,21 @@ async def _search(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
                        f"channel={channel_id} reason={reason}")
         return {"ok": False, "error": "not_accessible", "message": ACCESS_DENIED_MESSAGE}
 
-    docs, images, unavailable = await _gather_rows(db, channel_id, query, limit)
-    if unavailable == "both":
+    docs, images, ambient, unavailable = await _gather_rows(db, channel_id, query, limit)
+    if unavailable == "all":
         return _err("lookup_failed", "Couldn't read what's been shared here just now.")
 
     hits: List[Dict[str, Any]] = [_document_hit(row, query, channel_id) for row in docs]
-    image_hits = [_image_hit(row, query, channel_id) for row in images]
+    linked = ([_image_hit(row, query, channel_id) for row in images]
+              + [_ambient_hit(row, query) for row in ambient])
     links = await _permalinks(client, channel_id,
-                             [h["message_ts"] for h in image_hits if h.get("message_ts")])
-    for hit in image_hits:
+                             [h["message_ts"] for h in linked if h.get("message_ts")])
+    for hit in linked:
         link = links.get(hit.get("message_ts") or "")
         if link:
             hit["permalink"] = link
-    hits.extend(image_hits)
-    # Newest first ACROSS both stores — the two queries each sort their own rows, and a merged
+    hits.extend(linked)
+    # Newest first ACROSS every store — the queries each sort their own rows, and a merged
     # list that ran documents-then-images would call an old file the most recent thing here.
     hits.sort(key=lambda h: str(h.get("shared_at") or ""), reverse=True)
     hits = hits[:limit]
@@ -296,7 +329,7 @@ async def _search(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
         # proof of absence.
         result["incomplete"] = (
             f"The stored {unavailable} could not be searched this time, so this result covers "
-            f"only the other kind. Don't treat it as proof nothing exists.")
+            f"only the rest. Don't treat it as proof nothing exists.")
     if not hits:
         result["note"] = (
             "Nothing shared in this channel has a stored summary or description matching that. "
@@ -307,39 +340,40 @@ async def _search(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
         result["how_to_use"] = (
             "Document hits: pass file_id or filename to read_document for the real content. "
             "Image hits: the description and permalink are all there is — there is no id that "
-            "will open the picture, so answer from the description or share the link.")
+            "will open the picture, so answer from the description or share the link. Hits "
+            "shared in passing: the summary, url and permalink are all there is.")
     return result
 
 
-async def _gather_rows(db: Any, channel_id: str, query: str,
-                       limit: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]],
-                                            Optional[str]]:
-    """Both stores concurrently. Returns (documents, images, what-was-unavailable) — a store that
-    failed is NAMED rather than folded into an empty result."""
+async def _gather_rows(db: Any, channel_id: str, query: str, limit: int
+                       ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]],
+                                  List[Dict[str, Any]], Optional[str]]:
+    """Every store concurrently. Returns (documents, images, ambient, what-was-unavailable) — a
+    store that failed is NAMED rather than folded into an empty result, and "all" means nothing
+    could be searched."""
+    stores = (
+        ("documents", db.search_channel_documents_async),
+        ("image descriptions", db.search_channel_image_analyses_async),
+        ("summaries of things shared in passing", db.search_channel_ambient_artifacts_async),
+    )
     # Annotated rather than tuple-unpacked: `gather(..., return_exceptions=True)` gives the
     # checker no per-element type to resolve, and each element is genuinely rows-or-exception.
     gathered: List[Any] = list(await asyncio.gather(
-        db.search_channel_documents_async(channel_id, query, limit),
-        db.search_channel_image_analyses_async(channel_id, query, limit),
+        *(search(channel_id, query, limit) for _, search in stores),
         return_exceptions=True,
     ))
-    doc_result, image_result = gathered[0], gathered[1]
-    docs: List[Dict[str, Any]] = []
-    images: List[Dict[str, Any]] = []
+    rows: List[List[Dict[str, Any]]] = []
     failed: List[str] = []
-    if isinstance(doc_result, BaseException):
-        logger.warning(f"search_stored_knowledge document lookup failed: {doc_result}")
-        failed.append("documents")
-    else:
-        docs = list(doc_result or [])
-    if isinstance(image_result, BaseException):
-        logger.warning(f"search_stored_knowledge image lookup failed: {image_result}")
-        failed.append("image descriptions")
-    else:
-        images = list(image_result or [])
-    if len(failed) == 2:
-        return [], [], "both"
-    return docs, images, (failed[0] if failed else None)
+    for (name, _), result in zip(stores, gathered):
+        if isinstance(result, BaseException):
+            logger.warning(f"search_stored_knowledge {name} lookup failed: {result}")
+            failed.append(name)
+            rows.append([])
+        else:
+            rows.append(list(result or []))
+    if len(failed) == len(stores):
+        return [], [], [], "all"
+    return rows[0], rows[1], rows[2], (" or the ".join(failed) if failed else None)
 
 
 def register_knowledge_tools(registry: ToolRegistry) -> None:
@@ -18,7 +18,7 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, List, Optional
 
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import CONCURRENCY_SLACK_READ, ToolContext, ToolRegistry
 
 # list_channel_members: resolve at most this many names; the rest are a LOUD note.
 MEMBERS_NAME_CAP = 50
@@ -292,5 +292,7 @@ async def execute_list_channel_members(ctx: ToolContext, args: Dict[str, Any]) -
 
 def register_people_tools(registry: ToolRegistry) -> None:
     """Register lookup_user + list_channel_members (call only when ENABLE_PEOPLE_TOOLS is on)."""
-    registry.register(get_lookup_user_schema(), execute_lookup_user)
-    registry.register(get_list_channel_members_schema(), execute_list_channel_members)
+    registry.register(get_lookup_user_schema(), execute_lookup_user,
+                      concurrency=CONCURRENCY_SLACK_READ)
+    registry.register(get_list_channel_members_schema(), execute_list_channel_members,
+                      concurrency=CONCURRENCY_SLACK_READ)
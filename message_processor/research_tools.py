@@ -44,7 +44,7 @@ from config import clamp_effort, config
 from message_processor import document_tools, outbound_receipts
 from message_processor.artifacts import strip_citation_markers, strip_sandbox_links
 from message_processor.destination_tools import parse_destination_marker
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import CONCURRENCY_OPENAI, ToolContext, ToolRegistry
 
 # Process-lifetime flag: set once a labelled findings post fails (likely a missing
 # chat:write.customize scope) so we stop attempting the username override and post plainly
@@ -2098,7 +2098,8 @@ async def _run_build_phase(*, processor, client, channel_id: str, thread_root: s
     registry.register(image_tools.get_create_image_asset_schema,
                       image_tools.execute_create_image_asset,
                       name="create_image_asset", dynamic=True,
-                      timeout=float(config.api_timeout_image) + 60.0)
+                      timeout=float(config.api_timeout_image) + 60.0,
+                      concurrency=CONCURRENCY_OPENAI)
     file_mount.register_file_mount_tools(registry)
     # A build is exactly where full-coverage collection belongs — nobody is watching a blank
     # reply while it pages — so the export tool is here too, with the SAME authorization gate it
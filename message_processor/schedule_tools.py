@@ -44,7 +44,8 @@ from logger import setup_logger
 from message_processor.outbound_receipts import (CLASS_ASSISTANT_REPLY,
                                                  expect_scheduled_delivery,
                                                  forget_scheduled_delivery)
-from message_processor.tool_registry import ToolContext, ToolRegistry
+from message_processor.tool_registry import (CONCURRENCY_SLACK_READ, CONCURRENCY_SLACK_WRITE,
+                                             ToolContext, ToolRegistry)
 
 logger = setup_logger(name="slack_bot.ScheduleTools")
 
@@ -486,6 +487,9 @@ def register_schedule_tools(registry: ToolRegistry) -> None:
     Both surfaces on purpose — "remind me tomorrow" is at least as common in a DM as in a channel,
     and the DM schedules into that DM.
     """
-    registry.register(get_schedule_message_schema(), execute_schedule_message)
-    registry.register(get_list_scheduled_messages_schema(), execute_list_scheduled_messages)
-    registry.register(get_cancel_scheduled_message_schema(), execute_cancel_scheduled_message)
+    registry.register(get_schedule_message_schema(), execute_schedule_message,
+                      concurrency=CONCURRENCY_SLACK_WRITE)
+    registry.register(get_list_scheduled_messages_schema(), execute_list_scheduled_messages,
+                      concurrency=CONCURRENCY_SLACK_READ)
+    registry.register(get_cancel_scheduled_message_schema(), execute_cancel_scheduled_message,
+                      concurrency=CONCURRENCY_SLACK_WRITE)
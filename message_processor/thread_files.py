@@ -253,7 +253,7 @@ async def catalog_unattended(processor, client, message) -> None:
             else:
                 if file_id and file_id in known_docs:
                     continue
-                db.save_document(
+                await db.save_document_async(
                     thread_id=thread_key, filename=name,
                     mime_type=mime or "application/octet-stream",
                     summary=UNATTENDED_SUMMARY_TEMPLATE.format(name=name),
@@ -220,7 +220,8 @@ class ThreadManagementMixin(_Host):
                 model=config.utility_model,
                 temperature=0.3,
                 max_tokens=800,  # Increased for better summaries
-                system_prompt=None  # Already using developer message above
+                system_prompt=None,  # Already using developer message above
+                memo_operation="document_summary",  # a rebuilt thread re-summarizes the same file
             )
             
             # Format the summarized version
@@ -1076,6 +1077,105 @@ class ThreadManagementMixin(_Host):
             self.log_debug(f"root message fetch failed: {e}")
             return None
 
+    @staticmethod
+    def _ts_after(ts: Optional[str], than: Optional[str]) -> bool:
+        try:
+            return than is None or parse_ts(ts) > parse_ts(than)
+        except Exception:  # noqa: BLE001 — an unreadable ts is never "newer"
+            return False
+
+    @staticmethod
+    def _state_holds_text(thread_state, text: Optional[str]) -> bool:
+        """Does any message in the state carry `text`? The test an unplaceable delta must pass."""
+        needle = strip_continuation_markers(text or "").strip()
+        if not needle:
+            return False
+        return any(isinstance(m.get("content"), str) and needle in m["content"]
+                   for m in thread_state.messages)
+
+    def _apply_thread_deltas(self, thread_state, deltas: List[Dict[str, Any]]) -> Optional[bool]:
+        """Fold queued message/edit/delete events into a warm state, in arrival order.
+
+        Returns None when nothing in the state changed (replies only move the counters; an edit
+        or deletion of a message the state never held — our own transient chrome, a summarized
+        span — changes nothing), True when an edit or a deletion was applied in place, and False
+        when one could not be placed exactly — the caller then refetches, as every edit and
+        deletion used to.
+
+        Exact means: the message is found by its ts, and an edit's previous text occurs in it
+        once, verbatim. Anything the live path would have rewritten (a mention, an escaped
+        character) fails that test, which is the point — the rebuild is the only thing that
+        renders those the way a rebuild does. The same goes for a deletion of one of our own
+        turns (it may be several merged posts), and for an unplaceable event whose text shows up
+        elsewhere in the state — a merged continuation part, say.
+        """
+        touched = None
+        for delta in deltas:
+            kind, ts = delta.get("kind"), delta.get("ts")
+            if kind == "reply":
+                if (thread_state.slack_reply_count is not None and ts != thread_state.thread_ts
+                        and self._ts_after(ts, thread_state.slack_latest_reply)):
+                    thread_state.slack_reply_count += 1
+                    thread_state.slack_latest_reply = ts
+                continue
+            index = next((i for i, m in enumerate(thread_state.messages)
+                          if (m.get("metadata") or {}).get("ts") == ts), None)
+            old_text = delta.get("old_text") or ""
+            if kind == "delete":
+                if (thread_state.slack_reply_count is not None and ts != thread_state.thread_ts
+                        and not self._ts_after(ts, thread_state.slack_latest_reply)):
+                    thread_state.slack_reply_count -= 1
+                if index is None:
+                    if self._state_holds_text(thread_state, old_text):
+                        return False
+                elif thread_state.messages[index].get("role") != "user":
+                    return False  # one of ours: may be a merged continuation of several posts
+                else:
+                    removed = thread_state.messages.pop(index)
+                    thread_state.context_tokens = max(
+                        0, thread_state.context_tokens
+                        - self.thread_manager._token_counter.count_message_tokens(removed))
+                    touched = True
+                continue
+            if kind != "edit":
+                return False
+            new_text = delta.get("new_text") or ""
+            if new_text == old_text:
+                continue  # an unfurl or an attachment change: the words did not move
+            if index is None:
+                if self._state_holds_text(thread_state, old_text):
+                    return False
+                continue
+            target = thread_state.messages[index]
+            content = target.get("content")
+            if (not old_text or "<" in new_text or "&" in new_text
+                    or not isinstance(content, str) or content.count(old_text) != 1):
+                return False
+            target["content"] = content.replace(old_text, new_text, 1)
+            touched = True
+        return touched
+
+    async def _thread_counters_match(self, client, thread_state) -> bool:
+        """One root read instead of the whole transcript: do Slack's counters agree with ours?
+
+        reply_count must match exactly. latest_reply may trail ours (deleting the newest reply can
+        move it back); a latest_reply NEWER than anything we were told about is a missed event.
+        """
+        reader = getattr(client, "get_thread_reply_counters", None)
+        if thread_state.slack_reply_count is None or reader is None:
+            return False
+        self.thread_manager.count_rebuild("checks")
+        try:
+            counters = await reader(thread_state.channel_id, thread_state.thread_ts)
+        except Exception as e:  # noqa: BLE001
+            self.log_debug(f"thread counter check failed: {e}")
+            return False
+        if not counters:
+            return False
+        reply_count, latest_reply = counters
+        return (reply_count == thread_state.slack_reply_count
+                and not self._ts_after(latest_reply, thread_state.slack_latest_reply))
+
     async def _get_or_rebuild_thread_state(
         self,
         message: Message,
@@ -1099,6 +1199,25 @@ class ThreadManagementMixin(_Host):
             self.log_info(f"Warm thread {refresh_key} flagged needs_refresh (busy-rejected "
                           f"message) — refetching transcript from Slack")
             should_rebuild = True
+        # Events since the last turn, folded in place. Taken even when rebuilding, so a rebuild
+        # never leaves stale deltas for the turn after it.
+        deltas = self.thread_manager.take_thread_deltas(refresh_key)
+        if not should_rebuild and deltas:
+            applied = self._apply_thread_deltas(thread_state, deltas)
+            if applied is False:
+                self.log_info(f"Warm thread {refresh_key}: an edit/delete could not be applied "
+                              f"in place — refetching transcript from Slack")
+                should_rebuild = True
+            elif applied:
+                if await self._thread_counters_match(client, thread_state):
+                    self.thread_manager.count_rebuild("delta_turns")
+                    self.log_info(f"Warm thread {refresh_key}: {len(deltas)} event delta(s) "
+                                  f"applied in place; Slack's counters agree")
+                else:
+                    self.thread_manager.count_rebuild("divergences")
+                    self.log_info(f"Warm thread {refresh_key}: counters diverged from Slack "
+                                  f"after applying deltas — refetching transcript")
+                    should_rebuild = True
         if not should_rebuild and self.db:
             thread_key = f"{thread_state.channel_id}:{thread_state.thread_ts}"
             db_images = await self.db.find_thread_images_async(thread_key)
@@ -1113,6 +1232,7 @@ class ThreadManagementMixin(_Host):
                             break
         
         if should_rebuild:
+            self.thread_manager.count_rebuild("rebuilds")
             self.log_info(f"Checking thread history for {message.thread_id}")
 
             # Phase S: Slack is the only transcript. A rebuild always starts from a clean
@@ -1176,6 +1296,14 @@ class ThreadManagementMixin(_Host):
                 message.thread_id,
                 oldest=fetch_oldest
             )
+            # The baseline the next turn's event deltas are checked against. Only a fetch that
+            # reached the root carries it; a tail-only rebuild leaves the thread on refetch.
+            root_meta = (history[0].metadata or {}) if history else {}
+            if root_meta.get("ts") == message.thread_id and root_meta.get("reply_count") is not None:
+                thread_state.slack_reply_count = int(root_meta["reply_count"])
+                thread_state.slack_latest_reply = root_meta.get("latest_reply")
+            else:
+                thread_state.slack_reply_count = thread_state.slack_latest_reply = None
 
             # Merge split bot replies ("Continued..." parts) back into single turns and
             # strip the markers — otherwise the model sees itself emitting continuation
@@ -1490,7 +1618,7 @@ class ThreadManagementMixin(_Host):
                                                     # add_document would INSERT a duplicate ref row
                                                     # every rebuild — the table has no
                                                     # UNIQUE(thread_id, filename) constraint.
-                                                    self.db.restore_document_derived(
+                                                    await self.db.restore_document_derived_async(
                                                         thread_key, filename,
                                                         summary=doc_summary,
                                                         page_structure=extracted_content.get("page_structure"),
@@ -1502,7 +1630,7 @@ class ThreadManagementMixin(_Host):
                                                 else:
                                                     # Genuinely legacy (no row at all): insert once.
                                                     document_ledger = self.thread_manager.get_or_create_document_ledger(thread_state.thread_ts)
-                                                    document_ledger.add_document(
+                                                    await document_ledger.add_document_async(
                                                         content=extracted_content["content"],  # transient
                                                         filename=filename,
                                                         mime_type=mimetype,
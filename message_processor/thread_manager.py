@@ -21,6 +21,9 @@ _MAX_JOB_NOTES = 10
 # One note, capped. Long enough for a real correction with its reasoning, short enough that ten
 # of them cannot crowd out the job's own context.
 _JOB_NOTE_CHARS = 1500
+# Event deltas queued for one warm thread before its next turn folds them in. A thread that
+# collects more than this between turns is cheaper to refetch than to replay.
+_MAX_THREAD_DELTAS = 200
 
 
 @dataclass
@@ -44,6 +47,12 @@ class ThreadState:
     # Usage-driven budgeting: authoritative context size from the API's response.usage
     # after each call, plus chars/4 estimates for messages added between calls.
     context_tokens: int = 0
+    # Slack's own counters for the thread — the root's reply_count and latest_reply — as of the
+    # last rebuild, advanced by every reply and deletion event since. The next turn compares them
+    # with Slack's before trusting edits and deletions it applied in place. None when the rebuild
+    # never saw the root, which leaves that thread on refetch-on-change.
+    slack_reply_count: Optional[int] = None
+    slack_latest_reply: Optional[str] = None
     
     def add_message(self, role: str, content: Any, db = None, thread_key: Optional[str] = None, message_ts: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None, token_counter: Optional[TokenCounter] = None, max_tokens: Optional[int] = None):
         """Add a message to the thread history with optional metadata and token management.
@@ -177,6 +186,38 @@ class DocumentLedger:
             url_private: Slack CDN URL for authenticated re-download
             size_bytes: Original file size
         """
+        entry = self._append_entry(content, filename, mime_type, page_structure, total_pages,
+                                   summary, metadata, timestamp, file_id, url_private,
+                                   size_bytes)
+        if db and thread_id:
+            db.save_document(thread_id=thread_id, message_ts=message_ts,
+                             **self._document_row(entry))
+
+    async def add_document_async(self, content: str, filename: str, mime_type: str,
+                                 page_structure: Optional[Dict[str, Any]] = None,
+                                 total_pages: Optional[int] = None,
+                                 summary: Optional[str] = None,
+                                 metadata: Optional[Dict[str, Any]] = None,
+                                 timestamp: Optional[float] = None,
+                                 db = None, thread_id: Optional[str] = None,
+                                 message_ts: Optional[str] = None,
+                                 file_id: Optional[str] = None,
+                                 url_private: Optional[str] = None,
+                                 size_bytes: Optional[int] = None):
+        """Async add_document: the same ledger entry, persisted through save_document_async so
+        the row is written off the event loop. Same arguments as add_document."""
+        entry = self._append_entry(content, filename, mime_type, page_structure, total_pages,
+                                   summary, metadata, timestamp, file_id, url_private,
+                                   size_bytes)
+        if db and thread_id:
+            await db.save_document_async(thread_id=thread_id, message_ts=message_ts,
+                                         **self._document_row(entry))
+
+    def _append_entry(self, content: str, filename: str, mime_type: str,
+                      page_structure: Optional[Dict[str, Any]], total_pages: Optional[int],
+                      summary: Optional[str], metadata: Optional[Dict[str, Any]],
+                      timestamp: Optional[float], file_id: Optional[str],
+                      url_private: Optional[str], size_bytes: Optional[int]) -> Dict[str, Any]:
         if timestamp is None:
             timestamp = time.time()
 
@@ -199,21 +240,14 @@ class DocumentLedger:
             "size_bytes": size_bytes,
         }
         self.documents.append(entry)
-
-        if db and thread_id:
-            db.save_document(
-                thread_id=thread_id,
-                filename=filename,
-                mime_type=mime_type,
-                summary=summary,
-                file_id=file_id,
-                url_private=url_private,
-                size_bytes=size_bytes,
-                page_structure=page_structure,
-                total_pages=total_pages,
-                metadata=metadata,
-                message_ts=message_ts
-            )
+        return entry
+
+    @staticmethod
+    def _document_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """The save_document(_async) keyword arguments an entry persists as."""
+        return {key: entry[key] for key in ("filename", "mime_type", "summary", "file_id",
+                                            "url_private", "size_bytes", "page_structure",
+                                            "total_pages", "metadata")}
     
     def get_recent_documents(self, count: int = 5) -> List[Dict[str, Any]]:
         """Get the most recent documents"""
@@ -367,6 +401,12 @@ class AsyncThreadStateManager(LoggerMixin):
         # corresponding enqueue, and the drain pops while STILL HOLDING the lock, so
         # no message can slip between "queue looks empty" and "lock released".
         self._pending_queues: Dict[str, deque] = {}
+        # Message/edit/delete events for WARM threads, applied by the thread's next turn under its
+        # lock instead of refetching the whole transcript (ThreadManagementMixin
+        # ._apply_thread_deltas). A cold thread records nothing: its next turn rebuilds anyway.
+        self._thread_deltas: Dict[str, List[Dict[str, Any]]] = {}
+        self._rebuild_stats: Dict[str, int] = {
+            "rebuilds": 0, "delta_turns": 0, "checks": 0, "divergences": 0}
         self.log_info(f"AsyncThreadStateManager initialized {'with' if db else 'without'} database")
 
     # --- Phase Q: pending-message queue (busy rejection retired) ---
@@ -421,6 +461,29 @@ class AsyncThreadStateManager(LoggerMixin):
             return True
         return False
 
+    def note_thread_delta(self, thread_key: str, delta: Dict[str, Any]) -> None:
+        """Queue one event delta for a warm thread. SYNCHRONOUS (atomic on the loop)."""
+        state = self._threads.get(thread_key)
+        if state is None or not state.messages:
+            return
+        queue = self._thread_deltas.setdefault(thread_key, [])
+        if len(queue) >= _MAX_THREAD_DELTAS:
+            self._thread_deltas.pop(thread_key, None)
+            self.mark_needs_refresh(thread_key)
+            return
+        queue.append(delta)
+
+    def take_thread_deltas(self, thread_key: str) -> List[Dict[str, Any]]:
+        """Pop every delta queued for the thread, oldest first."""
+        return self._thread_deltas.pop(thread_key, None) or []
+
+    def count_rebuild(self, outcome: str) -> None:
+        self._rebuild_stats[outcome] = self._rebuild_stats.get(outcome, 0) + 1
+
+    def get_rebuild_stats(self) -> Dict[str, int]:
+        """Full transcript rebuilds vs. turns served by applying event deltas in place."""
+        return dict(self._rebuild_stats)
+
     def mark_upload_started(self, thread_key: str, generation_id: Optional[str] = None):
         """Signal that an asset upload for this thread is in flight. F13: overlapping
         generations each register their own token (generation_id, or "__sync__" when the
@@ -1004,6 +1067,7 @@ class AsyncThreadStateManager(LoggerMixin):
 
             for key in threads_to_remove:
                 del self._threads[key]
+                self._thread_deltas.pop(key, None)
                 # Also clean up associated asset and document ledgers
                 thread_ts = key.split(":")[1]
                 if thread_ts in self._assets:
@@ -1048,7 +1112,7 @@ class AsyncThreadStateManager(LoggerMixin):
 
         # Add documents to ledger
         for doc in documents:
-            document_ledger.add_document(
+            await document_ledger.add_document_async(
                 content=doc.get('content', ''),
                 filename=doc.get('filename', 'unknown'),
                 mime_type=doc.get('mime_type', 'text/plain'),
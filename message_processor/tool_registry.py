@@ -16,6 +16,7 @@ import asyncio
 import copy
 import hashlib
 import json
+import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Mapping, Optional
 
@@ -33,6 +34,20 @@ logger = setup_logger(name="slack_bot.ToolRegistry")
 SURFACE_DM = "dm"
 SURFACE_CHANNEL = "channel"
 
+# Concurrency classes. A round's calls are gathered, and a tool registered with a class shares
+# that class's per-round cap (`TOOL_CONCURRENCY_LIMITS`) with its siblings: eight history fetches
+# in one round reach Slack a few at a time, and an OCR-bound read_document queues only behind
+# other extractions, never in front of a cheap lookup. A tool with no class runs unbounded, as
+# every tool did before. Per ROUND, not per process: cross-turn pressure is already the Slack
+# rate scheduler's and the extraction pool's, and a process-wide cap would make one turn's slow
+# round another turn's queue.
+CONCURRENCY_SLACK_READ = "slack-read"
+CONCURRENCY_SLACK_WRITE = "slack-write"
+CONCURRENCY_CPU_EXTRACT = "cpu-extract"
+CONCURRENCY_OPENAI = "openai"
+CONCURRENCY_CLASSES = frozenset({CONCURRENCY_SLACK_READ, CONCURRENCY_SLACK_WRITE,
+                                 CONCURRENCY_CPU_EXTRACT, CONCURRENCY_OPENAI})
+
 
 @dataclass
 class SandboxHolder:
@@ -245,6 +260,10 @@ class ToolContext:
     # a background job's own sandbox, a hand-built context. On a chat turn the holder starts
     # empty and is filled by adoption or by the first bridge call.
     sandbox: Optional[SandboxHolder] = None
+    # The last dispatched round's `ToolCallTiming`s, in call order: how long each call queued
+    # behind its concurrency class and how long it then ran. Replaced by `dispatch_all` when
+    # its round ends; the tool loop reads it for its per-tool lines.
+    round_timings: Optional[List["ToolCallTiming"]] = None
 
     def sandbox_container_id(self) -> Optional[str]:
         """The addressable container this turn is ACTUALLY using, without creating one."""
@@ -276,6 +295,33 @@ class ToolContext:
 Executor = Callable[[ToolContext, Dict[str, Any]], Awaitable[Dict[str, Any]]]
 
 
+@dataclass
+class ToolCallTiming:
+    """One dispatched call's wall clock, split at the moment its class let it run."""
+    name: str
+    concurrency: Optional[str] = None
+    queue_ms: float = 0.0
+    exec_ms: float = 0.0
+
+
+class _RoundGates:
+    """One round's semaphores, one per concurrency class, made on first use."""
+
+    def __init__(self, limits: Mapping[str, int]):
+        self._limits = limits
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def semaphore(self, concurrency: Optional[str]) -> Optional[asyncio.Semaphore]:
+        if concurrency is None:
+            return None
+        limit = int(self._limits.get(concurrency, 0) or 0)
+        if limit <= 0:
+            return None  # no cap configured for this class: unbounded
+        if concurrency not in self._semaphores:
+            self._semaphores[concurrency] = asyncio.Semaphore(limit)
+        return self._semaphores[concurrency]
+
+
 # Containers the executors SHARE across a round. They are created here, before the per-call copies
 # exist, so no executor ever has to install one — an assign-if-None inside an executor would write
 # into its own copy, and two siblings that each installed a list would keep one of them.
@@ -322,8 +368,11 @@ def _call_fingerprint(name: str, args: Dict[str, Any]) -> str:
 class ToolRegistry:
     """Name → (schema, executor, enabled-gate). Gates are evaluated per request."""
 
-    def __init__(self):
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic):
         self._tools: Dict[str, Dict[str, Any]] = {}
+        self._clock = clock
+        # Per tool, since start: calls, and the milliseconds they spent queued and running.
+        self._timing_totals: Dict[str, Dict[str, float]] = {}
 
     def register(
         self,
@@ -335,6 +384,7 @@ class ToolRegistry:
         dynamic: bool = False,
         channel_schema: Any = None,
         channel_enabled: Optional[Callable[[dict], bool]] = None,
+        concurrency: Optional[str] = None,
     ) -> None:
         """Register a tool.
 
@@ -350,7 +400,13 @@ class ToolRegistry:
         variants accept and ignore the config so the registry can call them uniformly), and
         ``channel_enabled`` may read only channel-config-stable facts. A tool with neither
         keeps its static base schema and is exposed unconditionally there.
+
+        ``concurrency`` is one of ``CONCURRENCY_CLASSES``, or None for a tool that runs
+        unbounded. It decides which per-round cap the tool's calls share in ``dispatch_all``.
         """
+        if concurrency is not None and concurrency not in CONCURRENCY_CLASSES:
+            raise ValueError(f"Tool {name or '<unnamed>'}: unknown concurrency class "
+                             f"{concurrency!r}")
         if callable(schema):
             if not dynamic:
                 raise ValueError(
@@ -369,7 +425,8 @@ class ToolRegistry:
                              "enabled": enabled, "timeout": timeout,
                              "dynamic": bool(dynamic),
                              "channel_schema": channel_schema,
-                             "channel_enabled": channel_enabled}
+                             "channel_enabled": channel_enabled,
+                             "concurrency": concurrency}
 
     def schemas(self, thread_config: Optional[dict] = None,
                 surface: str = SURFACE_DM) -> List[Dict[str, Any]]:
@@ -786,13 +843,63 @@ class ToolRegistry:
 
         The call's own id rides along, because THIS is the seam a duplicate dispatch would arrive
         at: the loop hands the ids it already has, and the registry decides whether the work has
-        been done before."""
+        been done before.
+
+        Calls of a tool registered with a concurrency class wait for a slot in that class's
+        per-round semaphore first; queue and run time land in ``ctx.round_timings``."""
         self._restamp_trusted_roots(ctx)
         self._restamp_edit_targets(ctx)
-        return list(await asyncio.gather(
-            *(self.dispatch(ctx, c.get("name", ""), c.get("arguments"), c.get("call_id"))
-              for c in calls)
-        ))
+        gates = _RoundGates(getattr(config, "tool_concurrency_limits", None) or {})
+        timings = [ToolCallTiming(name=str(c.get("name", "")),
+                                  concurrency=self.concurrency_of(str(c.get("name", ""))))
+                   for c in calls]
+        try:
+            return list(await asyncio.gather(
+                *(self._dispatch_gated(ctx, c, gates.semaphore(t.concurrency), t)
+                  for c, t in zip(calls, timings))
+            ))
+        finally:
+            try:
+                ctx.round_timings = timings
+            except Exception:  # noqa: BLE001 — a read-only stand-in context goes without
+                pass
+
+    async def _dispatch_gated(self, ctx: Any, call: Dict[str, Any],
+                              semaphore: Optional[asyncio.Semaphore],
+                              timing: ToolCallTiming) -> Dict[str, Any]:
+        queued = started = self._clock()
+        try:
+            if semaphore is None:
+                return await self.dispatch(ctx, call.get("name", ""), call.get("arguments"),
+                                           call.get("call_id"))
+            async with semaphore:
+                started = self._clock()
+                return await self.dispatch(ctx, call.get("name", ""), call.get("arguments"),
+                                           call.get("call_id"))
+        finally:
+            timing.queue_ms = (started - queued) * 1000.0
+            timing.exec_ms = (self._clock() - started) * 1000.0
+            self._record_timing(timing)
+
+    def concurrency_of(self, name: str) -> Optional[str]:
+        tool = self._tools.get(name)
+        return tool.get("concurrency") if tool is not None else None
+
+    def _record_timing(self, timing: ToolCallTiming) -> None:
+        totals = self._timing_totals.setdefault(
+            timing.name, {"calls": 0, "queue_ms": 0.0, "exec_ms": 0.0})
+        totals["calls"] += 1
+        totals["queue_ms"] += timing.queue_ms
+        totals["exec_ms"] += timing.exec_ms
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per tool since start: calls, and mean milliseconds queued behind its class vs run."""
+        return {
+            name: {"class": self.concurrency_of(name), "calls": int(t["calls"]),
+                   "queue_ms_avg": round(t["queue_ms"] / t["calls"], 1),
+                   "exec_ms_avg": round(t["exec_ms"] / t["calls"], 1)}
+            for name, t in sorted(self._timing_totals.items()) if t["calls"]
+        }
 
 
 def serialize_tool_result(result: Any) -> str:
@@ -545,7 +545,7 @@ class MessageUtilitiesMixin(_Host):
             "size_bytes": size_bytes,
         }
 
-    def _persist_failed_document(self, message: Message, filename: str, mimetype: str,
+    async def _persist_failed_document(self, message: Message, filename: str, mimetype: str,
                                  failure_reason: str, *, file_id: Optional[str],
                                  url_private: Optional[str],
                                  size_bytes: Optional[int]) -> bool:
@@ -564,7 +564,7 @@ class MessageUtilitiesMixin(_Host):
             return False
         try:
             document_ledger = self.thread_manager.get_or_create_document_ledger(message.thread_id)
-            document_ledger.add_document(
+            await document_ledger.add_document_async(
                 content="",
                 filename=filename,
                 mime_type=mimetype,
@@ -615,7 +615,7 @@ class MessageUtilitiesMixin(_Host):
 
         # Store summary + metadata + Slack ref (never content)
         document_ledger = self.thread_manager.get_or_create_document_ledger(message.thread_id)
-        document_ledger.add_document(
+        await document_ledger.add_document_async(
             content=extracted["content"],  # transient; used only as summary fallback
             filename=file_name,
             mime_type=mimetype,
@@ -1007,7 +1007,7 @@ class MessageUtilitiesMixin(_Host):
                             # The bytes are still reachable through Slack, so the file earns a
                             # metadata-only row: that row is what gives it a mount id, and the
                             # sandbox can convert what our parsers could not read.
-                            mountable = self._persist_failed_document(
+                            mountable = await self._persist_failed_document(
                                 message, file_name, mimetype, error_msg,
                                 file_id=file_id,
                                 url_private=attachment.get("url"),
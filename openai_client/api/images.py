@@ -8,6 +8,7 @@ from config import config
 from message_processor.prompts import IMAGE_EDIT_SYSTEM_PROMPT, IMAGE_GEN_SYSTEM_PROMPT
 
 from ..utilities import ImageData
+from .responses import _utility_text
 
 
 def _is_v2(model_id: str) -> bool:
@@ -232,20 +233,9 @@ async def _enhance_image_edit_prompt(
                         if stream_callback:  # type: ignore[truthy-function]
                             stream_callback(text_chunk)
         else:
-            # Non-streaming fallback
-            response = await self._safe_api_call(
-                self.client.responses.create,
-                operation_type="prompt_enhancement",
-                **request_params,
-            )
-
-            enhanced = ""
-            if response.output:
-                for item in response.output:
-                    if hasattr(item, "content") and item.content:
-                        for content in item.content:
-                            if hasattr(content, "text"):
-                                enhanced += content.text
+            # Non-streaming fallback (memoized when image_edit_prompt is opted in)
+            enhanced = await _utility_text(
+                self, "image_edit_prompt", request_params, "prompt_enhancement")
 
         enhanced = enhanced.strip()
 
@@ -339,19 +329,8 @@ async def _enhance_image_prompt(
             request_params["reasoning"] = {"effort": config.utility_reasoning_effort}
             request_params["text"] = {"verbosity": config.utility_verbosity}
 
-            response = await self._safe_api_call(
-                self.client.responses.create,
-                operation_type="general",
-                **request_params,
-            )
-
-            enhanced = ""
-            if response.output:
-                for item in response.output:
-                    if hasattr(item, "content") and item.content:
-                        for content in item.content:
-                            if hasattr(content, "text"):
-                                enhanced += content.text
+            # Memoized when image_prompt is opted in; the streaming branch above never is.
+            enhanced = await _utility_text(self, "image_prompt", request_params, "general")
 
             enhanced = enhanced.strip()
 
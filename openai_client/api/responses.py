@@ -9,6 +9,7 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 from config import config, clamp_effort
 from openai_client.container_errors import (demote_container_tools, is_container_gone,
                                             mark_adoption_blocked, persistent_container_ids)
+from openai_client.utility_memo import MemoAnswer, UtilityMemo
 from message_processor.prompts import (MEMORY_EXTRACTION_SYSTEM_PROMPT, TOOL_RESULT_SUMMARIZE_PROMPT,
                                        WAKE_CLASSIFIER_SYSTEM_PROMPT)
 
@@ -99,6 +100,26 @@ def _join_output_text(response) -> str:
     return text
 
 
+async def _utility_text(self, operation: str, request_params: Dict[str, Any],
+                        operation_type: str) -> str:
+    """The joined text of one utility request, through the client's memo when this operation is
+    memoized (openai_client/utility_memo.py). Only a completed response is remembered. A client
+    without a real memo — the test doubles, mocks included — simply makes the call."""
+    async def _create() -> MemoAnswer:
+        response = await self._safe_api_call(
+            self.client.responses.create, operation_type=operation_type, **request_params)
+        usage = _capture_usage(None, response)
+        status = getattr(response, "status", None)
+        return MemoAnswer(text=_join_output_text(response),
+                          tokens=usage.get("input_tokens", 0) + usage.get("output_tokens", 0),
+                          cacheable=status is None or str(status) == "completed")
+
+    memo = getattr(self, "utility_memo", None)
+    if not isinstance(memo, UtilityMemo):
+        return (await _create()).text
+    return await memo.text(operation, request_params, _create)
+
+
 def _capture_usage(usage_sink, response) -> Dict[str, Any]:
     """Copy response.usage into the caller's sink (usage-driven context budgeting), and hand the
     same numbers back so telemetry can read them without a second sink.
@@ -404,6 +425,7 @@ async def create_text_response(
     attempt_sink: Optional[Any] = None,
     layout: str = "legacy",
     service_tier_eligible: bool = False,
+    memo_operation: Optional[str] = None,
 ) -> str:
     """
     Create a text response using the Responses API
@@ -418,6 +440,9 @@ async def create_text_response(
         reasoning_effort: For GPT-5 models (minimal, low, medium, high)
         verbosity: For GPT-5 models (low, medium, high)
         store: Whether to store the response (default False for stateless)
+        memo_operation: Utility memo operation this call may be answered from
+            (openai_client/utility_memo.py). Ignored when a usage or attempt sink is passed —
+            those record a real request, and a remembered answer is not one.
     
     Returns:
         Generated text response
@@ -451,6 +476,11 @@ async def create_text_response(
         # All text operations use the same timeout regardless of reasoning level
         operation_type = "text_normal"
 
+        if memo_operation is not None and usage_sink is None and attempt_sink is None:
+            output_text = await _utility_text(self, memo_operation, request_params, operation_type)
+            self.log_info(f"Generated response: {len(output_text)} chars")
+            return output_text
+
         # API call with enforced timeout wrapper
         _open_attempt(attempt_sink, request_params, attempts)
         response = await self._safe_api_call(
@@ -1810,20 +1840,9 @@ async def summarize_tool_result(self, text: str, max_chars: int) -> Optional[str
     request_params["text"] = {"verbosity": config.utility_verbosity}
 
     try:
-        response = await self._safe_api_call(
-            self.client.responses.create,
-            operation_type="utility_call",
-            **request_params,
-        )
-        result = ""
-        if response.output:
-            for item in response.output:
-                if hasattr(item, "content") and item.content:
-                    for content in item.content:
-                        if hasattr(content, "text"):
-                            result += content.text
-        result = result.strip()
-        return result or None
+        # The same output is often summarized again on a later round; the memo answers that.
+        result = await _utility_text(self, "tool_result_summary", request_params, "utility_call")
+        return result.strip() or None
     except Exception as e:
         self.log_warning(f"Tool-result summarization failed ({e}); falling back to truncation")
         return None
@@ -2,9 +2,9 @@
 
 Wraps the existing ``create_text_response_with_tools`` / ``create_streaming_response_with_tools``
 calls in a loop: collect ``function_call`` items → dispatch through the ToolRegistry
-(parallel, timeout-guarded) → append ``function_call`` + ``function_call_output`` items to the
-input → re-invoke. Local tools compose with server-side tools (web_search, MCP) in the same
-``tools`` array.
+(parallel within per-class concurrency caps, timeout-guarded) → append ``function_call`` +
+``function_call_output`` items to the input → re-invoke. Local tools compose with server-side
+tools (web_search, MCP) in the same ``tools`` array.
 
 Caps: ``MAX_TOOL_ROUNDS`` rounds / ``MAX_TOOL_CALLS_PER_TURN`` total calls. On cap, one final
 round runs with ``tool_choice="none"`` so the model must answer with what it has.
@@ -40,6 +40,27 @@ def _function_calls(sink: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [e for e in sink if e.get("type", "function_call") == "function_call"]
 
 
+def _round_timings(tool_context: Any, dispatch_calls: List[Dict[str, Any]]) -> Dict[int, Any]:
+    """id(call) -> the registry's `ToolCallTiming` for it, from the round just dispatched.
+
+    Empty when the registry kept none (a stand-in registry, a read-only context) — the per-tool
+    line then just goes without its timing."""
+    timings = getattr(tool_context, "round_timings", None)
+    if not isinstance(timings, list) or len(timings) != len(dispatch_calls):
+        return {}
+    return {id(c): t for c, t in zip(dispatch_calls, timings)}
+
+
+def _timing_note(timing: Any) -> str:
+    """` (queued 840ms behind slack-read, ran 310ms)` — waiting and executing, kept apart."""
+    if timing is None:
+        return ""
+    queued = f"queued {timing.queue_ms:.0f}ms"
+    if timing.concurrency:
+        queued += f" behind {timing.concurrency}"
+    return f" ({queued}, ran {timing.exec_ms:.0f}ms)"
+
+
 def _note_turn_tool_call(tool_context: Any, record: Dict[str, Any]) -> None:
     """Mirror one dispatched call onto the TURN (§5.4a amendment), if there is a turn to tell.
 
@@ -98,6 +119,7 @@ async def _run_tool_round(
     dispatch_calls = [c for c in calls if id(c) not in overrides]
     dispatched = await registry.dispatch_all(tool_context, dispatch_calls)
     dispatched_by_id = {id(c): r for c, r in zip(dispatch_calls, dispatched)}
+    timing_by_id = _round_timings(tool_context, dispatch_calls)
     result_by_id = {}
     for call in calls:
         oid = id(call)
@@ -112,7 +134,8 @@ async def _run_tool_round(
                   "gist": gist_from_arguments(call.get("arguments"))}
         local_tool_calls.append(record)
         _note_turn_tool_call(tool_context, record)
-        self.log_info(f"Local tool '{call.get('name')}' -> {'ok' if ok else 'error'}")
+        self.log_info(f"Local tool '{call.get('name')}' -> {'ok' if ok else 'error'}"
+                      f"{_timing_note(timing_by_id.get(oid))}")
         result_by_id[id(call)] = result
         await _notify(f"local:{call.get('name')}", "completed")
 
@@ -577,6 +600,7 @@ async def _handle_no_reply_terminal(
     dispatch_calls = [c for c in exec_calls if id(c) not in overrides]
     results = await registry.dispatch_all(tool_context, dispatch_calls)
     dispatched_by_id = {id(c): r for c, r in zip(dispatch_calls, results)}
+    timing_by_id = _round_timings(tool_context, dispatch_calls)
     result_by_id: Dict[int, Any] = {}
     terminal_result: Any = None
     for call in exec_calls:
@@ -600,7 +624,8 @@ async def _handle_no_reply_terminal(
                       "gist": gist_from_arguments(call.get("arguments"))}
             local_tool_calls.append(record)
             _note_turn_tool_call(tool_context, record)
-            self.log_info(f"Local tool '{call.get('name')}' -> {'ok' if ok else 'error'}")
+            self.log_info(f"Local tool '{call.get('name')}' -> {'ok' if ok else 'error'}"
+                          f"{_timing_note(timing_by_id.get(id(call)))}")
         await _notify(f"local:{call.get('name')}", "completed")
     _merge_used(tools_used_all, [c.get("name") for c in exec_calls if c.get("name")],
                 tool_context)
@@ -14,6 +14,8 @@ from .api import images as image_api
 from .api import responses as responses_api
 from .api import tool_loop as tool_loop_api
 from .api import vision as vision_api
+from .transport import PROBE_TIMEOUT_S, OpenAITransport
+from .utility_memo import UtilityMemo
 from .api.responses import (STALE_RECONSIDERATION_DECISION_SCHEMA,
                             STALE_RECONSIDERATION_RESPONSE_FORMAT,
                             ReconsiderationDecision, ReconsiderationDecisionError)
@@ -236,18 +238,55 @@ class OpenAIClient(LoggerMixin):
 
     async def close(self):
         """Close OpenAI client and cleanup resources"""
+        task, self._warm_task = self._warm_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
         await self._cleanup_session()
         if hasattr(self, 'client') and self.client:
             await self.client.close()
+            self.log_info(f"OpenAI transport: {self.transport.stats()}")
+            self.log_info(f"Utility memo: {self.utility_memo.stats()}")
             self.log_debug("OpenAI client closed and resources cleaned up")
 
+    def _probe(self):
+        """The warm-up request: one model lookup, small, free, and on the same host and pool as
+        every real call."""
+        return self.client.with_options(timeout=PROBE_TIMEOUT_S).models.retrieve(
+            config.gpt_model)
+
+    def start_connection_warming(self) -> asyncio.Task:
+        """Open the pool's connections now and keep one warm through quiet hours.
+
+        One background task, owned here and cancelled by close(): the boot warm-up first, then
+        the idle keep-alive. Off the boot path on purpose — a blackholed egress must not hold the
+        socket connection back, and nothing waits on the warm-up having finished."""
+        if self._warm_task is not None and not self._warm_task.done():
+            return self._warm_task
+
+        async def _warm():
+            await self.transport.prewarm(self._probe, config.openai_prewarm_connections)
+            await self.transport.keepalive(self._probe, config.openai_keepalive_interval)
+
+        self._warm_task = asyncio.create_task(_warm())
+        return self._warm_task
+
     def __init__(self):
-        # Initialize async OpenAI client with timeout directly
-        # The OpenAI SDK accepts timeout as a parameter
+        # One explicitly configured transport for every call (openai_client/transport.py):
+        # a sized keep-alive pool rather than the SDK's default five-second expiry.
+        self.transport = OpenAITransport()
+        self._warm_task: Optional[asyncio.Task] = None
+        # Remembered utility answers, shared by every channel this process serves
+        # (openai_client/utility_memo.py). In memory only: a restart starts it empty.
+        self.utility_memo = UtilityMemo()
         self.client = AsyncOpenAI(
             api_key=config.openai_api_key,
             timeout=config.api_timeout_read,  # Use read timeout as the overall timeout
             max_retries=0,  # Disable retries to fail fast on timeout
+            http_client=self.transport.http_client,
         )
 
         # Store streaming timeout for later use
@@ -258,7 +297,10 @@ class OpenAIClient(LoggerMixin):
 
         self.log_info(
             f"Async OpenAI client initialized with timeout: {config.api_timeout_read}s, "
-            f"streaming_chunk: {self.stream_timeout_seconds}s, max_retries: 0"
+            f"streaming_chunk: {self.stream_timeout_seconds}s, max_retries: 0, "
+            f"pool: {config.openai_http_keepalive_connections} keep-alive / "
+            f"{config.openai_http_max_connections} max, "
+            f"{'HTTP/2' if self.transport.http2 else 'HTTP/1.1'}"
         )
         self.log_debug(
             f"Client timeout object: {self.client.timeout}, type: {type(self.client.timeout)}"
@@ -434,6 +476,7 @@ class OpenAIClient(LoggerMixin):
         attempt_sink: Optional[Any] = None,
         layout: str = "legacy",
         service_tier_eligible: bool = False,
+        memo_operation: Optional[str] = None,
     ) -> str:
         return await responses_api.create_text_response(
             self,
@@ -452,6 +495,7 @@ class OpenAIClient(LoggerMixin):
             attempt_sink=attempt_sink,
             layout=layout,
             service_tier_eligible=service_tier_eligible,
+            memo_operation=memo_operation,
         )
 
     async def create_text_response_with_tools(
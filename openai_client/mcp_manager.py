@@ -2,6 +2,7 @@
 MCP (Model Context Protocol) Manager
 Handles loading, caching, and formatting of MCP server configurations
 """
+import asyncio
 import json
 import os
 import re
@@ -231,6 +232,14 @@ class MCPManager(LoggerMixin):
             self.cache_discovered_tool(server_label, name, tool.get("description"), schema)
         self.log_info(f"MCP discovery: cached {len(tools)} tool(s) for '{server_label}'")
 
+    async def cache_discovered_tools_payload_async(self, server_label: str,
+                                                   tools: List[Dict[str, Any]]):
+        """
+        cache_discovered_tools_payload for callers on the event loop: the per-tool
+        database writes run in a worker thread instead of stalling the loop.
+        """
+        await asyncio.to_thread(self.cache_discovered_tools_payload, server_label, tools)
+
     def _load_cache_from_db(self):
         """Load cached tool definitions from database."""
         if not self.db:
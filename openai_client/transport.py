@@ -0,0 +1,150 @@
+"""The one HTTP transport every OpenAI call goes through, sized and kept warm.
+
+Left to itself the SDK builds its own client with a five-second keep-alive expiry, so after any
+pause longer than that the next turn opens a fresh TCP connection and does a TLS handshake on
+the critical path — a few hundred milliseconds before the first byte of a reply, paid by exactly
+the turn that follows a quiet spell. This builds that client explicitly instead: a sized pool
+whose idle connections outlive a lull, HTTP/2 when `h2` is installed, connections opened at boot,
+and a cheap request after a long idle gap so one of them is still open when the next turn comes.
+
+Whether that works is counted rather than assumed. A trace hook on every request records which
+ones opened a connection and which reused one, so `stats()` says what the pool is actually doing.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from openai import DEFAULT_CONNECTION_LIMITS, APIStatusError, DefaultAsyncHttpxClient
+
+from config import config
+from logger import LoggerMixin
+
+# HTTP/2 needs the optional `h2` package; without it the client silently speaks HTTP/1.1, which
+# is still pooled and kept alive. Checked once, so the startup log can say which one is in use.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# `openai` re-exports its default limits instance but not the class, and the class belongs to
+# whichever httpx the SDK was built against. Taking it off the instance keeps this module from
+# importing that library directly.
+_Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+# A probe that has not answered in this long is a probe of a dead network, not a warm-up.
+PROBE_TIMEOUT_S = 10.0
+
+Probe = Callable[[], Awaitable[Any]]
+
+
+class OpenAITransport(LoggerMixin):
+    """The pooled HTTP client handed to `AsyncOpenAI`, plus its reuse counters."""
+
+    def __init__(self, *, max_connections: Optional[int] = None,
+                 keepalive_connections: Optional[int] = None,
+                 keepalive_expiry: Optional[float] = None, http2: Optional[bool] = None):
+        self.http2 = bool(config.openai_http2 if http2 is None else http2) and HTTP2_AVAILABLE
+        limits = _Limits(
+            max_connections=(config.openai_http_max_connections
+                             if max_connections is None else max_connections),
+            max_keepalive_connections=(config.openai_http_keepalive_connections
+                                       if keepalive_connections is None
+                                       else keepalive_connections),
+            keepalive_expiry=(config.openai_http_keepalive_expiry
+                              if keepalive_expiry is None else keepalive_expiry))
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.probes = 0
+        self.probe_failures = 0
+        self.last_request_at: Optional[float] = None
+        self.http_client = DefaultAsyncHttpxClient(
+            limits=limits, http2=self.http2, event_hooks={"request": [self._on_request]})
+
+    async def _on_request(self, request: Any) -> None:
+        """Stamp the request and attach the connection trace. An outer trace the caller set is
+        kept and still called, so this never hides another observer."""
+        self.last_request_at = time.monotonic()
+        outer = request.extensions.get("trace")
+
+        async def trace(name: str, info: Dict[str, Any]) -> None:
+            self._observe(name)
+            if outer is not None:
+                await outer(name, info)
+
+        request.extensions["trace"] = trace
+
+    def _observe(self, name: str) -> None:
+        # The connection layer emits `connection.connect_tcp.*` only for a NEW connection, and
+        # each protocol emits `<proto>.send_request_headers.*` once per request on the wire — so
+        # their difference is the number of requests that rode an existing connection.
+        if name.endswith("connect_tcp.complete"):
+            self.connections_opened += 1
+        elif name.endswith("start_tls.complete"):
+            self.tls_handshakes += 1
+        elif name.endswith("send_request_headers.started"):
+            self.requests += 1
+
+    def stats(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "reused": reused,
+            "reuse_rate": round(reused / self.requests, 3) if self.requests else None,
+            "probes": self.probes,
+            "probe_failures": self.probe_failures,
+        }
+
+    async def _probe(self, probe: Probe, why: str) -> bool:
+        """One cheap request. Any HTTP answer counts, an error status included — the connection
+        it travelled on is open either way, which is all a probe is for."""
+        self.probes += 1
+        try:
+            await asyncio.wait_for(probe(), timeout=PROBE_TIMEOUT_S)
+            return True
+        except APIStatusError:
+            return True
+        except Exception as e:  # noqa: BLE001 — a failed warm-up must never reach a caller
+            self.probe_failures += 1
+            self.log_debug(f"OpenAI {why} probe failed: {type(e).__name__}: {e}")
+            return False
+
+    async def prewarm(self, probe: Probe, connections: int) -> int:
+        """Open up to `connections` connections by probing that many times concurrently.
+
+        Concurrency is the point: sequential probes would reuse the first connection. Under
+        HTTP/2 they multiplex onto one, which is all that protocol needs. Returns how many
+        probes got an answer."""
+        if connections <= 0:
+            return 0
+        opened_before = self.connections_opened
+        answered = sum(await asyncio.gather(
+            *(self._probe(probe, "prewarm") for _ in range(connections))))
+        self.log_info(
+            f"OpenAI transport warmed: {answered}/{connections} probe(s) answered, "
+            f"{self.connections_opened - opened_before} connection(s) opened, "
+            f"{'HTTP/2' if self.http2 else 'HTTP/1.1'}")
+        return answered
+
+    async def keepalive(self, probe: Probe, interval: float) -> None:
+        """Probe whenever no request has gone out for `interval` seconds. Runs until cancelled.
+
+        Only idle gaps are filled: while turns are flowing the real traffic keeps the pool warm
+        and this sleeps. One probe refreshes one connection, which is the one the next turn
+        will get."""
+        if interval <= 0:
+            return
+        while True:
+            idle = (time.monotonic() - self.last_request_at
+                    if self.last_request_at is not None else interval)
+            if idle < interval:
+                await asyncio.sleep(interval - idle)
+                continue
+            await self._probe(probe, "keepalive")
+            await asyncio.sleep(interval)
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
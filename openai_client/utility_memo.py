@@ -0,0 +1,191 @@
+"""A content-addressed memo for utility-model answers.
+
+The small utility calls are often made twice on identical input: the same tool output
+re-summarized on a later round, the same link summarized in two channels, the same document
+summarized again when a thread is rebuilt. Each repeat pays a full round trip and its tokens for
+an answer the process already has. This remembers answers in memory, keyed by what was asked:
+
+    (operation, model, prompt version, sha256 of the exact request)
+
+The prompt version is a digest of the request's developer/system text, so editing a prompt retires
+its old answers without anyone remembering to bump a number. The input digest covers the whole
+request — effort, verbosity and output cap included — so two calls share an answer only when they
+would have sent the same bytes.
+
+Opt-in per operation (`UTILITY_MEMO_OPERATIONS`). Some calls are never shared, whatever the
+setting says: wake classification and memory extraction read one channel's steering and memory and
+decide something about that channel at that moment, so they go to the model every time and are not
+routed through here at all — `CHANNEL_BOUND_OPERATIONS` only makes the config refuse them.
+
+Only a completed answer is stored. Failures, refusals and truncated runs go back to the caller
+unremembered, so the next attempt asks again. Entries expire after `UTILITY_MEMO_TTL` seconds,
+and the least recently used go first once the stored text exceeds `UTILITY_MEMO_MAX_BYTES`.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from config import config
+from logger import LoggerMixin
+
+# Every operation that may be memoized. Each name is what a call site passes in and what
+# UTILITY_MEMO_OPERATIONS lists.
+MEMO_OPERATIONS = frozenset({
+    "tool_result_summary",   # summarize_tool_result
+    "document_summary",      # ThreadManager._summarize_document_content
+    "ambient_summary",       # AmbientMemory._summarize_text (links and files)
+    "image_prompt",          # _enhance_image_prompt, non-streaming
+    "image_edit_prompt",     # _enhance_image_edit_prompt, non-streaming
+})
+
+# Never memoized, even when listed: their answer belongs to one channel at one moment.
+CHANNEL_BOUND_OPERATIONS = frozenset({"wake_classifier", "memory_extraction"})
+
+# An entry's fixed overhead on top of its text: the key, the bookkeeping, the dict slot.
+_ENTRY_OVERHEAD_BYTES = 256
+
+PROMPT_DIGEST_CHARS = 8
+
+
+@dataclass(frozen=True)
+class MemoAnswer:
+    """What one real call produced: its text, the tokens it billed, and whether it may be kept."""
+
+    text: str
+    tokens: int = 0
+    cacheable: bool = True
+
+
+@dataclass
+class _Entry:
+    text: str
+    tokens: int
+    seconds: float
+    expires_at: float
+    size: int
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def prompt_version(request_params: Dict[str, Any]) -> str:
+    """A short digest of the request's standing instructions: the `instructions` field plus every
+    developer/system message. User content is left out — it is the input, not the prompt."""
+    parts = [request_params.get("instructions") or ""]
+    items = request_params.get("input")
+    if isinstance(items, list):
+        parts += [item.get("content") for item in items
+                  if isinstance(item, dict) and item.get("role") in ("developer", "system")]
+    return hashlib.sha256(_canonical(parts)).hexdigest()[:PROMPT_DIGEST_CHARS]
+
+
+def memo_key(operation: str, request_params: Dict[str, Any]) -> str:
+    return "|".join((operation, str(request_params.get("model") or ""),
+                     prompt_version(request_params),
+                     hashlib.sha256(_canonical(request_params)).hexdigest()))
+
+
+class UtilityMemo(LoggerMixin):
+    """Byte-bounded, expiring LRU of utility answers, with what it saved."""
+
+    def __init__(self, *, operations: Optional[Iterable[str]] = None,
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        wanted = set(config.utility_memo_operations if operations is None else operations)
+        refused = sorted(wanted & CHANNEL_BOUND_OPERATIONS)
+        unknown = sorted(wanted - MEMO_OPERATIONS - CHANNEL_BOUND_OPERATIONS)
+        if refused:
+            self.log_warning(f"Utility memo: {', '.join(refused)} never memoized (channel-bound)")
+        if unknown:
+            self.log_warning(f"Utility memo: unknown operation(s) ignored: {', '.join(unknown)}")
+        self.operations = frozenset(wanted & MEMO_OPERATIONS)
+        self.max_bytes = max(0, int(config.utility_memo_max_bytes
+                                    if max_bytes is None else max_bytes))
+        self.ttl = float(config.utility_memo_ttl if ttl is None else ttl)
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.bytes = 0
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.bypassed = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.tokens_saved = 0
+        self.seconds_saved = 0.0
+
+    def enabled(self, operation: str) -> bool:
+        return operation in self.operations and self.max_bytes > 0 and self.ttl > 0
+
+    async def text(self, operation: str, request_params: Dict[str, Any],
+                   create: Callable[[], Awaitable[MemoAnswer]]) -> str:
+        """The answer to `request_params`: remembered if this exact request was answered within
+        the TTL, otherwise from `create()`, which is stored when it says it may be. Exceptions
+        from `create()` propagate untouched and leave nothing behind."""
+        if not self.enabled(operation):
+            self.bypassed += 1
+            return (await create()).text
+        key = memo_key(operation, request_params)
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits[operation] += 1
+                self.tokens_saved += entry.tokens
+                self.seconds_saved += entry.seconds
+                self.log_debug(f"Utility memo hit: {operation}, {entry.tokens} tokens and "
+                               f"{entry.seconds:.2f}s saved")
+                return entry.text
+            self._drop(key)
+            self.expirations += 1
+        self.misses[operation] += 1
+        started = self._clock()
+        answer = await create()
+        if answer.cacheable and answer.text:
+            self._store(key, answer, self._clock() - started)
+        return answer.text
+
+    def _store(self, key: str, answer: MemoAnswer, seconds: float) -> None:
+        size = len(answer.text.encode("utf-8")) + len(key) + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return  # one answer larger than the whole memo is not worth evicting everything for
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = _Entry(text=answer.text, tokens=max(0, int(answer.tokens)),
+                                    seconds=max(0.0, seconds),
+                                    expires_at=self._clock() + self.ttl, size=size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "operations": sorted(self.operations),
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "tokens_saved": self.tokens_saved,
+            "seconds_saved": round(self.seconds_saved, 3),
+            "by_operation": {op: {"hits": self.hits[op], "misses": self.misses[op]}
+                             for op in sorted(set(self.hits) | set(self.misses))},
+        }
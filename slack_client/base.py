@@ -22,7 +22,11 @@ from .history_tool import SlackHistoryToolMixin
 from .channel_lookup_tool import (SlackChannelLookupToolMixin,
                                   register_channel_lookup_tool)
 from .search_tool import SlackSearchToolMixin
-from message_processor.tool_registry import Executor, ToolRegistry
+from .user_directory import UserCache, UserDirectory
+from .rate_scheduler import scheduler as rate_scheduler
+from .single_flight import single_flight
+from message_processor.tool_registry import (CONCURRENCY_SLACK_READ, CONCURRENCY_SLACK_WRITE,
+                                             Executor, ToolRegistry)
 from message_processor.bookmark_tools import register_bookmark_tools
 from message_processor.channel_admin_tools import register_channel_admin_tools
 from message_processor.destination_tools import register_destination_tools
@@ -72,10 +76,24 @@ class SlackBot(SlackMessageEventsMixin,  # type: ignore[misc]
     def __init__(self, message_handler: Optional[Callable] = None):
         super().__init__("SlackBot")
         self.app = AsyncApp(token=config.slack_bot_token)
+        if config.slack_api_url:
+            # Bolt builds every per-request client (and the Socket Mode client) off this one's
+            # base_url, so setting it here points the whole bot at the stand-in.
+            self.app.client.base_url = config.slack_api_url
+        # Every Web API call — ours through app.client, and each listener's per-request client —
+        # goes through the one shared rate scheduler (slack_client/rate_scheduler.py), and
+        # identical concurrent reads above it share one call (slack_client/single_flight.py).
+        rate_scheduler.install(self.app.client)
+        single_flight.install(self.app.client)
+        self.app.middleware(rate_scheduler.bolt_middleware)
+        self.app.middleware(single_flight.bolt_middleware)
         self.handler = None
         self.message_handler = message_handler  # Callback for processing messages
         self.markdown_converter = MarkdownConverter(platform="slack")
-        self.user_cache = {}  # Cache user info to avoid repeated API calls
+        # Cache user info to avoid repeated API calls — bounded, expiring, and kept warm in bulk
+        # by the user directory sweep started in start() (slack_client/user_directory.py).
+        self.user_cache = UserCache()
+        self.user_directory = UserDirectory(self)
 
         # Bot self-identity (populated once via auth_test on start; used to tell our own
         # messages apart from other bots'/humans' — see classify_sender / is_own_message)
@@ -117,6 +135,7 @@ class SlackBot(SlackMessageEventsMixin,  # type: ignore[misc]
                 # unresolvable to the checker, not its shape.
                 cast(Executor,
                      lambda ctx, args, _name=name: self.dispatch_history_tool_call(_name, args, ctx)),
+                concurrency=CONCURRENCY_SLACK_READ,
             )
         # Name → id resolution for the tools above, scoped to conversations the REQUESTER and
         # the bot share. Without it "what's in #product-insights?" from a DM dead-ends: the model
@@ -132,12 +151,14 @@ class SlackBot(SlackMessageEventsMixin,  # type: ignore[misc]
             # cache still powers search_workspace_emoji's results.
             registry.register(self.get_react_tool_schema, self.execute_react_tool,
                               name="react_to_message", dynamic=True,
-                              channel_schema=self.get_react_tool_schema_static)
+                              channel_schema=self.get_react_tool_schema_static,
+                              concurrency=CONCURRENCY_SLACK_WRITE)
             # T5b: take one of OUR OWN reactions back off. One static schema on both surfaces,
             # with no emoji enum: a REACTION_EMOJIS allowlist governs what may be PLACED, and an
             # emoji already on a message must stay removable after that list changes under it.
             registry.register(self.get_remove_reaction_tool_schema(),
-                              self.execute_remove_reaction_tool)
+                              self.execute_remove_reaction_tool,
+                              concurrency=CONCURRENCY_SLACK_WRITE)
             # Discovery for the ~1,400 custom emoji that cannot all fit in a schema description.
             # Hidden entirely under a REACTION_EMOJIS allowlist: there, the enum IS the palette
             # and searching a catalog the model may not draw from would only invite refusals.
@@ -152,7 +173,8 @@ class SlackBot(SlackMessageEventsMixin,  # type: ignore[misc]
             # matches what a channel turn may actually do (post once, into a thread the stream
             # showed it) instead of the DM instruction to acknowledge in the origin thread.
             registry.register(self.get_post_to_thread_tool_schema(), self.execute_post_to_thread,
-                              channel_schema=self.get_post_to_thread_channel_schema)
+                              channel_schema=self.get_post_to_thread_channel_schema,
+                              concurrency=CONCURRENCY_SLACK_WRITE)
         # EDIT_OWN_MESSAGE §3: overwrite ONE own finalized reply, disclosure-first. One static
         # schema, exposed on the CHANNEL surface only — DMs have no channel stream and receipts
         # are structurally exempt there, so no exact-message proof exists (the executor
@@ -160,18 +182,19 @@ class SlackBot(SlackMessageEventsMixin,  # type: ignore[misc]
         # visible mutations. No feature flag, per the spec.
         registry.register(self.get_edit_own_message_tool_schema(),
                           self.execute_edit_own_message,
-                          enabled=lambda _cfg: False)
+                          enabled=lambda _cfg: False, concurrency=CONCURRENCY_SLACK_WRITE)
         # T5a: delete ONE own message, on an explicit human request. Same surface stance as
         # edit_own_message — CHANNELS ONLY (owner ruling 2026-08-12): `enabled` is always False
         # so the DM surface never sees it, and the executor re-refuses a DM context as defense
         # in depth. Budgeted, not free: the mutation is visible and irreversible. No flag.
         registry.register(self.get_delete_own_message_tool_schema(),
                           self.execute_delete_own_message,
-                          enabled=lambda _cfg: False)
+                          enabled=lambda _cfg: False, concurrency=CONCURRENCY_SLACK_WRITE)
         # PIN_MESSAGE: pin/unpin a message by ts ON REQUEST, both surfaces. Budgeted; no flag.
         # Request-only policy lives in the schema; Slack's message_not_found confines targets
         # to the current conversation.
-        registry.register(self.get_pin_message_tool_schema(), self.execute_pin_message)
+        registry.register(self.get_pin_message_tool_schema(), self.execute_pin_message,
+                          concurrency=CONCURRENCY_SLACK_WRITE)
         # F2: on the DM surface no_response_needed is exposed only on turns whose ROUTE allows
         # silence (the `silence_capable` routing fact), via the per-request
         # _silence_capable_turn flag the text handler sets in a COPIED config. On the channel
@@ -207,6 +230,7 @@ class SlackBot(SlackMessageEventsMixin,  # type: ignore[misc]
                 # The channel schema describes the channel backend — keyword scan of THIS
                 # channel, `thread_ts` on results, no `scope`. The DM schema is unchanged.
                 channel_schema=self.get_search_tool_channel_schema,
+                concurrency=CONCURRENCY_SLACK_READ,
             )
         # Memory tools on BOTH surfaces, each behind its own flag and its own schema text: the
         # channel surface (ENABLE_CHANNEL_MEMORY) reads and writes this channel's facts, the DM
@@ -0,0 +1,427 @@
+"""The in-memory channel search index behind `SearchBackend.SERVICE_INDEX`.
+
+The in-channel scan answers `search_slack` by paging history and replies under an 8-second
+budget, so a busy channel comes back partial, and a recent reply under a root older than the
+history span is invisible to it. This keeps, per joined channel, every message the channel still
+holds — roots AND replies — with an inverted index from search token to ts, so a query scores
+only the messages that share a token with it and answers in milliseconds over the whole channel.
+
+  * BUILD: one walk of `conversations.history` plus `conversations.replies` for every
+    reply-bearing root, scheduled for each joined channel by the coverage bootstrap's supervisor
+    (so it runs as background traffic in the rate scheduler) and repeated every
+    `search_index_refresh_seconds`. A rebuild fills a fresh index and swaps it in whole; the old
+    one keeps answering until then.
+  * LIVE: both raw listeners hand every message, edit and deletion to `apply_event`
+    (synchronous, before their first await, like the page cache's invalidation), so a message
+    Slack has delivered is searchable before any turn that could be asked about it starts. A
+    deletion during a build is remembered until the swap, so a page fetched before it cannot
+    bring the message back.
+  * SWEEP: the coverage sweep's history pages are folded in as it reads them.
+
+MEMORY ONLY, BY RULE: nothing fetched is persisted. The index is rebuilt on every boot, and a
+process that has not finished building a channel simply falls back to the scan there.
+
+A channel holds at most `search_index_max_messages`; past that the oldest messages are dropped
+and the channel's index stops claiming completeness. Every index together holds at most
+`search_index_max_mb` (approximate: each message's raw payload plus its search text); past that
+the oldest message in ANY channel goes first, and that channel stops claiming completeness. Matching and ranking are the scan's own
+(`build_search_query`, `score_search_text`), over the same normalized text, and every candidate
+still goes through the scan's fence, delivery and receipt rules — the index only decides which
+messages are worth looking at.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from config import config
+from logger import setup_logger
+from slack_client.history_fetch import FetchBudget, iter_pages
+from slack_client.normalizer import (KIND_DELETE, KIND_EDIT, KIND_MESSAGE, KIND_TOMBSTONE,
+                                     ORIGIN_HISTORY, ORIGIN_REPLIES, TimestampError,
+                                     mutation_subject, normalize_slack_event,
+                                     normalize_slack_message, parse_ts)
+from slack_client.utilities import is_dm_conversation
+
+logger = setup_logger(name="slack_bot.ChannelIndex")
+
+# How many qualifying messages, best first, a lookup hands to the scan's gates: enough that
+# an undeliverable or unreceipted candidate never costs the result list a place.
+_CANDIDATE_FLOOR = 100
+_CANDIDATES_PER_RESULT = 5
+# A failed build (the bot left, a budget ran out) is retried no sooner than this.
+_RETRY_FAILED_SECONDS = 600.0
+
+
+@dataclass
+class _Doc:
+    ts: str
+    ts_key: Tuple[int, int]
+    root: Optional[str]          # the thread root when this is a reply, else None
+    raw: Dict[str, Any]
+    text: str                    # normalize_search_text of the normalized message text
+    tokens: FrozenSet[str]
+    is_self: bool
+    size: int                    # approximate bytes held: the raw payload plus `text`
+
+
+@dataclass
+class _Channel:
+    docs: Dict[str, _Doc] = field(default_factory=dict)
+    postings: Dict[str, Set[str]] = field(default_factory=dict)
+    # (ts_key, ts) for every doc, sorted oldest first: the caps evict from the front, and a
+    # lookup bisects it for the few messages at or after its trigger.
+    by_age: List[Tuple[Tuple[int, int], str]] = field(default_factory=list)
+    # Kept as docs come and go, so a lookup's coverage counts never walk the whole channel:
+    # messages not from the bot, and how many replies each thread root has indexed.
+    human_messages: int = 0
+    replies_by_root: Dict[str, int] = field(default_factory=dict)
+    size: int = 0
+    # While building: every ts deleted since the build started. A page fetched before the
+    # deletion must not bring the message back. Cleared when the build is swapped in.
+    deleted: Set[str] = field(default_factory=set)
+    ready: bool = False
+    truncated: bool = False
+    built_at: Optional[float] = None
+
+
+@dataclass
+class IndexLookup:
+    """What a lookup found: candidates' raw payloads by origin, and what the index covered."""
+
+    history: List[Dict[str, Any]]
+    replies: List[Dict[str, Any]]
+    messages: int
+    threads: int
+    complete: bool
+
+
+def _doc_from(client: Any, channel_id: str, raw: Any, origin: str) -> Optional[_Doc]:
+    from slack_client.search_tool import normalize_search_text, search_tokens
+
+    if not isinstance(raw, dict) or not isinstance(raw.get("ts"), str):
+        return None
+    try:
+        normalized = normalize_slack_message(client, raw, channel_id=channel_id, origin=origin)
+        if normalized is None:
+            return None
+        ts_key = parse_ts(normalized.ts)
+    except TimestampError:
+        return None
+    except Exception:  # noqa: BLE001 — the scan re-reads candidates and reports what it cannot
+        return None
+    text = normalize_search_text(normalized.text)
+    root = normalized.thread_root_ts
+    try:
+        size = len(json.dumps(raw, separators=(",", ":"), default=str)) + len(text)
+    except (TypeError, ValueError):
+        size = len(text)
+    return _Doc(ts=normalized.ts, ts_key=ts_key,
+                root=root if root and root != normalized.ts else None, raw=raw, text=text,
+                tokens=frozenset(search_tokens(text)),
+                is_self=normalized.sender_type == "self", size=size)
+
+
+class ChannelSearchIndex:
+    """Per-channel inverted indexes over every message a joined channel holds, in memory."""
+
+    def __init__(self, *, max_messages: Optional[int] = None, max_bytes: Optional[int] = None):
+        self._max_messages = max_messages
+        self._max_bytes = max_bytes
+        self._bytes = 0  # across every index, live and building
+        self._channels: Dict[str, _Channel] = {}
+        self._building: Dict[str, _Channel] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.lookups = 0
+        self.builds = 0
+        self.build_failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(config, "search_index", True))
+
+    @property
+    def max_messages(self) -> int:
+        if self._max_messages is not None:
+            return int(self._max_messages)
+        return int(getattr(config, "search_index_max_messages", 10000))
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return int(self._max_bytes)
+        return int(float(getattr(config, "search_index_max_mb", 0)) * 1024 * 1024)
+
+    def ready(self, channel_id: Optional[str]) -> bool:
+        channel = self._channels.get(channel_id or "")
+        return bool(self.enabled and channel is not None and channel.ready)
+
+    # -- writes ---------------------------------------------------------------------------
+
+    def _targets(self, channel_id: str) -> List[_Channel]:
+        return [c for c in (self._channels.get(channel_id), self._building.get(channel_id))
+                if c is not None]
+
+    def _put(self, channel: _Channel, doc: _Doc) -> None:
+        if doc.ts in channel.deleted:
+            return
+        self._drop(channel, doc.ts)  # an edit replaces the doc at the same ts
+        bisect.insort(channel.by_age, (doc.ts_key, doc.ts))
+        channel.docs[doc.ts] = doc
+        for token in doc.tokens:
+            channel.postings.setdefault(token, set()).add(doc.ts)
+        if not doc.is_self:
+            channel.human_messages += 1
+        if doc.root is not None:
+            channel.replies_by_root[doc.root] = channel.replies_by_root.get(doc.root, 0) + 1
+        channel.size += doc.size
+        self._bytes += doc.size
+        limit = self.max_messages
+        while limit > 0 and len(channel.docs) > limit:
+            self._drop(channel, channel.by_age[0][1])
+            channel.truncated = True
+        self._enforce_max_bytes()
+
+    def _enforce_max_bytes(self) -> None:
+        """Past the cross-channel cap, drop the oldest message held anywhere until under it."""
+        limit = self.max_bytes
+        while limit > 0 and self._bytes > limit:
+            held = [c for c in (*self._channels.values(), *self._building.values()) if c.by_age]
+            if not held:
+                return
+            oldest = min(held, key=lambda c: c.by_age[0][0])
+            self._drop(oldest, oldest.by_age[0][1])
+            oldest.truncated = True
+
+    def _drop(self, channel: _Channel, ts: Optional[str]) -> None:
+        doc = channel.docs.pop(ts or "", None)
+        if doc is None:
+            return
+        at = bisect.bisect_left(channel.by_age, (doc.ts_key, doc.ts))
+        if at < len(channel.by_age) and channel.by_age[at][1] == doc.ts:
+            del channel.by_age[at]
+        for token in doc.tokens:
+            posting = channel.postings.get(token)
+            if posting is not None:
+                posting.discard(doc.ts)
+                if not posting:
+                    del channel.postings[token]
+        if not doc.is_self:
+            channel.human_messages -= 1
+        if doc.root is not None:
+            left = channel.replies_by_root.get(doc.root, 0) - 1
+            if left > 0:
+                channel.replies_by_root[doc.root] = left
+            else:
+                channel.replies_by_root.pop(doc.root, None)
+        channel.size -= doc.size
+        self._bytes -= doc.size
+
+    def add_messages(self, client: Any, channel_id: str, raws: Iterable[Any], *,
+                     origin: str = ORIGIN_HISTORY) -> int:
+        """Fold fetched messages into every index this channel has. Returns how many landed."""
+        targets = self._targets(channel_id)
+        if not targets or not self.enabled:
+            return 0
+        added = 0
+        for raw in raws:
+            doc = _doc_from(client, channel_id, raw, origin)
+            if doc is None:
+                continue
+            for channel in targets:
+                self._put(channel, doc)
+            added += 1
+        return added
+
+    def apply_event(self, client: Any, event: Any) -> None:
+        """A raw listener event: index a new or edited message, forget a deleted one.
+        SYNCHRONOUS and never raises — an event the index cannot place is picked up by the
+        next rebuild."""
+        try:
+            channel_id = event.get("channel") if isinstance(event, dict) else None
+            if not channel_id or not self._targets(channel_id):
+                return
+            normalized = normalize_slack_event(client, event)
+            if normalized is None:
+                return
+            if normalized.kind in (KIND_DELETE, KIND_TOMBSTONE):
+                gone = normalized.deleted_ts or normalized.subject_ts
+                for channel in self._targets(channel_id):
+                    self._drop(channel, gone)
+                building = self._building.get(channel_id)
+                if building is not None and gone:
+                    building.deleted.add(gone)
+                return
+            if normalized.kind not in (KIND_MESSAGE, KIND_EDIT):
+                return
+            raw = mutation_subject(event) if normalized.kind == KIND_EDIT else event
+            message = normalized.message
+            origin = (ORIGIN_REPLIES if message is not None and message.thread_root_ts
+                      and message.thread_root_ts != message.ts else ORIGIN_HISTORY)
+            self.add_messages(client, channel_id, [raw], origin=origin)
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"search index event not applied: {e}")
+
+    # -- builds ---------------------------------------------------------------------------
+
+    def ensure_built(self, client: Any, channel_id: str) -> bool:
+        """Start a build for a joined channel that has none, or whose index is due a refresh.
+        Sync; the task inherits the caller's rate priority. Returns True when one started."""
+        if not self.enabled or is_dm_conversation(channel_id):
+            return False
+        task = self._tasks.get(channel_id)
+        if task is not None and not task.done():
+            return False
+        failed_at = self._failed_at.get(channel_id)
+        if failed_at is not None and time.monotonic() - failed_at < _RETRY_FAILED_SECONDS:
+            return False
+        current = self._channels.get(channel_id)
+        refresh = float(getattr(config, "search_index_refresh_seconds", 21600))
+        if current is not None and current.built_at is not None and (
+                refresh <= 0 or time.monotonic() - current.built_at < refresh):
+            return False
+        try:
+            self._tasks[channel_id] = asyncio.get_running_loop().create_task(
+                self.build(client, channel_id))
+        except RuntimeError:
+            return False
+        return True
+
+    async def build(self, client: Any, channel_id: str) -> bool:
+        """Walk the channel into a fresh index and swap it in. False when the walk failed."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(
+                max(1, int(getattr(config, "search_index_build_concurrency", 2))))
+        web = getattr(getattr(client, "app", None), "client", None)
+        history = getattr(web, "conversations_history", None)
+        replies = getattr(web, "conversations_replies", None)
+        if history is None or replies is None:
+            return False
+        fresh = self._building[channel_id] = _Channel()
+        started = time.monotonic()
+        page_size = int(getattr(config, "search_history_page_size", 200))
+        try:
+            async with self._semaphore:
+                budget = FetchBudget(total_seconds=float(
+                    getattr(config, "search_index_build_seconds", 900)), page_ceiling=None)
+                roots: Dict[str, None] = {}
+                async for page in iter_pages(history, channel_id=channel_id, limit=page_size,
+                                             budget=budget, label="search index history"):
+                    self.add_messages(client, channel_id, page, origin=ORIGIN_HISTORY)
+                    for raw in page:
+                        if isinstance(raw, dict) and isinstance(raw.get("ts"), str) and (
+                                raw.get("reply_count") or raw.get("latest_reply")):
+                            roots[raw["ts"]] = None
+                    if fresh.truncated:
+                        break  # anything older would only be dropped again
+                for root in roots:
+                    if fresh.truncated:
+                        break
+                    async for page in iter_pages(replies, channel_id=channel_id,
+                                                 limit=page_size, budget=budget,
+                                                 extra_params={"ts": root},
+                                                 label="search index replies"):
+                        self.add_messages(client, channel_id, page, origin=ORIGIN_REPLIES)
+        except asyncio.CancelledError:
+            self._abandon(channel_id, fresh)
+            raise
+        except Exception as e:  # noqa: BLE001 — a failed build leaves the channel on the scan
+            self._abandon(channel_id, fresh)
+            self._failed_at[channel_id] = time.monotonic()
+            self.build_failures += 1
+            logger.warning(f"search index build for {channel_id} stopped: {e}")
+            return False
+        if self._building.get(channel_id) is fresh:
+            del self._building[channel_id]
+        self._failed_at.pop(channel_id, None)
+        fresh.deleted.clear()
+        fresh.ready = True
+        fresh.built_at = time.monotonic()
+        replaced = self._channels.get(channel_id)
+        if replaced is not None:
+            self._bytes -= replaced.size
+        self._channels[channel_id] = fresh
+        self.builds += 1
+        logger.info(f"search index built for {channel_id}: {len(fresh.docs)} message(s), "
+                    f"{len(fresh.postings)} token(s) in {time.monotonic() - started:.1f}s"
+                    f"{' (truncated)' if fresh.truncated else ''}")
+        return True
+
+    def _abandon(self, channel_id: str, fresh: _Channel) -> None:
+        if self._building.get(channel_id) is fresh:
+            del self._building[channel_id]
+            self._bytes -= fresh.size
+
+    async def stop(self) -> None:
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    # -- reads ----------------------------------------------------------------------------
+
+    def lookup(self, channel_id: str, query: Any, trigger_key: Tuple[int, int],
+               limit: int) -> Optional[IndexLookup]:
+        """The best qualifying messages strictly older than the trigger, or None when this
+        channel has no ready index (the caller scans instead)."""
+        from slack_client.search_tool import score_search_text, search_tokens
+
+        if not self.ready(channel_id):
+            return None
+        channel = self._channels[channel_id]
+        self.lookups += 1
+        ids: Set[str] = set()
+        for token in query.content_tokens:
+            ids |= channel.postings.get(token, set())
+        phrase_tokens = search_tokens(query.phrase)
+        if phrase_tokens:
+            # A phrase hit contains every one of its tokens, stopwords included.
+            postings = [channel.postings.get(t, set()) for t in dict.fromkeys(phrase_tokens)]
+            ids |= set.intersection(*postings)
+        scored = []
+        for ts in ids:
+            doc = channel.docs.get(ts)
+            if doc is None or doc.ts_key >= trigger_key:
+                continue
+            score = score_search_text(query, doc.text)
+            if score is not None:
+                scored.append((score, doc.ts_key, doc))
+        scored.sort(key=lambda e: (e[0], e[1]), reverse=True)
+        keep = max(_CANDIDATE_FLOOR, _CANDIDATES_PER_RESULT * max(1, int(limit)))
+        picked = [doc for _score, _key, doc in scored[:keep]]
+        # Coverage is everything strictly older than the trigger: the channel's running counts,
+        # less the (usually few) messages at or after it.
+        messages = channel.human_messages
+        newer_replies: Dict[str, int] = {}
+        for _key, ts in channel.by_age[bisect.bisect_left(channel.by_age, (trigger_key,)):]:
+            doc = channel.docs[ts]
+            if not doc.is_self:
+                messages -= 1
+            if doc.root is not None:
+                newer_replies[doc.root] = newer_replies.get(doc.root, 0) + 1
+        threads = len(channel.replies_by_root) - sum(
+            1 for root, n in newer_replies.items() if n == channel.replies_by_root[root])
+        return IndexLookup(
+            history=[d.raw for d in picked if d.root is None],
+            replies=[d.raw for d in picked if d.root is not None],
+            messages=messages, threads=threads, complete=not channel.truncated)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"channels": sum(1 for c in self._channels.values() if c.ready),
+                "building": len(self._building),
+                "messages": sum(len(c.docs) for c in self._channels.values()),
+                "tokens": sum(len(c.postings) for c in self._channels.values()),
+                "bytes": self._bytes,
+                "lookups": self.lookups, "builds": self.builds,
+                "build_failures": self.build_failures}
+
+
+channel_index = ChannelSearchIndex()
@@ -17,11 +17,12 @@ import asyncio
 import random
 import time
 import uuid
-from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 
 from config import config
 from logger import setup_logger
-from slack_client import admission_watermark
+from slack_client import admission_watermark, rate_scheduler
+from slack_client.channel_index import channel_index
 from slack_client.history_fetch import (HistoryPageError, HistoryPageInvalid, PageResult,
                                         fetch_page, retry_after_seconds, slack_error_code)
 from slack_client.normalizer import (KIND_DELETE, KIND_EDIT, KIND_MESSAGE, KIND_TOMBSTONE,
@@ -58,6 +59,9 @@ _UNAVAILABLE_REASON = "unavailable"
 _APP_LEVEL_ERRORS = frozenset({
     "missing_scope", "invalid_auth", "account_inactive", "access_denied",
 })
+# One halving per burst: the pages already in flight when the first 429 lands tend to collect
+# their own, and each of those is the same signal, not a fresh one.
+_DECREASE_HOLDOFF_SECONDS = 5.0
 
 
 class ActivityObservation(NamedTuple):
@@ -367,13 +371,100 @@ class _SweepTokenLost(Exception):
     """Another worker took this channel's claim."""
 
 
+class _AdaptiveConcurrency:
+    """How many sweep pages may be in flight, learned AIMD-style. Entered like a semaphore.
+
+    Every page Slack answers adds 1/limit, so the limit climbs by about one per round of clean
+    pages, up to the ceiling; a 429 halves it, never below one. A fresh install into hundreds of
+    channels therefore finds the rate Slack will actually give it instead of crawling at a
+    guess or hammering into 429s. While a turn is waiting on `conversations.history` in the rate
+    scheduler (`pressure`), only one sweep page may be in flight, whatever the limit has grown to.
+    """
+
+    def __init__(self, initial: int, ceiling: int, *, pressure: Callable[[], int]):
+        self.ceiling = max(1, int(initial), int(ceiling))
+        self.limit = float(max(1, int(initial)))
+        self.in_use = 0
+        self.increases = 0
+        self.decreases = 0
+        self.yielded = 0
+        self._pressure = pressure
+        self._last_decrease = float("-inf")
+        self._waiters: List[asyncio.Future] = []
+
+    def allowed(self) -> int:
+        try:
+            if self._pressure():
+                return 1
+        except Exception:  # noqa: BLE001 — no scheduler to ask is no turn to yield to
+            pass
+        return max(1, int(self.limit))
+
+    def locked(self) -> bool:
+        return self.in_use >= self.allowed()
+
+    async def __aenter__(self) -> "_AdaptiveConcurrency":
+        if self.in_use >= self.allowed() and self.allowed() < int(self.limit):
+            self.yielded += 1
+        while self.in_use >= self.allowed():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # the slot it was woken for goes to the next in line
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_use += 1
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.allowed() - self.in_use
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self) -> None:
+        before = int(self.limit)
+        self.limit = min(float(self.ceiling), self.limit + 1.0 / self.limit)
+        if int(self.limit) > before:
+            self.increases += 1
+            self._wake()
+
+    def on_rate_limited(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < _DECREASE_HOLDOFF_SECONDS:
+            return
+        self._last_decrease = now
+        self.limit = max(1.0, self.limit / 2.0)
+        self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"limit": round(self.limit, 2), "allowed": self.allowed(),
+                "in_flight": self.in_use, "ceiling": self.ceiling,
+                "increases": self.increases, "decreases": self.decreases,
+                "yielded": self.yielded}
+
+
 class ChannelCoverageBootstrap:
     """Background sweep that extends each channel's coverage backward.
 
     One persistent worker per claimed channel holds its sweep token to a terminal state: a
     page-ceiling pause parks and resumes with the claim still held, so a deep channel is
-    covered across passes instead of one unbounded burst. The concurrency semaphore bounds
-    channels doing Slack work at once and is released across every sleep.
+    covered across passes instead of one unbounded burst. The adaptive concurrency limit bounds
+    channels doing Slack work at once, grows while pages succeed, halves on a 429, and is
+    released across every sleep. `stats()` reports it with an estimate of the time left to full
+    coverage.
     """
 
     def __init__(self, client: Any, db: Any = None, cfg: Any = None):
@@ -384,9 +475,18 @@ class ChannelCoverageBootstrap:
         self._workers: Dict[Tuple[str, str], asyncio.Task] = {}
         self._settled: Set[Tuple[str, str]] = set()
         self._discovered = False
-        self._semaphore = asyncio.Semaphore(
-            max(1, int(self.config.coverage_sweep_concurrency)))
+        initial = max(1, int(self.config.coverage_sweep_concurrency))
+        self._concurrency = _AdaptiveConcurrency(
+            initial, int(getattr(self.config, "coverage_sweep_max_concurrency", initial)),
+            pressure=lambda: rate_scheduler.scheduler.interactive_waiting("conversations.history"))
         self._stopping = False
+        self._team_id: Optional[str] = None
+        # Progress, for the time-to-coverage estimate: seconds of channel history walked, and
+        # each running channel's current horizon (epoch seconds).
+        self._pages = 0
+        self._first_page_at: Optional[float] = None
+        self._covered_seconds = 0.0
+        self._horizons: Dict[Tuple[str, str], float] = {}
         # Event handlers reach the sweep through the client, which is the only object they hold.
         try:
             client._coverage_bootstrap = self
@@ -411,6 +511,7 @@ class ChannelCoverageBootstrap:
             await asyncio.gather(*tasks, return_exceptions=True)
         self._workers.clear()
         self._task = None
+        await channel_index.stop()
 
     @staticmethod
     def _log_task_error(task: asyncio.Task) -> None:
@@ -423,9 +524,13 @@ class ChannelCoverageBootstrap:
     # -- supervision ----------------------------------------------------------------------
 
     async def _supervise(self) -> None:
+        # Every sweep worker is created from this task and inherits the marking: the whole
+        # bootstrap yields to turn traffic in the shared Slack rate scheduler.
+        rate_scheduler.mark_background()
         team_id = await self._await_identity()
         if not team_id:
             return
+        self._team_id = team_id
         while not self._stopping:
             if not self._discovered:
                 # A workspace that was rate-limited or briefly unreachable at boot would
@@ -435,11 +540,14 @@ class ChannelCoverageBootstrap:
                 if task.done():
                     self._workers.pop(key, None)
             for channel_id in sorted(_seeded_channels(self.client)):
+                if is_dm_conversation(channel_id):
+                    continue
+                # Every joined channel gets its in-memory search index, settled coverage or
+                # not: the index is rebuilt each boot, coverage is not.
+                channel_index.ensure_built(self.client, channel_id)
                 key = (team_id, channel_id)
                 if key in self._workers or key in self._settled:
                     continue
-                if is_dm_conversation(channel_id):
-                    continue
                 worker = asyncio.create_task(self._sweep_channel(team_id, channel_id))
                 worker.add_done_callback(self._log_task_error)
                 self._workers[key] = worker
@@ -586,9 +694,11 @@ class ChannelCoverageBootstrap:
             page, failure = await self._fetch_page(team_id, channel_id, token, latest, cursor)
             if page is None:
                 return failure or "park"
-            async with self._semaphore:
+            async with self._concurrency:
                 oldest, page_complete = await self._process_page(
                     team_id, channel_id, list(page.messages))
+            # The sweep's pages are the search index's too, for a channel it is building.
+            channel_index.add_messages(self.client, channel_id, page.messages)
             if not page_complete:
                 # Coverage stays where it is. The row is left `running`, so the channel reads as
                 # NOT bootstrapped and its turns fail closed — which is the truth: there is a
@@ -619,6 +729,7 @@ class ChannelCoverageBootstrap:
                 team_id, channel_id, token, oldest, status, reason)
             if not advanced:
                 return "lost"
+            self._record_progress(team_id, channel_id, latest, oldest, status)
             if status != "running":
                 logger.info(f"coverage sweep for {channel_id} finished: {status}/{reason}")
                 return "terminal"
@@ -656,8 +767,15 @@ class ChannelCoverageBootstrap:
 
         async def _guarded(**kwargs: Any) -> Any:
             # Held only while a page is actually in flight; every sleep happens outside it.
-            async with self._semaphore:
-                return await getter(**kwargs)
+            async with self._concurrency:
+                try:
+                    resp = await getter(**kwargs)
+                except Exception as e:
+                    if retry_after_seconds(e) is not None:
+                        self._concurrency.on_rate_limited()
+                    raise
+            self._concurrency.on_success()
+            return resp
 
         async def _sleeper(delay: float) -> None:
             await self._park(team_id, channel_id, token, delay)
@@ -777,6 +895,62 @@ class ChannelCoverageBootstrap:
             raise _SweepTokenLost(channel_id)
         await asyncio.sleep(self._resume_delay() if delay is None else max(0.0, delay))
 
+    # -- progress -------------------------------------------------------------------------
+
+    def _record_progress(self, team_id: str, channel_id: str, latest: Optional[str],
+                         oldest: Optional[str], status: str) -> None:
+        """Count one advanced page toward the walked span of history."""
+        key = (team_id, channel_id)
+        now = time.time()
+        self._pages += 1
+        if self._first_page_at is None:
+            self._first_page_at = time.monotonic()
+        start = self._horizons.get(key)
+        if start is None:
+            start = _ts_seconds(latest, now)
+        horizon = _ts_seconds(oldest, start)
+        self._covered_seconds += max(0.0, start - horizon)
+        if status == "running":
+            self._horizons[key] = horizon
+        else:
+            self._horizons.pop(key, None)
+
+    def _eta_seconds(self) -> Optional[float]:
+        """Seconds to full coverage at the rate history has been walked so far, or None before
+        the first page. An upper bound: the depth wall is assumed for every channel, and one
+        that reaches its first message sooner finishes sooner."""
+        if self._first_page_at is None or self._covered_seconds <= 0 or self._team_id is None:
+            return None
+        elapsed = time.monotonic() - self._first_page_at
+        if elapsed <= 0:
+            return None
+        now = time.time()
+        floor = now - max(1, int(self.config.coverage_bootstrap_days)) * 86400
+        remaining = sum(max(0.0, h - floor) for h in self._horizons.values())
+        for channel_id in _seeded_channels(self.client):
+            key = (self._team_id, channel_id)
+            if (is_dm_conversation(channel_id) or key in self._settled
+                    or key in self._horizons):
+                continue
+            remaining += now - floor
+        return round(remaining / (self._covered_seconds / elapsed), 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Concurrency now, channels by state, pages walked, and the time-to-coverage estimate."""
+        pending = 0
+        if self._team_id is not None:
+            pending = sum(1 for c in _seeded_channels(self.client)
+                          if not is_dm_conversation(c)
+                          and (self._team_id, c) not in self._settled
+                          and (self._team_id, c) not in self._workers)
+        elapsed = (time.monotonic() - self._first_page_at) if self._first_page_at else 0.0
+        return {"concurrency": self._concurrency.stats(),
+                "channels": {"sweeping": len(self._workers), "settled": len(self._settled),
+                             "pending": pending},
+                "pages": self._pages,
+                "pages_per_minute": round(self._pages * 60.0 / elapsed, 1) if elapsed > 0 else 0.0,
+                "eta_seconds": self._eta_seconds()}
+
     # -- helpers --------------------------------------------------------------------------
 
     def _resume_delay(self) -> float:
@@ -793,6 +967,13 @@ class ChannelCoverageBootstrap:
         return getter if callable(getter) else None
 
 
+def _ts_seconds(raw: Any, default: float) -> float:
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return default
+
+
 def _failure_outcome(err: Any) -> str:
     if err in _CHANNEL_GONE_ERRORS:
         return "gone"
@@ -447,6 +447,68 @@ class SlackMessageEventsMixin(_Host):
         except Exception as e:  # noqa: BLE001
             self.log_debug(f"actor tail feed failed: {e}")
 
+    def _feed_thread_state(self, event: Dict[str, Any]) -> None:
+        """Hand a warm ThreadState the change this event made to its thread. SYNCHRONOUS.
+
+        Called straight from both raw listeners, like the actor tail, so it runs for every event
+        whether or not ambient memory is wired. A new message or reply, a deletion and an ordinary
+        edit queue a delta the next turn folds in place (then checks against Slack's
+        reply_count/latest_reply); a tombstoned root — or any of them with THREAD_STATE_DELTAS
+        off — flags the thread for a full refetch, as every edit and deletion used to. Cold
+        threads are left alone: their next turn rebuilds anyway.
+
+        Never raises: a lost delta is caught by the counter check, an exception here costs the
+        event.
+        """
+        try:
+            if not isinstance(event, dict):
+                return
+            channel_id = event.get("channel")
+            if not channel_id:
+                return
+            proc = getattr(self, "processor", None)
+            tm = getattr(proc, "thread_manager", None) if proc is not None else None
+            # None when deltas are off or the manager cannot take them: refetch instead.
+            note = getattr(tm, "note_thread_delta", None) if config.thread_state_deltas else None
+            subtype = event.get("subtype")
+            if subtype == "message_deleted":
+                prev = event.get("previous_message") or {}
+                deleted_ts = event.get("deleted_ts") or prev.get("ts")
+                root = prev.get("thread_ts") or deleted_ts
+                if not root:
+                    return
+                if note is None:
+                    self._mark_thread_refresh(channel_id, root)
+                elif deleted_ts:
+                    note(f"{channel_id}:{root}", {
+                        "kind": "delete", "ts": deleted_ts, "old_text": prev.get("text") or ""})
+                return
+            if subtype == "message_changed":
+                edited = event.get("message") or {}
+                root = edited.get("thread_ts") or edited.get("ts")
+                if not root:
+                    return
+                if edited.get("subtype") == "tombstone" or (
+                        (edited.get("text") or "").strip() == _TOMBSTONE_TEXT):
+                    self._mark_thread_refresh(channel_id, root)
+                    return
+                if self.is_own_message(dict(edited, channel=channel_id)):
+                    return  # our own streaming edits: the state already holds the final text
+                if note is None:
+                    self._mark_thread_refresh(channel_id, root)
+                    return
+                prev = event.get("previous_message") or {}
+                note(f"{channel_id}:{root}", {
+                    "kind": "edit", "ts": edited.get("ts"),
+                    "old_text": prev.get("text") or "", "new_text": edited.get("text") or ""})
+                return
+            if subtype in self._TAIL_FEED_SKIP_SUBTYPES or note is None or not event.get("ts"):
+                return
+            root = event.get("thread_ts") or event["ts"]
+            note(f"{channel_id}:{root}", {"kind": "reply", "ts": event["ts"]})
+        except Exception as e:  # noqa: BLE001
+            self.log_debug(f"thread state feed failed: {e}")
+
     def _record_actor(self, channel_id: str, msg: Dict[str, Any]) -> None:
         ts = msg.get("ts")
         if not ts:
@@ -598,8 +660,6 @@ class SlackMessageEventsMixin(_Host):
                             await db.delete_ambient_artifacts_by_source(channel_id, deleted_ts)
                         except Exception as e:
                             self.log_debug(f"ambient delete-by-source failed: {e}")
-                    # A warm ThreadState may still hold the deleted message — force a rebuild.
-                    self._mark_thread_refresh(channel_id, prev.get("thread_ts") or deleted_ts)
                     # Track 1: a deleted message inside the narrative's window invalidates the cache.
                     await self._invalidate_channel_summary(channel_id, deleted_ts)
                     self.log_debug(f"message_deleted: purged artifacts for "
@@ -649,9 +709,6 @@ class SlackMessageEventsMixin(_Host):
                     if not synthetic.get("thread_ts") and event.get("message", {}).get("thread_ts"):
                         synthetic["thread_ts"] = event["message"]["thread_ts"]
                     if not self.is_own_message(synthetic):
-                        # A warm ThreadState may still hold the pre-edit text — force a rebuild.
-                        self._mark_thread_refresh(
-                            channel_id, synthetic.get("thread_ts") or new_ts)
                         svc.offer_event(synthetic, facade)
                 # F52: after the reconcile above, an edit may also DRIVE a reply (feature-flagged).
                 # Zero-cost pre-gates run synchronously inside; nothing is scheduled unless they
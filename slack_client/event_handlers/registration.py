@@ -8,8 +8,10 @@ from config import config
 from logger import setup_logger
 from slack_client import admission_watermark
 from slack_client._host import _Host
+from slack_client.channel_index import channel_index
 from slack_client.event_handlers import feedback as feedback_handlers
 from slack_client.normalizer import MUTATION_SUBTYPES, mutation_activity_ts
+from slack_client.page_cache import page_cache
 
 # Must go through setup_logger: handlers are attached to `slack_bot.*` loggers with
 # propagate=False, so a bare getLogger(__name__) writes to NOWHERE — and the one thing this
@@ -384,6 +386,10 @@ def _admit(client_self, event) -> object:
     """
     if not isinstance(event, dict):
         return None
+    # Before the own-message check: our own posts and edits change what a cached page shows too.
+    page_cache.invalidate_event(event)
+    # Same moment, same reason: a delivered message is searchable before any turn can ask.
+    channel_index.apply_event(client_self, event)
     channel_id = event.get("channel") or (event.get("item") or {}).get("channel")
     if not channel_id:
         return None
@@ -429,6 +435,8 @@ class SlackRegistrationMixin(_Host):
             index_ticket = _admit(self, event)
             if hasattr(self, "_feed_actor_tail"):
                 self._feed_actor_tail(event)
+            if hasattr(self, "_feed_thread_state"):
+                self._feed_thread_state(event)
             self.log_debug(f"App mention event: channel={event.get('channel')}, ts={event.get('ts')}")
             # F52: record this genuine Slack app_mention so the edit-reply path can tell that a
             # mention-added edit is already covered by Slack's own event (editing to add a mention
@@ -459,6 +467,8 @@ class SlackRegistrationMixin(_Host):
             index_ticket = _admit(self, event)
             if hasattr(self, "_feed_actor_tail"):
                 self._feed_actor_tail(event)
+            if hasattr(self, "_feed_thread_state"):
+                self._feed_thread_state(event)
             # F51: ambient capture + lifecycle (edits/deletions) runs FIRST, independent of
             # channel_type and ENABLE_CHANNEL_LISTENING — memory is a distinct setting from
             # whether the bot replies. Never blocks the wake path (offer_event only enqueues).
@@ -491,6 +501,15 @@ class SlackRegistrationMixin(_Host):
             # F51: a Slack file removed → purge summaries derived from it (best-effort).
             await self._ambient_file_deleted(event)
 
+        @self.app.event("user_change")
+        @track_ingress
+        async def handle_user_change(event):
+            # A renamed or re-profiled user: write the new profile through the user cache and the
+            # users table, so the next mention renders the new name instead of a cached one.
+            directory = getattr(self, "user_directory", None)
+            if directory is not None:
+                await directory.apply_user_change(event)
+
         # --- agent_view lifecycle (June 2026 surface, Phase G) ---
         @self.app.event("app_home_opened")
         @track_ingress
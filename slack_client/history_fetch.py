@@ -30,6 +30,7 @@ from message_processor.client_contract import HistoryFetchError
 from config import config
 from logger import setup_logger
 from slack_client.normalizer import TimestampError, parse_ts
+from slack_client.page_cache import page_cache
 
 logger = setup_logger(name="slack_bot.HistoryFetch")
 
@@ -244,14 +245,24 @@ async def fetch_page(method: Callable[..., Awaitable[Any]], params: Dict[str, An
 
     `sleeper` lets the bootstrap park with its sweep claim held and its heartbeat bumped
     instead of a bare asyncio.sleep.
+
+    A page another reader fetched moments ago comes from `page_cache` instead of Slack. It is
+    still charged to the budget, so a walk stops at the same depth whichever way its pages came,
+    and it is still validated like a fresh one.
     """
     tries = max(1, int(config.fetch_retry_attempts if attempts is None else attempts))
     sleep = sleeper or asyncio.sleep
     if budget is not None:
         budget.check_deadline()
         await budget.charge_page()
+    cache_key = page_cache.key_for(method, params)
+    cached = page_cache.get(cache_key)
+    if cached is not None:
+        return _page_result(cached, label=label, require_ts=require_ts)
+    generation = page_cache.generation(cache_key)
     last: Optional[BaseException] = None
     for attempt in range(tries):
+        started = time.monotonic()
         try:
             if budget is None:
                 resp = await method(**params)
@@ -288,7 +299,10 @@ async def fetch_page(method: Callable[..., Awaitable[Any]], params: Dict[str, An
             if resp is None or (hasattr(resp, "get") and resp.get("ok") is False):
                 code = str((resp or {}).get("error") or "" ) if resp is not None else "empty_response"
                 raise HistoryPageError(f"{label} not ok: {code}", code=code)
-            return _page_result(resp, label=label, require_ts=require_ts)
+            page = _page_result(resp, label=label, require_ts=require_ts)
+            page_cache.put(cache_key, page.raw, generation,
+                           cost_ms=(time.monotonic() - started) * 1000.0)
+            return page
         if attempt >= tries - 1:
             break
         wait = delay if delay is not None else float(2 ** attempt)
@@ -11,6 +11,7 @@ from config import config
 from slack_client._host import _Host
 from slack_client.formatting.blocks import extract_supplementary_text
 from slack_client.normalizer import ORIGIN_HISTORY, normalize_slack_message
+from slack_client.page_cache import read_page
 from slack_client.utilities import is_dm_conversation
 from message_processor.tool_registry import stage_discovered_edit_target, stage_discovered_root
 
@@ -832,7 +833,7 @@ class SlackHistoryToolMixin(_Host):
                     kwargs: Dict[str, Any] = {"channel": channel_id, "ts": thread_ts, "limit": 1000}
                     if cursor:
                         kwargs["cursor"] = cursor
-                    resp = await self.app.client.conversations_replies(**kwargs)
+                    resp = await read_page(self.app.client.conversations_replies, **kwargs)
                     # Dedupe by ts across pages. Slack's cursor contract doesn't promise that a
                     # later page omits the thread root, and the result now DECLARES its order —
                     # a duplicated root would both break that claim and read as someone
@@ -861,7 +862,8 @@ class SlackHistoryToolMixin(_Host):
                 # already the newest — then REVERSE them, because the result is prose the
                 # model reads top-to-bottom and newest-first inverts the discourse. See
                 # build_history_result for what that inversion actually cost.
-                resp = await self.app.client.conversations_history(channel=channel_id, limit=n)
+                resp = await read_page(self.app.client.conversations_history,
+                                       channel=channel_id, limit=n)
                 all_messages = resp.get("messages") or []
                 raw = list(reversed(all_messages[:n]))
             # BF2: render human authors by display name, not a raw Slack id (Slack is the only
@@ -41,6 +41,7 @@ from slack_client.event_handlers.feedback import (
 from slack_client._host import _Host
 from slack_client.formatting.blocks import extract_supplementary_text
 from slack_client.normalizer import TimestampError, parse_ts
+from slack_client.page_cache import page_cache, read_page
 from slack_client.utilities import is_user_shaped_id, strip_citations
 
 import re as _re
@@ -866,6 +867,13 @@ class SlackMessagingMixin(_Host):
             except Exception as e:  # noqa: BLE001 — startup must never break on emoji.list
                 self.log_debug(f"initial workspace emoji refresh failed: {e}")
 
+        # The whole user directory, in the background: names render from memory from the first
+        # turn that needs them instead of one users.info call per stranger. Never awaited here —
+        # a large workspace's users.list walk is rate-limited and must not hold up the socket.
+        directory = getattr(self, "user_directory", None)
+        if directory is not None:
+            directory.start()
+
         # Create a task for start_async that can be cancelled
         self._start_task = asyncio.create_task(self.handler.start_async())
 
@@ -892,6 +900,10 @@ class SlackMessagingMixin(_Host):
 
     async def stop(self):
         """Stop the Slack bot"""
+        directory = getattr(self, "user_directory", None)
+        if directory is not None:
+            await directory.stop()
+
         # F9: stop the liveness monitor first (independent of the handler teardown below).
         monitor = getattr(self, "_socket_liveness", None)
         if monitor is not None:
@@ -1089,6 +1101,8 @@ class SlackMessagingMixin(_Host):
         `receipt_class` (EDIT_OWN_MESSAGE §4) is a required keyword with no default: every
         posting site says what kind of surface it minted."""
         from message_processor.outbound_receipts import record_transport_post
+        # A page cached before this post landed no longer shows the conversation as it is.
+        page_cache.invalidate(channel_id, thread_root_ts or message_ts or "")
         try:
             await record_transport_post(
                 team_id=getattr(self, "self_team_id", None), channel_id=channel_id,
@@ -1972,7 +1986,7 @@ class SlackMessagingMixin(_Host):
         """
         for attempt in range(attempts):
             try:
-                return await self.app.client.conversations_replies(**kwargs)
+                return await read_page(self.app.client.conversations_replies, **kwargs)
             except SlackApiError as e:
                 err = e.response.get("error") if getattr(e, "response", None) else None
                 status = getattr(getattr(e, "response", None), "status_code", None)
@@ -1991,6 +2005,25 @@ class SlackMessagingMixin(_Host):
                     continue
                 raise
 
+    async def get_thread_reply_counters(self, channel_id: str,
+                                        thread_id: str) -> Optional[Tuple[int, Optional[str]]]:
+        """The thread root's (reply_count, latest_reply), straight from Slack.
+
+        One limit=1 replies call — the root and nothing else. Deliberately NOT through the page
+        cache: this is the check that catches an event we never received, and a cached page is
+        exactly as blind to that event as we are. None on any failure (the caller rebuilds).
+        """
+        try:
+            resp = await self.app.client.conversations_replies(channel=channel_id, ts=thread_id,
+                                                               limit=1)
+        except Exception as e:  # noqa: BLE001
+            self.log_debug(f"reply counter read failed for {channel_id}:{thread_id}: {e}")
+            return None
+        root = next(iter(resp.get("messages") or []), None)
+        if not root or root.get("ts") != thread_id:
+            return None
+        return int(root.get("reply_count") or 0), root.get("latest_reply")
+
     async def get_thread_history(self, channel_id: str, thread_id: str,
                                  limit: Optional[int] = None,
                                  oldest: Optional[str] = None) -> List[Message]:
@@ -2088,6 +2121,11 @@ class SlackMessagingMixin(_Host):
                             "reactions": msg.get("reactions") or None
                         }
                     ))
+                    # Only the root carries these: the baseline a warm ThreadState's event deltas
+                    # are checked against (see get_thread_reply_counters).
+                    if msg.get("reply_count") is not None:
+                        provisional[-1].metadata["reply_count"] = msg.get("reply_count")
+                        provisional[-1].metadata["latest_reply"] = msg.get("latest_reply")
 
                 total_fetched += len(slack_messages)
 
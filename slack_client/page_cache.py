@@ -0,0 +1,320 @@
+"""Process-local cache of conversations.history / conversations.replies pages.
+
+Every reader of a conversation goes to Slack on its own: the thread rebuild
+(`get_thread_history`), the channel stream's periphery and origin fetches, the history tools and
+the in-channel search scan. Within one busy turn several of them ask for the same page seconds
+apart. This cache sits under all of them, at the two places a page is actually requested —
+`history_fetch.fetch_page` and `read_page` below — so one answer serves every reader that asks
+the same question while it is still true.
+
+WHAT IT IS NOT: a transcript. Pages live in this process's memory only, as serialized bytes,
+under a short TTL and a byte ceiling. Nothing here is ever written to disk or to the database,
+so "Slack is the only transcript; it is never mirrored" holds exactly as before — a restart
+starts cold.
+
+KEYED BY WHAT DECIDED THE ANSWER:
+  * the token the page was read with — two workspaces (or a user token and a bot token) can be
+    shown different messages for the same channel id;
+  * the method, and every request parameter: channel, thread `ts`, cursor, oldest/latest,
+    inclusive and limit. A different window is a different question.
+A client with no token (every test double) is never cached, so a fake that changes its answer
+between two calls still sees both answers.
+
+FRESHNESS: the raw Slack listeners call `invalidate_event` before their first await. A new
+message drops every cached history page of its channel — a reply changes its parent's
+`reply_count` too — and the replies of its own thread; an edit or a deletion drops everything
+cached for the channel, because the message it touches can sit in any window. Our own accepted
+posts invalidate the same way (`messaging._record_receipt`), so a turn never reads a page
+fetched before its own reply landed. The TTL bounds whatever no event told us about.
+
+A refused page, an error or a page that fails validation is never stored.
+
+WHAT A HIT SAVED: each page remembers how long Slack took to answer it, so a hit can report the
+wall clock it spared the reader and not only the call. A page the participation gate fetched
+speculatively during its debounce (`message_processor.history_prefetch`) is marked as such, so
+the turn it was fetched for can say how much of its saving was the prefetch's doing.
+"""
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from config import config
+from logger import setup_logger
+
+logger = setup_logger(name="slack_bot.PageCache")
+
+CACHEABLE_METHODS = frozenset({"conversations_history", "conversations_replies"})
+
+_Key = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass
+class TurnTally:
+    """One turn's share of the cache: every page it asked for, and how many Slack answered."""
+
+    hits: int = 0
+    misses: int = 0
+    saved_ms: float = 0.0
+    prefetched: int = 0
+    prefetch_saved_ms: float = 0.0
+    # How long the turn waited on a prefetch still in flight when it needed the pages.
+    prefetch_wait_ms: float = 0.0
+
+    @property
+    def reads(self) -> int:
+        return self.hits + self.misses
+
+    def summary(self) -> str:
+        ratio = self.hits / self.reads if self.reads else 0.0
+        text = (f"{self.hits}/{self.reads} page(s) from cache ({ratio:.0%}), "
+                f"{self.hits} Slack call(s) saved")
+        if self.saved_ms >= 1:
+            text += f" (~{self.saved_ms:.0f}ms)"
+        if self.prefetched or self.prefetch_wait_ms:
+            text += (f", {self.prefetched} prefetched (saved ~{self.prefetch_saved_ms:.0f}ms, "
+                     f"waited {self.prefetch_wait_ms:.0f}ms)")
+        return text
+
+    @property
+    def prefetch_net_ms(self) -> float:
+        """Time to first token the debounce-window prefetch bought this turn, net of its wait."""
+        return self.prefetch_saved_ms - self.prefetch_wait_ms
+
+
+_TURN_TALLY: ContextVar[Optional[TurnTally]] = ContextVar("slack_page_tally", default=None)
+# Set for the lifetime of a speculative prefetch task: what it stores is marked as prefetched.
+_FILL_SOURCE: ContextVar[Optional[str]] = ContextVar("slack_page_fill_source", default=None)
+
+
+def begin_turn():
+    """Start counting this turn's page reads. Tasks the turn spawns inherit the same tally."""
+    return _TURN_TALLY.set(TurnTally())
+
+
+def end_turn(token) -> Optional[TurnTally]:
+    """Stop counting; the tally, or None when no page was read at all."""
+    tally = _TURN_TALLY.get()
+    _TURN_TALLY.reset(token)
+    return tally if tally is not None and tally.reads else None
+
+
+def current_tally() -> Optional[TurnTally]:
+    """The running turn's tally so far, or None outside a turn."""
+    return _TURN_TALLY.get()
+
+
+def mark_prefetch() -> None:
+    """Mark every page the CURRENT task stores from here on as speculatively prefetched.
+
+    Call it first thing inside the prefetch task: a ContextVar set there stays with that task and
+    never reaches the turn that later reads the pages. It also detaches the task from any turn
+    tally it inherited: a prefetch's own reads are not a turn's.
+    """
+    _FILL_SOURCE.set("prefetch")
+    _TURN_TALLY.set(None)
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    expires_at: float
+    channel: str
+    thread: Optional[str]
+    cost_ms: float = 0.0
+    prefetched: bool = False
+
+
+class SlackPageCache:
+    """A byte- and TTL-bounded LRU of serialized Slack pages, indexed by channel."""
+
+    def __init__(self, *, ttl_s: Optional[float] = None, max_bytes: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self._ttl_override = ttl_s
+        self._max_bytes_override = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._by_channel: Dict[str, Set[_Key]] = {}
+        # Bumped by every invalidation of a channel, cached pages or not. A page is stored only if
+        # its channel's generation is the one read before the request went out: an event that
+        # landed while Slack was answering may be exactly what the answer is missing.
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._saved_ms = 0.0
+        self._prefetch_hits = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    # Read at call time, not construction, so an operator's env and a test's monkeypatch both
+    # reach the process-wide instance.
+    @property
+    def ttl_s(self) -> float:
+        if self._ttl_override is not None:
+            return self._ttl_override
+        return float(getattr(config, "slack_page_cache_ttl_seconds", 0.0))
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes_override is not None:
+            return self._max_bytes_override
+        return int(float(getattr(config, "slack_page_cache_max_mb", 0)) * 1024 * 1024)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def key_for(method: Callable[..., Any], params: Dict[str, Any]) -> Optional[_Key]:
+        """The cache key for one request, or None when the request is not cacheable."""
+        name = getattr(method, "__name__", "")
+        if name not in CACHEABLE_METHODS or not params.get("channel"):
+            return None
+        token = getattr(getattr(method, "__self__", None), "token", None)
+        if not isinstance(token, str) or not token:
+            return None
+        return (token, name, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+    def generation(self, key: Optional[_Key]) -> int:
+        """Read BEFORE the request; hand it back to `put`."""
+        return self._generations.get(dict(key[2])["channel"], 0) if key is not None else 0
+
+    def get(self, key: Optional[_Key]) -> Optional[Dict[str, Any]]:
+        """A fresh copy of the cached page, or None. Counts toward the current turn's tally."""
+        if key is None or not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._drop(key)
+            entry = None
+        tally = _TURN_TALLY.get()
+        if entry is None:
+            self._misses += 1
+            if tally is not None:
+                tally.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        self._saved_ms += entry.cost_ms
+        self._prefetch_hits += int(entry.prefetched)
+        if tally is not None:
+            tally.hits += 1
+            tally.saved_ms += entry.cost_ms
+            if entry.prefetched:
+                tally.prefetched += 1
+                tally.prefetch_saved_ms += entry.cost_ms
+        # Deserialized per hit: a caller that edits its messages in place cannot reach the next
+        # caller's copy.
+        return json.loads(entry.body)
+
+    def put(self, key: Optional[_Key], page: Dict[str, Any], generation: int, *,
+            cost_ms: float = 0.0) -> None:
+        """Store one page fetched under `generation`; `cost_ms` is how long Slack took."""
+        if key is None or not self.enabled or self.generation(key) != generation:
+            return
+        try:
+            body = json.dumps(page, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return  # not a plain Slack payload; not worth guessing how to copy it
+        limit = self.max_bytes
+        if len(body) > limit:
+            return
+        params = dict(key[2])
+        self._drop(key)
+        self._entries[key] = _Entry(body=body, expires_at=self._clock() + self.ttl_s,
+                                    channel=params["channel"], thread=params.get("ts"),
+                                    cost_ms=max(0.0, float(cost_ms)),
+                                    prefetched=_FILL_SOURCE.get() == "prefetch")
+        self._by_channel.setdefault(params["channel"], set()).add(key)
+        self._bytes += len(body)
+        while self._bytes > limit and self._entries:
+            self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, channel_id: Optional[str], thread_ts: Optional[str] = None) -> int:
+        """Drop what a change in `channel_id` can have made stale; how many pages went.
+
+        With `thread_ts`, that is the channel's history pages plus that one thread's replies;
+        without it, every page of the channel.
+        """
+        if not channel_id:
+            return 0
+        self._generations[str(channel_id)] = self._generations.get(str(channel_id), 0) + 1
+        keys = self._by_channel.get(str(channel_id))
+        if not keys:
+            return 0
+        doomed = [k for k in keys
+                  if thread_ts is None or self._entries[k].thread in (None, str(thread_ts))]
+        for key in doomed:
+            self._drop(key)
+        self._invalidations += len(doomed)
+        return len(doomed)
+
+    def invalidate_event(self, event: Any) -> int:
+        """Apply one raw Slack message event. SYNCHRONOUS and never raises."""
+        try:
+            if not isinstance(event, dict):
+                return 0
+            channel_id = event.get("channel")
+            subtype = event.get("subtype")
+            if subtype in ("message_changed", "message_deleted"):
+                return self.invalidate(channel_id)
+            return self.invalidate(channel_id, event.get("thread_ts") or event.get("ts") or "")
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"page cache invalidation failed: {e}")
+            return 0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_channel.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        reads = self._hits + self._misses
+        return {"hits": self._hits, "misses": self._misses,
+                "hit_ratio": round(self._hits / reads, 3) if reads else 0.0,
+                "calls_saved": self._hits, "saved_ms": round(self._saved_ms, 1),
+                "prefetch_hits": self._prefetch_hits, "entries": len(self._entries),
+                "bytes": self._bytes, "evictions": self._evictions,
+                "invalidations": self._invalidations}
+
+    def _drop(self, key: _Key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.body)
+        keys = self._by_channel.get(entry.channel)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_channel[entry.channel]
+
+
+page_cache = SlackPageCache()
+
+
+async def read_page(method: Callable[..., Awaitable[Any]], **params: Any) -> Any:
+    """`await method(**params)` through the cache, for the readers that call Slack directly.
+
+    Returns the cached page as a plain dict on a hit, and Slack's own response on a miss — both
+    answer `.get`, which is all these callers use. Only an `ok` answer is stored.
+    """
+    key = page_cache.key_for(method, params)
+    cached = page_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = page_cache.generation(key)
+    started = time.monotonic()
+    resp = await method(**params)
+    if key is not None and resp is not None:
+        data = getattr(resp, "data", resp)
+        if isinstance(data, dict) and data.get("ok") is not False \
+                and isinstance(data.get("messages"), list):
+            page_cache.put(key, data, generation,
+                           cost_ms=(time.monotonic() - started) * 1000.0)
+    return resp
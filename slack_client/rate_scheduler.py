@@ -0,0 +1,278 @@
+"""One client-side Slack rate scheduler under every Web API call the bot makes.
+
+Before this, every caller handled Slack's 429s its own way — `history_fetch`'s Retry-After
+retries, `_replies_page_with_retry`, the coverage bootstrap's park, the search scan's budget,
+the streaming `RateLimitManager` for chat.update — and none of them knew what the others were
+spending. So a background sweep could use a method's whole allowance and the turn a person was
+waiting on took the 429.
+
+THE SCHEDULER SITS AT `api_call`, the one method every `AsyncWebClient` call funnels through, so
+nothing above it changes. `install()` wraps it on a client instance; it is installed on
+`app.client` at construction and, through a Bolt global middleware, on the per-request client
+Bolt builds for every listener. Each call takes a token from:
+
+  * its METHOD's bucket, refilled at the rate of the method's published Web API tier
+    (`_TIERS`; Slack's limits are per method and per workspace, and the tier sets the rate);
+  * for chat.postMessage and chat.update, also its CHANNEL's bucket (about one per second).
+
+Methods not in the tier table pass straight through, counted but never delayed.
+
+PRIORITY: a call is INTERACTIVE unless the task making it declared itself BACKGROUND
+(`mark_background()`, at the top of a background task's coroutine — a ContextVar, so it covers
+every call that task and its children make and nothing else). Background calls leave a reserve
+(`slack_rate_background_reserve` of each bucket) untouched and yield outright to any interactive
+call waiting on the same bucket, so a sweep slows down before a turn does.
+
+A 429 empties the bucket and holds it shut for Retry-After, for every caller at once, and is
+re-raised unchanged: callers keep their own retry and deadline logic, they just no longer
+discover the limit one by one. `stats()` publishes per-method queue depth, wait time and 429
+counts; the cleanup worker logs it.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import config
+from logger import setup_logger
+
+logger = setup_logger(name="slack_bot.RateScheduler")
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# Calls per minute by Web API tier. Tier 1 is listed for completeness; nothing we call uses it.
+_TIER_PER_MINUTE = {1: 1.0, 2: 20.0, 3: 50.0, 4: 100.0}
+
+# The methods this bot actually calls, by published tier.
+_TIERS: Dict[str, int] = {
+    "users.list": 2, "users.conversations": 2, "conversations.list": 2, "emoji.list": 2,
+    "search.messages": 2, "conversations.setTopic": 2, "conversations.setPurpose": 2,
+    "conversations.history": 3, "conversations.replies": 3, "conversations.info": 3,
+    "chat.update": 3, "chat.delete": 3, "reactions.add": 3, "reactions.remove": 3,
+    "reactions.get": 3, "pins.add": 3, "pins.remove": 3, "pins.list": 2,
+    "bookmarks.add": 2, "bookmarks.edit": 2, "bookmarks.list": 3, "bookmarks.remove": 2,
+    "files.list": 3, "team.info": 3, "conversations.join": 3, "canvases.create": 2,
+    "canvases.edit": 3, "users.info": 4, "users.profile.get": 4, "conversations.members": 4,
+    "files.info": 4, "files.getUploadURLExternal": 4, "files.completeUploadExternal": 4,
+    "chat.postEphemeral": 4, "chat.getPermalink": 4,
+}
+
+# chat.postMessage has no tier: Slack allows about one message per second per channel, with
+# short bursts. chat.update is Tier 3 AND shares that per-channel pacing in practice.
+_PER_CHANNEL = frozenset({"chat.postMessage", "chat.update"})
+_PER_CHANNEL_RATE_S = 1.0
+_PER_CHANNEL_BURST = 3.0
+
+_PRIORITY: ContextVar[str] = ContextVar("slack_call_priority", default=INTERACTIVE)
+
+
+def mark_background() -> None:
+    """Declare the CURRENT task background traffic. Call it first thing in the task's coroutine;
+    the setting stays with that task (and tasks it creates) and never reaches a turn."""
+    _PRIORITY.set(BACKGROUND)
+
+
+def current_priority() -> str:
+    return _PRIORITY.get()
+
+
+class _Bucket:
+    def __init__(self, per_second: float, capacity: float, clock: Callable[[], float]):
+        self.per_second = per_second
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self.blocked_until = 0.0
+        self.waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.per_second)
+        self._updated = now
+
+    def take(self, priority: str, reserve: float) -> float:
+        """Take a token and return 0, or return how long to wait before asking again."""
+        now = self._clock()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        need = 1.0
+        if priority == BACKGROUND:
+            if self.waiting[INTERACTIVE]:
+                return 1.0 / self.per_second
+            need += reserve * self.capacity
+        if self.tokens >= need:
+            self.tokens -= 1.0
+            return 0.0
+        return (need - self.tokens) / self.per_second
+
+    def block(self, seconds: float) -> None:
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, self._clock() + seconds)
+
+
+@dataclass
+class _MethodStats:
+    calls: int = 0
+    delayed: int = 0
+    wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    background_wait_ms: float = 0.0
+    rate_limited: int = 0
+
+
+def _is_rate_limited(error: BaseException) -> bool:
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    try:
+        return (response or {}).get("error") == "ratelimited"  # type: ignore[union-attr]
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def _channel_of(kwargs: Dict[str, Any]) -> Optional[str]:
+    for part in ("json", "data", "params"):
+        body = kwargs.get(part)
+        if isinstance(body, dict) and body.get("channel"):
+            return str(body["channel"])
+    return None
+
+
+class SlackRateScheduler:
+    """Token buckets per method (by tier) and per channel, shared by every installed client."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Any] = asyncio.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._methods: Dict[str, _Bucket] = {}
+        self._channels: Dict[Tuple[str, str], _Bucket] = {}
+        self._stats: Dict[str, _MethodStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(config, "slack_rate_scheduler", True))
+
+    def _buckets(self, method: str, channel: Optional[str]):
+        out = []
+        if method in _PER_CHANNEL and channel:
+            key = (method, channel)
+            bucket = self._channels.get(key)
+            if bucket is None:
+                bucket = self._channels[key] = _Bucket(_PER_CHANNEL_RATE_S, _PER_CHANNEL_BURST,
+                                                       self._clock)
+            out.append(bucket)
+        tier = _TIERS.get(method)
+        if tier is not None:
+            bucket = self._methods.get(method)
+            if bucket is None:
+                per_minute = _TIER_PER_MINUTE[tier]
+                # A quarter-minute of burst: Slack tolerates short bursts above the rate.
+                bucket = self._methods[method] = _Bucket(per_minute / 60.0, per_minute / 4.0,
+                                                         self._clock)
+            out.append(bucket)
+        return out
+
+    async def acquire(self, method: str, channel: Optional[str] = None) -> float:
+        """Wait for this call's turn. Returns the milliseconds waited."""
+        stats = self._stats.setdefault(method, _MethodStats())
+        stats.calls += 1
+        if not self.enabled:
+            return 0.0
+        priority = _PRIORITY.get()
+        reserve = min(0.9, max(0.0, float(getattr(config, "slack_rate_background_reserve",
+                                                  0.25))))
+        started = self._clock()
+        for bucket in self._buckets(method, channel):
+            while True:
+                delay = bucket.take(priority, reserve)
+                if delay <= 0:
+                    break
+                bucket.waiting[priority] += 1
+                try:
+                    await self._sleep(delay)
+                finally:
+                    bucket.waiting[priority] -= 1
+        waited_ms = (self._clock() - started) * 1000.0
+        if waited_ms > 0:
+            stats.delayed += 1
+            stats.wait_ms += waited_ms
+            stats.max_wait_ms = max(stats.max_wait_ms, waited_ms)
+            if priority == BACKGROUND:
+                stats.background_wait_ms += waited_ms
+        return waited_ms
+
+    def interactive_waiting(self, method: str) -> int:
+        """How many turn (interactive) callers are waiting on `method`'s bucket right now."""
+        bucket = self._methods.get(method)
+        return bucket.waiting[INTERACTIVE] if bucket is not None else 0
+
+    def rate_limited(self, method: str, channel: Optional[str], error: BaseException) -> None:
+        """Slack said 429: hold the bucket the limit belongs to shut for Retry-After."""
+        from slack_client.history_fetch import retry_after_seconds
+
+        self._stats.setdefault(method, _MethodStats()).rate_limited += 1
+        wait = retry_after_seconds(error)
+        wait = 30.0 if wait is None else wait
+        buckets = self._buckets(method, channel)
+        if buckets:
+            buckets[0].block(wait)  # the channel bucket when there is one, else the method's
+        logger.warning(f"Slack 429 on {method}{f' in {channel}' if channel else ''}: "
+                       f"holding it for {wait:g}s")
+
+    def install(self, web: Any) -> Any:
+        """Route `web`'s calls through this scheduler. Idempotent; returns `web`."""
+        original = getattr(web, "api_call", None)
+        if not callable(original) or getattr(web, "_rate_scheduler", None) is self:
+            return web
+
+        async def api_call(api_method: str, **kwargs: Any) -> Any:
+            channel = _channel_of(kwargs) if api_method in _PER_CHANNEL else None
+            await self.acquire(api_method, channel)
+            try:
+                return await original(api_method, **kwargs)
+            except Exception as e:
+                if _is_rate_limited(e):
+                    self.rate_limited(api_method, channel, e)
+                raise
+
+        try:
+            web.api_call = api_call
+            web._rate_scheduler = self
+        except Exception as e:  # noqa: BLE001 — an unpatchable client just runs unscheduled
+            logger.debug(f"rate scheduler not installed on {type(web).__name__}: {e}")
+        return web
+
+    async def bolt_middleware(self, context: Any, next: Callable[[], Any]) -> Any:  # noqa: A002
+        """Bolt global middleware: schedule the per-request client Bolt hands each listener."""
+        client = getattr(context, "client", None)
+        if client is not None:
+            self.install(client)
+        return await next()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per method: calls, delayed calls, total/max wait, queue depth now, and 429s."""
+        methods: Dict[str, Dict[str, Any]] = {}
+        for name, s in sorted(self._stats.items()):
+            bucket = self._methods.get(name)
+            depth = sum(bucket.waiting.values()) if bucket is not None else 0
+            depth += sum(sum(b.waiting.values()) for (m, _), b in self._channels.items()
+                         if m == name)
+            methods[name] = {"calls": s.calls, "delayed": s.delayed,
+                             "wait_ms": round(s.wait_ms, 1),
+                             "max_wait_ms": round(s.max_wait_ms, 1),
+                             "background_wait_ms": round(s.background_wait_ms, 1),
+                             "queue_depth": depth, "rate_limited": s.rate_limited}
+        return {"calls": sum(m["calls"] for m in methods.values()),
+                "queue_depth": sum(m["queue_depth"] for m in methods.values()),
+                "wait_ms": round(sum(m["wait_ms"] for m in methods.values()), 1),
+                "rate_limited": sum(m["rate_limited"] for m in methods.values()),
+                "methods": methods}
+
+
+scheduler = SlackRateScheduler()
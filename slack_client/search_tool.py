@@ -15,6 +15,7 @@ from slack_sdk.errors import SlackApiError
 from message_processor.client_contract import HistoryFetchError
 from config import config
 from slack_client._host import _Host
+from slack_client.channel_index import IndexLookup, channel_index
 from slack_client.history_fetch import (FetchBudget, HistoryPageError, iter_pages,
                                         slack_error_code)
 from slack_client.messaging import is_self_chrome_message
@@ -34,25 +35,31 @@ class SearchBackend(Enum):
     ("event carried no action_token") and an index that returned zero exact-recall hits for
     content seeded twelve hours earlier.
 
-    `SERVICE_INDEX` is a RESERVED seam for the later service-account backend (shape 2). It is
-    declared so the selector's shape is honest about what is coming and is deliberately NOT
-    selectable: nothing returns it, and no config value names it.
+    `SERVICE_INDEX` is the same channel search answered from the in-memory index of that channel
+    (slack_client/channel_index.py) instead of a paged scan: every message the channel holds,
+    replies under old roots included, in milliseconds. It is selected only once that channel's
+    index has finished building this process; until then the channel gets the scan. Both run
+    the scan's fence, delivery and receipt rules, and the result shape is the same.
     """
 
     ASSISTANT_CONTEXT = "assistant_context"
     IN_CHANNEL_SCAN = "in_channel_scan"
-    SERVICE_INDEX = "service_index"  # reserved — not selectable
+    SERVICE_INDEX = "service_index"
 
 
 def search_backend_for(ctx: Any) -> SearchBackend:
-    """The backend for one request — a pure function of the SURFACE, and nothing else.
+    """The backend for one request — split on the SURFACE, then on whether the channel's index
+    is ready.
 
     A true 1:1 IM is the only DM: `ToolContext.is_dm` is stamped from `is_dm_conversation`, which
-    classifies an MPIM as channel-shaped, so a group DM lands on the in-channel scan with every
+    classifies an MPIM as channel-shaped, so a group DM lands on the in-channel search with every
     other multi-user surface.
     """
-    return (SearchBackend.ASSISTANT_CONTEXT if getattr(ctx, "is_dm", False)
-            else SearchBackend.IN_CHANNEL_SCAN)
+    if getattr(ctx, "is_dm", False):
+        return SearchBackend.ASSISTANT_CONTEXT
+    if channel_index.ready(getattr(ctx, "channel_id", None)):
+        return SearchBackend.SERVICE_INDEX
+    return SearchBackend.IN_CHANNEL_SCAN
 
 
 # ---------------------------------------------------------------- matching (spec §S2, pure)
@@ -449,6 +456,7 @@ def coverage_note(*, complete: bool, messages: int, threads: int,
         "thread_page_ceiling": "stopped at a single thread's page limit",
         "history_data_invalid": "skipped messages it could not read",
         "reply_data_invalid": "skipped thread replies it could not read",
+        "index_horizon": "reached the oldest message it keeps for this channel",
         # NOT a Slack failure, and the generic tail said it was. This is the local receipt
         # ledger — the evidence that says which of our OWN messages may be replayed — and
         # naming the wrong system in the one sentence a person reads is how an operator spends
@@ -494,7 +502,8 @@ class SlackSearchToolMixin(_Host):
     ITS ONE STRUCTURAL LIMITATION, stated wherever the tool is described (§S10): a recent reply
     beneath a thread root OLDER than the scanned history span is undiscoverable unless a
     `thread_broadcast` names that root, because Slack offers no current-channel index of
-    replies. The reserved `SearchBackend.SERVICE_INDEX` seam may close that; v1 does not.
+    replies. `SearchBackend.SERVICE_INDEX` closes that for a channel whose in-memory index is
+    built: the index holds the replies under every root.
 
     The DM path's own bounds follow, and none of them apply to the channel scan — which is
     bounded instead by the canonical channel-read authorization, the current channel, and the
@@ -736,9 +745,10 @@ class SlackSearchToolMixin(_Host):
         query = (args.get("query") or "").strip()
         if not query:
             return {"ok": False, "error": "bad_arguments", "message": "query is required."}
-        if search_backend_for(ctx) is SearchBackend.IN_CHANNEL_SCAN:
-            return await self._execute_in_channel_scan(ctx, args, query)
-        return await self._execute_assistant_context(ctx, args, query)
+        backend = search_backend_for(ctx)
+        if backend is SearchBackend.ASSISTANT_CONTEXT:
+            return await self._execute_assistant_context(ctx, args, query)
+        return await self._execute_in_channel_scan(ctx, args, query, backend=backend)
 
     async def _execute_assistant_context(self, ctx, args: Dict[str, Any],
                                          query: str) -> Dict[str, Any]:
@@ -900,8 +910,9 @@ class SlackSearchToolMixin(_Host):
 
     # ------------------------------------------------ the in-channel scan (§S3–S7, §S10)
 
-    async def _execute_in_channel_scan(self, ctx, args: Dict[str, Any],
-                                       query: str) -> Dict[str, Any]:
+    async def _execute_in_channel_scan(self, ctx, args: Dict[str, Any], query: str, *,
+                                       backend: SearchBackend = SearchBackend.IN_CHANNEL_SCAN
+                                       ) -> Dict[str, Any]:
         """Keyword-scan the CURRENT channel on the BOT token.
 
         NO SLACK FAILURE ESCAPES: a refused page, a spent budget and a malformed page all become
@@ -918,8 +929,9 @@ class SlackSearchToolMixin(_Host):
 
         THE LIMITATION IS STRUCTURAL AND STATED EVERYWHERE (§S10): a recent reply beneath a root
         older than the history span is undiscoverable unless a `thread_broadcast` exposes it.
-        Slack offers no current-channel reply index; the later service-account backend may close
-        that gap, and v1 does not promise it.
+        Slack offers no current-channel reply index. Under `SearchBackend.SERVICE_INDEX` the
+        candidates come from this process's own in-memory index of the channel instead of the
+        walk (`_scan_index`), and everything after that — receipts, shaping — is the same.
 
         NOTHING FETCHED IS PERSISTED (CLAUDE.md rule 4): pages are scored and dropped, the
         database is READ for receipt evidence and never written.
@@ -980,8 +992,13 @@ class SlackSearchToolMixin(_Host):
         history_budget = FetchBudget(deadline_at=deadline_at, page_ceiling=history_ceiling)
         reply_budget = FetchBudget(deadline_at=deadline_at, page_ceiling=reply_ceiling)
 
-        await self._scan_history(ctx, channel_id, scan, history_budget, history_ceiling)
-        await self._scan_replies(ctx, channel_id, scan, reply_budget, reply_ceiling)
+        lookup = (channel_index.lookup(channel_id, scan.query, trigger_key, limit)
+                  if backend is SearchBackend.SERVICE_INDEX else None)
+        if lookup is not None:
+            await self._scan_index(ctx, channel_id, scan, lookup)
+        else:
+            await self._scan_history(ctx, channel_id, scan, history_budget, history_ceiling)
+            await self._scan_replies(ctx, channel_id, scan, reply_budget, reply_ceiling)
         await self._admit_self_messages(ctx, channel_id, scan, deadline_at)
 
         results, kept = await self._shape_scan_results(ctx, channel_id, scan, deadline_at)
@@ -997,7 +1014,8 @@ class SlackSearchToolMixin(_Host):
                                   stopped_reason=scan.stopped_reason),
         }
         self.log_info(
-            f"search_tool: in-channel scan of {channel_id} read {scan.scanned} messages / "
+            f"search_tool: {'index lookup' if lookup is not None else 'in-channel scan'} of "
+            f"{channel_id} read {scan.scanned} messages / "
             f"{scan.threads_scanned} threads ({history_budget.pages_used} history pages, "
             f"{reply_budget.pages_used} reply pages), complete={scan.complete}, "
             f"stopped={scan.stopped_reason or '-'}, kept {len(results)}")
@@ -1101,6 +1119,21 @@ class SlackSearchToolMixin(_Host):
             code = slack_error_code(cause) if cause is not None else ""
         return f"{phase}_error:{code}" if code else f"{phase}_error"
 
+    async def _scan_index(self, ctx, channel_id: str, scan: "_ChannelScan",
+                          lookup: IndexLookup) -> None:
+        """The index's best candidates through the same gates a fetched page goes through.
+
+        The index has already done the matching, so only the messages worth ranking are
+        normalized, fenced and delivery-checked here; the coverage counts are the index's own,
+        which is every message it holds from before the trigger, not just the candidates.
+        """
+        await self._score_page(ctx, channel_id, scan, lookup.history, ORIGIN_HISTORY, "history")
+        await self._score_page(ctx, channel_id, scan, lookup.replies, ORIGIN_REPLIES, "reply")
+        scan.scanned = lookup.messages
+        scan.threads_scanned = lookup.threads
+        if not lookup.complete:
+            scan.stop("index_horizon")
+
     async def _scan_history(self, ctx, channel_id: str, scan: "_ChannelScan",
                             budget: FetchBudget, ceiling: int) -> None:
         """The newest-first history walk, bounded ABOVE by the trigger.
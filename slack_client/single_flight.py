@@ -0,0 +1,188 @@
+"""Single-flight coalescing of identical concurrent Slack reads.
+
+When several channel messages wake turns at once, each turn independently asks Slack the same
+questions — `conversations.info` for the channel context, `conversations.members` for the access
+check, `users.info` for the same senders, the same `conversations.replies` pages — within a few
+milliseconds of each other. The page cache only helps once a read has COMPLETED; until then every
+turn pays for its own copy.
+
+THE COALESCER SITS AT `api_call`, on top of the rate scheduler (`install()` after
+`rate_scheduler.install`), so a deduplicated call neither goes out nor spends a rate token. A call
+is keyed by method, token and its normalized arguments (params/json/data merged, None dropped,
+values compared as Slack reads them). The first caller's request runs in a task of its own; every
+identical call that arrives while it is in flight awaits that same task. Each caller gets its own
+copy of the response, so one turn editing `messages` never reaches another; an error reaches every
+waiter, unchanged.
+
+Flights never cross priority classes. The leader's task inherits the leader's context, and with it
+the rate scheduler's priority, so a turn joining a background sweep's call would wait behind the
+background reserve with it. The priority is part of the key instead: background callers share
+with each other, interactive callers with each other.
+
+Only methods in `_READS` are ever coalesced — reads whose answer cannot depend on who asked
+beyond the token. Writes are never listed, so two identical posts still post twice. A caller that
+is cancelled leaves the shared call running for the others; the call is cancelled only when its
+last waiter has gone. `stats()` publishes per-method leaders and deduplicated calls; the cleanup
+worker logs it.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import functools
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import config
+from logger import setup_logger
+from slack_client import rate_scheduler
+
+logger = setup_logger(name="slack_bot.SingleFlight")
+
+# Read-only methods whose concurrent identical calls may share one response. Opt-in by design:
+# anything not listed here — every write included — always goes out on its own.
+_READS = frozenset({
+    "conversations.info", "conversations.members", "conversations.replies",
+    "conversations.history", "users.info", "users.profile.get", "team.info",
+    "bookmarks.list", "pins.list", "files.info", "emoji.list", "reactions.get",
+})
+
+
+def _normal(value: Any) -> Any:
+    """A value as Slack reads it: form-encoded True and "true", 200 and "200" are one value."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, str)):
+        return str(value)
+    if isinstance(value, dict):
+        return {str(k): _normal(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normal(v) for v in value]
+    return str(value)
+
+
+def flight_key(web: Any, api_method: str, kwargs: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """The coalescing key for one call, or None when the call must go out on its own. The
+    caller's rate-scheduler priority is part of it: flights never cross priority classes."""
+    if api_method not in _READS or kwargs.get("files"):
+        return None
+    args: Dict[str, Any] = {}
+    for part in ("params", "data", "json"):
+        body = kwargs.get(part)
+        if isinstance(body, dict):
+            args.update(body)
+    token = args.pop("token", None) or getattr(web, "token", None) or ""
+    try:
+        normalized = json.dumps(_normal(args), sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    priority = rate_scheduler.current_priority()
+    return api_method, f"{priority}\x00{token}\x00{normalized}"
+
+
+def _own_copy(result: Any) -> Any:
+    """A response the caller may mutate without touching anyone else's."""
+    if isinstance(result, dict):
+        return copy.deepcopy(result)
+    data = getattr(result, "data", None)
+    if isinstance(data, dict):
+        clone = copy.copy(result)  # shares the client reference, which is what we want
+        clone.data = copy.deepcopy(data)
+        if hasattr(clone, "_initial_data"):
+            clone._initial_data = clone.data
+        return clone
+    return result
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future
+    waiters: int = 0
+
+
+@dataclass
+class _MethodStats:
+    calls: int = 0
+    leaders: int = 0
+    deduplicated: int = 0
+
+
+class SingleFlight:
+    """In-flight identical reads, keyed by method and normalized arguments, shared by every client."""
+
+    def __init__(self):
+        self._flights: Dict[Tuple[str, str], _Flight] = {}
+        self._stats: Dict[str, _MethodStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(config, "slack_single_flight", True))
+
+    async def call(self, web: Any, original: Callable[..., Any], api_method: str,
+                   kwargs: Dict[str, Any]) -> Any:
+        """Run `original(api_method, **kwargs)`, or join the identical call already running."""
+        key = flight_key(web, api_method, kwargs) if self.enabled else None
+        if key is None:
+            return await original(api_method, **kwargs)
+        stats = self._stats.setdefault(api_method, _MethodStats())
+        stats.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            stats.leaders += 1
+            flight = _Flight(asyncio.ensure_future(original(api_method, **kwargs)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(functools.partial(self._landed, key, flight))
+        else:
+            stats.deduplicated += 1
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # The last one waiting went away: nobody may join a call being cancelled.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+        return _own_copy(result)
+
+    def _landed(self, key: Tuple[str, str], flight: _Flight, _task: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # retrieved here, so an unawaited failure is not logged twice
+
+    def install(self, web: Any) -> Any:
+        """Coalesce `web`'s listed reads. Install AFTER the rate scheduler. Idempotent; returns `web`."""
+        original = getattr(web, "api_call", None)
+        if not callable(original) or getattr(web, "_single_flight", None) is self:
+            return web
+
+        async def api_call(api_method: str, **kwargs: Any) -> Any:
+            return await self.call(web, original, api_method, kwargs)
+
+        try:
+            web.api_call = api_call
+            web._single_flight = self
+        except Exception as e:  # noqa: BLE001 — an unpatchable client just runs uncoalesced
+            logger.debug(f"single-flight not installed on {type(web).__name__}: {e}")
+        return web
+
+    async def bolt_middleware(self, context: Any, next: Callable[[], Any]) -> Any:  # noqa: A002
+        """Bolt global middleware: coalesce on the per-request client Bolt hands each listener."""
+        client = getattr(context, "client", None)
+        if client is not None:
+            self.install(client)
+        return await next()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per method: coalescible calls, calls that went out, and calls that shared one."""
+        methods = {name: {"calls": s.calls, "leaders": s.leaders, "deduplicated": s.deduplicated}
+                   for name, s in sorted(self._stats.items())}
+        return {"in_flight": len(self._flights),
+                "deduplicated": sum(m["deduplicated"] for m in methods.values()),
+                "methods": methods}
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,250 @@
+"""The workspace user directory: a bounded in-memory cache, warmed in bulk.
+
+`client.user_cache` used to be a plain dict filled one `users.info` call at a time. After a restart
+in a large workspace that meant hundreds of serial lookups before names rendered, and then names
+that never changed again however stale they got. Two things replace it:
+
+  * `UserCache` — the same mapping every reader already uses (`get`, `in`, `[uid]`, entries that
+    are plain dicts), bounded to `user_cache_max_entries` by least-recent use, and with every entry
+    expiring `user_cache_ttl_seconds` after it was filled. An expired entry reads as absent, so the
+    ordinary miss path refetches it.
+  * `UserDirectory` — a background `users.list` sweep at start, repeated at half the TTL so a live
+    entry is always refreshed before it expires. Each page goes into the cache and, in one
+    transaction, into the users table (`save_user_infos_async`). A `user_change` event writes the
+    changed profile through both at once (`apply_user_change`).
+
+Fail-soft like `WorkspaceEmojiCache`: a sweep that fails keeps what it had, and everything above
+still works from the per-user lookups it replaces. Rate limits are waited out, not fought — a
+users.list page is Tier 2.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from config import config
+from slack_client import rate_scheduler
+from slack_client.history_fetch import retry_after_seconds, slack_error_code
+
+_PAGE_LIMIT = 200
+
+
+def user_entry(user: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The cache entry for one Slack user object, or None when it carries no usable name."""
+    if not isinstance(user, dict) or not user.get("id"):
+        return None
+    profile = user.get("profile") or {}
+    name = profile.get("display_name") or profile.get("real_name") or user.get("name")
+    if not name:
+        return None
+    return {
+        "username": name,
+        "real_name": profile.get("real_name"),
+        "email": profile.get("email"),
+        "timezone": user.get("tz", "UTC"),
+        "tz_label": user.get("tz_label", "UTC"),
+        "tz_offset": user.get("tz_offset", 0),
+    }
+
+
+class UserCache(OrderedDict):
+    """`user_id -> info dict`, least-recently-used first, each entry with its own expiry.
+
+    Still a dict, so the readers that test `isinstance(cache, dict)` keep working. Reads through
+    `[]`, `get` and `in` honour the TTL and refresh recency; iteration (`items()`) sees whatever is
+    held, expired or not, which is what a name search across the cache wants.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_s: Optional[float] = None,
+                 *, clock: Callable[[], float] = time.monotonic):
+        self._max_entries = max_entries
+        self._ttl_s = ttl_s
+        self._clock = clock
+        self._filled_at: Dict[str, float] = {}
+        super().__init__()
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return int(self._max_entries)
+        return int(getattr(config, "user_cache_max_entries", 20000))
+
+    @property
+    def ttl_s(self) -> float:
+        if self._ttl_s is not None:
+            return float(self._ttl_s)
+        return float(getattr(config, "user_cache_ttl_seconds", 21600))
+
+    def _fresh(self, key: Any) -> bool:
+        if not OrderedDict.__contains__(self, key):
+            return False
+        ttl = self.ttl_s
+        if ttl > 0 and self._clock() - self._filled_at.get(key, 0.0) > ttl:
+            self.pop(key, None)
+            return False
+        return True
+
+    def __contains__(self, key: Any) -> bool:
+        return self._fresh(key)
+
+    def __getitem__(self, key: Any) -> Any:
+        if not self._fresh(key):
+            raise KeyError(key)
+        self.move_to_end(key)
+        return OrderedDict.__getitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        OrderedDict.__setitem__(self, key, value)
+        self.move_to_end(key)
+        self._filled_at[key] = self._clock()
+        limit = self.max_entries
+        while limit > 0 and len(self) > limit:
+            oldest = next(iter(self))
+            self.pop(oldest, None)
+
+    def __delitem__(self, key: Any) -> None:
+        OrderedDict.__delitem__(self, key)
+        self._filled_at.pop(key, None)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        self._filled_at.pop(key, None)
+        return OrderedDict.pop(self, key, *default)
+
+
+class UserDirectory:
+    """Keeps `client.user_cache` holding the whole workspace, refreshed in the background."""
+
+    def __init__(self, client):
+        self._client = client
+        self._task: Optional[asyncio.Task] = None
+        self.warmed_at: Optional[float] = None  # monotonic; None until a sweep has completed
+        # True when the last sweep fit the cache whole — only then is a miss a real stranger.
+        self.complete = False
+        self.last_count = 0
+        # The ids the last sweep's users.list returned. Slack Connect and other external users
+        # are not listed, so only these may skip the users table on a cache miss.
+        self.listed: frozenset = frozenset()
+
+    def _log_debug(self, msg: str) -> None:
+        log = getattr(self._client, "log_debug", None)
+        if log:
+            log(msg)
+
+    @property
+    def is_warm(self) -> bool:
+        """A completed sweep whose entries have not had time to expire."""
+        cache = getattr(self._client, "user_cache", None)
+        ttl = cache.ttl_s if isinstance(cache, UserCache) else 0.0
+        return (self.warmed_at is not None
+                and (ttl <= 0 or time.monotonic() - self.warmed_at < ttl))
+
+    def start(self) -> None:
+        """Schedule the sweep loop. Sync, never raises, never blocks startup on users.list."""
+        if not getattr(config, "user_directory_warmup", True):
+            return
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        except RuntimeError:
+            self._task = None
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):  # noqa: BLE001
+                pass
+
+    async def _run(self) -> None:
+        rate_scheduler.mark_background()
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001 — a failed sweep keeps what it had
+                self._log_debug(f"user directory sweep failed, keeping what we have: {e}")
+            cache = getattr(self._client, "user_cache", None)
+            ttl = cache.ttl_s if isinstance(cache, UserCache) else 0.0
+            if ttl <= 0:
+                return  # nothing expires, so there is nothing to refresh
+            await asyncio.sleep(max(60.0, ttl / 2))
+
+    async def sweep(self) -> int:
+        """One full `users.list` walk into the cache and the users table. Returns users stored."""
+        web = self._client.app.client
+        cache = self._client.user_cache
+        db = getattr(self._client, "db", None)
+        cursor: Optional[str] = None
+        stored = 0
+        listed = set()
+        started = time.monotonic()
+        while True:
+            params: Dict[str, Any] = {"limit": _PAGE_LIMIT}
+            if cursor:
+                params["cursor"] = cursor
+            try:
+                resp = await web.users_list(**params)
+            except Exception as e:  # noqa: BLE001
+                wait = retry_after_seconds(e)
+                if slack_error_code(e) == "ratelimited" or wait is not None:
+                    await asyncio.sleep(wait if wait is not None else 30.0)
+                    continue
+                raise
+            rows: List[Dict[str, Any]] = []
+            for user in (resp or {}).get("members") or []:
+                entry = user_entry(user)
+                if entry is None:
+                    continue
+                cache[user["id"]] = entry
+                listed.add(user["id"])
+                rows.append(dict(entry, user_id=user["id"]))
+            if rows and db is not None:
+                try:
+                    await db.save_user_infos_async(rows)
+                except Exception as e:  # noqa: BLE001 — the cache is still warm
+                    self._log_debug(f"user directory page not persisted: {e}")
+            stored += len(rows)
+            cursor = ((resp or {}).get("response_metadata") or {}).get("next_cursor") or None
+            if not cursor:
+                break
+        self.warmed_at = started
+        self.last_count = stored
+        self.listed = frozenset(listed)
+        self.complete = not isinstance(cache, UserCache) or stored <= cache.max_entries
+        self._log_debug(f"user directory warmed: {stored} user(s) in "
+                        f"{time.monotonic() - started:.1f}s")
+        return stored
+
+    async def apply_user_change(self, event: Dict[str, Any]) -> None:
+        """A `user_change` event: the event carries the whole new user object, so write it
+        through rather than merely dropping the entry (a dropped entry would be refilled from
+        the users table, which holds the same stale name)."""
+        user = (event or {}).get("user") or {}
+        uid = user.get("id") if isinstance(user, dict) else None
+        if not uid:
+            return
+        cache = getattr(self._client, "user_cache", None)
+        entry = user_entry(user)
+        if cache is not None:
+            if entry is None:
+                cache.pop(uid, None)
+            else:
+                cache[uid] = entry
+        db = getattr(self._client, "db", None)
+        if entry is not None and db is not None:
+            try:
+                await db.save_user_infos_async([dict(entry, user_id=uid)])
+            except Exception as e:  # noqa: BLE001
+                self._log_debug(f"user_change for {uid} not persisted: {e}")
@@ -602,11 +602,19 @@ class SlackUtilitiesMixin(_Host):
 
         # Read-only DB pass — ONE bulk read for all pending ids (never get_or_create; reading
         # must not create rows). `pending` preserves input order, so `still` stays ordered.
+        # While the user directory is warm and whole, an id users.list returned is skipped: the
+        # sweep wrote its row into the cache first, so a miss there is a miss here too. An id it
+        # did not return (a Slack Connect or other external user) may still have a row that an
+        # earlier users.info lookup wrote, so it is read like any other.
         still: list = []
         rows = {}
-        if pending:
+        directory = getattr(self, "user_directory", None)
+        unlisted = pending
+        if directory is not None and directory.is_warm and directory.complete:
+            unlisted = [uid for uid in pending if uid not in directory.listed]
+        if unlisted:
             try:
-                rows = await self.db.get_user_infos_async(pending)
+                rows = await self.db.get_user_infos_async(unlisted)
             except Exception as e:
                 self.log_debug(f"resolve_usernames bulk DB read failed: {e}")
                 rows = {}
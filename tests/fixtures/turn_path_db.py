@@ -0,0 +1,248 @@
+"""A production-shaped database and the accessors a turn runs against it.
+
+`build(db, scale)` fills a freshly initialised DatabaseManager with deterministic synthetic rows —
+receipts, thread activity, images, documents, tool usage, ambient artifacts, users — spread over
+a few hundred channels, with one busy channel (`HOT_CHANNEL`) holding the share a large workspace's
+loudest room really does. `scale=1.0` is production size (hundreds of thousands of receipts and
+activity rows); the unit-tier plan check builds a sliver of that, because without `ANALYZE` (this
+bot never runs it) SQLite's plan for a statement does not depend on how many rows are there.
+
+`TURN_PATH` names every accessor the query-plan suite runs, each as a coroutine factory over the
+built database. Adding a hot-path accessor to database.py means adding it here — that is what puts
+it under the plan check and the latency baseline.
+
+Nothing here reads a real name or channel; the text is generated, the users come from
+`tests/fixtures/people.py`.
+"""
+from __future__ import annotations
+
+import json
+import random
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from tests.fixtures.people import EXTRAS, ROSTER
+
+TEAM = "T0PLAN000"
+HOT_CHANNEL = "C0HOT0001"
+CHANNELS = 200
+
+# Rows at scale=1.0. The hot channel takes HOT_SHARE of each per-channel table.
+PRODUCTION_ROWS = {
+    "receipts": 300_000,
+    "activity": 200_000,
+    "images": 100_000,
+    "documents": 100_000,
+    "tool_usage": 150_000,
+    "ambient": 100_000,
+    "users": 5_000,
+}
+HOT_SHARE = 0.05
+
+_WORDS = ("pricing", "roadmap", "invoice", "checkout", "latency", "budget", "launch", "retro",
+          "schema", "migration", "outage", "deploy", "quarterly", "onboarding", "contract",
+          "dashboard", "screenshot", "error", "report", "calendar", "holiday", "vendor")
+_BASE_TS = 1_760_000_000
+
+
+def _ts(i: int) -> str:
+    """A Slack ts, strictly increasing with i."""
+    return f"{_BASE_TS + i * 7}.{i % 1_000_000:06d}"
+
+
+def _channel(rng: random.Random) -> str:
+    if rng.random() < HOT_SHARE:
+        return HOT_CHANNEL
+    return f"C0PLAN{rng.randrange(CHANNELS):03d}"
+
+
+def _text(rng: random.Random, words: int) -> str:
+    """Summary-like text: mostly a long tail of filler terms, one word in five a topic word, so a
+    search for a topic matches the fraction of rows it would in a real workspace, not all."""
+    return " ".join(rng.choice(_WORDS) if rng.random() < 0.2 else f"term{rng.randrange(5000)}"
+                    for _ in range(words))
+
+
+def _rows(n: int, make: Callable[[int], Tuple]) -> Iterator[Tuple]:
+    return (make(i) for i in range(n))
+
+
+def build(db: Any, scale: float = 1.0, seed: int = 7) -> Dict[str, int]:
+    """Fill `db` (sync connection, already initialised) and return the row counts written."""
+    rng = random.Random(seed)
+    counts = {name: max(20, int(n * scale)) for name, n in PRODUCTION_ROWS.items()}
+    conn = db.conn
+    conn.execute("BEGIN")
+
+    people = list(ROSTER) + list(EXTRAS)
+    conn.executemany(
+        "INSERT INTO users (user_id, username, real_name, timezone) VALUES (?, ?, ?, ?)",
+        _rows(counts["users"], lambda i: (
+            f"U0PLAN{i:05d}", f"user{i}", people[i % len(people)], "America/Chicago")))
+    conn.executemany(
+        "INSERT INTO user_preferences (slack_user_id, model) VALUES (?, 'gpt-5.6-sol')",
+        _rows(counts["users"], lambda i: (f"U0PLAN{i:05d}",)))
+    conn.executemany(
+        "INSERT INTO channel_settings (channel_id, response_mode) VALUES (?, 'auto')",
+        [(f"C0PLAN{c:03d}",) for c in range(CHANNELS)] + [(HOT_CHANNEL,)])
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO outbound_receipts (team_id, channel_id, message_ts, turn_id, "
+        "state, thread_root_ts, receipt_class) VALUES (?, ?, ?, ?, ?, ?, 'assistant_reply')",
+        _rows(counts["receipts"], lambda i: (
+            TEAM, _channel(rng), _ts(i), f"turn-{i}",
+            "finalized" if i % 50 else "in_flight",
+            _ts(i - i % 5) if i % 3 else None)))
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO channel_thread_activity (team_id, channel_id, root_ts, "
+        "last_observed_reply_ts, advisory_reply_count, last_index_event_ts, dirty) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        _rows(counts["activity"], lambda i: (
+            TEAM, _channel(rng), _ts(i), _ts(i + 3), i % 12, _ts(i + 4),
+            1 if i % 400 == 0 else 0)))
+
+    threads: List[Tuple[str, str, str]] = []
+
+    def _thread(i: int) -> str:
+        channel = _channel(rng)
+        key = f"{channel}:{_ts(i - i % 4)}"
+        if i % 4 == 0:
+            threads.append((key, channel, _ts(i)))
+        return key
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO images (thread_id, url, message_ts, image_type, analysis) "
+        "VALUES (?, ?, ?, 'screenshot', ?)",
+        _rows(counts["images"], lambda i: (
+            _thread(i), f"https://files.example.test/img/{i}.png", _ts(i), _text(rng, 16))))
+    conn.executemany(
+        "INSERT INTO documents (thread_id, filename, mime_type, summary, file_id, message_ts) "
+        "VALUES (?, ?, 'application/pdf', ?, ?, ?)",
+        _rows(counts["documents"], lambda i: (
+            _thread(i), f"{rng.choice(_WORDS)}-{i}.pdf", _text(rng, 20), f"F0PLAN{i:06d}",
+            _ts(i))))
+    conn.executemany(
+        "INSERT OR IGNORE INTO threads (thread_id, channel_id, thread_ts) VALUES (?, ?, ?)",
+        threads)
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO message_tool_usage (channel_id, message_ts, thread_key, tools_json) "
+        "VALUES (?, ?, ?, ?)",
+        _rows(counts["tool_usage"], lambda i: (
+            _channel(rng), _ts(i), f"{HOT_CHANNEL}:{_ts(i - i % 6)}",
+            json.dumps([{"tool_name": "web_search", "gist": rng.choice(_WORDS)}]))))
+    conn.executemany(
+        "INSERT OR IGNORE INTO ambient_artifacts (channel_id, source_ts, conversation_ts, kind, "
+        "ref, title, summary, status, fetched_at) "
+        "VALUES (?, ?, ?, 'link', ?, ?, ?, 'ready', CURRENT_TIMESTAMP)",
+        _rows(counts["ambient"], lambda i: (
+            _channel(rng), _ts(i), _ts(i - i % 3), f"https://example.test/page/{i % 5000}",
+            _text(rng, 4), _text(rng, 20))))
+
+    conn.execute(
+        "INSERT INTO channel_window_anchor (team_id, channel_id, floor_ts, selection_version) "
+        "VALUES (?, ?, ?, 1)", (TEAM, HOT_CHANNEL, _ts(counts["receipts"] // 2)))
+    conn.execute(
+        "INSERT INTO channel_coverage (team_id, channel_id, inventory_start_ts, bootstrap_status) "
+        "VALUES (?, ?, ?, 'complete')", (TEAM, HOT_CHANNEL, _ts(0)))
+    conn.execute("COMMIT")
+    counts["threads"] = len(threads)
+    return counts
+
+
+# --------------------------------------------------------------------------- the turn path
+
+def _recent(counts: Dict[str, int], back: int) -> str:
+    return _ts(counts["receipts"] - back)
+
+
+def _hot_thread(db: Any) -> str:
+    row = db.conn.execute("SELECT thread_id FROM threads WHERE channel_id = ? "
+                          "ORDER BY thread_ts DESC LIMIT 1", (HOT_CHANNEL,)).fetchone()
+    return row[0] if row else f"{HOT_CHANNEL}:{_ts(0)}"
+
+
+def _hot_ids(db: Any, n: int = 50) -> List[str]:
+    return [r[0] for r in db.conn.execute(
+        "SELECT message_ts FROM outbound_receipts WHERE team_id = ? AND channel_id = ? "
+        "ORDER BY message_ts DESC LIMIT ?", (TEAM, HOT_CHANNEL, n))]
+
+
+TurnCall = Callable[[Any, Dict[str, int]], Awaitable[Any]]
+_serial = iter(range(10**9))
+
+
+def _write_ts() -> str:
+    return f"{_BASE_TS * 2}.{next(_serial):06d}"
+
+
+TURN_PATH: Dict[str, TurnCall] = {
+    # READ 1 — window anchor, discovery, activity
+    "read_channel_window_anchor": lambda db, c: db.read_channel_window_anchor_async(
+        TEAM, HOT_CHANNEL),
+    "read_channel_discovery_roots": lambda db, c: db.read_channel_discovery_roots_async(
+        TEAM, HOT_CHANNEL, floor_ts=_recent(c, 20_000), high_ts=_recent(c, 0)),
+    "get_thread_activity": lambda db, c: db.get_thread_activity_async(
+        TEAM, HOT_CHANNEL, since_ts=_recent(c, 2_000)),
+    "thread_activity_exists": lambda db, c: db.thread_activity_exists_async(
+        TEAM, HOT_CHANNEL, _recent(c, 10)),
+    "get_channel_coverage": lambda db, c: db.get_channel_coverage_async(TEAM, HOT_CHANNEL),
+    # READ 2 — the render pin over exact ids
+    "read_channel_sidecars_for": lambda db, c: db.read_channel_sidecars_for_async(
+        TEAM, HOT_CHANNEL, _hot_ids(db)),
+    "get_ambient_artifacts_for_messages": lambda db, c: db.get_ambient_artifacts_for_messages(
+        HOT_CHANNEL, _hot_ids(db), statuses=["ready"]),
+    "find_reusable_ambient_summary": lambda db, c: db.find_reusable_ambient_summary(
+        HOT_CHANNEL, "link", "https://example.test/page/42"),
+    "get_thread_tool_usage": lambda db, c: db.get_thread_tool_usage_async(_hot_thread(db)),
+    # receipts
+    "get_receipt": lambda db, c: db.get_receipt_async(TEAM, HOT_CHANNEL, _recent(c, 1)),
+    "get_oldest_receipt_ts": lambda db, c: db.get_oldest_receipt_ts_async(TEAM, HOT_CHANNEL),
+    "register_receipt": lambda db, c: db.register_receipt_async(
+        TEAM, HOT_CHANNEL, _write_ts(), "turn-bench", "in_flight",
+        receipt_class="assistant_reply"),
+    "finalize_receipts": lambda db, c: db.finalize_receipts_async(
+        TEAM, HOT_CHANNEL, [(_write_ts(), None, "assistant_reply")], "turn-bench"),
+    # per-turn writes
+    "record_thread_activity": lambda db, c: db.record_thread_activity_async(
+        TEAM, HOT_CHANNEL, _recent(c, 10), reply_ts=_write_ts(), event_ts=_write_ts()),
+    "update_thread_activity": lambda db, c: db.update_thread_activity_async(_hot_thread(db)),
+    "save_tool_usage": lambda db, c: db.save_tool_usage_async(
+        HOT_CHANNEL, _write_ts(), _hot_thread(db), [{"tool_name": "web_search", "gist": "q"}]),
+    # thread, channel and user state
+    "get_or_create_thread": lambda db, c: db.get_or_create_thread_async(
+        _hot_thread(db), HOT_CHANNEL),
+    "get_thread_config": lambda db, c: db.get_thread_config_async(_hot_thread(db)),
+    "get_channel_settings": lambda db, c: db.get_channel_settings_async(HOT_CHANNEL),
+    "get_channel_policy": lambda db, c: db.get_channel_policy_async(HOT_CHANNEL),
+    "get_channel_memory": lambda db, c: db.get_channel_memory_async(HOT_CHANNEL),
+    "get_user_preferences": lambda db, c: db.get_user_preferences_async("U0PLAN00042"),
+    "get_user_infos": lambda db, c: db.get_user_infos_async(
+        [f"U0PLAN{i:05d}" for i in range(0, 400, 7)]),
+    # channel-wide files and knowledge search
+    "find_channel_images": lambda db, c: db.find_channel_images_async(
+        HOT_CHANNEL, within_hours=24 * 30),
+    "get_channel_documents": lambda db, c: db.get_channel_documents_async(HOT_CHANNEL),
+    "find_thread_images": lambda db, c: db.find_thread_images_async(_hot_thread(db)),
+    "get_thread_documents": lambda db, c: db.get_thread_documents_async(_hot_thread(db)),
+    "search_channel_documents": lambda db, c: db.search_channel_documents_async(
+        HOT_CHANNEL, "roadmap"),
+    "search_channel_image_analyses": lambda db, c: db.search_channel_image_analyses_async(
+        HOT_CHANNEL, "checkout error"),
+}
+
+# Statements that carry no plan worth checking.
+_NO_PLAN = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA")
+
+
+def full_scans(conn: Any, sql: str, params: Any) -> List[str]:
+    """The EXPLAIN QUERY PLAN steps of one statement that read a whole table.
+
+    A full-text MATCH shows up as a SCAN of the virtual table with a MATCH constraint (`:M`) —
+    that is the index doing its job, not a scan. `SCAN CONSTANT ROW` is a VALUES list.
+    """
+    if sql.lstrip().upper().startswith(_NO_PLAN):
+        return []
+    steps = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())]
+    return [s for s in steps
+            if s.startswith("SCAN ") and ":M" not in s and s != "SCAN CONSTANT ROW"]
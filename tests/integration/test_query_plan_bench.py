@@ -0,0 +1,146 @@
+"""Turn-path SQL at production size: plans must stay index lookups, latency must hold its baseline.
+
+The unit tier (`tests/unit/test_query_plans.py`) proves no turn-path statement PLANS as a full
+scan. That is necessary and not sufficient — a SEARCH on `(team_id, channel_id)` that then
+filters a busy channel's quarter-million rows in Python-visible time is a lookup on paper and a
+stall in practice. So this file builds the database at production size
+(`tests/fixtures/turn_path_db.PRODUCTION_ROWS`), re-checks every plan there, and times every
+accessor in `TURN_PATH` against `tests/fixtures/query_plan_baseline.json`.
+
+RUNNING IT
+
+    ulimit -v 4194304 && timeout 1200 python3 -m pytest tests/integration -m slow \\
+        -k query_plan_bench -s
+
+The build takes most of a minute; nothing here touches the network. `make test` (the unit tier)
+does not collect this file.
+
+THE BASELINE
+
+Each accessor's median over `REPEATS` timed calls (after one warm-up) is compared with its
+recorded median. It fails when the new median exceeds `TOLERANCE ×` the baseline plus
+`FLOOR_MS` — generous on purpose: a baseline is recorded on one machine and replayed on others,
+and what this exists to catch is the order-of-magnitude step a lost index or a new scan causes,
+not jitter. An accessor with no recorded row fails too; recording it is a deliberate act.
+
+To re-record after a deliberate change (and read the diff before committing it):
+
+    QUERY_PLAN_RECORD=1 python3 -m pytest tests/integration -m slow -k query_plan_bench -s
+
+Recording writes the file and skips the latency assertions; the plan assertions still run.
+`QUERY_PLAN_SCALE` (default 1.0) shrinks the build for a quick look — a scaled run never records
+and never compares latency, because its numbers mean nothing against a production-size baseline.
+"""
+import asyncio
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Dict
+
+import aiosqlite
+import pytest
+
+from database import DatabaseManager
+from tests.fixtures.turn_path_db import TURN_PATH, build, full_scans
+
+BASELINE = Path(__file__).resolve().parents[1] / "fixtures" / "query_plan_baseline.json"
+RECORDING = os.getenv("QUERY_PLAN_RECORD") == "1"
+SCALE = float(os.getenv("QUERY_PLAN_SCALE") or "1.0")
+REPEATS = 7
+TOLERANCE = 3.0
+FLOOR_MS = 2.0
+
+pytestmark = pytest.mark.slow
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    mp = pytest.MonkeyPatch()
+    mp.setenv("DATABASE_DIR", str(tmp_path_factory.mktemp("query_plan_bench")))
+    db = DatabaseManager(platform="slack")
+    started = time.perf_counter()
+    counts = build(db, scale=SCALE)
+    print(f"\nbuilt {counts} in {time.perf_counter() - started:.1f}s")
+    yield db, counts
+    db.close()
+    mp.undo()
+
+
+def _load_baseline() -> Dict:
+    if not BASELINE.exists():
+        return {}
+    return json.loads(BASELINE.read_text(encoding="utf-8"))
+
+
+def _write_baseline(medians: Dict[str, float]) -> None:
+    data = {"scale": SCALE, "repeats": REPEATS,
+            "median_ms": {name: round(ms, 3) for name, ms in sorted(medians.items())}}
+    BASELINE.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+async def _time(db, counts, call) -> float:
+    await call(db, counts)  # warm-up: page cache, pooled connection, statement cache
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        await call(db, counts)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def test_no_turn_path_statement_scans_at_production_size(built, monkeypatch):
+    db, counts = built
+    issued = []
+    original = aiosqlite.Connection.execute
+
+    def recording(self, sql, parameters=None):
+        issued.append((sql, parameters))
+        return original(self, sql, parameters)
+
+    monkeypatch.setattr(aiosqlite.Connection, "execute", recording)
+
+    async def run_all():
+        offenders = []
+        for name, call in sorted(TURN_PATH.items()):
+            issued.clear()
+            await call(db, counts)
+            offenders.extend(f"{name}: {scan}\n    {sql.strip()[:200]}"
+                             for sql, params in issued
+                             for scan in full_scans(db.conn, sql, params))
+        await db.close_pool_async()
+        return offenders
+
+    offenders = asyncio.run(run_all())
+    assert not offenders, "full scans on the turn path:\n" + "\n".join(offenders)
+
+
+def test_turn_path_latency_holds_its_baseline(built):
+    db, counts = built
+
+    async def run_all():
+        medians = {name: await _time(db, counts, call) for name, call in sorted(TURN_PATH.items())}
+        await db.close_pool_async()
+        return medians
+
+    medians = asyncio.run(run_all())
+    recorded = _load_baseline().get("median_ms", {})
+    lines = [f"  {name:<36} {ms:>9.3f}ms   baseline "
+             f"{recorded[name]:.3f}ms" if name in recorded else
+             f"  {name:<36} {ms:>9.3f}ms   (no baseline)"
+             for name, ms in sorted(medians.items())]
+    print("\nturn-path accessor medians:\n" + "\n".join(lines))
+
+    if SCALE != 1.0:
+        pytest.skip(f"QUERY_PLAN_SCALE={SCALE}: latency is only compared at production size")
+    if RECORDING:
+        _write_baseline(medians)
+        pytest.skip(f"recorded {len(medians)} medians to {BASELINE.name}")
+
+    missing = sorted(set(medians) - set(recorded))
+    slower = [f"{name}: {ms:.3f}ms against a baseline of {recorded[name]:.3f}ms"
+              for name, ms in sorted(medians.items())
+              if name in recorded and ms > recorded[name] * TOLERANCE + FLOOR_MS]
+    assert not missing, f"no recorded baseline for {missing} — re-record with QUERY_PLAN_RECORD=1"
+    assert not slower, "turn-path latency regressed:\n" + "\n".join(slower)
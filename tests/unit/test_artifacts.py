@@ -418,11 +418,12 @@ class TestPublishArtifacts:
 class TestPersistence:
     async def test_document_artifact_goes_to_the_documents_table(self):
         db = MagicMock()
+        db.save_document_async = AsyncMock()
         await publish_artifacts(
             openai_client=_openai([_cfile("f1", "/mnt/data/totals.csv")], payload=CSV),
             client=_client(), channel_id="C1", thread_id="1.0", thread_key="C1:1.0",
             container_ids=["c1"], db=db, message_ts="1.0")
-        doc = db.save_document.call_args.kwargs
+        doc = db.save_document_async.call_args.kwargs
         assert doc["file_id"] == "F123"          # the Slack ref, so read_document can re-derive
         assert doc["mime_type"] == "text/csv"
         assert doc["metadata"]["source"] == "generated"
@@ -432,17 +433,18 @@ class TestPersistence:
         input through DocumentHandler, which has no image parser. Route images to images."""
         db = MagicMock()
         db.save_image_metadata_async = AsyncMock()
+        db.save_document_async = AsyncMock()
         await publish_artifacts(
             openai_client=_openai([_cfile("f1", "/mnt/data/chart.png")]), client=_client(),
             channel_id="C1", thread_id="1.0", thread_key="C1:1.0",
             container_ids=["c1"], db=db, message_ts="1.0")
-        db.save_document.assert_not_called()
+        db.save_document_async.assert_not_called()
         db.save_image_metadata_async.assert_awaited_once()
         assert db.save_image_metadata_async.call_args.kwargs["image_type"] == "generated"
 
     async def test_db_failure_never_unposts_the_file(self):
         db = MagicMock()
-        db.save_document.side_effect = RuntimeError("db down")
+        db.save_document_async = AsyncMock(side_effect=RuntimeError("db down"))
         out = await publish_artifacts(
             openai_client=_openai([_cfile("f1", "/mnt/data/totals.csv")], payload=CSV),
             client=_client(), channel_id="C1", thread_id="1.0", thread_key="C1:1.0",
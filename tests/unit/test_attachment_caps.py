@@ -13,6 +13,7 @@ import pytest
 from PIL import Image
 
 from message_processor.ingestion.image_validation import TOO_LARGE_AFTER_CONVERSION
+from message_processor.thread_manager import DocumentLedger
 from message_processor.utilities import MessageUtilitiesMixin
 
 pytestmark = pytest.mark.asyncio
@@ -160,7 +161,8 @@ async def test_scanned_pdf_over_page_cap_reextracts_with_rendering():
     dh.safe_extract_content_async = fake_extract
     proc = _Proc(document_handler=dh)
     proc._summarize_document_for_attach = AsyncMock(return_value="SUMMARY")
-    proc.thread_manager.get_or_create_document_ledger = MagicMock(return_value=MagicMock())
+    proc.thread_manager.get_or_create_document_ledger = MagicMock(
+        return_value=MagicMock(spec=DocumentLedger))
 
     client = MagicMock()
     client.download_file = AsyncMock(return_value=b"%PDF-1.4 tiny")
@@ -230,7 +232,7 @@ async def test_slack_url_document_warms_ledger_and_extraction_cache():
 
     dh.safe_extract_content_async = fake_extract
     proc = _Proc(document_handler=dh)
-    ledger = MagicMock()
+    ledger = MagicMock(spec=DocumentLedger)
     proc.thread_manager.get_or_create_document_ledger = MagicMock(return_value=ledger)
 
     url = "https://files.slack.com/files-pri/T1-F7/data.csv"
@@ -242,7 +244,7 @@ async def test_slack_url_document_warms_ledger_and_extraction_cache():
 
     assert len(docs) == 1
     assert docs[0]["summary"]  # deterministic schema block, not empty
-    ledger.add_document.assert_called_once()
+    ledger.add_document_async.assert_awaited_once()
     assert _extraction_cache.get("F7") == "col1,col2\n1,2"
 
 
@@ -273,7 +275,8 @@ async def test_slack_url_document_download_passes_document_cap():
 
     dh.safe_extract_content_async = fake_extract
     proc = _Proc(document_handler=dh)
-    proc.thread_manager.get_or_create_document_ledger = MagicMock(return_value=MagicMock())
+    proc.thread_manager.get_or_create_document_ledger = MagicMock(
+        return_value=MagicMock(spec=DocumentLedger))
     url = "https://files.slack.com/files-pri/T1-F7/data.csv"
     client = SlackBot()
     client.download_file = AsyncMock(return_value=b"c1,c2\n1,2")
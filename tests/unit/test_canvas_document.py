@@ -23,6 +23,7 @@ from message_processor.ingestion.document_handler import (
     SUPPORTED_DOCUMENT_MIMETYPES,
     DocumentHandler,
 )
+from message_processor.thread_manager import DocumentLedger
 
 pytestmark = pytest.mark.unit
 
@@ -239,6 +240,8 @@ class TestArrivalPath:
                 self.image_url_handler.max_image_size = 20 * 1024 * 1024
                 self.image_url_handler.process_urls_from_text = AsyncMock(return_value=([], []))
                 self.thread_manager = MagicMock()
+                self.thread_manager.get_or_create_document_ledger.return_value = MagicMock(
+                    spec=DocumentLedger)
                 for name in ("log_info", "log_debug", "log_warning", "log_error"):
                     setattr(self, name, MagicMock())
 
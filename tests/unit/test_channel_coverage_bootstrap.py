@@ -3,7 +3,7 @@
 Coverage is a promise about how far back the stream can honestly reach, so the sweep only
 ever moves it to the oldest ts of a page it FULLY processed, and only while holding the
 channel's claim. Everything here is about that discipline: a crash mid-page loses nothing, a
-page-ceiling park keeps the claim, and the concurrency semaphore never sits idle across a sleep.
+page-ceiling park keeps the claim, and a concurrency slot never sits idle across a sleep.
 """
 import asyncio
 import time
@@ -99,9 +99,7 @@ def _cfg(**overrides):
 
 
 def _boot(db, web, cfg=None, client=None):
-    boot = ChannelCoverageBootstrap(client or _Client(db, web), db=db, cfg=cfg or _cfg())
-    boot._semaphore = asyncio.Semaphore(max(1, int(boot.config.coverage_sweep_concurrency)))
-    return boot
+    return ChannelCoverageBootstrap(client or _Client(db, web), db=db, cfg=cfg or _cfg())
 
 
 def _page(messages, has_more=False, cursor="", is_limited=False):
@@ -427,7 +425,7 @@ async def test_the_retry_budget_parks_instead_of_spinning(temp_db, sleeps):
     assert (await _coverage(temp_db))["bootstrap_status"] == "complete"
 
 
-async def test_the_semaphore_is_released_across_every_sleep(temp_db, monkeypatch):
+async def test_the_concurrency_slot_is_released_across_every_sleep(temp_db, monkeypatch):
     real_sleep = asyncio.sleep
     observed = []
     web = _Web(pages=[_rate_limited("2"),
@@ -438,7 +436,7 @@ async def test_the_semaphore_is_released_across_every_sleep(temp_db, monkeypatch
                                         history_page_ceiling=1))
 
     async def _fake(delay, *args, **kwargs):
-        observed.append(boot._semaphore.locked())
+        observed.append(boot._concurrency.locked())
         await real_sleep(0)
 
     monkeypatch.setattr(asyncio, "sleep", _fake)
@@ -447,6 +445,69 @@ async def test_the_semaphore_is_released_across_every_sleep(temp_db, monkeypatch
     assert observed and not any(observed)
 
 
+# ------------------------------------------------------------------ adaptive concurrency
+
+async def test_the_limit_climbs_on_clean_pages_and_halves_once_per_429_burst():
+    waiting = []
+    gate = activity_index._AdaptiveConcurrency(2, 4, pressure=lambda: len(waiting))
+    for _ in range(20):
+        gate.on_success()
+    assert gate.limit == 4.0 and gate.allowed() == 4
+    gate.on_rate_limited()
+    gate.on_rate_limited()  # the same burst: one signal, one halving
+    assert gate.limit == 2.0 and gate.decreases == 1
+    waiting.append("a turn")
+    assert gate.allowed() == 1  # a waiting turn gets the history bucket to itself
+
+
+async def test_a_waiting_turn_holds_the_sweep_to_one_page_in_flight():
+    waiting = ["a turn"]
+    gate = activity_index._AdaptiveConcurrency(4, 4, pressure=lambda: len(waiting))
+    entered = []
+
+    async def page(name):
+        async with gate:
+            entered.append(name)
+            await asyncio.sleep(0)
+
+    async with gate:
+        second = asyncio.create_task(page("second"))
+        await asyncio.sleep(0)
+        assert entered == [] and gate.yielded == 1
+        waiting.clear()
+    await second
+    assert entered == ["second"] and gate.in_use == 0
+
+
+async def test_a_rate_limited_sweep_backs_off_and_reports_its_progress(temp_db, sleeps):
+    web = _Web(pages=[_page([_parent(TS_A)], has_more=True, cursor="c1"),
+                      _rate_limited("2"),
+                      _page([_parent(TS_B)], has_more=True, cursor="c2"),
+                      _page([_parent(TS_C)], has_more=True, cursor="c3")])
+    await temp_db.seed_channel_coverage_async(TEAM, CH, SEED)
+    await temp_db.seed_channel_coverage_async(TEAM, "C2", SEED)
+    client = _Client(temp_db, web)
+    client._coverage_seeded_channels = {CH, "C2"}
+    boot = _boot(temp_db, web, cfg=_cfg(coverage_sweep_concurrency=4, history_page_ceiling=3,
+                                        coverage_sweep_max_concurrency=8), client=client)
+    boot._team_id = TEAM
+    assert boot.stats()["eta_seconds"] is None  # nothing walked yet, nothing to extrapolate
+
+    assert await boot._sweep_pass(TEAM, CH, await _claim(temp_db)) == "park"
+
+    stats = boot.stats()
+    assert stats["concurrency"]["decreases"] == 1 and stats["concurrency"]["limit"] < 4
+    assert stats["pages"] == 3 and stats["channels"]["pending"] == 2
+    # CH is parked part-way and C2 has not started: coverage is some way off, but not unknown.
+    assert stats["eta_seconds"] is not None and stats["eta_seconds"] > 0
+
+
+async def _claim(db, channel=CH):
+    token = "tok"
+    assert await db.acquire_coverage_sweep_async(TEAM, channel, token)
+    return token
+
+
 # ------------------------------------------------------------------ discovery & lifecycle
 
 async def test_users_conversations_is_fully_paginated_and_seeds(temp_db, sleeps):
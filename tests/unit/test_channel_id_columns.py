@@ -0,0 +1,106 @@
+"""The generated `channel_id` column on images/documents and the channel-scoped reads built on it.
+
+Every channel-scoped image and document read used to be `thread_id LIKE 'C1:%'`, which no index
+could serve. What has to hold now: the column is derived from the key (so no writer can forget
+it), an upgraded database gets it too, the channel boundary stays exact, and the reads are index
+lookups — checked by running EXPLAIN QUERY PLAN over the statements the accessors really issue.
+"""
+import sqlite3
+
+import aiosqlite
+import pytest
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    manager = DatabaseManager(platform="slack")
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def issued(monkeypatch):
+    """Every (sql, params) an aiosqlite connection executes while the test runs."""
+    statements = []
+    original = aiosqlite.Connection.execute
+
+    def recording(self, sql, parameters=None):
+        statements.append((sql, tuple(parameters or ())))
+        return original(self, sql, parameters)
+
+    monkeypatch.setattr(aiosqlite.Connection, "execute", recording)
+    return statements
+
+
+def _full_scans(db: DatabaseManager, sql: str, params) -> list:
+    """The plan steps that read a whole table. A full-text MATCH is reported as a SCAN of the
+    virtual table with a MATCH constraint (`:M`) — that one is the index doing its job."""
+    steps = [row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    return [s for s in steps if s.startswith("SCAN ") and ":M" not in s
+            and s != "SCAN CONSTANT ROW"]
+
+
+def test_the_column_is_the_channel_half_of_the_key(db):
+    db.save_image_metadata("C1:1700000000.000100", "https://x.test/1.png", "screenshot")
+    db.save_document("D0AB:1700000000.000200", "a.pdf", "application/pdf", summary="s")
+    assert db.conn.execute("SELECT channel_id FROM images").fetchone()[0] == "C1"
+    assert db.conn.execute("SELECT channel_id FROM documents").fetchone()[0] == "D0AB"
+
+
+def test_a_row_that_moves_thread_moves_channel(db):
+    db.save_image_metadata("C1:1.0", "https://x.test/1.png", "screenshot")
+    db.save_image_metadata("C2:1.0", "https://x.test/1.png", "screenshot")
+    assert db.conn.execute("SELECT channel_id FROM images").fetchone()[0] == "C2"
+
+
+def test_an_upgraded_database_gets_the_column_and_indexes(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    legacy = sqlite3.connect(tmp_path / "slack.db")
+    legacy.execute("CREATE TABLE documents (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                   "thread_id TEXT NOT NULL, filename TEXT NOT NULL, mime_type TEXT NOT NULL, "
+                   "summary TEXT, file_id TEXT, url_private TEXT, size_bytes INTEGER, "
+                   "page_structure TEXT, total_pages INTEGER, metadata_json TEXT, "
+                   "message_ts TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+    legacy.execute("INSERT INTO documents (thread_id, filename, mime_type, summary) "
+                   "VALUES ('C9:1.0', 'old.pdf', 'application/pdf', 'kept')")
+    legacy.commit()
+    legacy.close()
+
+    upgraded = DatabaseManager(platform="slack")
+    try:
+        assert upgraded.conn.execute("SELECT channel_id FROM documents").fetchone()[0] == "C9"
+        indexes = {r[0] for r in upgraded.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_images_channel_created", "idx_documents_channel_created",
+                "idx_tool_usage_channel_created", "idx_images_channel_message",
+                "idx_documents_channel_message"} <= indexes
+    finally:
+        upgraded.close()
+
+
+async def test_a_channel_whose_id_prefixes_another_stays_separate(db):
+    db.save_image_metadata("C1:1.0", "https://x.test/one.png", "screenshot")
+    db.save_image_metadata("C12:1.0", "https://x.test/twelve.png", "screenshot")
+    db.save_document("C12:1.0", "twelve.pdf", "application/pdf", summary="s")
+    assert [i["url"] for i in await db.find_channel_images_async("C1")] == [
+        "https://x.test/one.png"]
+    assert await db.get_channel_documents_async("C1") == []
+
+
+@pytest.mark.parametrize("fts", [True, False], ids=["fts", "like-fallback"])
+async def test_no_channel_scoped_read_scans_its_table(db, issued, fts):
+    db._knowledge_fts = fts
+    await db.find_channel_images_async("C1", within_hours=24)
+    await db.get_channel_documents_async("C1")
+    await db.search_channel_documents_async("C1", "quarterly")
+    await db.search_channel_image_analyses_async("C1", "checkout")
+    await db.read_channel_sidecars_for_async("T1", "C1", ["1.0", "2.0"])
+
+    scoped = [(sql, params) for sql, params in issued
+              if " images" in sql or " documents" in sql]
+    assert len(scoped) >= 6
+    for sql, params in scoped:
+        assert _full_scans(db, sql, params) == [], sql
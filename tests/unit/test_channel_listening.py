@@ -177,9 +177,11 @@ async def test_bare_chrome_bot_message_still_dropped(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_edit_and_delete_mark_thread_needs_refresh():
+async def test_edit_and_delete_mark_thread_needs_refresh(monkeypatch):
     # Blocker 1: a message edit/delete must flag the affected thread's warm ThreadState for
-    # rebuild, or it can keep answering from the deleted/pre-edit content.
+    # rebuild, or it can keep answering from the deleted/pre-edit content. With
+    # THREAD_STATE_DELTAS on they become in-place deltas instead (test_thread_state_deltas);
+    # off, the raw-listener feed flags the refetch — ambient memory wired or not.
     from types import SimpleNamespace
 
     from slack_client.event_handlers.message_events import SlackMessageEventsMixin
@@ -206,16 +208,17 @@ async def test_edit_and_delete_mark_thread_needs_refresh():
         def log_debug(self, *a, **k):
             pass
 
+    monkeypatch.setattr(config, "thread_state_deltas", False, raising=False)
     host = _Host()
     # delete: refresh keyed on the deleted message's thread root
-    await host._ambient_ingest(
+    host._feed_thread_state(
         {"subtype": "message_deleted", "channel": "C1", "deleted_ts": "5.0",
-         "previous_message": {"ts": "5.0", "thread_ts": "1.0"}}, object())
+         "previous_message": {"ts": "5.0", "thread_ts": "1.0"}})
     assert "C1:1.0" in refreshed
     # edit: refresh keyed on the edited message's thread root
-    await host._ambient_ingest(
+    host._feed_thread_state(
         {"subtype": "message_changed", "channel": "C1",
-         "message": {"ts": "6.0", "thread_ts": "2.0", "text": "edited text"}}, object())
+         "message": {"ts": "6.0", "thread_ts": "2.0", "text": "edited text"}})
     assert "C1:2.0" in refreshed
 
 
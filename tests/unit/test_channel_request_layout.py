@@ -27,6 +27,7 @@ from message_processor.channel_request import (BATCHED_IMAGE_CAP, IMAGE_TOKEN_BO
                                                estimate_admission, native_file_token_bound,
                                                prompt_cache_key, to_input_items)
 from message_processor.channel_stream import END_MARKER_TEXT, StreamOverBudgetError
+from message_processor.thread_manager import DocumentLedger
 from message_processor.turn_runtime import TurnRuntime
 from tests.unit.channel_turn_harness import (build_stream, file_ref, item_texts,
                                              no_tools_prepared, normalized,
@@ -933,7 +934,8 @@ async def test_the_estimate_runs_before_summarization_and_caps_what_follows():
     processor._summarize_document_for_attach = AsyncMock(
         side_effect=lambda *a, **k: order.append("summarize") or ("SUM " * 400))
     processor._update_status = MagicMock()
-    processor.thread_manager.get_or_create_document_ledger = MagicMock()
+    processor.thread_manager.get_or_create_document_ledger = MagicMock(
+        return_value=MagicMock(spec=DocumentLedger))
     processor._build_channel_info = AsyncMock(return_value=None)
     processor._build_tools_array = MagicMock(return_value=None)
     processor._get_system_prompt = MagicMock(return_value="SYSTEM")
@@ -986,7 +988,8 @@ async def test_a_queued_documents_summary_waits_for_the_catch_up_turns_admission
     processor._summarize_document_for_attach = AsyncMock(
         side_effect=lambda *a, **k: order.append("summarize") or ("SUM " * 400))
     processor._update_status = MagicMock()
-    processor.thread_manager.get_or_create_document_ledger = MagicMock()
+    processor.thread_manager.get_or_create_document_ledger = MagicMock(
+        return_value=MagicMock(spec=DocumentLedger))
     processor._build_channel_info = AsyncMock(return_value=None)
     processor._build_tools_array = MagicMock(return_value=None)
     processor._get_system_prompt = MagicMock(return_value="SYSTEM")
@@ -1034,7 +1037,8 @@ async def test_the_admitted_size_bounds_the_request_that_is_actually_sent():
     processor.db = None
     processor._summarize_document_for_attach = AsyncMock(return_value="verbose prose " * 2000)
     processor._update_status = MagicMock()
-    processor.thread_manager.get_or_create_document_ledger = MagicMock()
+    processor.thread_manager.get_or_create_document_ledger = MagicMock(
+        return_value=MagicMock(spec=DocumentLedger))
     processor._build_channel_info = AsyncMock(return_value=None)
     processor._build_tools_array = MagicMock(return_value=None)
     processor._get_system_prompt = MagicMock(return_value="SYSTEM")
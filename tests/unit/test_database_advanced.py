@@ -293,6 +293,133 @@ class TestDatabaseBackupOperations:
             db_with_backup.conn.rollback()
 
 
+class TestPacedBackup:
+    """The nightly backup: throttled steps that hold no snapshot between them, written under a
+    temporary name until it is whole, retried from scratch when interrupted."""
+
+    @pytest.fixture
+    def db(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+        monkeypatch.setenv("DB_BACKUP_PAGES_PER_STEP", "2")
+        monkeypatch.setenv("DB_BACKUP_STEP_PAUSE_MS", "0")
+        manager = DatabaseManager("test")
+        for i in range(200):
+            manager.save_thread_summary(f"C1:{i}", "x" * 2000, f"{i}.0")
+        yield manager
+        manager.close()
+
+    @staticmethod
+    def _summaries(path):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM thread_summaries").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_a_paced_backup_is_whole_and_leaves_no_partial(self, db):
+        path = db.backup_database(paced=True)
+        assert self._summaries(path) == 200
+        assert not [f for f in os.listdir(f"{db.db_dir}/backups") if f.endswith(".partial")]
+
+    @staticmethod
+    def _between_steps(monkeypatch, each_step):
+        """Run `each_step(remaining)` after every step of the paced copy, inside the pause."""
+        class Stepped(sqlite3.Connection):
+            def backup(self, target, *, pages=-1, progress=None, **kw):
+                def step(status, remaining, total):
+                    each_step(remaining)
+                    progress(status, remaining, total)
+                return super().backup(target, pages=pages,
+                                      progress=step if progress else None, **kw)
+
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, "connect", lambda *a, **kw: connect(
+            *a, **kw, factory=Stepped) if kw.get("uri") else connect(*a, **kw))
+
+    def test_the_wal_checkpoints_between_steps(self, db, monkeypatch):
+        """No snapshot is held across the pause, so a checkpoint can recycle the whole WAL."""
+        writer = sqlite3.connect(db.db_path, isolation_level=None, timeout=0,
+                                 check_same_thread=False)
+        checkpoints = []
+
+        def write_and_checkpoint(remaining):
+            if not checkpoints:
+                writer.execute("INSERT INTO thread_summaries (thread_id, summary_text, "
+                               "boundary_ts) VALUES ('C9:1', 'late', '9.0')")
+                checkpoints.append(
+                    writer.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone())
+
+        self._between_steps(monkeypatch, write_and_checkpoint)
+        path = db.backup_database(paced=True)
+        writer.close()
+        [(busy, frames, copied)] = checkpoints
+        assert busy == 0 and frames == copied
+        assert self._summaries(path) == 201
+
+    def test_writes_that_keep_restarting_the_copy_do_not_stop_it_finishing(self, db, monkeypatch):
+        """A foreign write between steps restarts an online backup from page one; a copy that
+        keeps being restarted finishes in one unpaced step instead of never."""
+        writer = sqlite3.connect(db.db_path, isolation_level=None, check_same_thread=False)
+        steps = []
+
+        def write(remaining):
+            steps.append(remaining)
+            writer.execute("INSERT INTO thread_summaries (thread_id, summary_text, boundary_ts) "
+                           "VALUES (?, 'late', '9.0')", (f"C9:{len(steps)}",))
+
+        self._between_steps(monkeypatch, write)
+        path = db.backup_database(paced=True)
+        writer.close()
+        assert len(steps) < 50
+        assert self._summaries(path) >= 200
+
+    def test_an_interrupted_attempt_is_retried_from_a_fresh_snapshot(self, db, monkeypatch):
+        monkeypatch.setattr(db._backup_stop, "wait", lambda timeout: False)
+        calls = []
+        real = db._copy_in_steps
+
+        def flaky(source, partial, pages, pause):
+            calls.append(partial)
+            if len(calls) == 1:
+                open(partial, "wb").write(b"half a copy")
+                raise sqlite3.OperationalError("disk I/O error")
+            return real(source, partial, pages, pause)
+
+        monkeypatch.setattr(db, "_copy_in_steps", flaky)
+        path = db.backup_database(paced=True)
+        assert len(calls) == 2
+        assert self._summaries(path) == 200
+
+    def test_closing_the_database_abandons_the_copy(self, db, monkeypatch):
+        db._backup_stop.set()
+        with pytest.raises(Exception, match="closing"):
+            db.backup_database(paced=True)
+        assert os.listdir(f"{db.db_dir}/backups") == []
+
+    def test_compact_mode_takes_a_vacuumed_snapshot(self, db, monkeypatch):
+        monkeypatch.setenv("DB_BACKUP_COMPACT", "true")
+        db.conn.execute("DELETE FROM thread_summaries WHERE boundary_ts > '100'")
+        path = db.backup_database(paced=True)
+        conn = sqlite3.connect(path)
+        try:
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+            assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        finally:
+            conn.close()
+
+    def test_only_an_abandoned_partial_is_swept(self, db):
+        backups = f"{db.db_dir}/backups"
+        stale = os.path.join(backups, "test_20260101_000000.db.partial")
+        fresh = os.path.join(backups, "test_20260102_000000.db.partial")
+        for f in (stale, fresh):
+            open(f, "wb").close()
+        day_old = (datetime.now() - timedelta(days=2)).timestamp()
+        os.utime(stale, (day_old, day_old))
+        db.cleanup_old_backups()
+        assert not os.path.exists(stale)
+        assert os.path.exists(fresh)
+
+
 class TestDatabaseEdgeCases:
     """Test edge cases and boundary conditions"""
     
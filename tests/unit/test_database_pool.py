@@ -0,0 +1,121 @@
+"""Pooled async connections in DatabaseManager.
+
+The async accessors used to open a fresh aiosqlite connection — a worker thread, a file open and
+a `journal_mode` PRAGMA — on every call. They now borrow from a fixed pool of readers plus one
+writer. What has to survive the change: the per-call busy-timeout cap, transaction isolation
+between borrowers, and the freedom to nest an accessor inside another one's block.
+"""
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    monkeypatch.setenv("DB_READER_POOL_SIZE", "2")
+    db = DatabaseManager(platform="slack")
+    yield db
+    db.close()
+
+
+async def test_connections_are_reused_across_calls(temp_db):
+    for i in range(20):
+        await temp_db.set_meta_async(f"k{i}", "v")
+        assert await temp_db.get_meta_async(f"k{i}") == "v"
+
+    stats = temp_db.get_pool_stats()
+    assert stats["acquisitions"] == 40
+    # One writer and one reader ever opened — never one connection per call.
+    assert stats["open"] == 2
+    assert stats["readers_in_use"] == 0 and stats["writer_in_use"] == 0
+
+
+async def test_a_full_pool_makes_the_next_borrower_wait_and_says_so(temp_db):
+    release = asyncio.Event()
+    held = asyncio.Event()
+
+    async def hold_reader():
+        async with temp_db._stream_conn() as db:
+            await db.execute("SELECT 1")
+            if temp_db.get_pool_stats()["readers_in_use"] == 2:
+                held.set()
+            await release.wait()
+
+    holders = [asyncio.create_task(hold_reader()) for _ in range(2)]
+    await asyncio.wait_for(held.wait(), 5)
+
+    waiter = asyncio.create_task(temp_db.get_meta_async("missing"))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    assert temp_db.get_pool_stats()["readers_waiting"] == 1
+
+    release.set()
+    assert await asyncio.wait_for(waiter, 5) is None
+    await asyncio.gather(*holders)
+    stats = temp_db.get_pool_stats()
+    assert stats["waited"] == 1
+    assert stats["wait_ms_max"] >= 40
+    assert stats["open"] == 2, "the waiter took a returned reader, it did not open a third"
+
+
+async def test_an_open_transaction_is_rolled_back_before_reuse(temp_db):
+    async with temp_db._stream_conn(write=True) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.execute("INSERT INTO bot_meta (key, value) VALUES ('half', 'written')")
+        # Leave without COMMIT: the next borrower must not inherit this transaction.
+
+    assert await temp_db.get_meta_async("half") is None
+    async with temp_db._stream_conn(write=True) as db:
+        assert not db.in_transaction
+
+
+async def test_a_nested_borrow_never_waits_on_the_pool(temp_db):
+    """The writer is ONE connection; an accessor called from inside a write block must not
+    queue behind the block that is waiting for it."""
+    async with temp_db._stream_conn(write=True):
+        await asyncio.wait_for(temp_db.set_meta_async("inner", "v"), 5)
+    assert await temp_db.get_meta_async("inner") == "v"
+    assert temp_db.get_pool_stats()["overflow"] == 1
+
+
+async def test_legacy_accessors_keep_tuple_rows_and_implicit_transactions(temp_db):
+    async with temp_db._async_conn() as db:
+        assert db.row_factory is None
+        assert db.isolation_level == "DEFERRED"
+    async with temp_db._stream_conn() as db:
+        assert db.isolation_level is None
+
+
+async def test_a_capped_borrow_is_capped_on_a_reused_connection(temp_db):
+    """The cap is set per borrow, not per connection: a writer opened with the house timeout
+    still fails fast for a deadline-bound caller, and goes back to the house value after."""
+    await temp_db.set_meta_async("warm", "v")  # the writer is now open and pooled
+    locker = sqlite3.connect(temp_db.db_path)
+    locker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        with pytest.raises(sqlite3.OperationalError):
+            async with temp_db._stream_conn(write=True, busy_timeout_ms=200) as db:
+                await db.execute("BEGIN IMMEDIATE")
+        assert time.monotonic() - started < 2.0
+    finally:
+        locker.rollback()
+        locker.close()
+
+    async with temp_db._stream_conn(write=True) as db:
+        async with db.execute("PRAGMA busy_timeout") as cursor:
+            assert (await cursor.fetchone())[0] == DatabaseManager.STREAM_BUSY_TIMEOUT_MS
+    assert temp_db.get_pool_stats()["open"] == 1, "the capped borrow reused the warm writer"
+
+
+async def test_close_pool_closes_idle_connections(temp_db):
+    await temp_db.get_meta_async("k")
+    await temp_db.close_pool_async()
+    assert temp_db.get_pool_stats()["open"] == 0
+    # ...and the pool reopens on the next borrow.
+    assert await temp_db.get_meta_async("k") is None
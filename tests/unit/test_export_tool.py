@@ -2,8 +2,11 @@
 
 The properties under test are the ones that make an export trustworthy: the canonical
 authorization gate, complete-or-nothing paging (dedupe, threads under out-of-range roots),
-chunking at the transfer bound rather than truncation, and the dead-container guard.
+chunking at the transfer bound rather than truncation, and the dead-container guard — and, since
+the export streams, that parts are staged while the walk is still going, threads are walked
+concurrently, a failed walk takes its parts back, and several channels are gated one by one.
 """
+import asyncio
 import json
 from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
@@ -339,3 +342,194 @@ class TestRegistration:
         registry = ToolRegistry()
         export_tool.register_export_tool(registry)
         assert registry._tools["export_conversation"]["timeout"] == 600.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestStreaming:
+    async def test_a_part_is_staged_while_history_is_still_paging(self, monkeypatch):
+        monkeypatch.setattr(export_tool, "_max_transfer_bytes", lambda: 80)
+        web = _Web([_page([_msg("300.0", text="x" * 40)], cursor="c1"),
+                    _page([_msg("200.0", text="y" * 40)], cursor="c2"),
+                    _page([_msg("100.0", text="z" * 40)])])
+        ctx, created = _ctx(_client(web))
+        staged_when = []
+        history = web.conversations_history
+
+        async def _watching(**kwargs):
+            staged_when.append(len(created))
+            return await history(**kwargs)
+
+        web.conversations_history = _watching  # type: ignore[method-assign]
+
+        result = await export_tool.execute_export_conversation(ctx, {})
+
+        # The first part was already in the container when the last page was asked for.
+        assert staged_when == [0, 0, 1]
+        assert result["message_count"] == 3 and len(result["paths"]) == 3
+        assert result["oldest_ts"] == "100.0" and result["latest_ts"] == "300.0"
+        assert result["messages_per_second"] > 0
+
+    async def test_threads_are_walked_concurrently_and_each_speaker_resolved_once(self,
+                                                                                 monkeypatch):
+        from config import config as cfg
+
+        monkeypatch.setattr(cfg, "export_reply_concurrency", 3)
+        in_flight, peak = 0, 0
+        roots = [_msg(f"{100 + i}.0", reply_count=1, latest_reply=f"{200 + i}.0")
+                 for i in range(3)]
+        web = _Web([_page(roots)])
+
+        async def _replies(**kwargs):
+            nonlocal in_flight, peak
+            web.replies_calls.append(kwargs)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            root = kwargs["ts"]
+            return _page([_msg(f"{float(root) + 100:.1f}", thread_ts=root)])
+
+        web.conversations_replies = _replies  # type: ignore[method-assign]
+        client = _client(web, names={"U1": "Dana Whitfield"})
+        ctx, created = _ctx(client)
+
+        result = await export_tool.execute_export_conversation(ctx, {})
+
+        assert peak == 3 and result["thread_count"] == 3 and result["message_count"] == 6
+        assert [line["ts"] for line in _lines(created[0][2])] == [
+            "100.0", "101.0", "102.0", "200.0", "201.0", "202.0"]
+        assert client.resolve_usernames.await_count == 1
+
+    async def test_a_walk_that_fails_part_way_takes_back_what_it_staged(self, monkeypatch):
+        from slack_sdk.errors import SlackApiError
+
+        monkeypatch.setattr(export_tool, "_max_transfer_bytes", lambda: 80)
+        web = _Web([])
+
+        async def _boom(**kwargs):
+            web.history_calls.append(kwargs)
+            if len(web.history_calls) < 3:
+                return _page([_msg(f"{300 - len(web.history_calls)}.0", text="x" * 40)],
+                             cursor=f"c{len(web.history_calls)}")
+            raise SlackApiError("nope", SimpleNamespace(
+                data={"error": "channel_not_found"},
+                get=lambda k, d=None: {"error": "channel_not_found"}.get(k, d),
+                headers={}))
+
+        web.conversations_history = _boom  # type: ignore[method-assign]
+        ctx, created = _ctx(_client(web))
+        raw = ctx.processor.openai_client.client
+        raw.containers.files.delete = AsyncMock()
+
+        result = await export_tool.execute_export_conversation(ctx, {})
+
+        assert result["ok"] is False and result["error"] == "history_unavailable"
+        assert len(created) == 1
+        assert raw.containers.files.delete.await_args.args == ("cfile_1",)
+        assert ctx.mounted_files == []
+
+    async def test_a_walk_cancelled_part_way_takes_back_what_it_staged(self, monkeypatch):
+        monkeypatch.setattr(export_tool, "_max_transfer_bytes", lambda: 80)
+        web = _Web([])
+        stalled = asyncio.Event()
+
+        async def _stall(**kwargs):
+            web.history_calls.append(kwargs)
+            if len(web.history_calls) < 3:
+                return _page([_msg(f"{300 - len(web.history_calls)}.0", text="x" * 40)],
+                             cursor=f"c{len(web.history_calls)}")
+            stalled.set()
+            await asyncio.Event().wait()
+
+        web.conversations_history = _stall  # type: ignore[method-assign]
+        ctx, created = _ctx(_client(web))
+        raw = ctx.processor.openai_client.client
+        raw.containers.files.delete = AsyncMock()
+
+        export = asyncio.create_task(export_tool.execute_export_conversation(ctx, {}))
+        await asyncio.wait_for(stalled.wait(), 5)
+        export.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await export
+
+        assert len(created) == 1
+        assert raw.containers.files.delete.await_args.args == ("cfile_1",)
+        assert ctx.mounted_files == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSeveralChannels:
+    async def test_each_channel_gets_its_own_parts_and_a_denied_one_is_reported(self):
+        from slack_client.history_tool import ACCESS_DENIED_MESSAGE
+
+        web = _Web([_page([_msg("100.0")])])
+        client = _client(web)
+        client._authorize_channel_read = AsyncMock(side_effect=lambda cid, ctx: (
+            ("DENY", "not_member") if cid == "C0SECRET9" else ("ALLOW", "both_members")))
+        ctx, created = _ctx(client)
+
+        result = await export_tool.execute_export_conversation(
+            ctx, {"channel_ids": ["C0EXPORT1", "C0OTHER99", "C0SECRET9", "C0EXPORT1"]})
+
+        assert result["ok"] is True and result["message_count"] == 2
+        assert sorted(name for _, name, _ in created) == [
+            "export-C0EXPORT1-part-001.jsonl", "export-C0OTHER99-part-001.jsonl"]
+        assert [c["channel"] for c in result["channels"]] == ["C0EXPORT1", "C0OTHER99",
+                                                              "C0SECRET9"]
+        assert result["channels"][2] == {"channel": "C0SECRET9", "ok": False,
+                                         "error": "not_accessible",
+                                         "message": ACCESS_DENIED_MESSAGE}
+
+    async def test_an_unexpected_failure_stops_every_channel_and_takes_back_all_parts(
+            self, monkeypatch):
+        monkeypatch.setattr(export_tool, "_max_transfer_bytes", lambda: 80)
+        web = _Web([])
+        calls: Dict[str, int] = {}
+
+        async def _history(**kwargs):
+            web.history_calls.append(kwargs)
+            channel = kwargs["channel"]
+            calls[channel] = calls.get(channel, 0) + 1
+            if calls[channel] < 3:
+                return _page([_msg(f"{300 - calls[channel]}.0", text="x" * 40)],
+                             cursor=f"c{calls[channel]}")
+            if channel == "C0OTHER99":
+                await asyncio.Event().wait()  # still walking when the other one breaks
+            return _page([_msg("100.0", text="breaks the serializer")])
+
+        serialize = export_tool._serialize
+
+        def _serialize(client, msg, names, channel_id):
+            if msg.get("text") == "breaks the serializer":
+                raise RuntimeError("unexpected")
+            return serialize(client, msg, names, channel_id)
+
+        monkeypatch.setattr(export_tool, "_serialize", _serialize)
+        web.conversations_history = _history  # type: ignore[method-assign]
+        ctx, created = _ctx(_client(web))
+        raw = ctx.processor.openai_client.client
+        raw.containers.files.delete = AsyncMock()
+
+        result = await export_tool.execute_export_conversation(
+            ctx, {"channel_ids": ["C0EXPORT1", "C0OTHER99"]})
+
+        assert result["ok"] is False and result["error"] == "export_failed"
+        assert len(created) == 2
+        assert sorted(c.args for c in raw.containers.files.delete.await_args_list) == [
+            ("cfile_1",), ("cfile_2",)]
+        assert ctx.mounted_files == []
+
+    async def test_every_channel_denied_is_the_one_canonical_refusal(self):
+        from slack_client.history_tool import ACCESS_DENIED_MESSAGE
+
+        web = _Web([_page([_msg("100.0")])])
+        ctx, created = _ctx(_client(web, verdict="DENY"))
+
+        result = await export_tool.execute_export_conversation(
+            ctx, {"channel_ids": ["C0EXPORT1", "C0OTHER99"]})
+
+        assert result == {"ok": False, "error": "not_accessible",
+                          "message": ACCESS_DENIED_MESSAGE}
+        assert created == [] and web.history_calls == []
@@ -0,0 +1,143 @@
+"""The opt-in group-commit queue for high-frequency writes.
+
+With DB_GROUP_COMMIT on, tool-usage, activity, receipt and ambient-status writes queue behind
+one worker and commit in batches. What has to hold: a caller returns only once its write is
+durable, one failing write does not take its batch-mates down with it, and with the flag off
+nothing is queued at all.
+"""
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from database import DatabaseManager
+
+
+def _status(db: DatabaseManager, ref: str):
+    return db.set_ambient_artifact_status(channel_id="C1", source_ts="1.0", kind="link",
+                                          ref=ref, status="failed", error_code="timeout")
+
+
+def _make(tmp_path, monkeypatch, enabled: bool, window_ms: str = "0") -> DatabaseManager:
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    monkeypatch.setenv("DB_GROUP_COMMIT", "true" if enabled else "false")
+    monkeypatch.setenv("DB_GROUP_COMMIT_WINDOW_MS", window_ms)
+    monkeypatch.setenv("DB_GROUP_COMMIT_MAX_ROWS", "8")
+    return DatabaseManager(platform="slack")
+
+
+@pytest.fixture
+def grouped_db(tmp_path, monkeypatch):
+    db = _make(tmp_path, monkeypatch, enabled=True, window_ms="20")
+    yield db
+    db.close()
+
+
+async def test_concurrent_writes_share_a_commit(grouped_db):
+    for i in range(6):
+        grouped_db.get_or_create_thread(f"C{i}:1.0", f"C{i}")
+
+    await asyncio.gather(*(grouped_db.update_thread_activity_async(f"C{i}:1.0")
+                           for i in range(6)))
+
+    stats = grouped_db.get_pool_stats()["group_commit"]
+    assert stats["writes"] == 6
+    assert stats["batches"] == 1, "six writes inside one window are one transaction"
+    assert stats["queued"] == 0
+
+
+async def test_a_batch_never_exceeds_max_rows(grouped_db):
+    await asyncio.gather(*(_status(grouped_db, f"a{i}")
+                           for i in range(20)))
+    stats = grouped_db.get_pool_stats()["group_commit"]
+    assert stats["writes"] == 20
+    assert stats["max_batch"] <= 8
+
+
+async def test_the_await_is_the_commit(grouped_db):
+    """The returned await is the durability ack: another connection already sees the row."""
+    await grouped_db.save_tool_usage_async("C1", "1.000001", "C1:1.0",
+                                           [{"tool_name": "web_search", "gist": "q"}])
+    other = sqlite3.connect(grouped_db.db_path)
+    try:
+        row = other.execute("SELECT tools_json FROM message_tool_usage WHERE channel_id = 'C1' "
+                            "AND message_ts = '1.000001'").fetchone()
+    finally:
+        other.close()
+    assert row is not None and "web_search" in row[0]
+
+
+async def test_one_failing_write_is_rolled_back_alone(grouped_db):
+    async def good(db, key):
+        await db.execute("INSERT INTO bot_meta (key, value) VALUES (?, 'v')", (key,))
+
+    async def bad(db):
+        await db.execute("INSERT INTO bot_meta (key, value) VALUES ('doomed', 'v')")
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        grouped_db._queued_write(lambda db: good(db, "before")),
+        grouped_db._queued_write(bad),
+        grouped_db._queued_write(lambda db: good(db, "after")),
+        return_exceptions=True)
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+    assert await grouped_db.get_meta_async("before") == "v"
+    assert await grouped_db.get_meta_async("after") == "v"
+    assert await grouped_db.get_meta_async("doomed") is None, "its savepoint was rolled back"
+    stats = grouped_db.get_pool_stats()["group_commit"]
+    assert stats["batches"] == 1 and stats["failed_writes"] == 1
+
+
+async def test_register_receipt_returns_its_transition_through_the_queue(grouped_db):
+    first = await grouped_db.register_receipt_async(
+        "T1", "C1", "1.0", "turn-a", "in_flight", receipt_class="assistant_reply")
+    again = await grouped_db.register_receipt_async(
+        "T1", "C1", "1.0", "turn-b", "in_flight", receipt_class="assistant_reply")
+    assert (first.applied, first.reason) == (True, "inserted")
+    assert (again.applied, again.reason) == (False, "foreign_owner")
+
+
+async def test_a_write_from_inside_a_borrow_bypasses_the_queue(grouped_db):
+    """The worker needs the writer; a caller already holding it must not wait on the worker."""
+    async with grouped_db._stream_conn(write=True):
+        await asyncio.wait_for(_status(grouped_db, "nested"), 5)
+    assert grouped_db.get_pool_stats()["group_commit"]["writes"] == 0
+
+
+async def test_close_pool_flushes_queued_writes(grouped_db):
+    task = asyncio.ensure_future(_status(grouped_db, "late"))
+    await asyncio.sleep(0)
+    await grouped_db.close_pool_async()
+    assert task.done() and task.exception() is None
+
+
+async def test_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("DB_GROUP_COMMIT", raising=False)
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    db = DatabaseManager(platform="slack")
+    try:
+        assert db._group_commit is None
+        db.get_or_create_thread("C1:1.0", "C1")
+        await db.update_thread_activity_async("C1:1.0")
+        assert "group_commit" not in db.get_pool_stats()
+    finally:
+        db.close()
+
+
+def test_a_sync_close_after_the_loop_is_gone_closes_quietly(grouped_db, monkeypatch):
+    grouped_db.get_or_create_thread("C1:1.0", "C1")
+    asyncio.run(grouped_db.update_thread_activity_async("C1:1.0"))
+    worker_errors = []
+    monkeypatch.setattr(threading, "excepthook", worker_errors.append)
+    before = threading.active_count()
+
+    grouped_db.close()
+
+    # The pooled writer's worker thread is gone, and it did not die resolving a future on the
+    # loop that opened it.
+    assert worker_errors == []
+    assert threading.active_count() < before
+    assert grouped_db.get_pool_stats()["open"] == 0
@@ -0,0 +1,261 @@
+"""Speculative history reads during the wake gate's debounce window.
+
+What has to hold: the pages a prefetch reads are the ones the turn then finds in the page cache,
+marked as prefetched, with the time they saved and the time the turn waited on them both on the
+turn's tally; a newer arrival in the channel cancels the older prefetch and an older one never
+replaces a newer; a decline cancels it; and the per-channel allowance caps what speculation may
+spend. In `stream` mode the prefetch asks every question the turn's build will, reply fan-out
+included, and writes nothing; and a prefetch's pages are counted once, as claimed by the turn it
+woke or wasted by the decline that retired it.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from config import config
+from message_processor.history_prefetch import HistoryPrefetcher
+from slack_client import admission_watermark, history_fetch
+from slack_client import page_cache as page_cache_module
+from slack_client.history_fetch import page_messages
+from slack_client.page_cache import SlackPageCache, begin_turn, end_turn
+
+
+class _Web:
+    def __init__(self, delay=0.02):
+        self.token = "xoxb-test"
+        self.delay = delay
+        self.calls = []
+
+    async def conversations_history(self, **kwargs):
+        self.calls.append(("history", kwargs))
+        await asyncio.sleep(self.delay)
+        return {"ok": True, "messages": [{"ts": "100.0", "text": "root", "reply_count": 1}]}
+
+    async def conversations_replies(self, **kwargs):
+        self.calls.append(("replies", kwargs))
+        await asyncio.sleep(self.delay)
+        return {"ok": True, "messages": [{"ts": "100.0", "text": "root"},
+                                         {"ts": "101.0", "thread_ts": "100.0", "text": "reply"}]}
+
+
+class _Db:
+    async def read_channel_window_anchor_async(self, team_id, channel_id):
+        return None
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = SlackPageCache(ttl_s=30.0, max_bytes=1 << 20)
+    monkeypatch.setattr(page_cache_module, "page_cache", fresh)
+    monkeypatch.setattr(history_fetch, "page_cache", fresh)
+    monkeypatch.setattr(config, "participation_prefetch_pages", 4)
+    monkeypatch.setattr(config, "participation_prefetch_pages_per_minute", 12)
+    monkeypatch.setattr(admission_watermark, "pin",
+                        lambda channel_id, ts: admission_watermark.HPin(h=str(ts), frontier=0))
+    return fresh
+
+
+async def _settled(prefetcher):
+    await asyncio.gather(*(p.task for p in list(prefetcher._live.values())),
+                         return_exceptions=True)
+
+
+async def test_the_turn_reads_what_the_prefetch_fetched(cache):
+    web, prefetcher = _Web(), HistoryPrefetcher()
+    assert prefetcher.start(web, _Db(), "C1", "101.0", "100.0")
+    token = begin_turn()
+    waited = await prefetcher.claim("C1", "101.0")
+    await page_messages(web.conversations_replies, channel_id="C1", latest="101.0",
+                        inclusive=True, extra_params={"ts": "100.0"})
+    tally = end_turn(token)
+    assert sorted(kind for kind, _ in web.calls) == ["history", "replies"]
+    assert (tally.hits, tally.misses, tally.prefetched) == (1, 0, 1)
+    assert tally.prefetch_saved_ms >= 10 and tally.prefetch_wait_ms == pytest.approx(waited)
+    assert "1 prefetched" in tally.summary()
+    assert cache.stats()["prefetch_hits"] == 1
+
+
+async def test_a_newer_arrival_supersedes_and_an_older_one_does_not(cache):
+    web, prefetcher = _Web(delay=5.0), HistoryPrefetcher()
+    assert prefetcher.start(web, _Db(), "C1", "101.0", "100.0")
+    first = prefetcher._live["C1"].task
+    assert prefetcher.start(web, _Db(), "C1", "102.0", "100.0")
+    await asyncio.sleep(0)
+    assert first.cancelled() or first.cancelling()
+    assert not prefetcher.start(web, _Db(), "C1", "101.5", "100.0")
+    assert prefetcher._live["C1"].ts == "102.0"
+    prefetcher.cancel("C1", "102.0", reason="test")
+
+
+async def test_a_decline_cancels_its_prefetch(cache):
+    web, prefetcher = _Web(delay=5.0), HistoryPrefetcher()
+    prefetcher.start(web, _Db(), "C1", "101.0", "100.0")
+    task = prefetcher._live["C1"].task
+    prefetcher.cancel("C1", "100.5", reason="superseded")  # not its ts: left alone
+    assert not task.done()
+    prefetcher.cancel("C1", "101.0", reason="silence")
+    await asyncio.gather(task, return_exceptions=True)
+    assert task.cancelled() and prefetcher.stats()["live"] == 0
+    assert cache.stats()["entries"] == 0
+
+
+async def test_the_per_channel_allowance_caps_speculation(cache, monkeypatch):
+    monkeypatch.setattr(config, "participation_prefetch_pages_per_minute", 4)
+    web, prefetcher = _Web(delay=0), HistoryPrefetcher()
+    assert prefetcher.start(web, _Db(), "C1", "101.0", "100.0")
+    await _settled(prefetcher)
+    cache.invalidate_event({"type": "message", "channel": "C1", "ts": "102.0"})
+    assert prefetcher.start(web, _Db(), "C1", "102.0", "100.0")
+    await _settled(prefetcher)
+    assert not prefetcher.start(web, _Db(), "C1", "103.0", "100.0")
+    assert prefetcher.start(web, _Db(), "C2", "103.0", "100.0")  # another channel's own minute
+    await _settled(prefetcher)
+    assert prefetcher.stats()["skipped_budget"] == 1
+
+
+async def test_prefetch_off_or_no_cache_starts_nothing(cache, monkeypatch):
+    web, prefetcher = _Web(), HistoryPrefetcher()
+    monkeypatch.setattr(config, "participation_prefetch_pages", 0)
+    assert not prefetcher.start(web, _Db(), "C1", "101.0", "100.0")
+    monkeypatch.setattr(config, "participation_prefetch_pages", 4)
+    monkeypatch.setattr(page_cache_module, "page_cache", SlackPageCache(ttl_s=0, max_bytes=1))
+    assert not prefetcher.start(web, _Db(), "C1", "101.0", "100.0")
+    assert web.calls == [] and await prefetcher.claim("C1", "101.0") == 0.0
+
+
+# ------------------------------------------------------------------ the `stream` mode
+
+
+class _StreamWeb:
+    """A Slack web client with a token, so its pages are cacheable: one channel, two threads."""
+
+    def __init__(self):
+        from tests.unit.test_reconsideration_snapshot import raw
+
+        self.token = "xoxb-test"
+        self.calls = []
+        self.history = [raw(_ROOT_A, reply_count=1, latest_reply=_REPLY_A),
+                        raw(_ROOT_B, reply_count=1, latest_reply=_REPLY_B)]
+        self.threads = {_ROOT_A: [raw(_ROOT_A, reply_count=1), raw(_REPLY_A, root=_ROOT_A)],
+                        _ROOT_B: [raw(_ROOT_B, reply_count=1), raw(_REPLY_B, root=_ROOT_B)]}
+
+    async def conversations_history(self, **kwargs):
+        self.calls.append(("history", kwargs.get("oldest")))
+        return {"ok": True, "messages": list(reversed(self.history))}
+
+    async def conversations_replies(self, **kwargs):
+        self.calls.append(("replies", kwargs["ts"]))
+        return {"ok": True, "messages": self.threads[kwargs["ts"]]}
+
+
+_ROOT_A, _REPLY_A = "1700000100.000000", "1700000200.000000"
+_ROOT_B, _REPLY_B = "1700000300.000000", "1700000400.000000"
+
+
+def _stream_client():
+    from tests.unit.test_reconsideration_snapshot import _Client
+
+    client = _Client()
+    client.app = SimpleNamespace(client=_StreamWeb())
+    return client
+
+
+async def _turn_reads(client, db, trigger_ts, origin_root_ts):
+    """What a woken turn's build reads, and how much of it Slack had to answer."""
+    from message_processor import channel_stream
+    from tests.unit.test_reconsideration_snapshot import CH, TEAM
+
+    token = begin_turn()
+    await channel_stream.build_reconsideration_snapshot(
+        client=client, db=db, team_id=TEAM, channel_id=CH, trigger_ts=trigger_ts,
+        origin_root_ts=origin_root_ts)
+    return end_turn(token)
+
+
+async def test_stream_mode_leaves_the_turn_nothing_to_ask_slack(cache, monkeypatch):
+    from tests.unit.test_reconsideration_snapshot import CH, H, _db
+
+    monkeypatch.setattr(config, "participation_prefetch_mode", "stream")
+    monkeypatch.setattr(config, "participation_prefetch_pages", 10)
+    client, db, prefetcher = _stream_client(), _db(), HistoryPrefetcher()
+
+    assert prefetcher.start(client, db, CH, H, _ROOT_A)
+    await _settled(prefetcher)
+    asked = list(client.app.client.calls)
+    # The whole build's questions: the walk, the origin, and the fan-out over BOTH threads.
+    assert ("replies", _ROOT_B) in asked and ("history", "1700000000.000000") in asked
+    db.advance_channel_window_anchor_async.assert_not_called()  # speculation writes nothing
+    db.clear_thread_dirty_async.assert_not_called()
+
+    tally = await _turn_reads(client, db, H, _ROOT_A)
+    assert client.app.client.calls == asked
+    assert tally.misses == 0 and tally.prefetched == tally.hits == len(asked)
+
+
+async def test_pages_mode_leaves_the_fan_out_to_the_turn(cache, monkeypatch):
+    from tests.unit.test_reconsideration_snapshot import CH, H, _db
+
+    monkeypatch.setattr(config, "participation_prefetch_mode", "pages")
+    monkeypatch.setattr(config, "participation_prefetch_pages", 10)
+    client, db, prefetcher = _stream_client(), _db(), HistoryPrefetcher()
+
+    assert prefetcher.start(client, db, CH, H, _ROOT_A)
+    await _settled(prefetcher)
+    assert ("replies", _ROOT_B) not in client.app.client.calls
+
+    tally = await _turn_reads(client, db, H, _ROOT_A)
+    assert tally.prefetched == 2  # the walk and the origin
+    assert tally.misses >= 1      # the other thread's replies: the turn asked for them itself
+    assert prefetcher.stats()["mode"] == "pages"
+
+
+async def test_claimed_and_declined_pages_are_accounted_apart(cache):
+    web, prefetcher = _Web(delay=0), HistoryPrefetcher()
+
+    # Finished before the classifier answered: still the claiming turn's pages.
+    assert prefetcher.start(web, _Db(), "C1", "101.0", "100.0")
+    await _settled(prefetcher)
+    token = begin_turn()
+    await prefetcher.claim("C1", "101.0")
+    await page_messages(web.conversations_replies, channel_id="C1", latest="101.0",
+                        inclusive=True, extra_params={"ts": "100.0"})
+    prefetcher.credit(end_turn(token))
+
+    # Declined after it finished: its pages were thrown away.
+    assert prefetcher.start(web, _Db(), "C2", "101.0", "100.0")
+    await _settled(prefetcher)
+    prefetcher.cancel("C2", "101.0", reason="silence")
+    prefetcher.cancel("C2", "101.0", reason="silence")  # counted once
+
+    stats = prefetcher.stats()
+    assert (stats["claimed"], stats["pages_claimed"]) == (1, 2)
+    assert (stats["declined"], stats["pages_wasted"]) == (1, 2)
+    assert stats["woken_turns"] == 1
+    assert stats["saved_ms_per_woken_turn"] is not None
+    assert stats["wasted_pages_per_declined_turn"] == 2.0
+
+
+async def test_a_stream_prefetch_waits_in_the_drain_no_longer_than_its_budget(cache, monkeypatch):
+    import time
+
+    from message_processor import channel_stream
+    from tests.unit.test_reconsideration_snapshot import CH, TEAM, H, _db
+
+    waited = []
+
+    async def _drain(channel_id, frontier, timeout=None):
+        waited.append(timeout)
+        raise history_fetch.HistoryFetchError("drain timed out")
+
+    monkeypatch.setattr(admission_watermark, "drain", _drain)
+    budget = history_fetch.FetchBudget(deadline_at=time.monotonic() + 2.0, page_ceiling=10)
+
+    with pytest.raises(history_fetch.HistoryFetchError):
+        await channel_stream.prefetch_channel_turn_stream(
+            client=_stream_client(), db=_db(), team_id=TEAM, channel_id=CH, h=H,
+            origin_root_ts=_ROOT_A, trigger_ts=H, budget=budget, drain_timeout=30.0)
+
+    assert len(waited) == 1 and 0 < waited[0] <= 2.0
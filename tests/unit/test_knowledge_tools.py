@@ -51,18 +51,40 @@ def _img(**kw: Any) -> Dict[str, Any]:
     return row
 
 
+def _shared(**kw: Any) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "id": 3,
+        "channel_id": CHANNEL,
+        "source_ts": "1740795000.000300",
+        "conversation_ts": "1740795000.000300",
+        "kind": "link",
+        "ref": "https://vendor.test/pricing",
+        "title": "Vendor pricing",
+        "summary": "Enterprise pricing tiers; the annual plan drops to four seats minimum.",
+        "status": "ready",
+        "created_at": "2026-03-05 12:00:00",
+    }
+    row.update(kw)
+    return row
+
+
 class _DB:
     """A database double recording the exact arguments each accessor was called with."""
 
     def __init__(self, docs: Optional[List[Dict]] = None, images: Optional[List[Dict]] = None,
                  doc_error: Optional[Exception] = None,
-                 image_error: Optional[Exception] = None):
+                 image_error: Optional[Exception] = None,
+                 ambient: Optional[List[Dict]] = None,
+                 ambient_error: Optional[Exception] = None):
         self._docs = list(docs or [])
         self._images = list(images or [])
+        self._ambient = list(ambient or [])
         self._doc_error = doc_error
         self._image_error = image_error
+        self._ambient_error = ambient_error
         self.doc_calls: List[tuple] = []
         self.image_calls: List[tuple] = []
+        self.ambient_calls: List[tuple] = []
 
     async def search_channel_documents_async(self, channel_id, query, limit=10):
         self.doc_calls.append((channel_id, query, limit))
@@ -76,6 +98,12 @@ class _DB:
             raise self._image_error
         return list(self._images)
 
+    async def search_channel_ambient_artifacts_async(self, channel_id, query, limit=10):
+        self.ambient_calls.append((channel_id, query, limit))
+        if self._ambient_error:
+            raise self._ambient_error
+        return list(self._ambient)
+
 
 def _client(verdict: str = "ALLOW", permalink: Optional[str] = "https://slack.test/archives/p1"):
     web = MagicMock()
@@ -113,7 +141,7 @@ class TestAuthorization:
         assert result["ok"] is False and result["error"] == "not_accessible"
         assert result["message"] == ACCESS_DENIED_MESSAGE
         # The gate is not advisory: nothing was read, so nothing could leak through the result.
-        assert db.doc_calls == [] and db.image_calls == []
+        assert db.doc_calls == [] and db.image_calls == [] and db.ambient_calls == []
 
     async def test_a_redirect_is_indistinguishable_from_a_denial(self):
         deny = await _run(_client(verdict="DENY"), _DB(docs=[_doc()]))
@@ -256,11 +284,34 @@ class TestResultContract:
         assert "holiday calendar" not in str(hit)
         assert "filename" in hit["note"]
 
-    async def test_results_from_both_stores_are_merged_newest_first(self):
+    async def test_a_link_shared_in_passing_is_informational_with_its_url(self):
+        result = await _run(_client(), _DB(ambient=[_shared()]), {"query": "seats"})
+        hit = result["results"][0]
+        assert (hit["kind"], hit["source"], hit["matched_in"]) == (
+            "link", "shared in passing", "summary")
+        assert hit["url"] == "https://vendor.test/pricing"
+        assert "four seats" in hit["summary_snippet"]
+        assert hit["permalink"] == "https://slack.test/archives/p1"
+        # A top-level message is its own conversation: no thread to point at.
+        assert "thread_ts" not in hit
+        assert not any(key in hit for key in ("image_id", "id", "file_id"))
+
+    async def test_an_image_shared_in_passing_carries_no_handle(self):
+        row = _shared(kind="image", ref="F0AMB0001", title="whiteboard.png",
+                      summary="A whiteboard sketch of the release train.",
+                      conversation_ts="1740790000.000200")
+        result = await _run(_client(), _DB(ambient=[row]), {"query": "release train"})
+        hit = result["results"][0]
+        assert hit["kind"] == "image" and hit["thread_ts"] == "1740790000.000200"
+        assert "url" not in hit and "F0AMB0001" not in str(hit)
+
+    async def test_results_from_every_store_are_merged_newest_first(self):
         old_doc = _doc(created_at="2026-03-01 10:00:00")
         new_image = _img(created_at="2026-03-09 10:00:00")
-        result = await _run(_client(), _DB(docs=[old_doc], images=[new_image]), {"query": "e"})
-        assert [h["kind"] for h in result["results"]] == ["image", "document"]
+        link = _shared(created_at="2026-03-05 12:00:00")
+        result = await _run(_client(), _DB(docs=[old_doc], images=[new_image], ambient=[link]),
+                            {"query": "e"})
+        assert [h["kind"] for h in result["results"]] == ["image", "link", "document"]
 
     async def test_the_merged_list_honours_the_requested_limit(self):
         docs = [_doc(id=i, file_id=f"F{i}", created_at=f"2026-03-0{i} 10:00:00")
@@ -288,8 +339,16 @@ class TestHonestyAboutMisses:
         assert len(result["results"]) == 1
         assert "image descriptions" in result["incomplete"]
 
-    async def test_both_stores_failing_is_a_failure_not_an_empty_answer(self):
-        db = _DB(doc_error=RuntimeError("boom"), image_error=RuntimeError("boom"))
+    async def test_two_failed_stores_are_both_named(self):
+        db = _DB(ambient=[_shared()], doc_error=RuntimeError("boom"),
+                 image_error=RuntimeError("boom"))
+        result = await _run(_client(), db, {"query": "pricing"})
+        assert result["ok"] is True and result["results"][0]["kind"] == "link"
+        assert "documents or the image descriptions" in result["incomplete"]
+
+    async def test_every_store_failing_is_a_failure_not_an_empty_answer(self):
+        db = _DB(doc_error=RuntimeError("boom"), image_error=RuntimeError("boom"),
+                 ambient_error=RuntimeError("boom"))
         result = await _run(_client(), db, {"query": "pricing"})
         assert result["ok"] is False and result["error"] == "lookup_failed"
 
@@ -460,6 +519,80 @@ class TestStoreQueries:
         rows = await real_db.search_channel_documents_async("C1", "quarterly", limit=2)
         assert [d["filename"] for d in rows] == ["doc5.pdf", "doc4.pdf"]
 
+    async def test_the_search_is_an_index_lookup_not_a_scan(self, real_db):
+        assert real_db._knowledge_fts
+        sql, params = real_db._knowledge_search_sql(
+            "documents", "t.thread_id LIKE ?", ("C1:%",), "quarterly", 10)
+        plan = " | ".join(r[3] for r in real_db.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        assert "VIRTUAL TABLE INDEX" in plan and "SCAN t" not in plan
+
+    async def test_a_query_too_short_for_a_trigram_still_matches(self, real_db):
+        real_db.save_document("C1:111.0", "q3.pdf", "application/pdf", summary="Q3 numbers",
+                              file_id="FA")
+        real_db.conn.close()
+        assert [d["filename"] for d in
+                await real_db.search_channel_documents_async("C1", "q3")] == ["q3.pdf"]
+
+    async def test_fts_syntax_in_the_query_is_literal_text(self, real_db):
+        real_db.save_document("C1:111.0", "a.pdf", "application/pdf",
+                              summary='the "alpha OR beta" clause', file_id="FA")
+        real_db.save_document("C1:222.0", "b.pdf", "application/pdf", summary="alpha only",
+                              file_id="FB")
+        real_db.conn.close()
+        found = await real_db.search_channel_documents_async("C1", '"alpha OR beta"')
+        assert [d["filename"] for d in found] == ["a.pdf"]
+
+    async def test_the_better_match_ranks_first(self, real_db):
+        real_db.save_document("C1:111.0", "misc.pdf", "application/pdf",
+                              summary="Notes from the offsite, one line on the roadmap and "
+                                      "a great deal about lunch, travel and the venue.",
+                              file_id="FA")
+        real_db.save_document("C1:222.0", "roadmap.pdf", "application/pdf",
+                              summary="The roadmap: roadmap themes, roadmap dates.", file_id="FB")
+        real_db.conn.execute("UPDATE documents SET created_at = '2026-03-01' WHERE file_id = 'FB'")
+        real_db.conn.close()
+        found = await real_db.search_channel_documents_async("C1", "roadmap")
+        assert [d["filename"] for d in found] == ["roadmap.pdf", "misc.pdf"]
+
+    async def test_the_index_follows_updates_and_deletes(self, real_db):
+        real_db.save_image_metadata("C1:111.0", "https://x.test/1.png", "screenshot",
+                                    analysis="A login form")
+        real_db.conn.execute("UPDATE images SET analysis = 'A checkout page'")
+        real_db.save_document("C1:111.0", "gone.pdf", "application/pdf", summary="invoice",
+                              file_id="FA")
+        real_db.conn.execute("DELETE FROM documents")
+        real_db.conn.close()
+
+        assert await real_db.search_channel_image_analyses_async("C1", "login") == []
+        assert len(await real_db.search_channel_image_analyses_async("C1", "checkout")) == 1
+        assert await real_db.search_channel_documents_async("C1", "invoice") == []
+
+    async def test_ambient_artifacts_are_searched_ready_and_same_channel_only(self, real_db):
+        for channel, ts, status in (("C1", "1.0", "ready"), ("C2", "2.0", "ready"),
+                                    ("C1", "3.0", "failed")):
+            real_db.conn.execute(
+                "INSERT INTO ambient_artifacts (channel_id, source_ts, conversation_ts, kind, "
+                "ref, title, summary, status) VALUES (?, ?, ?, 'link', ?, 'Pricing', "
+                "'Enterprise pricing tiers', ?)", (channel, ts, ts, f"https://x.test/{ts}", status))
+        real_db.conn.close()
+
+        found = await real_db.search_channel_ambient_artifacts_async("C1", "pricing")
+        assert [a["source_ts"] for a in found] == ["1.0"]
+
+    async def test_an_existing_database_is_indexed_on_upgrade(self, real_db):
+        real_db.save_document("C1:111.0", "old.pdf", "application/pdf", summary="legacy memo",
+                              file_id="FA")
+        for trigger in ("documents_fts_ai", "documents_fts_ad", "documents_fts_au"):
+            real_db.conn.execute(f"DROP TRIGGER {trigger}")
+        real_db.conn.execute("DROP TABLE documents_fts")
+        real_db.conn.execute("INSERT INTO documents (thread_id, filename, mime_type, summary) "
+                             "VALUES ('C1:222.0', 'older.pdf', 'application/pdf', 'legacy memo')")
+        real_db.init_schema()
+        real_db.conn.close()
+
+        found = await real_db.search_channel_documents_async("C1", "legacy memo")
+        assert sorted(d["filename"] for d in found) == ["old.pdf", "older.pdf"]
+
     async def test_an_empty_query_or_channel_returns_nothing_rather_than_everything(self,
                                                                                    real_db):
         real_db.save_document("C1:111.0", "a.pdf", "application/pdf", summary="anything",
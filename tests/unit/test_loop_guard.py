@@ -0,0 +1,192 @@
+"""No synchronous sqlite on the event-loop thread.
+
+`DatabaseManager.conn` is a plain sqlite3 connection: a statement on it runs on the calling
+thread, and on the loop thread that stalls Socket Mode for as long as it waits on the write lock.
+DB_LOOP_GUARD installs `_LoopCallDetector` as that connection's trace callback. What has to
+hold: a sync call from a coroutine is flagged with its call site, an offloaded one is not, and
+the database work a turn does — reads, document rows, artifact and catalog rows, MCP discovery,
+tool usage, receipts — runs no statement on the loop at all, and neither does a whole DM turn
+through `process_message` with the model and the platform client stubbed out.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from database import DatabaseManager
+from message_processor import artifacts
+from message_processor.base import MessageProcessor
+from message_processor.client_contract import BaseClient, Message
+from message_processor.thread_files import catalog_unattended
+from message_processor.thread_manager import DocumentLedger
+from openai_client.mcp_manager import MCPManager
+
+THREAD = "C1:100.0"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    monkeypatch.setenv("DB_LOOP_GUARD", "true")
+    manager = DatabaseManager(platform="slack")
+    yield manager
+    manager.close()
+
+
+def _calls(db):
+    return db.get_loop_call_stats()["calls"]
+
+
+async def test_a_sync_call_from_a_coroutine_is_flagged_with_its_call_site(db):
+    db.get_thread_config(THREAD)
+    stats = db.get_loop_call_stats()
+    assert stats["calls"] == 1
+    [site] = stats["sites"]
+    assert site.startswith("get_thread_config <- tests/unit/test_loop_guard.py:")
+
+
+async def test_an_offloaded_call_is_not_flagged(db):
+    await asyncio.to_thread(db.get_thread_config, THREAD)
+    assert _calls(db) == 0
+
+
+def test_outside_a_loop_nothing_is_flagged(db):
+    db.get_thread_config(THREAD)
+    assert _calls(db) == 0
+
+
+def test_the_guard_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    manager = DatabaseManager(platform="slack")
+    try:
+        assert manager.get_loop_call_stats() is None
+    finally:
+        manager.close()
+
+
+async def test_a_turns_database_calls_run_no_sqlite_on_the_loop(db):
+    message = Message(text="see attached", user_id="U1", channel_id="C1", thread_id="100.0",
+                      metadata={"ts": "101.0"},
+                      attachments=[{"type": "file", "id": "F1", "name": "plan.pdf",
+                                    "mimetype": "application/pdf",
+                                    "url_private": "https://files.slack.com/F1"},
+                                   {"type": "image", "id": "F2", "name": "chart.png",
+                                    "mimetype": "image/png",
+                                    "url_private": "https://files.slack.com/F2"}])
+
+    # The reads every channel turn makes before it calls the model
+    await db.get_or_create_thread_async(THREAD, "C1", "U1")
+    await db.get_thread_config_async(THREAD)
+    await db.get_channel_settings_async("C1")
+    await db.get_channel_policy_async("C1")
+    await db.get_channel_memory_async("C1")
+    await db.get_user_preferences_async("U1")
+
+    # The files: catalogued, then read and summarized, then a slimmed row re-hydrated
+    await catalog_unattended(SimpleNamespace(db=db), None, message)
+    await DocumentLedger(thread_ts="100.0").add_document_async(
+        content="text", filename="plan.pdf", mime_type="application/pdf",
+        summary="A two-page plan.", db=db, thread_id=THREAD, message_ts="101.0",
+        file_id="F1", url_private="https://files.slack.com/F1")
+    await db.restore_document_derived_async(THREAD, "plan.pdf", summary="Re-read.")
+
+    # What the reply leaves behind
+    await MCPManager(db=db).cache_discovered_tools_payload_async(
+        "docs", [{"name": "search", "description": "Search the docs", "input_schema": {}}])
+    await artifacts._persist(db, ext="csv", filename="totals.csv", thread_key=THREAD,
+                             upload={"file_id": "F9", "url_private": "https://files/F9"},
+                             size=12, message_ts="102.0")
+    await db.save_tool_usage_async("C1", "102.0", THREAD, [{"tool_name": "web_search"}])
+    await db.update_thread_activity_async(THREAD)
+    await db.register_receipt_async("T1", "C1", "102.0", "s1:1", "finalized", "100.0",
+                                    receipt_class=None)
+
+    assert db.get_loop_call_stats() == {"calls": 0, "sites": {}}
+    docs = {d["filename"]: d["summary"] for d in await db.get_thread_documents_async(THREAD)}
+    assert docs == {"plan.pdf": "Re-read.", "totals.csv": "Generated by the assistant (totals.csv)."}
+    assert [t["tool_name"] for t in db.get_mcp_tools()] == ["search"]
+
+
+async def test_positional_arguments_reach_the_document_row(db):
+    await DocumentLedger(thread_ts="100.0").add_document_async(
+        "text", "plan.pdf", "application/pdf", None, None, "A plan.", None, None,
+        db, THREAD, "101.0", "F1")
+
+    [row] = await db.get_thread_documents_async(THREAD)
+    assert (row["message_ts"], row["file_id"]) == ("101.0", "F1")
+
+
+class _Client(BaseClient):
+    """Just enough of a platform client for a DM turn; no history, no network."""
+
+    def __init__(self):
+        super().__init__("guard")
+        self.sent = []
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def send_message(self, channel_id, thread_id, text, **kwargs):
+        self.sent.append(text)
+        return True
+
+    async def send_message_async(self, channel_id, thread_id, text, **kwargs):
+        return await self.send_message(channel_id, thread_id, text, **kwargs)
+
+    async def send_image(self, *args, **kwargs):
+        return None
+
+    async def send_image_async(self, *args, **kwargs):
+        return None
+
+    async def send_thinking_indicator(self, *args, **kwargs):
+        return "100.5"
+
+    async def send_thinking_indicator_async(self, *args, **kwargs):
+        return "100.5"
+
+    async def update_message(self, channel_id, message_id, text, **kwargs):
+        self.sent.append(text)
+        return True
+
+    async def delete_message(self, channel_id, message_id):
+        return True
+
+    async def get_thread_history(self, channel_id, thread_id, limit=None, **kwargs):
+        return []
+
+    async def download_file(self, *args, **kwargs):
+        return None
+
+    async def download_file_async(self, *args, **kwargs):
+        return None
+
+    def format_text(self, text):
+        return text
+
+
+async def test_a_real_turn_runs_no_sqlite_on_the_loop(db):
+    answered = asyncio.Event()
+
+    async def _reply(**kwargs):
+        answered.set()
+        return {"text": "The rollout notes are in the usual doc.", "tools_used": []}
+
+    model = MagicMock()
+    model.create_text_response_with_tools = AsyncMock(side_effect=_reply)
+    with patch("message_processor.base.OpenAIClient", return_value=model):
+        processor = MessageProcessor(db=db)
+    message = Message(text="Where are the rollout notes?", user_id="U1", channel_id="D1",
+                      thread_id="100.0", metadata={"ts": "100.0", "username": "dana"})
+
+    response = await processor.process_message(message, _Client())
+    await asyncio.wait_for(answered.wait(), timeout=5)
+    await processor.drain_background_tasks()  # what the turn left to background tasks
+
+    assert (response.type, response.content) == ("text", "The rollout notes are in the usual doc.")
+    model.create_text_response_with_tools.assert_awaited_once()
+    assert db.get_loop_call_stats() == {"calls": 0, "sites": {}}
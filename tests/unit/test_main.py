@@ -1030,7 +1030,7 @@ class TestChatBotV2CleanupTaskCoverage:
         await bot.cleanup_task
 
         # Untagged so cleanup_old_backups()'s 7-day retention prunes it
-        bot.processor.db.backup_database.assert_called_once_with()
+        bot.processor.db.backup_database.assert_called_once_with(paced=True)
         mock_logger.info.assert_any_call(
             "Scheduled database backup complete (7-day retention)")
 
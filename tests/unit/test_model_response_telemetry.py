@@ -27,6 +27,7 @@ from message_processor.handlers import text as text_handler
 from message_processor.turn_runtime import TurnRuntime
 from openai_client.api import responses as R
 from openai_client.api import tool_loop
+from message_processor.thread_manager import DocumentLedger
 from message_processor.tool_registry import ToolContext, ToolRegistry
 
 
@@ -500,6 +501,8 @@ async def test_an_attached_documents_summary_is_an_attempt_on_the_turn(rows):
 
     host = MagicMock()
     host.openai_client = _OpenAI()
+    host.thread_manager.get_or_create_document_ledger.return_value = MagicMock(
+        spec=DocumentLedger)
     host.log_warning = host.log_info = host.log_debug = lambda *a, **k: None
     host.finalize_deferred_documents = U.finalize_deferred_documents.__get__(host)
     host._finalize_document_summary = U._finalize_document_summary.__get__(host)
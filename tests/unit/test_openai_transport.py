@@ -0,0 +1,155 @@
+"""The pooled, kept-warm HTTP transport every OpenAI call goes through.
+
+The transport earns its place only if the pool really holds connections across requests and the
+warm-up really opens them ahead of a turn — so these tests drive it through a real `AsyncOpenAI`
+against the local OpenAI stand-in over loopback, and read the answer off its own trace counters.
+
+What has to hold: back-to-back requests ride one connection, a streamed reply read to the end
+hands its connection back, the boot warm-up opens one connection per concurrent probe, the
+keep-alive probes only after an idle gap and never while traffic flows, an error status still
+counts as an answered probe while a dead host counts as a failure, and the client's close()
+cancels the warming task it started.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from openai import AsyncOpenAI
+
+from openai_client.transport import OpenAITransport
+from tools.fake_openai import FakeOpenAI
+
+
+@pytest.fixture
+async def model():
+    fake = FakeOpenAI(deltas=3)
+    await fake.start()
+    yield fake
+    await fake.stop()
+
+
+@pytest.fixture
+async def transport():
+    pool = OpenAITransport(max_connections=10, keepalive_connections=5, keepalive_expiry=60.0,
+                           http2=False)
+    yield pool
+    await pool.aclose()
+
+
+def _client(transport: OpenAITransport, base_url: str) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key="sk-test", base_url=base_url, max_retries=0,
+                       http_client=transport.http_client)
+
+
+async def test_sequential_requests_share_one_connection(model, transport):
+    client = _client(transport, model.base_url)
+
+    await client.responses.create(model="gpt-test", input="hello")
+    stream = await client.responses.create(model="gpt-test", input="hello", stream=True)
+    async for _ in stream:
+        pass
+    await client.models.retrieve("gpt-test")
+
+    stats = transport.stats()
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["reused"] == 2
+    assert stats["tls_handshakes"] == 0  # loopback is plain HTTP
+
+
+async def test_prewarm_opens_one_connection_per_concurrent_probe(model, transport):
+    client = _client(transport, model.base_url)
+
+    answered = await transport.prewarm(lambda: client.models.retrieve("gpt-test"), 3)
+
+    assert answered == 3
+    assert model.calls["models"] == 3
+    assert transport.connections_opened == 3
+
+    await client.responses.create(model="gpt-test", input="hello")
+    assert transport.connections_opened == 3  # the turn found a warm connection
+
+
+async def test_prewarm_of_nothing_sends_nothing(model, transport):
+    client = _client(transport, model.base_url)
+
+    assert await transport.prewarm(lambda: client.models.retrieve("gpt-test"), 0) == 0
+    assert transport.stats()["requests"] == 0
+
+
+async def test_keepalive_probes_after_an_idle_gap_only(model, transport):
+    client = _client(transport, model.base_url)
+    probe = lambda: client.models.retrieve("gpt-test")  # noqa: E731
+
+    await client.responses.create(model="gpt-test", input="hello")
+    task = asyncio.create_task(transport.keepalive(probe, 0.3))
+    try:
+        await asyncio.sleep(0.15)
+        assert transport.probes == 0  # the last request is still fresh
+
+        await asyncio.sleep(0.3)
+        assert transport.probes == 1
+        assert model.calls["models"] == 1
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert transport.connections_opened == 1  # the probe refreshed the turn's connection
+
+
+async def test_keepalive_stays_quiet_while_traffic_flows(model, transport):
+    client = _client(transport, model.base_url)
+    task = asyncio.create_task(
+        transport.keepalive(lambda: client.models.retrieve("gpt-test"), 0.3))
+    try:
+        await asyncio.sleep(0.05)  # no request yet: the first pass probes straight away
+        assert transport.probes == 1
+        deadline = time.monotonic() + 0.6
+        while time.monotonic() < deadline:
+            await client.responses.create(model="gpt-test", input="hello")
+            await asyncio.sleep(0.1)
+        assert transport.probes == 1
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+async def test_an_error_status_is_an_answer_and_a_dead_host_is_not(model, transport):
+    client = _client(transport, model.base_url)
+
+    # The stand-in serves no files endpoint: a 404 still proves the connection is open.
+    assert await transport._probe(lambda: client.files.retrieve("file-missing"), "test")
+    assert transport.probe_failures == 0
+
+    await model.stop()
+    assert not await transport._probe(lambda: client.models.retrieve("gpt-test"), "test")
+    assert transport.probe_failures == 1
+    assert transport.probes == 2
+
+
+async def test_close_cancels_the_warming_task(model, monkeypatch):
+    from config import config
+    from openai_client import OpenAIClient
+
+    monkeypatch.setenv("OPENAI_BASE_URL", model.base_url)
+    monkeypatch.setattr(config, "openai_api_key", "sk-test")
+    monkeypatch.setattr(config, "openai_prewarm_connections", 2)
+    monkeypatch.setattr(config, "openai_keepalive_interval", 60.0)
+    client = OpenAIClient()
+
+    task = client.start_connection_warming()
+    assert client.start_connection_warming() is task  # one task, however often it is asked
+    for _ in range(50):
+        if model.calls["models"] == 2:
+            break
+        await asyncio.sleep(0.02)
+    assert model.calls["models"] == 2
+    assert not task.done()  # now idling in the keep-alive loop
+
+    await client.close()
+
+    assert task.cancelled()
+    assert client.transport.stats()["probes"] == 2
@@ -672,11 +672,12 @@ async def test_a_dm_post_with_no_intent_is_not_an_error(service, caplog):
 
 
 class _FakeSlack:
-    def __init__(self, share_ts="150.0"):
+    def __init__(self, share_ts="150.0", info_gate=None):
         self.posts = []
         self.uploads = []
         self.share_ts = share_ts
         self.info_calls = 0
+        self.info_gate = info_gate
         self.next_ts = iter([f"20{i}.0" for i in range(1, 40)])
 
     async def chat_postMessage(self, **kwargs):
@@ -693,6 +694,8 @@ class _FakeSlack:
 
     async def files_info(self, file):
         self.info_calls += 1
+        if self.info_gate is not None:
+            await self.info_gate.wait()
         shares = {"public": {CH: [{"ts": self.share_ts}]}} if self.share_ts else {}
         return {"file": {"shares": shares}}
 
@@ -860,13 +863,17 @@ async def _finish_resolvers(service):
 async def test_an_artifact_upload_resolves_its_own_share_receipt(service, temp_db):
     # The whole point of finding 1: nobody else is watching a plain file upload, so if the
     # transport does not start the poll the artifact never earns a receipt at all.
-    bot = _messaging(temp_db, _FakeSlack())
+    # The poll is held until the pending row has been seen: reads and writes use different
+    # pooled connections, so an unheld poll can resolve the share before the read lands.
+    gate = asyncio.Event()
+    bot = _messaging(temp_db, _FakeSlack(info_gate=gate))
     identity = await bot.send_file(CH, "99.0", io.BytesIO(b"x,y\n1,2\n"), "report.csv",
                                    receipt_class="artifact",
                                    receipts=_ledger())
     assert identity["file_id"] == "F1"
     assert len(await temp_db.get_pending_shares_async()) == 1
 
+    gate.set()
     await _finish_resolvers(service)
     assert await temp_db.get_pending_shares_async() == []
     row = await temp_db.get_receipt_async(TEAM, CH, "150.0")
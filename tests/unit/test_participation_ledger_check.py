@@ -87,6 +87,7 @@ def stream_render_payload(**overrides):
         "history_pages": 1, "reply_pages": 0, "origin_pages": 1,
         "selection_version": 1, "serializer_version": 3,
         "reselected": False, "anchor_advanced": False,
+        "item_digests": ["horizon:" + "0" * 12, "1.0:" + "1" * 12, "end:" + "2" * 12],
     }
     payload.update(overrides)
     return payload
@@ -304,6 +305,18 @@ def test_stream_render_with_no_turn_id_at_all_fails(tmp_path):
     assert "stream_render_missing_turn_id" in names(payload)
 
 
+def test_item_digests_are_optional_but_must_be_well_formed_when_present(tmp_path):
+    rows = healthy_rows()
+    del rows[row_index(rows, "stream_render")]["item_digests"]
+    code, _ = check(write_ledger(tmp_path, rows))
+    assert code == 0  # a row from before the digests existed
+
+    rows[row_index(rows, "stream_render")]["item_digests"] = ["1.0:" + "1" * 12, "end:x"]
+    code, payload = check(write_ledger(tmp_path, rows))
+    assert code == 1
+    assert "stream_render_bad_field" in names(payload)
+
+
 def test_a_turn_that_claims_a_build_and_rendered_nothing_fails(tmp_path):
     rows = healthy_rows()
     del rows[row_index(rows, "stream_render")]
@@ -29,7 +29,8 @@ from slack_sdk.errors import SlackApiError
 
 from slack_client import messaging
 from slack_client.messaging import SlackMessagingMixin
-from message_processor.tool_registry import SURFACE_CHANNEL, ToolContext, ToolRegistry
+from message_processor.tool_registry import (CONCURRENCY_SLACK_WRITE, SURFACE_CHANNEL, ToolContext,
+                                             ToolRegistry)
 
 TEAM = "T1"
 CH = "C1"
@@ -117,9 +118,10 @@ def test_schema_is_exactly_the_spec_dict():
 def test_registered_on_both_surfaces_with_no_gate():
     from slack_client.base import SlackBot
 
-    src = inspect.getsource(SlackBot._build_tool_registry)
-    assert ("registry.register(self.get_pin_message_tool_schema(), self.execute_pin_message)"
-            in src)
+    from tests.unit.test_participation_tuning import _slack_tool_mock
+
+    built = SlackBot._build_tool_registry(_slack_tool_mock())
+    assert built.concurrency_of("pin_message") == CONCURRENCY_SLACK_WRITE
 
     registry = ToolRegistry()
     registry.register(_host().get_pin_message_tool_schema(), AsyncMock())
@@ -0,0 +1,103 @@
+"""The prompt cache report: token buckets joined to their turns, and where a prefix moved.
+
+The report is read to decide whether prefix stability is worth what it costs, so its joins have
+to be the ledger's real ones — `model_response` reaches its channel only through `turn_start` —
+and its divergence verdict has to be the same `first_divergence` the replay check asserts with.
+
+What has to hold: tokens land under the channel and surface of their turn (or `?` / `unknown`
+when that turn rotated away), split by fork reason; consecutive renders are classed identical,
+append or rewrite; a rewrite names its first moved item and the pinned inputs that changed; and
+the CLI survives a bad line but not a missing file.
+"""
+from __future__ import annotations
+
+import json
+
+from tools import prompt_cache_report as pcr
+from tools.prompt_cache_report import first_divergence
+
+H0, M1, M2, E = "horizon:aaaaaaaaaaaa", "1.0:bbbbbbbbbbbb", "2.0:cccccccccccc", "end:eeeeeeeeeeee"
+
+
+def render(turn_id, digests, *, channel="C1", **fields):
+    return {"event": "stream_render", "turn_id": turn_id, "channel_id": channel,
+            "stream_sha256": "|".join(digests), "item_digests": list(digests),
+            "actor_map_hash": "a" * 64, "serializer_config_hash": "c" * 64, **fields}
+
+
+def start(turn_id, *, channel="C1", surface="channel"):
+    return {"event": "turn_start", "turn_id": turn_id, "channel_id": channel, "surface": surface}
+
+
+def attempt(turn_id, input_tokens, cached, fork_reason=None):
+    row = {"event": "model_response", "turn_id": turn_id, "input_tokens": input_tokens,
+           "cached_input_tokens": cached}
+    if fork_reason:
+        row["fork_reason"] = fork_reason
+    return row
+
+
+def test_first_divergence_tells_an_append_from_a_rewrite():
+    assert first_divergence([H0, M1, E], [H0, M1, E]) is None
+    assert first_divergence([H0, M1, E], [H0, M1, M2, E]) == {
+        "kind": "append", "index": 2, "before": "end", "after": "2.0", "kept": 1.0}
+    edited = "1.0:dddddddddddd"
+    assert first_divergence([H0, M1, M2, E], [H0, edited, M2, E]) == {
+        "kind": "rewrite", "index": 1, "before": "1.0", "after": "1.0", "kept": 0.333}
+    # A floor that advanced drops the oldest message: the prefix is gone from item 1.
+    assert first_divergence([H0, M1, M2, E], [H0, M2, E])["kind"] == "rewrite"
+
+
+def test_tokens_join_to_their_turn_and_split_by_fork_reason():
+    rows = [start("t1"), attempt("t1", 1000, 800), attempt("t1", 1000, 900, "timeout_retry"),
+            start("t2", channel="D1", surface="dm"), attempt("t2", 400, 0),
+            attempt("gone", 50, 0)]
+
+    report = pcr.build_report(rows)
+
+    assert report["totals"]["input_tokens"] == 2450
+    assert report["by_surface"]["channel"]["cached_input_tokens"] == 1700
+    assert report["by_surface"]["channel"]["uncached_input_tokens"] == 300
+    assert report["by_surface"]["dm"]["hit_rate"] == 0.0
+    forks = report["by_channel"]["C1"]["fork_reasons"]
+    assert (forks["none"]["attempts"], forks["timeout_retry"]["cached_input_tokens"]) == (1, 900)
+    assert report["by_channel"]["?"]["attempts"] == 1          # its turn_start rotated out
+    assert report["by_surface"]["unknown"]["input_tokens"] == 50
+
+
+def test_consecutive_renders_are_classed_and_a_rewrite_names_its_cause():
+    rows = [start("t1"), render("t1", [H0, M1, E]), attempt("t1", 1000, 0),
+            start("t2"), render("t2", [H0, M1, E]), attempt("t2", 1000, 950),
+            start("t3"), render("t3", [H0, M1, M2, E]), attempt("t3", 1100, 900),
+            start("t4"), render("t4", ["1.0:ffffffffffff", M2, E], actor_map_hash="b" * 64),
+            attempt("t4", 1100, 0),
+            render("t5", [H0, M1, E], channel="C2"),
+            {k: v for k, v in render("t6", [H0, M1, M2, E], channel="C2").items()
+             if k != "item_digests"}]
+
+    report = pcr.build_report(rows)
+
+    assert report["by_channel"]["C1"]["prefix"] == {
+        "renders": 4, "identical": 1, "append": 1, "rewrite": 1, "unlocated": 0}
+    assert report["by_channel"]["C2"]["prefix"]["unlocated"] == 1
+    assert report["by_prefix_outcome"]["identical"]["hit_rate"] == 0.95
+    assert report["by_prefix_outcome"]["rewrite"]["cached_input_tokens"] == 0
+    (rewrite,) = report["divergences"]
+    assert (rewrite["turn_id"], rewrite["previous_turn_id"]) == ("t4", "t3")
+    assert (rewrite["index"], rewrite["before"], rewrite["after"]) == (0, "horizon", "1.0")
+    assert rewrite["changed"] == ["actor_map_hash"]
+
+
+def test_the_cli_skips_a_bad_line_and_refuses_a_missing_file(tmp_path, capsys):
+    ledger = tmp_path / "participation.jsonl"
+    ledger.write_text(json.dumps(start("t1")) + "\nnot json\n"
+                      + json.dumps(attempt("t1", 10, 5)) + "\n")
+
+    assert pcr.main([str(ledger), "--json"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["counts"]["unparsable_lines"] == 1
+    assert out["by_channel"]["C1"]["hit_rate"] == 0.5
+
+    assert pcr.main([str(ledger)]) == 0
+    assert "C1" in capsys.readouterr().out
+    assert pcr.main([str(tmp_path / "absent.jsonl")]) == 2
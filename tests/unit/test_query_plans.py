@@ -0,0 +1,76 @@
+"""No turn-path statement in database.py may plan as a full table scan.
+
+Every accessor in `tests/fixtures/turn_path_db.TURN_PATH` runs against a small build of the
+production-shaped database, every statement it issues is recorded, and each one is run back
+through EXPLAIN QUERY PLAN. The build is a sliver of production size on purpose: this bot never
+runs ANALYZE, so SQLite picks the same plan for ten rows as for ten million, and the plan is what
+this file guards. Latency at production size is the slow tier's job
+(`tests/integration/test_query_plan_bench.py`).
+
+A new hot-path accessor belongs in TURN_PATH. A statement that genuinely has to scan (a nightly
+sweep, never a turn) does not.
+"""
+import aiosqlite
+import pytest
+
+from database import DatabaseManager
+from tests.fixtures.turn_path_db import _NO_PLAN, TURN_PATH, build, full_scans
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    mp = pytest.MonkeyPatch()
+    mp.setenv("DATABASE_DIR", str(tmp_path_factory.mktemp("query_plans")))
+    db = DatabaseManager(platform="slack")
+    counts = build(db, scale=0.002)
+    yield db, counts
+    db.close()
+    mp.undo()
+
+
+@pytest.fixture
+def issued(built, monkeypatch):
+    """Every (sql, params) the test runs, on an aiosqlite connection or on the sync `db.conn`.
+
+    The sync side comes from SQLite's trace callback, which hands over the statement with its
+    parameters already bound in — so those are recorded with no params of their own.
+    """
+    db, _ = built
+    statements = []
+    original = aiosqlite.Connection.execute
+
+    def recording(self, sql, parameters=None):
+        statements.append((sql, parameters))
+        return original(self, sql, parameters)
+
+    monkeypatch.setattr(aiosqlite.Connection, "execute", recording)
+    # The settings cache would answer a warm read without SQL; the SQL is what is under test.
+    monkeypatch.setattr(db, "_settings_cache", None)
+    db.conn.set_trace_callback(lambda sql: statements.append((sql, None)))
+    yield statements
+    db.conn.set_trace_callback(None)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("accessor", sorted(TURN_PATH))
+async def test_the_accessor_never_plans_a_full_scan(built, issued, accessor):
+    db, counts = built
+    await TURN_PATH[accessor](db, counts)
+    db.conn.set_trace_callback(None)  # the plans below are ours, not the accessor's
+    ran = [(sql, params) for sql, params in issued
+           if not sql.lstrip().upper().startswith(_NO_PLAN)]
+    # An accessor that ran nothing would pass below without proving anything.
+    assert ran, f"{accessor} issued no statement on either connection"
+    for sql, params in ran:
+        assert full_scans(db.conn, sql, params) == [], f"{accessor}:\n{sql}"
+
+
+@pytest.mark.unit
+def test_the_build_is_the_shape_it_claims(built):
+    db, counts = built
+    hot = db.conn.execute(
+        "SELECT COUNT(*) FROM outbound_receipts WHERE channel_id = 'C0HOT0001'").fetchone()[0]
+    assert db.conn.execute("SELECT COUNT(*) FROM outbound_receipts").fetchone()[0] > 0
+    assert 0 < hot < counts["receipts"]
+    assert db.conn.execute("SELECT COUNT(*) FROM documents_fts").fetchone()[0] == \
+        counts["documents"]
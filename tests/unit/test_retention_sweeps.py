@@ -0,0 +1,133 @@
+"""Batched retention sweeps and the incremental vacuum behind them.
+
+A sweep used to be one statement over everything eligible — after an outage, one enormous
+transaction holding the write lock. What has to hold now: the rows a sweep removes are exactly
+the ones the single statement removed, they go in DB_SWEEP_BATCH_ROWS-sized transactions with the
+lock free between them, and the pages they free go back to the filesystem.
+"""
+import logging
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+import database
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    monkeypatch.setenv("DB_SWEEP_BATCH_ROWS", "3")
+    monkeypatch.setenv("DB_SWEEP_PAUSE_MS", "0")
+    manager = DatabaseManager(platform="slack")
+    yield manager
+    manager.close()
+
+
+def _tool_rows(db, old: int, fresh: int) -> None:
+    rows = [("C1", f"{i}.0", "C1:1.0", "[]", "-200 days") for i in range(old)]
+    rows += [("C1", f"{old + i}.0", "C1:1.0", "[]", "-1 days") for i in range(fresh)]
+    db.conn.executemany(
+        "INSERT INTO message_tool_usage (channel_id, message_ts, thread_key, tools_json, "
+        "created_at) VALUES (?, ?, ?, ?, datetime('now', ?))", rows)
+
+
+def _count(db, table):
+    return db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_a_sweep_runs_in_batches_and_logs_its_lock_time(db, caplog):
+    _tool_rows(db, old=10, fresh=2)
+    with caplog.at_level(logging.INFO):
+        db.delete_old_tool_usage(days=90)
+    assert _count(db, "message_tool_usage") == 2
+    assert any("DB sweep message_tool_usage: removed 10 rows in 4 batch(es); write lock held"
+               in r.getMessage() for r in caplog.records)
+
+
+def test_the_write_lock_is_free_between_batches(db, monkeypatch):
+    """Another writer — one that will not wait at all — gets in between every two batches."""
+    _tool_rows(db, old=8, fresh=0)
+    other = sqlite3.connect(db.db_path, isolation_level=None, timeout=0)
+    wrote = []
+
+    def pause(seconds):
+        other.execute("INSERT INTO modal_sessions (session_id, user_id, state) "
+                      "VALUES (?, 'U1', '{}')", (f"s{len(wrote)}",))
+        wrote.append(seconds)
+
+    monkeypatch.setenv("DB_SWEEP_PAUSE_MS", "1")
+    monkeypatch.setattr(database.time, "sleep", pause)
+    db.delete_old_tool_usage(days=90)
+    other.close()
+    assert len(wrote) == 2  # batches of 3, 3 and 2: two gaps
+    assert _count(db, "message_tool_usage") == 0
+
+
+def test_slimming_walks_past_rows_it_keeps(db):
+    for i in range(7):
+        db.save_document(f"C1:{i}.0", f"d{i}.pdf", "application/pdf", summary="bulk")
+    db.conn.execute("UPDATE documents SET created_at = datetime('now', '-200 days') "
+                    "WHERE filename != 'd3.pdf'")
+    db.delete_old_documents(days=90)
+    kept = dict(db.conn.execute("SELECT filename, summary FROM documents"))
+    assert len(kept) == 7
+    assert kept.pop("d3.pdf") == "bulk"
+    assert set(kept.values()) == {None}
+
+
+async def test_ambient_addenda_retire_with_their_artifacts_across_batches(db):
+    for i in range(5):
+        await db.insert_pending_ambient_artifact(
+            channel_id="C1", source_ts=f"10{i}.0", conversation_ts="100.0", kind="link",
+            ref=f"https://x/{i}", expires_at="2000-01-01 00:00:00")
+        db.conn.execute(
+            "INSERT INTO thread_summary_addenda (thread_id, channel_id, source_ts, kind, ref, "
+            "note) VALUES (?, 'C1', ?, 'link', ?, 'n')",
+            (f"C1:{100 + i % 2}.0", f"10{i}.0", f"https://x/{i}"))
+    swept = db.delete_expired_ambient_artifacts(days=30)
+    assert sorted(swept) == ["C1:100.0", "C1:101.0"]
+    assert _count(db, "ambient_artifacts") == 0
+    assert _count(db, "thread_summary_addenda") == 0
+
+
+def test_freed_pages_go_back_to_the_filesystem(db, monkeypatch):
+    monkeypatch.setenv("DB_SWEEP_BATCH_ROWS", "1000")
+    assert db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+    db.conn.executemany(
+        "INSERT INTO message_tool_usage (channel_id, message_ts, thread_key, tools_json, "
+        "created_at) VALUES ('C1', ?, 'C1:1.0', ?, datetime('now', '-200 days'))",
+        [(f"{i}.0", "x" * 2000) for i in range(2000)])
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    before = os.path.getsize(db.db_path)
+    db.delete_old_tool_usage(days=90)
+    assert db.reclaim_free_pages() > 0
+    assert db.conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    assert os.path.getsize(db.db_path) < before / 2
+
+
+def test_an_older_database_is_converted_only_when_asked(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    legacy = sqlite3.connect(tmp_path / "slack.db")
+    legacy.execute("CREATE TABLE filler (x)")
+    legacy.close()
+
+    def mode():
+        # Read from the file header: a connection that asked for INCREMENTAL reports its own
+        # request, not what the file is.
+        with closing(sqlite3.connect(tmp_path / "slack.db")) as probe:
+            return probe.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+    manager = DatabaseManager(platform="slack")
+    try:
+        assert mode() == 0
+        assert manager.reclaim_free_pages() == 0
+        assert mode() == 0
+        monkeypatch.setenv("DB_AUTO_VACUUM_CONVERT", "true")
+        manager.reclaim_free_pages()
+        assert mode() == 2
+    finally:
+        manager.close()
@@ -0,0 +1,96 @@
+"""The startup fast path: a database already on the current schema skips the migration chain.
+
+`DatabaseManager._open_schema` stores a fingerprint (database.py's bytes, the SQLite version,
+every sqlite_master row) after a clean full pass, and the next boot that computes the same one
+serves straight away. What has to hold: anything that could make a migration do work — a code
+change, a schema edited underneath us, a step that failed last time — forces the full pass.
+"""
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+import database
+from database import DatabaseManager
+
+
+@pytest.fixture
+def open_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    passes = []
+    full = DatabaseManager._run_migrations
+
+    def counted(self):
+        passes.append(1)
+        return full(self)
+
+    monkeypatch.setattr(DatabaseManager, "_run_migrations", counted)
+    opened = []
+
+    def open_():
+        manager = DatabaseManager(platform="slack")
+        opened.append(manager)
+        return manager
+
+    open_.passes = passes
+    yield open_
+    for manager in opened:
+        manager.close()
+
+
+def test_a_current_database_skips_the_migrations(open_db):
+    open_db().close()
+    second = open_db()
+    assert len(open_db.passes) == 1
+    assert second._knowledge_fts is True
+
+
+def test_verify_mode_always_runs_the_full_pass(open_db, monkeypatch):
+    open_db().close()
+    monkeypatch.setenv("DB_SCHEMA_VERIFY", "true")
+    open_db()
+    assert len(open_db.passes) == 2
+
+
+def test_a_schema_edited_underneath_runs_the_full_pass_and_repairs_it(open_db, tmp_path):
+    open_db().close()
+    with closing(sqlite3.connect(tmp_path / "slack.db")) as conn:
+        conn.execute("DROP INDEX idx_images_channel_message")
+    repaired = open_db()
+    assert len(open_db.passes) == 2
+    assert repaired.conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'idx_images_channel_message'").fetchone()
+
+
+def test_a_code_change_runs_the_full_pass(open_db, tmp_path, monkeypatch):
+    open_db().close()
+    edited = tmp_path / "database.py"
+    edited.write_bytes(open(database.__file__, "rb").read() + b"\n# a new migration\n")
+    monkeypatch.setattr(database, "__file__", str(edited))
+    open_db().close()
+    open_db()
+    assert len(open_db.passes) == 2  # once for the edit, then current again
+
+
+def test_a_failed_step_is_retried_next_boot(open_db, monkeypatch):
+    def broken(self):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(DatabaseManager, "_migrate_participation_redesign", broken)
+        open_db().close()
+    open_db().close()
+    open_db()
+    assert len(open_db.passes) == 2
+
+
+def test_the_fast_path_still_backfills_settings_completed(open_db):
+    first = open_db()
+    first.create_default_user_preferences("U1", "u1@example.com")
+    first.conn.execute("UPDATE user_preferences SET settings_completed = 0, "
+                       "created_at = strftime('%s', 'now') - 2 * 86400")
+    first.close()
+    second = open_db()
+    assert len(open_db.passes) == 1
+    assert second.conn.execute(
+        "SELECT settings_completed FROM user_preferences").fetchone()[0] == 1
@@ -1294,7 +1294,7 @@ def test_the_backend_selector_splits_on_the_surface_alone():
     assert is_dm_conversation("D0123", "im") is True
     assert search_backend_for(_ctx(channel_id="G0123MPIM", is_dm=False)) is (
         SearchBackend.IN_CHANNEL_SCAN)
-    # The reserved shape-2 seam exists and is not selectable.
+    # The index backend is selected only for a channel whose index is built — none here.
     assert SearchBackend.SERVICE_INDEX.value == "service_index"
     assert search_backend_for(_ctx()) is not SearchBackend.SERVICE_INDEX
 
@@ -1387,3 +1387,163 @@ def test_the_search_tool_is_registered_with_its_own_timeout():
     from slack_client import base as base_mod
     src = inspect.getsource(base_mod)
     assert "timeout=config.search_tool_timeout_seconds" in src
+
+
+# --- the in-memory channel index (SERVICE_INDEX) --------------------------------------
+
+@pytest.fixture
+def index(monkeypatch):
+    from slack_client.channel_index import ChannelSearchIndex
+
+    fresh = ChannelSearchIndex(max_messages=100)
+    monkeypatch.setattr(search_mod, "channel_index", fresh)
+    return fresh
+
+
+def _old_thread_client():
+    """A channel whose answer sits in a reply under a root far older than anything recent."""
+    return _FakeSlack(
+        history=[{"messages": [_m("400.000000", "lunch?"),
+                               _m("100.000000", "vendor thread", reply_count=1,
+                                  latest_reply="450.000000")]}],
+        replies={"100.000000": [{"messages": [
+            _m("100.000000", "vendor thread", reply_count=1),
+            _m("450.000000", "cert renewal is with Kestwood", thread_ts="100.000000")]}]})
+
+
+@pytest.mark.asyncio
+async def test_a_built_index_answers_without_fetching_and_sees_old_thread_replies(index):
+    client = _old_thread_client()
+    bot = _ScanBot(client)
+    assert await index.build(bot, CH)
+    client.history_calls.clear()
+    client.reply_calls.clear()
+    ctx = _scan_ctx()
+    assert search_backend_for(ctx) is SearchBackend.SERVICE_INDEX
+    payload = await bot.execute_search_tool(ctx, {"query": "cert renewal"})
+    assert [r["ts"] for r in payload["results"]] == ["450.000000"]
+    assert payload["results"][0]["thread_ts"] == "100.000000"
+    assert client.history_calls == [] and client.reply_calls == []
+    coverage = payload["coverage"]
+    assert coverage["complete"] is True and coverage["messages_scanned"] == 3
+    assert coverage["threads_scanned"] == 1
+
+
+@pytest.mark.asyncio
+async def test_live_events_keep_the_index_current(index):
+    client = _old_thread_client()
+    bot = _ScanBot(client)
+    await index.build(bot, CH)
+    index.apply_event(bot, {"type": "message", "channel": CH, "user": "U_HUMAN",
+                            "team": "T_TEST", "ts": "480.000000", "text": "cert renewal signed"})
+    index.apply_event(bot, {"type": "message", "subtype": "message_changed", "channel": CH,
+                            "ts": "481.000000", "message": _m("400.000000", "cert renewal lunch")})
+    index.apply_event(bot, {"type": "message", "subtype": "message_deleted", "channel": CH,
+                            "ts": "482.000000", "deleted_ts": "450.000000",
+                            "previous_message": _m("450.000000", "cert renewal is with Kestwood",
+                                                   thread_ts="100.000000")})
+    payload = await bot.execute_search_tool(_scan_ctx(), {"query": "cert renewal"})
+    assert [r["ts"] for r in payload["results"]] == ["480.000000", "400.000000"]
+    assert len(client.history_calls) == 1  # the build's walk, and nothing since
+
+
+@pytest.mark.asyncio
+async def test_a_truncated_index_says_its_coverage_is_partial(monkeypatch):
+    from slack_client.channel_index import ChannelSearchIndex
+
+    small = ChannelSearchIndex(max_messages=2)
+    monkeypatch.setattr(search_mod, "channel_index", small)
+    client = _FakeSlack(history=[{"messages": [_m(f"{ts}.000000", "cert renewal")
+                                               for ts in (400, 300, 200)]}])
+    bot = _ScanBot(client)
+    await small.build(bot, CH)
+    payload = await bot.execute_search_tool(_scan_ctx(), {"query": "cert renewal"})
+    assert [r["ts"] for r in payload["results"]] == ["400.000000", "300.000000"]
+    assert payload["coverage"]["complete"] is False
+    assert payload["coverage"]["stopped_reason"] == "index_horizon"
+    assert "NOT read" in payload["coverage"]["note"]
+
+
+@pytest.mark.asyncio
+async def test_the_cap_evicts_the_oldest_whatever_order_messages_arrive_in(monkeypatch):
+    from slack_client.channel_index import ChannelSearchIndex
+
+    small = ChannelSearchIndex(max_messages=3)
+    monkeypatch.setattr(search_mod, "channel_index", small)
+    client = _FakeSlack(history=[{"messages": [_m(f"{ts}.000000", "cert renewal")
+                                               for ts in (300, 200)]}])
+    bot = _ScanBot(client)
+    await small.build(bot, CH)
+    for ts, text in ((100, "cert renewal"), (400, "cert renewal"), (450, "cert renewal")):
+        small.apply_event(bot, {"type": "message", "channel": CH, "user": "U_HUMAN",
+                                "team": "T_TEST", "ts": f"{ts}.000000", "text": text})
+    small.apply_event(bot, {"type": "message", "subtype": "message_changed", "channel": CH,
+                            "ts": "460.000000", "message": _m("300.000000", "cert renewal v2")})
+    payload = await bot.execute_search_tool(_scan_ctx(), {"query": "cert renewal"})
+    assert [r["ts"] for r in payload["results"]] == ["450.000000", "400.000000", "300.000000"]
+    assert payload["coverage"]["complete"] is False
+
+
+@pytest.mark.asyncio
+async def test_coverage_counts_only_what_is_older_than_the_trigger(index):
+    bot = _ScanBot(_old_thread_client())
+    assert await index.build(bot, CH)
+    payload = await bot.execute_search_tool(_scan_ctx(trigger_ts="420.000000"),
+                                            {"query": "vendor thread"})
+    assert [r["ts"] for r in payload["results"]] == ["100.000000"]
+    # The lunch message and the root; the reply at 450 came after the trigger.
+    assert payload["coverage"]["messages_scanned"] == 2
+    assert payload["coverage"]["threads_scanned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_the_memory_cap_drops_the_oldest_message_in_any_channel(monkeypatch):
+    from slack_client.channel_index import ChannelSearchIndex
+
+    other = "C_OTHER"
+    channels = {CH: (300, 200), other: (250,)}
+
+    async def _build_both(index):
+        for channel_id, stamps in channels.items():
+            client = _FakeSlack(history=[{"messages": [_m(f"{ts}.000000", "cert renewal")
+                                                       for ts in stamps]}])
+            assert await index.build(_ScanBot(client), channel_id)
+
+    whole = ChannelSearchIndex(max_messages=100, max_bytes=0)
+    await _build_both(whole)
+    capped = ChannelSearchIndex(max_messages=100, max_bytes=whole.stats()["bytes"] - 1)
+    monkeypatch.setattr(search_mod, "channel_index", capped)
+    await _build_both(capped)
+
+    bot = _ScanBot(_FakeSlack())
+    here = await bot.execute_search_tool(_scan_ctx(), {"query": "cert renewal"})
+    assert [r["ts"] for r in here["results"]] == ["300.000000"]
+    assert here["coverage"]["complete"] is False
+    there = await bot.execute_search_tool(_scan_ctx(channel_id=other), {"query": "cert renewal"})
+    assert [r["ts"] for r in there["results"]] == ["250.000000"]
+    assert there["coverage"]["complete"] is True
+    assert capped.stats()["bytes"] < whole.stats()["bytes"]
+
+
+@pytest.mark.asyncio
+async def test_a_deletion_during_a_build_is_not_undone_by_an_earlier_fetched_page(index):
+    client = _old_thread_client()
+    bot = _ScanBot(client)
+    fetch_replies = client.conversations_replies
+
+    async def replies_fetched_before_the_delete(**kwargs):
+        page = await fetch_replies(**kwargs)
+        index.apply_event(bot, {"type": "message", "subtype": "message_deleted", "channel": CH,
+                                "ts": "482.000000", "deleted_ts": "450.000000",
+                                "previous_message": _m("450.000000", "cert renewal",
+                                                       thread_ts="100.000000")})
+        return page
+
+    client.conversations_replies = replies_fetched_before_the_delete
+    assert await index.build(bot, CH)
+    payload = await bot.execute_search_tool(_scan_ctx(), {"query": "cert renewal"})
+    assert payload["results"] == []
+    index.apply_event(bot, {"type": "message", "channel": CH, "user": "U_HUMAN", "team": "T_TEST",
+                            "ts": "490.000000", "text": "cert renewal signed"})
+    payload = await bot.execute_search_tool(_scan_ctx(), {"query": "cert renewal"})
+    assert [r["ts"] for r in payload["results"]] == ["490.000000"]
@@ -0,0 +1,124 @@
+"""The in-process cache in front of channel settings, policy, memory and user preferences.
+
+Every channel message reads these rows and almost nothing writes them, so the async getters are
+served from `DatabaseManager._settings_cache`. What has to hold: a repeat read never reaches
+SQLite, every writer this process has makes the next read fresh, a read that raced a write cannot
+park the old row in the cache, and a fenced channel is still served by its epoch overlay.
+"""
+import pytest
+
+import database
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    manager = DatabaseManager(platform="slack")
+    yield manager
+    manager.close()
+
+
+def _stats(db, kind):
+    return db.get_settings_cache_stats()[kind]
+
+
+async def test_a_repeat_read_is_served_from_the_cache(db):
+    await db.set_channel_settings_async("C1", response_mode="auto_respond")
+    first = await db.get_channel_settings_async("C1")
+    second = await db.get_channel_settings_async("C1")
+    assert first == second and second["response_mode"] == "auto_respond"
+    assert _stats(db, "settings") == {"hits": 1, "misses": 1, "entries": 1}
+
+
+async def test_a_caller_mutating_its_copy_does_not_touch_the_cache(db):
+    await db.set_channel_settings_async("C1", model="gpt-5")
+    (await db.get_channel_settings_async("C1"))["model"] = "scribbled"
+    assert (await db.get_channel_settings_async("C1"))["model"] == "gpt-5"
+
+
+async def test_both_settings_writers_invalidate(db):
+    await db.set_channel_settings_async("C1", model="gpt-5")
+    await db.get_channel_settings_async("C1")
+    await db.set_channel_settings_async("C1", model="gpt-5-mini")
+    assert (await db.get_channel_settings_async("C1"))["model"] == "gpt-5-mini"
+    db.set_channel_settings("C1", model="gpt-5-nano")
+    assert (await db.get_channel_settings_async("C1"))["model"] == "gpt-5-nano"
+
+
+async def test_an_absent_row_is_cached_until_it_is_written(db):
+    assert await db.get_channel_policy_async("C1") is None
+    assert await db.get_channel_policy_async("C1") is None
+    assert _stats(db, "policy")["hits"] == 1
+    await db.set_channel_policy_async("C1", "Only answer deploy questions.")
+    assert (await db.get_channel_policy_async("C1"))["content"] == \
+        "Only answer deploy questions."
+    await db.set_channel_settings_and_policy_async("C1", "Stay in threads.", model="gpt-5")
+    assert (await db.get_channel_policy_async("C1"))["content"] == "Stay in threads."
+    assert (await db.get_channel_settings_async("C1"))["model"] == "gpt-5"
+
+
+async def test_a_workspace_fact_reaches_every_channel_s_cached_memory(db):
+    assert await db.get_channel_memory_async("C1") == []
+    assert await db.get_channel_memory_async("C2") == []
+    fact = await db.add_channel_memory_async("C1", "Standup is at 10.", scope="workspace")
+    assert [m["content"] for m in await db.get_channel_memory_async("C2")] == [
+        "Standup is at 10."]
+    await db.update_channel_memory_async(fact, "Standup is at 11.")
+    assert [m["content"] for m in await db.get_channel_memory_async("C1")] == [
+        "Standup is at 11."]
+    await db.delete_channel_memory_async(fact)
+    assert await db.get_channel_memory_async("C2") == []
+
+
+async def test_user_preferences_follow_create_and_update(db):
+    assert await db.get_user_preferences_async("U1") is None
+    await db.create_default_user_preferences_async("U1", "u1@example.com")
+    assert (await db.get_user_preferences_async("U1"))["slack_email"] == "u1@example.com"
+    await db.update_user_preferences_async("U1", {"verbosity": "low"})
+    assert (await db.get_user_preferences_async("U1"))["verbosity"] == "low"
+
+
+async def test_a_read_that_raced_a_write_does_not_cache_the_old_row(db, monkeypatch):
+    await db.set_channel_settings_async("C1", model="gpt-5")
+    load = db._load_channel_settings_async
+
+    async def load_then_lose_the_race(channel_id):
+        row = await load(channel_id)
+        await db.set_channel_settings_async("C1", model="gpt-5-mini")
+        return row
+
+    monkeypatch.setattr(db, "_load_channel_settings_async", load_then_lose_the_race)
+    assert (await db.get_channel_settings_async("C1"))["model"] == "gpt-5"
+    monkeypatch.setattr(db, "_load_channel_settings_async", load)
+    assert (await db.get_channel_settings_async("C1"))["model"] == "gpt-5-mini"
+
+
+async def test_a_fenced_channel_is_served_by_its_overlay_not_the_cache(db, monkeypatch):
+    await db.set_channel_settings_async("C1", model="gpt-5")
+    await db.get_channel_settings_async("C1")
+
+    class Store:
+        def channel_settings(self, key):
+            return {"model": "fixture-model"}
+
+    production = database._epoch_overlay
+    monkeypatch.setattr(database, "_epoch_overlay",
+                        lambda channel_id, team_id=None:
+                        (Store(), "k") if channel_id == "C1" else None)
+    assert (await db.get_channel_settings_async("C1"))["model"] == "fixture-model"
+    monkeypatch.setattr(database, "_epoch_overlay", production)
+    assert (await db.get_channel_settings_async("C1"))["model"] == "gpt-5"
+
+
+async def test_a_zero_ttl_turns_the_cache_off(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    monkeypatch.setenv("DB_SETTINGS_CACHE_TTL_SECONDS", "0")
+    manager = DatabaseManager(platform="slack")
+    try:
+        await manager.get_channel_settings_async("C1")
+        await manager.get_channel_settings_async("C1")
+        assert manager.get_settings_cache_stats()["settings"] == {
+            "hits": 0, "misses": 2, "entries": 0}
+    finally:
+        manager.close()
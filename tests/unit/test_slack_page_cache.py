@@ -0,0 +1,180 @@
+"""The process-local page cache under every conversations.history / replies reader.
+
+What has to hold: a second reader asking the same question of the same token gets the first
+reader's page without a Slack call; any message, edit or deletion it could be missing evicts it
+(and a page fetched while that event was landing is never stored); TTL and byte ceilings are
+real; a client with no token is never cached; and each turn can say how many calls it saved.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from slack_client import history_fetch
+from slack_client import page_cache as page_cache_module
+from slack_client.history_fetch import page_messages
+from slack_client.page_cache import SlackPageCache, begin_turn, end_turn, read_page
+
+
+class _Web:
+    """A slack_sdk WebClient stand-in: bound methods, a token, and a call log."""
+
+    def __init__(self, token="xoxb-test"):
+        self.token = token
+        self.calls = []
+        self.messages = {"C1": [{"ts": "100.0", "text": "root", "reply_count": 1}]}
+        self.replies = {"100.0": [{"ts": "100.0", "text": "root"},
+                                  {"ts": "101.0", "thread_ts": "100.0", "text": "reply"}],
+                        "200.0": [{"ts": "200.0", "text": "other root"}]}
+
+    async def conversations_history(self, **kwargs):
+        self.calls.append(("history", kwargs))
+        return {"ok": True, "messages": list(self.messages[kwargs["channel"]])}
+
+    async def conversations_replies(self, **kwargs):
+        self.calls.append(("replies", kwargs))
+        return {"ok": True, "messages": list(self.replies[kwargs["ts"]])}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    clock = _Clock()
+    fresh = SlackPageCache(ttl_s=30.0, max_bytes=1 << 20, clock=clock)
+    fresh.clock = clock
+    monkeypatch.setattr(page_cache_module, "page_cache", fresh)
+    monkeypatch.setattr(history_fetch, "page_cache", fresh)
+    return fresh
+
+
+async def _replies(web, root="100.0"):
+    return await page_messages(web.conversations_replies, channel_id="C1",
+                               extra_params={"ts": root})
+
+
+async def test_a_second_reader_is_served_without_a_slack_call(cache):
+    web = _Web()
+    first = await _replies(web)
+    second = await _replies(web)
+    assert first == second and len(web.calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["calls_saved"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == 0.5
+
+
+async def test_a_caller_editing_its_page_does_not_reach_the_next_reader(cache):
+    web = _Web()
+    (await _replies(web))[0]["text"] = "scribbled"
+    assert (await _replies(web))[0]["text"] == "root"
+
+
+async def test_the_direct_readers_share_the_cache(cache):
+    web = _Web()
+    await read_page(web.conversations_history, channel="C1", limit=20)
+    resp = await read_page(web.conversations_history, channel="C1", limit=20)
+    assert resp["messages"][0]["text"] == "root" and len(web.calls) == 1
+    await read_page(web.conversations_history, channel="C1", limit=50)
+    assert len(web.calls) == 2  # a different window is a different question
+
+
+async def test_a_new_reply_evicts_its_thread_and_the_channel_history_only(cache):
+    web = _Web()
+    await _replies(web, "100.0")
+    await _replies(web, "200.0")
+    await read_page(web.conversations_history, channel="C1", limit=20)
+    cache.invalidate_event({"type": "message", "channel": "C1", "ts": "102.0",
+                            "thread_ts": "100.0"})
+    await _replies(web, "100.0")
+    await _replies(web, "200.0")
+    await read_page(web.conversations_history, channel="C1", limit=20)
+    assert [kind for kind, _ in web.calls[3:]] == ["replies", "history"]
+
+
+async def test_an_edit_or_a_deletion_evicts_the_whole_channel(cache):
+    web = _Web()
+    for subtype in ("message_changed", "message_deleted"):
+        await _replies(web, "100.0")
+        await _replies(web, "200.0")
+        before = len(web.calls)
+        cache.invalidate_event({"type": "message", "subtype": subtype, "channel": "C1"})
+        await _replies(web, "100.0")
+        await _replies(web, "200.0")
+        assert len(web.calls) == before + 2
+
+
+async def test_a_page_fetched_while_an_event_landed_is_not_stored(cache):
+    web = _Web()
+    answer = web.conversations_replies
+
+    async def answered_before_the_event(**kwargs):
+        page = await answer(**kwargs)
+        cache.invalidate_event({"type": "message", "channel": "C1", "ts": "102.0",
+                                "thread_ts": "100.0"})
+        return page
+
+    answered_before_the_event.__name__ = "conversations_replies"
+    answered_before_the_event.__self__ = web
+    await page_messages(answered_before_the_event, channel_id="C1",
+                        extra_params={"ts": "100.0"})
+    assert cache.stats()["entries"] == 0
+
+
+async def test_pages_expire_with_the_ttl(cache):
+    web = _Web()
+    await _replies(web)
+    cache.clock.now += 31
+    await _replies(web)
+    assert len(web.calls) == 2
+
+
+async def test_the_byte_ceiling_evicts_the_least_recently_used_page(monkeypatch):
+    web = _Web()
+    web.replies["100.0"] = [{"ts": "100.0", "text": "x" * 400}]
+    web.replies["200.0"] = [{"ts": "200.0", "text": "y" * 400}]
+    small = SlackPageCache(ttl_s=30.0, max_bytes=700)
+    monkeypatch.setattr(history_fetch, "page_cache", small)
+    await _replies(web, "100.0")
+    await _replies(web, "200.0")
+    stats = small.stats()
+    assert stats["entries"] == 1 and stats["evictions"] == 1 and stats["bytes"] <= 700
+    await _replies(web, "200.0")
+    assert len(web.calls) == 2
+
+
+async def test_a_client_without_a_token_is_never_cached(cache):
+    web = _Web(token=None)
+    await _replies(web)
+    await _replies(web)
+    assert len(web.calls) == 2 and cache.stats()["entries"] == 0
+
+
+async def test_a_refused_page_is_not_stored(cache):
+    web = _Web()
+
+    async def conversations_history(**kwargs):
+        web.calls.append(("history", kwargs))
+        return {"ok": False, "error": "not_in_channel"}
+
+    conversations_history.__self__ = web
+    await read_page(conversations_history, channel="C1")
+    await read_page(conversations_history, channel="C1")
+    assert len(web.calls) == 2
+
+
+async def test_a_turn_counts_the_calls_it_saved(cache):
+    web = _Web()
+    token = begin_turn()
+    await _replies(web)
+    await asyncio.gather(_replies(web), _replies(web))
+    tally = end_turn(token)
+    assert (tally.hits, tally.misses) == (2, 1)
+    assert tally.summary() == "2/3 page(s) from cache (67%), 2 Slack call(s) saved"
+    assert end_turn(begin_turn()) is None  # a turn that read nothing reports nothing
@@ -0,0 +1,126 @@
+"""The shared client-side Slack rate scheduler under every Web API call.
+
+What has to hold: a method is paced at its tier once its burst is spent; chat.postMessage is paced
+per channel, not across channels; a 429 holds the method shut for Retry-After for every caller
+and is still raised to the one that hit it; a background caller leaves the reserve to turn traffic
+and yields to a turn waiting on the same bucket; and an installed client routes its ordinary
+methods through the scheduler without knowing it.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from config import config
+from slack_client import rate_scheduler
+from slack_client.rate_scheduler import SlackRateScheduler
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.slept.append(delay)
+        self.now += delay
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def sched():
+    clock = _Clock()
+    s = SlackRateScheduler(clock=clock, sleep=clock.sleep)
+    s.clock = clock
+    return s
+
+
+class _RateLimited(Exception):
+    def __init__(self):
+        super().__init__("ratelimited")
+        self.response = SimpleNamespace(status_code=429, headers={"Retry-After": "7"})
+
+
+class _Web:
+    """An AsyncWebClient stand-in: named methods that funnel into api_call."""
+
+    def __init__(self):
+        self.sent = []
+        self.fail_next = False
+
+    async def api_call(self, api_method, **kwargs):
+        if self.fail_next:
+            self.fail_next = False
+            raise _RateLimited()
+        self.sent.append(api_method)
+        return {"ok": True}
+
+    async def users_list(self, **kwargs):
+        return await self.api_call("users.list", http_verb="GET", params=kwargs)
+
+    async def chat_postMessage(self, **kwargs):
+        return await self.api_call("chat.postMessage", json=kwargs)
+
+
+async def test_a_method_is_paced_at_its_tier_after_the_burst(sched):
+    for _ in range(5):  # Tier 2: 20/min, a quarter-minute of burst
+        assert await sched.acquire("users.list") == 0.0
+    waited = await sched.acquire("users.list")
+    assert waited == pytest.approx(3000.0)
+    assert await sched.acquire("unlisted.method") == 0.0  # not in the table: never delayed
+
+
+async def test_posts_are_paced_per_channel(sched):
+    for _ in range(3):
+        await sched.acquire("chat.postMessage", "C1")
+    assert await sched.acquire("chat.postMessage", "C2") == 0.0
+    assert await sched.acquire("chat.postMessage", "C1") == pytest.approx(1000.0)
+
+
+async def test_a_429_holds_the_method_for_everyone_and_still_raises(sched):
+    web = sched.install(_Web())
+    web.fail_next = True
+    with pytest.raises(_RateLimited):
+        await web.users_list(limit=200)
+    await web.users_list(limit=200)
+    assert sched.clock.slept == [pytest.approx(7.0)] and web.sent == ["users.list"]
+    stats = sched.stats()["methods"]["users.list"]
+    assert (stats["calls"], stats["rate_limited"], stats["delayed"]) == (2, 1, 1)
+
+
+async def test_background_leaves_the_reserve_and_yields_to_a_waiting_turn(sched, monkeypatch):
+    monkeypatch.setattr(config, "slack_rate_background_reserve", 0.4)
+    order = []
+
+    async def call(name, background):
+        if background:
+            rate_scheduler.mark_background()
+        await sched.acquire("users.list")
+        order.append(name)
+
+    for _ in range(3):  # 2 of 5 tokens left: below a background caller's reserve of 2
+        await sched.acquire("users.list")
+    await asyncio.gather(asyncio.create_task(call("sweep", True)),
+                         asyncio.create_task(call("turn", False)))
+    assert order == ["turn", "sweep"]
+    assert sched.stats()["methods"]["users.list"]["background_wait_ms"] > 0
+
+
+async def test_an_installed_client_is_scheduled_and_installing_twice_is_harmless(sched):
+    web = _Web()
+    sched.install(web)
+    sched.install(web)
+    for _ in range(4):
+        await web.chat_postMessage(channel="C1", text="hi")
+    assert web.sent == ["chat.postMessage"] * 4
+    assert sched.clock.slept == [pytest.approx(1.0)]
+
+
+async def test_off_means_straight_through(sched, monkeypatch):
+    monkeypatch.setattr(config, "slack_rate_scheduler", False)
+    for _ in range(10):
+        assert await sched.acquire("users.list") == 0.0
+    assert sched.stats()["calls"] == 10
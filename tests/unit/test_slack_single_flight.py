@@ -0,0 +1,117 @@
+"""Single-flight coalescing of identical concurrent Slack reads.
+
+What has to hold: identical concurrent reads make one network call and each caller gets its own
+copy of the answer; arguments that differ only in how they are spelled still share, arguments
+that differ do not, nor do different tokens; writes are never coalesced; an error reaches every
+waiter; one waiter going away leaves the call running for the rest; a turn never joins a
+background call, so it never waits at background priority; and it sits above the rate scheduler,
+so a deduplicated call spends no rate token.
+"""
+import asyncio
+
+import pytest
+
+from config import config
+from slack_client import rate_scheduler
+from slack_client.rate_scheduler import SlackRateScheduler
+from slack_client.single_flight import SingleFlight
+
+
+class _Web:
+    """An AsyncWebClient stand-in whose calls take a moment, so they overlap."""
+
+    def __init__(self, token="xoxb-test", delay=0.01, fail=False):
+        self.token = token
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.priorities = []
+
+    async def api_call(self, api_method, **kwargs):
+        self.sent.append(api_method)
+        self.priorities.append(rate_scheduler.current_priority())
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("channel_not_found")
+        return {"ok": True, "channel": {"id": "C1", "members": ["U1"]}}
+
+    async def conversations_info(self, **kwargs):
+        return await self.api_call("conversations.info", http_verb="GET", params=kwargs)
+
+    async def chat_postMessage(self, **kwargs):
+        return await self.api_call("chat.postMessage", json=kwargs)
+
+
+@pytest.fixture
+def flights():
+    return SingleFlight()
+
+
+async def test_identical_reads_share_one_call_and_each_gets_its_own_copy(flights):
+    web = flights.install(_Web())
+    first, second, third = await asyncio.gather(
+        web.conversations_info(channel="C1", include_num_members=True),
+        web.conversations_info(channel="C1", include_num_members="true"),
+        web.conversations_info(channel="C2"))
+    assert web.sent == ["conversations.info", "conversations.info"]
+    first["channel"]["members"].append("U2")
+    assert second["channel"]["members"] == ["U1"] and third["channel"]["members"] == ["U1"]
+    stats = flights.stats()
+    assert stats["methods"]["conversations.info"] == {"calls": 3, "leaders": 2, "deduplicated": 1}
+    assert stats["in_flight"] == 0
+
+
+async def test_different_tokens_and_writes_never_share(flights):
+    web, other = flights.install(_Web()), flights.install(_Web(token="xoxb-other"))
+    await asyncio.gather(web.conversations_info(channel="C1"), other.conversations_info(channel="C1"),
+                         web.chat_postMessage(channel="C1", text="hi"),
+                         web.chat_postMessage(channel="C1", text="hi"))
+    assert sorted(web.sent) == ["chat.postMessage", "chat.postMessage", "conversations.info"]
+    assert other.sent == ["conversations.info"] and flights.stats()["deduplicated"] == 0
+
+
+async def test_an_error_reaches_every_waiter(flights):
+    web = flights.install(_Web(fail=True))
+    results = await asyncio.gather(*(web.conversations_info(channel="C1") for _ in range(3)),
+                                   return_exceptions=True)
+    assert web.sent == ["conversations.info"]
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_a_cancelled_waiter_leaves_the_call_to_the_others(flights):
+    web = flights.install(_Web(delay=0.05))
+    leaver = asyncio.create_task(web.conversations_info(channel="C1"))
+    stayer = asyncio.create_task(web.conversations_info(channel="C1"))
+    await asyncio.sleep(0.01)
+    leaver.cancel()
+    assert (await stayer)["ok"] and web.sent == ["conversations.info"]
+    assert leaver.cancelled()
+
+
+async def test_an_interactive_caller_never_joins_a_background_call(flights):
+    web = flights.install(_Web(delay=0.05))
+
+    async def sweep():
+        rate_scheduler.mark_background()
+        return await web.conversations_info(channel="C1")
+
+    background = [asyncio.create_task(sweep()) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    turn = await web.conversations_info(channel="C1")
+    await asyncio.gather(*background)
+
+    assert turn["ok"] and web.sent == ["conversations.info"] * 2
+    assert web.priorities == [rate_scheduler.BACKGROUND, rate_scheduler.INTERACTIVE]
+    assert flights.stats()["methods"]["conversations.info"]["deduplicated"] == 1
+
+
+async def test_a_deduplicated_call_spends_no_rate_token_and_off_means_each_alone(flights,
+                                                                               monkeypatch):
+    rates = SlackRateScheduler()
+    web = flights.install(rates.install(_Web()))
+    flights.install(web)  # installing twice is harmless
+    await asyncio.gather(*(web.conversations_info(channel="C1") for _ in range(4)))
+    assert rates.stats()["methods"]["conversations.info"]["calls"] == 1
+    monkeypatch.setattr(config, "slack_single_flight", False)
+    await asyncio.gather(*(web.conversations_info(channel="C1") for _ in range(2)))
+    assert web.sent == ["conversations.info"] * 3
@@ -0,0 +1,133 @@
+"""Recorded channel pins, replayed through `serialize_stream`: the cached prefix must survive.
+
+The provider caches the longest byte-identical prefix of a request, and the channel stream is
+built so that prefix is the whole periphery. That only pays if two things hold across a DEPLOY
+and across TURNS, and neither is visible in a single-build test:
+
+  * the same pin renders the same bytes after a change as before it — otherwise every channel's
+    warm prefix goes cold at once, under the same `SERIALIZER_VERSION`;
+  * a later turn in the same room only EXTENDS the previous turn's items, so the prefix the
+    previous turn paid for is still a prefix. An edit is the honest exception and it rewrites
+    from the edited message, not from the top.
+
+`tests/fixtures/stream_prefix_pins.json` holds the pins (messages, H, actors, the serializer
+config they were pinned with), the expected outcome of each turn-to-turn transition, and the
+recorded `item_digests` of every build. The transition verdict is `first_divergence` from
+`tools/prompt_cache_report.py`, so this check and the ledger report cannot disagree about what
+"append" means.
+
+To re-record after a DELIBERATE grammar change (bump SERIALIZER_VERSION in the same commit, and
+read the diff — every changed digest is a prefix the cache will miss once):
+
+    STREAM_PREFIX_RECORD=1 python3 -m pytest tests/unit/test_stream_prefix_stability.py
+
+What has to hold: recorded pins render their recorded digests, each transition is the recorded
+append or rewrite, and every origin in a turn shares one `stream_sha256`.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from message_processor.channel_stream import (SERIALIZER_VERSION, serialize_stream,
+                                              serializer_config_snapshot)
+from slack_client.normalizer import ORIGIN_REPLIES
+from tests.unit.test_channel_stream_serializer import msg, pinned
+from tools.prompt_cache_report import APPEND, first_divergence
+
+PINS = Path(__file__).resolve().parents[1] / "fixtures" / "stream_prefix_pins.json"
+RECORDING = os.getenv("STREAM_PREFIX_RECORD") == "1"
+
+
+def _load():
+    return json.loads(PINS.read_text(encoding="utf-8"))
+
+
+FIXTURE = _load()
+SCENARIOS = {scenario["name"]: scenario for scenario in FIXTURE["scenarios"]}
+
+
+def _message(row, *, origin=None):
+    extra = {"origin": origin} if origin else {}
+    return msg(row["ts"], text=row["text"], sender=row["sender"], root=row.get("root"),
+               edited_ts=row.get("edited_ts"), **extra)
+
+
+def _streams(turn, *, config):
+    """The turn's build once per origin — or once with no origin when the turn names none."""
+    base = pinned([_message(row) for row in turn["messages"]], h=turn["h"],
+                  actors=tuple(map(tuple, FIXTURE["actors"])), serializer_config=config)
+    streams = []
+    for origin in turn.get("origins") or [None]:
+        thread = [_message(row, origin=ORIGIN_REPLIES) for row in turn["messages"]
+                  if origin and (row["ts"] == origin or row.get("root") == origin)]
+        streams.append(serialize_stream(dataclasses.replace(
+            base, origin_root_ts=origin, origin_snapshot=tuple(thread))))
+    return streams
+
+
+def _builds(scenario, *, config):
+    return [_streams(turn, config=config)[0] for turn in scenario["turns"]]
+
+
+@pytest.mark.skipif(not RECORDING, reason="set STREAM_PREFIX_RECORD=1 to re-record the digests")
+def test_record():
+    config = serializer_config_snapshot()
+    FIXTURE["serializer_version"] = SERIALIZER_VERSION
+    FIXTURE["serializer_config"] = config
+    for scenario in FIXTURE["scenarios"]:
+        scenario["recorded"] = [{"stream_sha256": s.stream_sha256,
+                                 "item_digests": s.item_digests()}
+                                for s in _builds(scenario, config=config)]
+    PINS.write_text(json.dumps(FIXTURE, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+@pytest.mark.skipif(RECORDING, reason="recording")
+def test_the_recording_is_for_this_serializer_version():
+    assert FIXTURE["serializer_version"] == SERIALIZER_VERSION, (
+        "SERIALIZER_VERSION moved; re-record with STREAM_PREFIX_RECORD=1 and review the diff")
+
+
+@pytest.mark.skipif(RECORDING, reason="recording")
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_recorded_pins_render_their_recorded_bytes(name):
+    scenario = SCENARIOS[name]
+    builds = _builds(scenario, config=FIXTURE["serializer_config"])
+
+    for turn, (stream, recorded) in enumerate(zip(builds, scenario["recorded"])):
+        moved = first_divergence(recorded["item_digests"], stream.item_digests())
+        assert moved is None, (
+            f"{name} turn {turn}: the same pin now renders different bytes from item "
+            f"{moved['index']} ({moved['before']}), so every cached prefix past it misses at "
+            "deploy. If that is deliberate, bump SERIALIZER_VERSION and re-record.")
+        assert stream.stream_sha256 == recorded["stream_sha256"]
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_each_turn_keeps_the_previous_turns_prefix(name):
+    scenario = SCENARIOS[name]
+    builds = _builds(scenario, config=FIXTURE["serializer_config"])
+
+    for turn, expect in enumerate(scenario["expect"], start=1):
+        split = first_divergence(builds[turn - 1].item_digests(), builds[turn].item_digests())
+        assert split is not None and split["kind"] == expect["kind"], (name, turn, split)
+        if split["kind"] == APPEND:
+            assert split["before"] == "end"  # the only item the new turn gave up
+        else:
+            assert split["before"] == expect["before"], (name, turn, split)
+
+
+def test_every_origin_in_a_turn_shares_one_prefix():
+    turns = [turn for scenario in FIXTURE["scenarios"] for turn in scenario["turns"]
+             if len(turn.get("origins") or ()) > 1]
+    assert turns, "no recorded turn renders more than one origin"
+
+    for turn in turns:
+        streams = _streams(turn, config=FIXTURE["serializer_config"])
+        assert len({s.stream_sha256 for s in streams}) == 1
+        assert len({s.union_sha256 for s in streams}) == len(streams)
+        assert len({tuple(s.item_digests()) for s in streams}) == 1
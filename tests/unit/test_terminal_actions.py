@@ -349,7 +349,7 @@ def _terminal_processor(loop_result, *, background=False, sandbox_assets=(), art
     host._is_reaction_only = MagicMock(return_value=False)
     host.db = None
     host.mcp_manager = MagicMock()
-    host.mcp_manager.cache_discovered_tools_payload = MagicMock()
+    host.mcp_manager.cache_discovered_tools_payload_async = AsyncMock()
 
     async def _passthru(m, *a, **k):
         return m
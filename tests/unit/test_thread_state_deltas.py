@@ -0,0 +1,176 @@
+"""Event deltas applied to a warm ThreadState instead of a full transcript refetch.
+
+A warm thread used to refetch everything from Slack after any edit or deletion anywhere in it.
+Now the raw listeners queue each change (`_feed_thread_state`) and the next turn folds it in
+place, then asks Slack for the root's reply_count/latest_reply only. What has to hold: an edit or
+deletion that can be placed exactly lands without a refetch; one that cannot — or a counter that
+disagrees with what the events told us, i.e. a missed event — falls back to the full rebuild;
+and with THREAD_STATE_DELTAS off every edit and deletion still flags the refetch.
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from config import config
+from message_processor.client_contract import Message
+from message_processor.thread_management import ThreadManagementMixin
+from message_processor.thread_manager import AsyncThreadStateManager
+from message_processor.utilities import MessageUtilitiesMixin
+from slack_client.event_handlers.message_events import SlackMessageEventsMixin
+
+KEY = "C1:100.0"
+
+
+class _Proc(ThreadManagementMixin, MessageUtilitiesMixin):
+    def __init__(self):
+        self.db = None
+        self.thread_manager = AsyncThreadStateManager(db=None)
+        self.openai_client = None
+        self.document_handler = None
+
+    def log_info(self, *a, **k): pass
+    log_debug = log_warning = log_error = log_info
+
+    def _update_status(self, *a, **k): pass
+
+
+def _hist(ts, text, **root):
+    return Message(text=text, user_id="U1", channel_id="C1", thread_id="100.0", attachments=[],
+                   metadata={"ts": ts, "is_bot": False, "sender_type": "human",
+                             "bot_name": None, "username": "Peter", "reactions": None, **root})
+
+
+def _incoming(ts):
+    return Message(text="next", user_id="U1", channel_id="C1", thread_id="100.0",
+                   attachments=[], metadata={"ts": ts})
+
+
+def _client(counters):
+    c = MagicMock()
+    c.get_thread_history = AsyncMock(return_value=[
+        _hist("100.0", "kickoff", reply_count=2, latest_reply="102.0"),
+        _hist("101.0", "the launch is on Tuesday"),
+        _hist("102.0", "sounds good")])
+    c.get_thread_reply_counters = AsyncMock(return_value=counters)
+    c.name = "slack"
+    c.user_cache = {}
+    c.bot_user_id = "UBOT"
+    return c
+
+
+async def _warm(counters):
+    proc, client = _Proc(), _client(counters)
+    state = await proc._get_or_rebuild_thread_state(_incoming("102.0"), client)
+    assert (state.slack_reply_count, state.slack_latest_reply) == (2, "102.0")
+    proc.thread_manager.note_thread_delta(KEY, {"kind": "reply", "ts": "103.0"})
+    return proc, client
+
+
+def _text(state):
+    return " ".join(str(m.get("content")) for m in state.messages)
+
+
+async def test_an_edit_is_applied_in_place_without_a_refetch():
+    proc, client = await _warm(counters=(3, "103.0"))
+    proc.thread_manager.note_thread_delta(KEY, {
+        "kind": "edit", "ts": "101.0",
+        "old_text": "the launch is on Tuesday", "new_text": "the launch is on Friday"})
+    state = await proc._get_or_rebuild_thread_state(_incoming("103.0"), client)
+    assert client.get_thread_history.await_count == 1
+    assert "on Friday" in _text(state) and "on Tuesday" not in _text(state)
+    assert proc.thread_manager.get_rebuild_stats() == {
+        "rebuilds": 1, "delta_turns": 1, "checks": 1, "divergences": 0}
+
+
+async def test_a_deletion_is_applied_in_place_and_moves_the_counter_back():
+    proc, client = await _warm(counters=(2, "103.0"))
+    proc.thread_manager.note_thread_delta(KEY, {
+        "kind": "delete", "ts": "101.0", "old_text": "the launch is on Tuesday"})
+    state = await proc._get_or_rebuild_thread_state(_incoming("103.0"), client)
+    assert client.get_thread_history.await_count == 1
+    assert "Tuesday" not in _text(state) and state.slack_reply_count == 2
+
+
+async def test_a_missed_event_shows_in_the_counters_and_forces_a_rebuild():
+    proc, client = await _warm(counters=(4, "104.0"))  # Slack saw a reply we never heard of
+    proc.thread_manager.note_thread_delta(KEY, {
+        "kind": "edit", "ts": "101.0",
+        "old_text": "the launch is on Tuesday", "new_text": "the launch is on Friday"})
+    await proc._get_or_rebuild_thread_state(_incoming("103.0"), client)
+    assert client.get_thread_history.await_count == 2
+    assert proc.thread_manager.get_rebuild_stats()["divergences"] == 1
+
+
+async def test_an_edit_that_cannot_be_placed_exactly_rebuilds_without_a_check():
+    proc, client = await _warm(counters=(3, "103.0"))
+    proc.thread_manager.note_thread_delta(KEY, {
+        "kind": "edit", "ts": "101.0",
+        "old_text": "the launch is on Tuesday", "new_text": "ask <@U2> about the launch"})
+    await proc._get_or_rebuild_thread_state(_incoming("103.0"), client)
+    assert client.get_thread_history.await_count == 2
+    client.get_thread_reply_counters.assert_not_awaited()
+
+
+async def test_replies_alone_need_neither_a_check_nor_a_refetch():
+    proc, client = await _warm(counters=None)
+    state = await proc._get_or_rebuild_thread_state(_incoming("103.0"), client)
+    assert client.get_thread_history.await_count == 1
+    client.get_thread_reply_counters.assert_not_awaited()
+    assert (state.slack_reply_count, state.slack_latest_reply) == (3, "103.0")
+
+
+def test_an_overflowing_queue_falls_back_to_a_refetch():
+    tm = AsyncThreadStateManager(db=None)
+    tm._threads[KEY] = SimpleNamespace(messages=[{"role": "user", "content": "x"}])
+    for i in range(201):
+        tm.note_thread_delta(KEY, {"kind": "reply", "ts": f"{200 + i}.0"})
+    assert tm.take_thread_deltas(KEY) == [] and tm.consume_needs_refresh(KEY) is True
+
+
+class _Host(SlackMessageEventsMixin):
+    def __init__(self):
+        self.tm = MagicMock()
+        self.processor = SimpleNamespace(thread_manager=self.tm)
+
+    def is_own_message(self, e):
+        return e.get("bot_id") == "BME"
+
+    def log_debug(self, *a, **k): pass
+
+
+@pytest.mark.parametrize("event, delta", [
+    ({"channel": "C1", "ts": "103.0", "thread_ts": "100.0"}, {"kind": "reply", "ts": "103.0"}),
+    ({"channel": "C1", "subtype": "message_deleted", "deleted_ts": "101.0",
+      "previous_message": {"ts": "101.0", "thread_ts": "100.0", "text": "old"}},
+     {"kind": "delete", "ts": "101.0", "old_text": "old"}),
+    ({"channel": "C1", "subtype": "message_changed",
+      "message": {"ts": "101.0", "thread_ts": "100.0", "text": "new"},
+      "previous_message": {"ts": "101.0", "text": "old"}},
+     {"kind": "edit", "ts": "101.0", "old_text": "old", "new_text": "new"}),
+])
+def test_the_listener_feed_queues_one_delta_per_event(event, delta):
+    host = _Host()
+    host._feed_thread_state(event)
+    host.tm.note_thread_delta.assert_called_once_with(KEY, delta)
+
+
+def test_our_own_streaming_edits_are_not_fed():
+    host = _Host()
+    host._feed_thread_state({"channel": "C1", "subtype": "message_changed",
+                             "message": {"ts": "104.0", "thread_ts": "100.0", "bot_id": "BME",
+                                         "text": "more tokens"}})
+    host.tm.note_thread_delta.assert_not_called()
+    host.tm.mark_needs_refresh.assert_not_called()
+
+
+def test_a_tombstone_or_the_setting_off_still_flags_a_refetch(monkeypatch):
+    host = _Host()
+    host._feed_thread_state({"channel": "C1", "subtype": "message_changed",
+                             "message": {"ts": "100.0", "subtype": "tombstone"}})
+    monkeypatch.setattr(config, "thread_state_deltas", False)
+    host._feed_thread_state({"channel": "C1", "subtype": "message_changed",
+                             "message": {"ts": "101.0", "thread_ts": "100.0", "text": "new"}})
+    host._feed_thread_state({"channel": "C1", "ts": "103.0", "thread_ts": "100.0"})
+    assert [c.args for c in host.tm.mark_needs_refresh.call_args_list] == [(KEY,), (KEY,)]
+    host.tm.note_thread_delta.assert_not_called()
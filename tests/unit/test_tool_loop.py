@@ -153,6 +153,79 @@ class TestToolRegistry:
         assert [s["name"] for s in reg.schemas({"allow": True})] == ["gated"]
         assert reg.has_tools({"allow": True}) and not reg.has_tools({"allow": False})
 
+    @pytest.mark.asyncio
+    async def test_a_concurrency_class_caps_its_calls_per_round(self, monkeypatch):
+        # Six history reads in one round reach Slack two at a time; a cheap unclassed lookup in
+        # the same round never waits behind them; results keep the order of the calls.
+        monkeypatch.setattr(config, "tool_concurrency_limits", {"slack-read": 2})
+        running = Counter()
+        peak = Counter()
+        now = [0.0]  # the registry's clock: a read "takes" 250ms by moving it on
+
+        def tracked(kind, delay):
+            async def exec_(ctx, args):
+                running[kind] += 1
+                peak[kind] = max(peak[kind], running[kind])
+                began = now[0]
+                await asyncio.sleep(0)
+                now[0] = max(now[0], began + delay)
+                running[kind] -= 1
+                return {"ok": True, "n": args.get("n")}
+            return exec_
+
+        reg = ToolRegistry(clock=lambda: now[0])
+        reg.register({"type": "function", "name": "fetch_thread_messages", "parameters": {}},
+                     tracked("read", 0.25), concurrency="slack-read")
+        reg.register({"type": "function", "name": "lookup", "parameters": {}},
+                     tracked("lookup", 0.0))
+        calls = [_call("fetch_thread_messages", f"c{i}", f'{{"n": {i}}}') for i in range(6)]
+        calls.append(_call("lookup", "c-look", '{"n": 99}'))
+        ctx = ToolContext()
+
+        out = await reg.dispatch_all(ctx, calls)
+
+        assert [r["n"] for r in out] == [0, 1, 2, 3, 4, 5, 99]
+        assert peak["read"] == 2
+        timings = ctx.round_timings
+        assert [t.name for t in timings] == [c["name"] for c in calls]
+        assert timings[0].concurrency == "slack-read" and timings[-1].concurrency is None
+        # Three pairs: the second waited for the first, the third for both.
+        assert [t.queue_ms for t in timings[:6]] == [0.0, 0.0, 250.0, 250.0, 500.0, 500.0]
+        assert timings[-1].queue_ms == 0.0
+        assert all(t.exec_ms == 250.0 for t in timings[:6])
+        stats = reg.stats()
+        assert stats["fetch_thread_messages"]["calls"] == 6
+        assert stats["fetch_thread_messages"]["class"] == "slack-read"
+        assert stats["fetch_thread_messages"]["queue_ms_avg"] == 250.0
+        assert (stats["lookup"]["class"], stats["lookup"]["calls"],
+                stats["lookup"]["queue_ms_avg"]) == (None, 1, 0.0)
+
+    @pytest.mark.asyncio
+    async def test_a_class_without_a_limit_runs_unbounded(self, monkeypatch):
+        monkeypatch.setattr(config, "tool_concurrency_limits", {"slack-read": 0})
+        running, peak = [0], [0]
+
+        async def exec_(ctx, args):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.02)
+            running[0] -= 1
+            return {"ok": True}
+
+        reg = ToolRegistry()
+        reg.register({"type": "function", "name": "r", "parameters": {}}, exec_,
+                     concurrency="slack-read")
+        reg.register({"type": "function", "name": "w", "parameters": {}}, exec_,
+                     concurrency="slack-write")  # not configured at all
+        await reg.dispatch_all(ToolContext(), [_call("r", f"r{i}") for i in range(4)]
+                               + [_call("w", f"w{i}") for i in range(4)])
+        assert peak[0] == 8
+
+    def test_an_unknown_concurrency_class_is_refused_at_registration(self):
+        with pytest.raises(ValueError, match="concurrency"):
+            ToolRegistry().register({"type": "function", "name": "x", "parameters": {}}, _ok,
+                                    concurrency="slack")
+
     def test_serialize_truncates(self, monkeypatch):
         monkeypatch.setattr(config, "tool_result_max_chars", 20)
         s = serialize_tool_result({"data": "x" * 100})
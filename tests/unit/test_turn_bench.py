@@ -0,0 +1,137 @@
+"""The local Slack and OpenAI stand-ins the turn benchmark runs the bot against.
+
+The benchmark is only as honest as its fakes: a number it reports means something only if the
+bot's real clients talk to them exactly as they would talk to Slack and OpenAI. So these tests
+drive the fakes through those real clients — `AsyncWebClient`, `AsyncOpenAI`, a raw websocket —
+over loopback, never by calling handlers directly.
+
+What has to hold: the Web API pages and threads like Slack does, a 429 arrives with the status
+and `Retry-After` the SDK acts on, a streamed answer parses into the canned text with usage on
+the terminal event, structured output satisfies the schema it was asked for, and an injected
+Socket Mode event is delivered and acknowledged.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import aiohttp
+import pytest
+from openai import AsyncOpenAI
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from tools.fake_openai import FakeOpenAI, schema_instance
+from tools.fake_slack import BOT_USER_ID, FakeSlack
+
+
+@pytest.fixture
+async def slack():
+    fake = FakeSlack()
+    fake.add_user("U0DANA", "Dana Whitfield")
+    fake.add_channel("C0BENCH", "bench", ["U0DANA"])
+    await fake.start()
+    yield fake
+    await fake.stop()
+
+
+@pytest.fixture
+async def model():
+    fake = FakeOpenAI(deltas=5)
+    await fake.start()
+    yield fake
+    await fake.stop()
+
+
+async def test_history_pages_newest_first_and_threads_keep_their_replies(slack):
+    roots = [slack.post("C0BENCH", f"message {n}", user="U0DANA") for n in range(5)]
+    slack.post("C0BENCH", "a reply", user="U0DANA", thread_ts=roots[1]["ts"])
+    client = AsyncWebClient(token="xoxb-test", base_url=slack.base_url)
+
+    seen, cursor = [], None
+    while True:
+        page = await client.conversations_history(channel="C0BENCH", limit=2, cursor=cursor)
+        seen += [m["ts"] for m in page["messages"]]
+        cursor = page["response_metadata"]["next_cursor"]
+        if not page["has_more"]:
+            break
+
+    assert seen == [m["ts"] for m in reversed(roots)]  # the reply is not a channel message
+    thread = await client.conversations_replies(channel="C0BENCH", ts=roots[1]["ts"])
+    assert [m["text"] for m in thread["messages"]] == ["message 1", "a reply"]
+    assert thread["messages"][0]["reply_count"] == 1
+
+
+async def test_posts_and_stream_appends_land_in_the_transcript(slack):
+    client = AsyncWebClient(token="xoxb-test", base_url=slack.base_url)
+
+    started = await client.api_call("chat.startStream", json={
+        "channel": "C0BENCH", "markdown_text": "Hel"})
+    await client.api_call("chat.appendStream", json={
+        "channel": "C0BENCH", "ts": started["ts"], "markdown_text": "lo"})
+
+    message = slack.messages["C0BENCH"][-1]
+    assert (message["text"], message["user"]) == ("Hello", BOT_USER_ID)
+    assert slack.calls["chat.startStream"] == slack.calls["chat.appendStream"] == 1
+
+
+async def test_a_refused_call_is_a_429_with_retry_after(slack):
+    slack.rate_limit_ratio, slack.retry_after_s = 1.0, 3
+    slack.rate_limit_methods = frozenset({"users.info"})
+    client = AsyncWebClient(token="xoxb-test", base_url=slack.base_url)
+
+    with pytest.raises(SlackApiError) as refused:
+        await client.users_info(user="U0DANA")
+
+    assert refused.value.response.status_code == 429
+    assert refused.value.response.headers["Retry-After"] == "3"
+    assert (await client.auth_test())["user_id"] == BOT_USER_ID  # other methods unaffected
+    assert slack.rate_limited == {"users.info": 1}
+
+
+async def test_an_injected_event_is_delivered_and_acknowledged(slack):
+    message = slack.post("C0BENCH", f"<@{BOT_USER_ID}> hello", user="U0DANA")
+    url = (await AsyncWebClient(token="xapp-test", base_url=slack.base_url)
+           .apps_connections_open(app_token="xapp-test"))["url"]
+
+    async with aiohttp.ClientSession() as session, session.ws_connect(url) as ws:
+        assert json.loads((await ws.receive()).data)["type"] == "hello"
+        inject = asyncio.ensure_future(
+            slack.inject(slack.message_event(message, "C0BENCH"), timeout=5))
+        envelope = json.loads((await ws.receive()).data)
+        assert envelope["payload"]["event"]["ts"] == message["ts"]
+        assert not inject.done()  # held until the ack
+        await ws.send_str(json.dumps({"envelope_id": envelope["envelope_id"]}))
+        await inject
+
+
+async def test_a_streamed_answer_parses_into_the_canned_text_with_usage(model):
+    client = AsyncOpenAI(api_key="sk-test", base_url=model.base_url)
+
+    stream = await client.responses.create(model="gpt-5", input="hello", stream=True)
+    deltas, completed = [], None
+    async for event in stream:
+        if event.type == "response.output_text.delta":
+            deltas.append(event.delta)
+        elif event.type == "response.completed":
+            completed = event.response
+
+    assert len(deltas) == 5 and "".join(deltas) == model.reply
+    assert completed.output_text == model.reply
+    assert completed.usage.input_tokens_details.cached_tokens >= 0
+    assert model.calls == {"stream": 1}
+
+
+async def test_structured_output_satisfies_the_requested_schema(model):
+    client = AsyncOpenAI(api_key="sk-test", base_url=model.base_url)
+    schema = {"type": "object", "properties": {
+        "wake": {"type": "boolean"},
+        "reason": {"anyOf": [{"$ref": "#/$defs/Reason"}, {"type": "null"}]},
+        "tags": {"type": "array", "items": {"type": "string"}, "minItems": 1}},
+        "$defs": {"Reason": {"type": "string", "enum": ["asked", "ambient"]}}}
+
+    response = await client.responses.create(model="gpt-5-mini", input="classify", text={
+        "format": {"type": "json_schema", "name": "verdict", "schema": schema}})
+
+    assert json.loads(response.output_text) == {"wake": False, "reason": "asked", "tags": [""]}
+    assert schema_instance(schema) == json.loads(response.output_text)
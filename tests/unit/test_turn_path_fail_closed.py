@@ -57,9 +57,7 @@ def _cfg(**overrides):
 
 
 def _boot(db, cfg=None):
-    boot = ChannelCoverageBootstrap(_Client(db), db=db, cfg=cfg or _cfg())
-    boot._semaphore = asyncio.Semaphore(2)
-    return boot
+    return ChannelCoverageBootstrap(_Client(db), db=db, cfg=cfg or _cfg())
 
 
 def _db():
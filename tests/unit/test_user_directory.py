@@ -0,0 +1,144 @@
+"""The bounded user cache and the bulk users.list warm-up behind it.
+
+What has to hold: the cache is still a dict to its readers but evicts the least recently used
+entry past its size and forgets an entry past its TTL; one sweep walks every users.list page,
+waits out a rate limit, and lands each page in the cache and the users table in one write; a
+`user_change` writes the new name through both; and once the directory is warm and whole,
+`resolve_usernames` answers a listed user from memory alone while an external one users.list
+never returned still falls back to the users table and users.info.
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from database import DatabaseManager
+from slack_client.user_directory import UserCache, UserDirectory
+from slack_client.utilities import SlackUtilitiesMixin
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _member(uid, real_name, display_name=None):
+    return {"id": uid, "name": uid.lower(), "tz": "Europe/Berlin",
+            "profile": {"display_name": display_name or real_name.split()[0].lower(),
+                        "real_name": real_name}}
+
+
+class _Bot(SlackUtilitiesMixin):
+    def __init__(self, pages):
+        self.user_cache = UserCache(max_entries=100, ttl_s=3600)
+        self.db = MagicMock()
+        self.db.save_user_infos_async = AsyncMock(side_effect=lambda rows: len(rows))
+        self.db.get_user_infos_async = AsyncMock(return_value={})
+        self.app = SimpleNamespace(client=SimpleNamespace(users_list=AsyncMock(side_effect=pages)))
+        self.user_directory = UserDirectory(self)
+
+    def log_debug(self, *a, **k):
+        pass
+
+
+def _rate_limited():
+    body = {"ok": False, "error": "ratelimited"}
+    response = SimpleNamespace(headers={"Retry-After": "0"}, data=body, status_code=429,
+                               get=body.get)
+    return SlackApiError("ratelimited", response)
+
+
+def test_the_cache_is_a_bounded_expiring_dict():
+    clock = _Clock()
+    cache = UserCache(max_entries=2, ttl_s=60, clock=clock)
+    assert isinstance(cache, dict)
+    cache["U1"] = {"username": "dana"}
+    cache["U2"] = {"username": "jamie"}
+    assert cache["U1"]["username"] == "dana"  # U1 is now the most recent
+    cache["U3"] = {"username": "riley"}
+    assert "U2" not in cache and "U1" in cache and "U3" in cache
+    clock.now += 61
+    assert cache.get("U1") is None and "U3" not in cache and len(cache) == 0
+
+
+async def test_one_sweep_walks_every_page_and_persists_each_once():
+    bot = _Bot([
+        {"ok": True, "members": [_member("U1", "Dana Whitfield"), _member("U2", "Jamie Jensen")],
+         "response_metadata": {"next_cursor": "c2"}},
+        _rate_limited(),
+        {"ok": True, "members": [_member("U3", "Riley Reyes"), {"id": "U4", "profile": {}}],
+         "response_metadata": {"next_cursor": ""}},
+    ])
+    assert await bot.user_directory.sweep() == 3
+    assert bot.app.client.users_list.await_args_list[-1].kwargs == {"limit": 200, "cursor": "c2"}
+    assert bot.db.save_user_infos_async.await_count == 2
+    assert bot.user_cache["U3"]["username"] == "riley"
+    assert bot.user_directory.is_warm and bot.user_directory.complete
+
+
+async def test_a_warm_directory_resolves_names_without_the_db_or_slack():
+    bot = _Bot([{"ok": True, "members": [_member("U1", "Dana Whitfield")]}])
+    await bot.user_directory.sweep()
+    bot.user_cache.pop("U1")  # listed, then evicted: the users table holds nothing newer
+    bot.user_cache["U2"] = {"username": "jamie"}
+    api = MagicMock()
+    api.users_info = AsyncMock()
+    assert await bot.resolve_usernames(["U2", "U1"], api, max_remote_lookups=0) == {"U2": "jamie"}
+    bot.db.get_user_infos_async.assert_not_called()
+    api.users_info.assert_not_called()
+
+
+async def test_an_external_user_users_list_never_returned_still_falls_back():
+    bot = _Bot([{"ok": True, "members": [_member("U1", "Dana Whitfield")]}])
+    await bot.user_directory.sweep()
+    bot.db.get_user_infos_async.return_value = {"U0EXT": {"username": "partner.sam"}}
+    api = MagicMock()
+    api.users_info = AsyncMock(return_value={"ok": True, "user": _member("W0EXT", "Ola Berg")})
+
+    names = await bot.resolve_usernames(["U1", "U0EXT", "W0EXT"], api, max_remote_lookups=1)
+
+    assert names == {"U1": "dana", "U0EXT": "partner.sam", "W0EXT": "ola"}
+    bot.db.get_user_infos_async.assert_awaited_once_with(["U0EXT", "W0EXT"])
+    api.users_info.assert_awaited_once_with(user="W0EXT")
+
+
+async def test_a_user_change_writes_the_new_name_through():
+    bot = _Bot([])
+    bot.user_cache["U1"] = {"username": "dana"}
+    await bot.user_directory.apply_user_change({"type": "user_change",
+                                                "user": _member("U1", "Dana Whitfield", "dana.w")})
+    assert bot.user_cache["U1"]["username"] == "dana.w"
+    rows = bot.db.save_user_infos_async.await_args.args[0]
+    assert rows[0]["user_id"] == "U1" and rows[0]["username"] == "dana.w"
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    db = DatabaseManager(platform="slack")
+    yield db
+    db.conn.close()
+
+
+async def test_the_bulk_write_upserts_without_touching_other_columns(temp_db):
+    await temp_db.get_or_create_user_async("U1", "old")
+    temp_db.conn.execute("UPDATE users SET config_json = '{\"x\": 1}' WHERE user_id = 'U1'")
+    temp_db.conn.commit()
+    assert await temp_db.save_user_infos_async([
+        {"user_id": "U1", "username": "new", "real_name": "Tessa Tran"},
+        {"user_id": "U2", "username": "stranger"}]) == 2
+    rows = await temp_db.get_user_infos_async(["U1", "U2"])
+    assert rows["U1"]["username"] == "new" and rows["U1"]["config_json"] == '{"x": 1}'
+    assert rows["U2"]["username"] == "stranger" and rows["U2"]["timezone"] == "UTC"
+
+
+async def test_a_sweep_without_an_email_keeps_the_stored_one(temp_db):
+    await temp_db.save_user_infos_async([{"user_id": "U1", "username": "dana",
+                                          "email": "dana@example.com"}])
+    await temp_db.save_user_infos_async([{"user_id": "U1", "username": "dana.w"}])
+    row = (await temp_db.get_user_infos_async(["U1"]))["U1"]
+    assert (row["username"], row["email"]) == ("dana.w", "dana@example.com")
@@ -0,0 +1,208 @@
+"""The content-addressed memo in front of utility-model calls.
+
+A remembered answer is only right if it answers exactly the question that was asked, so the key
+has to move with everything that shapes the answer and nothing else. The memo has to stay inside
+its byte and time bounds, and what it saved has to be counted.
+
+What has to hold: an identical request is answered from memory with its tokens and latency
+counted as saved; a different input, prompt or model is a miss; an operation not opted in, or a
+channel-bound one, always reaches the model; failures and unfinished answers are not kept;
+entries expire after the TTL; the least recently used go first when the byte bound is hit; and
+through the real client a repeated tool-output summary costs one request, not two.
+"""
+from __future__ import annotations
+
+import pytest
+
+from openai_client.utility_memo import (CHANNEL_BOUND_OPERATIONS, MemoAnswer, UtilityMemo,
+                                        memo_key, prompt_version)
+from tools.fake_openai import FakeOpenAI
+
+
+def _request(text: str, *, prompt: str = "Summarize in one line.", model: str = "gpt-test"):
+    return {"model": model, "store": False, "max_output_tokens": 1024,
+            "input": [{"role": "developer", "content": prompt},
+                      {"role": "user", "content": text}]}
+
+
+class _Model:
+    """Counts calls; answers with `text` (or raises) after a fake second of work."""
+
+    def __init__(self, clock, text="a summary", tokens=120, cacheable=True, exc=None):
+        self.clock, self.text, self.tokens, self.cacheable, self.exc = (
+            clock, text, tokens, cacheable, exc)
+        self.calls = 0
+
+    async def __call__(self) -> MemoAnswer:
+        self.calls += 1
+        self.clock.now += 1.0
+        if self.exc is not None:
+            raise self.exc
+        return MemoAnswer(text=self.text, tokens=self.tokens, cacheable=self.cacheable)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _memo(clock, **kwargs):
+    kwargs.setdefault("operations", ["tool_result_summary", "ambient_summary"])
+    kwargs.setdefault("max_bytes", 1 << 20)
+    kwargs.setdefault("ttl", 60.0)
+    return UtilityMemo(clock=clock, **kwargs)
+
+
+async def test_an_identical_request_is_answered_from_memory_and_counted():
+    clock = _Clock()
+    memo, model = _memo(clock), _Model(clock)
+
+    first = await memo.text("tool_result_summary", _request("report body"), model)
+    second = await memo.text("tool_result_summary", _request("report body"), model)
+
+    assert first == second == "a summary"
+    assert model.calls == 1
+    stats = memo.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    assert stats["tokens_saved"] == 120
+    assert stats["seconds_saved"] == 1.0
+    assert stats["by_operation"] == {"tool_result_summary": {"hits": 1, "misses": 1}}
+
+
+async def test_input_prompt_model_and_operation_all_move_the_key():
+    base = _request("report body")
+    keys = {
+        memo_key("tool_result_summary", base),
+        memo_key("tool_result_summary", _request("another body")),
+        memo_key("tool_result_summary", _request("report body", prompt="Summarize briefly.")),
+        memo_key("tool_result_summary", _request("report body", model="gpt-other")),
+        memo_key("ambient_summary", base),
+        memo_key("tool_result_summary", {**base, "max_output_tokens": 2048}),
+    }
+    assert len(keys) == 6
+    assert memo_key("tool_result_summary", dict(reversed(list(base.items())))) == \
+        memo_key("tool_result_summary", base)  # key order is not content
+
+    # The prompt version follows the instructions only, never the user's input.
+    assert prompt_version(base) == prompt_version(_request("another body"))
+    assert prompt_version(base) != prompt_version(_request("report body", prompt="Other."))
+
+    clock = _Clock()
+    memo, model = _memo(clock), _Model(clock)
+    await memo.text("tool_result_summary", base, model)
+    await memo.text("tool_result_summary", _request("report body", prompt="Other."), model)
+    assert model.calls == 2
+
+
+async def test_operations_are_opt_in_and_channel_bound_ones_are_refused():
+    clock = _Clock()
+    memo = _memo(clock, operations=["ambient_summary", *CHANNEL_BOUND_OPERATIONS, "bogus"])
+    assert memo.operations == frozenset({"ambient_summary"})
+
+    model = _Model(clock)
+    for operation in ("tool_result_summary", "wake_classifier", "memory_extraction"):
+        await memo.text(operation, _request("same"), model)
+        await memo.text(operation, _request("same"), model)
+    assert model.calls == 6
+    assert memo.stats()["bypassed"] == 6
+    assert memo.stats()["entries"] == 0
+
+
+async def test_failures_and_unfinished_answers_are_not_kept():
+    clock = _Clock()
+    memo = _memo(clock)
+
+    failing = _Model(clock, exc=TimeoutError("slow"))
+    with pytest.raises(TimeoutError):
+        await memo.text("tool_result_summary", _request("body"), failing)
+    truncated = _Model(clock, cacheable=False)
+    await memo.text("tool_result_summary", _request("body"), truncated)
+    empty = _Model(clock, text="")
+    await memo.text("tool_result_summary", _request("body"), empty)
+
+    assert memo.stats()["entries"] == 0
+    good = _Model(clock)
+    await memo.text("tool_result_summary", _request("body"), good)
+    assert good.calls == 1 and memo.stats()["entries"] == 1
+
+
+async def test_entries_expire_after_the_ttl():
+    clock = _Clock()
+    memo, model = _memo(clock, ttl=30.0), _Model(clock)
+
+    await memo.text("tool_result_summary", _request("body"), model)
+    clock.now += 28.0
+    await memo.text("tool_result_summary", _request("body"), model)
+    assert model.calls == 1
+
+    clock.now += 5.0
+    await memo.text("tool_result_summary", _request("body"), model)
+    assert model.calls == 2
+    assert memo.stats()["expirations"] == 1
+    assert memo.stats()["entries"] == 1
+
+
+async def test_the_byte_bound_evicts_least_recently_used_first():
+    clock = _Clock()
+    model = _Model(clock, text="x" * 400)
+    probe = _memo(clock)
+    await probe.text("tool_result_summary", _request("a"), model)
+    one = probe.bytes
+    memo = _memo(clock, max_bytes=one * 2 + 10)  # room for two entries
+
+    await memo.text("tool_result_summary", _request("a"), model)
+    await memo.text("tool_result_summary", _request("b"), model)
+    await memo.text("tool_result_summary", _request("a"), model)  # hit: `a` is now most recent
+    await memo.text("tool_result_summary", _request("c"), model)  # evicts `b`
+
+    assert memo.evictions == 1
+    assert memo.bytes <= memo.max_bytes
+    calls = model.calls
+    await memo.text("tool_result_summary", _request("a"), model)
+    await memo.text("tool_result_summary", _request("c"), model)
+    assert model.calls == calls
+    await memo.text("tool_result_summary", _request("b"), model)
+    assert model.calls == calls + 1
+
+    tiny = _memo(clock, max_bytes=100)
+    await tiny.text("tool_result_summary", _request("a"), model)
+    assert tiny.stats()["entries"] == 0  # larger than the whole memo: never stored
+
+
+async def test_a_repeated_tool_summary_costs_one_request_through_the_client(monkeypatch):
+    from config import config
+    from openai_client import OpenAIClient
+
+    fake = FakeOpenAI(deltas=2, reply="Ice Cream report 2025-12-10 link=http://x/1")
+    await fake.start()
+    monkeypatch.setenv("OPENAI_BASE_URL", fake.base_url)
+    monkeypatch.setattr(config, "openai_api_key", "sk-test")
+    monkeypatch.setattr(config, "utility_memo_operations", ["tool_result_summary"])
+    client = OpenAIClient()
+    try:
+        first = await client.summarize_tool_result("y" * 5000, 200)
+        second = await client.summarize_tool_result("y" * 5000, 200)
+        other = await client.summarize_tool_result("z" * 5000, 200)
+
+        assert first == second == other == "Ice Cream report 2025-12-10 link=http://x/1"
+        assert fake.calls["create"] == 2
+        stats = client.utility_memo.stats()
+        assert stats["hits"] == 1
+        assert stats["tokens_saved"] > 0
+
+        # A caller recording usage is recording a real request: no memo for it.
+        sink = {}
+        await client.create_text_response(
+            messages=[{"role": "user", "content": "y" * 50}], model=config.utility_model,
+            usage_sink=sink, memo_operation="tool_result_summary")
+        await client.create_text_response(
+            messages=[{"role": "user", "content": "y" * 50}], model=config.utility_model,
+            usage_sink=sink, memo_operation="tool_result_summary")
+        assert fake.calls["create"] == 4
+        assert sink["input_tokens"] > 0
+    finally:
+        await client.close()
+        await fake.stop()
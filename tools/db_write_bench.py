@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""A write-path benchmark for the async accessors: group commit OFF vs ON.
+
+    python3 -m tools.db_write_bench [--writers 16] [--writes 50] [--window-ms 0] [--json]
+
+Each run builds a throwaway DatabaseManager in a temp directory, then has `--writers` tasks each
+make `--writes` small writes through the real accessors (thread-activity touches and tool-usage
+rows — the two hottest per-turn writers). A separate sqlite3 connection on its own thread plays
+the other process: it takes the write lock for `--hold-ms` every `--contend-ms`, the way a
+backup or a second bot process would.
+
+Reported per mode: wall time, writes/s, p50/p99/max per-write latency, and STALLS — writes that
+took longer than `--stall-ms`, i.e. the ones a user would notice as a hitch in the turn that made
+them. With the queue on, the group-commit counters (batches, average batch) are printed too.
+
+Nothing outside the temp directory is touched.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _contend(db_path: str, hold_ms: float, every_ms: float, stop: threading.Event) -> int:
+    """Hold the write lock for `hold_ms` every `every_ms` until told to stop."""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    held = 0
+    try:
+        while not stop.wait(every_ms / 1000.0):
+            conn.execute("BEGIN IMMEDIATE")
+            time.sleep(hold_ms / 1000.0)
+            conn.execute("COMMIT")
+            held += 1
+    finally:
+        conn.close()
+    return held
+
+
+async def _run_mode(group_commit: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="db_write_bench_") as tmp:
+        os.environ["DATABASE_DIR"] = tmp
+        os.environ["DB_GROUP_COMMIT"] = "true" if group_commit else "false"
+        os.environ["DB_GROUP_COMMIT_WINDOW_MS"] = str(args.window_ms)
+        from database import DatabaseManager
+        db = DatabaseManager.__new__(DatabaseManager)
+        db.logger.setLevel(logging.WARNING)  # the migration chatter would bury the report
+        DatabaseManager.__init__(db, platform="slack")
+        for w in range(args.writers):
+            db.get_or_create_thread(f"C{w:04d}:1.0", f"C{w:04d}")
+
+        latencies: List[float] = []
+
+        async def writer(w: int) -> None:
+            key = f"C{w:04d}:1.0"
+            for i in range(args.writes):
+                started = time.perf_counter()
+                if i % 2:
+                    await db.save_tool_usage_async(
+                        f"C{w:04d}", f"{w}.{i:06d}", key,
+                        [{"tool_name": "bench_tool", "gist": str(i)}])
+                else:
+                    await db.update_thread_activity_async(key)
+                latencies.append((time.perf_counter() - started) * 1000.0)
+
+        stop = threading.Event()
+        contention: Dict[str, int] = {}
+        contender = threading.Thread(
+            target=lambda: contention.update(
+                held=_contend(db.db_path, args.hold_ms, args.contend_ms, stop)),
+            daemon=True)
+        contender.start()
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(writer(w) for w in range(args.writers)))
+            await db.flush_writes_async()
+        finally:
+            elapsed = time.perf_counter() - started
+            stop.set()
+            contender.join()
+            stats = db.get_pool_stats()
+            await db.close_pool_async()
+            db.close()
+
+    total = len(latencies)
+    return {
+        "group_commit": group_commit,
+        "writes": total,
+        "seconds": round(elapsed, 3),
+        "writes_per_s": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+        "stalls": sum(1 for ms in latencies if ms > args.stall_ms),
+        "contender_holds": contention.get("held", 0),
+        "pool": {k: stats[k] for k in ("waited", "wait_ms_max")},
+        "group_commit_stats": stats.get("group_commit"),
+    }
+
+
+def _print_human(results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+    print(f"{args.writers} writers × {args.writes} writes; contender holds the write lock "
+          f"{args.hold_ms:g}ms every {args.contend_ms:g}ms; stall = >{args.stall_ms:g}ms")
+    for r in results:
+        label = "group commit ON " if r["group_commit"] else "group commit OFF"
+        print(f"  {label}: {r['seconds']:>7.3f}s  {r['writes_per_s']:>8.1f} writes/s  "
+              f"p50 {r['p50_ms']:>7.2f}ms  p99 {r['p99_ms']:>8.2f}ms  "
+              f"max {r['max_ms']:>8.2f}ms  stalls {r['stalls']}  "
+              f"(contender held {r['contender_holds']}×)")
+        gc = r["group_commit_stats"]
+        if gc:
+            print(f"                   batches {gc['batches']}  avg batch {gc['avg_batch']}  "
+                  f"max batch {gc['max_batch']}  failed {gc['failed_writes']}")
+
+
+async def _amain(args: argparse.Namespace) -> int:
+    results = [await _run_mode(False, args), await _run_mode(True, args)]
+    if args.as_json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        _print_human(results, args)
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=16, help="concurrent writer tasks")
+    parser.add_argument("--writes", type=int, default=50, help="writes per writer")
+    parser.add_argument("--window-ms", type=float, default=0.0,
+                        help="group-commit window (DB_GROUP_COMMIT_WINDOW_MS)")
+    parser.add_argument("--hold-ms", type=float, default=20.0,
+                        help="how long the contender holds the write lock")
+    parser.add_argument("--contend-ms", type=float, default=100.0,
+                        help="how often the contender takes the write lock")
+    parser.add_argument("--stall-ms", type=float, default=50.0,
+                        help="per-write latency counted as a stall")
+    parser.add_argument("--json", action="store_true", dest="as_json",
+                        help="machine-readable results on stdout")
+    return asyncio.run(_amain(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""A local OpenAI Responses endpoint that answers every request with canned text.
+
+    python3 -m tools.fake_openai [--port 8798] [--ttft-ms 300] [--delta-ms 15]
+
+Point the bot at it with `OPENAI_BASE_URL=http://127.0.0.1:8798/v1` (the SDK reads it) and any
+API key. `POST /v1/responses` answers in the shape the SDK parses:
+
+* `stream: true` gets the server-sent event sequence a plain text answer produces —
+  `response.created`, the output item / content part openers, `--deltas` text deltas spaced
+  `--delta-ms` apart after a `--ttft-ms` wait, their closers, and `response.completed` carrying
+  usage. That is the path a turn's reply takes.
+* anything else gets the completed response object after `--ttft-ms`. When the request asks for
+  a `json_schema` text format, the text is a minimal instance of that schema, so the utility
+  calls that parse structured output (wake classification, summaries, gates) get something
+  they accept.
+
+`GET /v1/models/<id>` answers at once, so the bot's connection warm-up has something to reach.
+
+The model never calls a tool: the point is the cost of the bot's own path around the model, not
+the model. Usage reports the input as characters / 4, and `cached_tokens` as a fixed share of
+it (`--cached-ratio`) so cache accounting has numbers to carry.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from aiohttp import web
+
+_REPLY = ("Here is a short answer from the stand-in model. It says nothing in particular, "
+          "but it arrives in pieces the way a real reply does, so the streaming path, the "
+          "Slack updates and the bookkeeping around them all do their usual work.")
+
+
+def schema_instance(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """The smallest value that satisfies a JSON schema of the shapes structured outputs use."""
+    defs = defs if defs is not None else schema.get("$defs", schema.get("definitions", {}))
+    if "$ref" in schema:
+        return schema_instance(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), defs)
+    for key in ("anyOf", "oneOf"):
+        if schema.get(key):
+            return schema_instance(schema[key][0], defs)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object" or "properties" in schema:
+        return {name: schema_instance(sub, defs)
+                for name, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [schema_instance(schema["items"], defs)
+                for _ in range(int(schema.get("minItems", 0)))] if "items" in schema else []
+    if kind == "string":
+        return "x" * int(schema.get("minLength", 0))
+    if kind in ("integer", "number"):
+        return schema.get("minimum", 0)
+    if kind == "boolean":
+        return False
+    return None
+
+
+class FakeOpenAI:
+    """A Responses endpoint on loopback with configurable time-to-first-token and pacing."""
+
+    def __init__(self, *, ttft_ms: float = 0.0, delta_ms: float = 0.0, deltas: int = 12,
+                 reply: str = _REPLY, cached_ratio: float = 0.5):
+        self.ttft_ms = ttft_ms
+        self.delta_ms = delta_ms
+        self.deltas = max(1, deltas)
+        self.reply = reply
+        self.cached_ratio = cached_ratio
+        self.calls: Counter = Counter()
+        self.requests: List[Dict[str, Any]] = []
+        self._ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Listen on `host:port` (0 = any free port) and return the API base URL."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/v1/responses", self._responses)
+        app.router.add_get("/v1/models/{model}", self._model)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.base_url = f"http://{host}:{bound}/v1"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _text_for(self, body: Dict[str, Any]) -> str:
+        fmt = (body.get("text") or {}).get("format") or {}
+        if fmt.get("type") == "json_schema":
+            return json.dumps(schema_instance(fmt.get("schema") or {}))
+        if fmt.get("type") == "json_object":
+            return "{}"
+        return self.reply
+
+    def _response(self, body: Dict[str, Any], response_id: str, text: Optional[str],
+                  status: str) -> Dict[str, Any]:
+        prompt_tokens = max(1, len(json.dumps(body.get("input", ""))) // 4)
+        output = []
+        if text is not None:
+            output.append({"type": "message", "id": f"msg_{response_id}", "role": "assistant",
+                           "status": "completed",
+                           "content": [{"type": "output_text", "text": text,
+                                        "annotations": []}]})
+        return {
+            "id": response_id, "object": "response", "created_at": int(time.time()),
+            "model": body.get("model", "fake"), "status": status, "output": output,
+            "parallel_tool_calls": True, "tool_choice": body.get("tool_choice", "auto"),
+            "tools": [], "error": None, "incomplete_details": None, "metadata": {},
+            "instructions": None, "temperature": body.get("temperature"), "top_p": None,
+            "service_tier": body.get("service_tier") or "default",
+            "usage": None if text is None else {
+                "input_tokens": prompt_tokens,
+                "input_tokens_details": {"cached_tokens": int(prompt_tokens * self.cached_ratio)},
+                "output_tokens": max(1, len(text) // 4),
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": prompt_tokens + max(1, len(text) // 4)},
+        }
+
+    async def _model(self, request: web.Request) -> web.Response:
+        """`models.retrieve` — what the bot's connection warm-up asks for."""
+        self.calls["models"] += 1
+        return web.json_response({"id": request.match_info["model"], "object": "model",
+                                  "created": 0, "owned_by": "fake"})
+
+    async def _responses(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.calls["stream" if body.get("stream") else "create"] += 1
+        self.requests.append(body)
+        response_id = f"resp_{next(self._ids):06d}"
+        text = self._text_for(body)
+        if self.ttft_ms:
+            await asyncio.sleep(self.ttft_ms / 1000.0)
+        if not body.get("stream"):
+            return web.json_response(self._response(body, response_id, text, "completed"))
+
+        stream = web.StreamResponse(headers={"Content-Type": "text/event-stream",
+                                             "Cache-Control": "no-cache"})
+        await stream.prepare(request)
+        sequence = itertools.count()
+        item_id = f"msg_{response_id}"
+
+        async def _send(event: Dict[str, Any]) -> None:
+            event["sequence_number"] = next(sequence)
+            await stream.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                               .encode())
+
+        await _send({"type": "response.created",
+                     "response": self._response(body, response_id, None, "in_progress")})
+        await _send({"type": "response.output_item.added", "output_index": 0,
+                     "item": {"type": "message", "id": item_id, "role": "assistant",
+                              "status": "in_progress", "content": []}})
+        await _send({"type": "response.content_part.added", "item_id": item_id,
+                     "output_index": 0, "content_index": 0,
+                     "part": {"type": "output_text", "text": "", "annotations": []}})
+        step = -(-len(text) // self.deltas)
+        for start in range(0, len(text), step):
+            if self.delta_ms and start:
+                await asyncio.sleep(self.delta_ms / 1000.0)
+            await _send({"type": "response.output_text.delta", "item_id": item_id,
+                         "output_index": 0, "content_index": 0,
+                         "delta": text[start:start + step], "logprobs": []})
+        await _send({"type": "response.output_text.done", "item_id": item_id,
+                     "output_index": 0, "content_index": 0, "text": text, "logprobs": []})
+        await _send({"type": "response.content_part.done", "item_id": item_id,
+                     "output_index": 0, "content_index": 0,
+                     "part": {"type": "output_text", "text": text, "annotations": []}})
+        done = self._response(body, response_id, text, "completed")
+        await _send({"type": "response.output_item.done", "output_index": 0,
+                     "item": done["output"][0]})
+        await _send({"type": "response.completed", "response": done})
+        await stream.write_eof()
+        return stream
+
+
+async def _serve(args: argparse.Namespace) -> int:
+    fake = FakeOpenAI(ttft_ms=args.ttft_ms, delta_ms=args.delta_ms, deltas=args.deltas)
+    print(f"fake OpenAI Responses API at {await fake.start(port=args.port)} — Ctrl-C to stop",
+          flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await fake.stop()
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="wait before the answer")
+    parser.add_argument("--delta-ms", type=float, default=15.0, help="gap between text deltas")
+    parser.add_argument("--deltas", type=int, default=12, help="text deltas per streamed answer")
+    try:
+        return asyncio.run(_serve(parser.parse_args(argv)))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
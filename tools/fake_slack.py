@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""A local Slack stand-in: the Web API the bot calls, plus a Socket Mode event injector.
+
+    python3 -m tools.fake_slack [--port 8799] [--latency-ms 40] [--rate-limit-ratio 0.02]
+
+Point the bot at it with `SLACK_API_URL=http://127.0.0.1:8799/api/` and any tokens. Bolt's
+`auth.test`, every per-request client and the Socket Mode `apps.connections.open` go through
+that one base URL, so an unmodified bot boots, connects its socket here and answers events
+injected with `FakeSlack.inject()`. `tools/turn_bench.py` is the in-process user.
+
+WHAT IS MODELLED is what a turn reads and writes: one workspace, its users and channels, a
+transcript per channel with real thread bookkeeping (`reply_count`, `latest_reply`), and the
+cursor paging of `conversations.history` / `conversations.replies`. Posts, updates, deletes and
+the chat streaming methods change that transcript, so a turn that reads back what it wrote sees
+it. A method not modelled answers `{"ok": true}` — enough for reactions, status lines and the
+like, whose effect nothing reads back.
+
+WHAT IS CONFIGURABLE is what Slack's cost looks like: a latency per call (mean and jitter) and
+a share of calls refused with HTTP 429 and `Retry-After`, optionally only for some methods. Every
+call is counted by method, so a benchmark can report Slack calls per turn.
+
+Nothing here reaches the network beyond the loopback port it listens on.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from aiohttp import WSMsgType, web
+
+TEAM_ID = "T0BENCH"
+BOT_USER_ID = "U0BENCHBOT"
+BOT_ID = "B0BENCHBOT"
+APP_ID = "A0BENCHAPP"
+BOT_NAME = "benchbot"
+
+# Default page size when a caller passes no `limit`, as Slack documents it.
+_DEFAULT_LIMIT = 100
+
+
+class FakeSlack:
+    """One fake workspace served over HTTP on loopback."""
+
+    def __init__(self, *, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_limit_ratio: float = 0.0, retry_after_s: int = 1,
+                 rate_limit_methods: Optional[Iterable[str]] = None, seed: int = 7):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after_s = retry_after_s
+        self.rate_limit_methods = frozenset(rate_limit_methods or ())
+        self._rng = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self.members: Dict[str, List[str]] = {}
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self._clock = itertools.count(1)
+        self._epoch = time.time()
+        self._envelopes = itertools.count(1)
+        self._sockets: List[web.WebSocketResponse] = []
+        self._acks: Dict[str, asyncio.Future] = {}
+        self._socket_ready = asyncio.Event()
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+        self.add_user(BOT_USER_ID, BOT_NAME, is_bot=True)
+
+    # -- the workspace ------------------------------------------------------------------------
+
+    def next_ts(self) -> str:
+        """A fresh message ts, strictly after every earlier one."""
+        return f"{self._epoch + next(self._clock) / 1000.0:.6f}"
+
+    def add_user(self, user_id: str, name: str, *, is_bot: bool = False) -> Dict[str, Any]:
+        user = {"id": user_id, "team_id": TEAM_ID, "name": name.lower().replace(" ", "."),
+                "real_name": name, "tz": "UTC", "tz_offset": 0, "is_bot": is_bot,
+                "deleted": False,
+                "profile": {"real_name": name, "display_name": name.split()[0].lower(),
+                            "bot_id": BOT_ID if is_bot else None}}
+        self.users[user_id] = user
+        return user
+
+    def add_channel(self, channel_id: str, name: str, members: Sequence[str]) -> Dict[str, Any]:
+        channel = {"id": channel_id, "name": name, "is_channel": True, "is_group": False,
+                   "is_im": False, "is_mpim": False, "is_private": False, "is_archived": False,
+                   "is_member": True, "created": int(self._epoch) - 86400,
+                   "topic": {"value": ""}, "purpose": {"value": ""}}
+        self.channels[channel_id] = channel
+        self.members[channel_id] = list(dict.fromkeys([BOT_USER_ID, *members]))
+        self.messages.setdefault(channel_id, [])
+        return channel
+
+    def post(self, channel_id: str, text: str, *, user: str, thread_ts: Optional[str] = None,
+             **extra: Any) -> Dict[str, Any]:
+        """Add a message to a channel's transcript the way Slack stores it, and return it."""
+        ts = self.next_ts()
+        message: Dict[str, Any] = {"type": "message", "ts": ts, "user": user, "text": text,
+                                   "team": TEAM_ID, **extra}
+        if user == BOT_USER_ID:
+            message.update(bot_id=BOT_ID, app_id=APP_ID)
+        if thread_ts:
+            message["thread_ts"] = thread_ts
+            root = self._find(channel_id, thread_ts)
+            if root is not None:
+                root["thread_ts"] = thread_ts
+                root["reply_count"] = root.get("reply_count", 0) + 1
+                root["latest_reply"] = ts
+                root["reply_users"] = sorted({*root.get("reply_users", []), user})
+        self.messages.setdefault(channel_id, []).append(message)
+        return message
+
+    def _find(self, channel_id: str, ts: Optional[str]) -> Optional[Dict[str, Any]]:
+        for message in self.messages.get(channel_id, []):
+            if message["ts"] == ts:
+                return message
+        return None
+
+    # -- Socket Mode ---------------------------------------------------------------------------
+
+    def message_event(self, message: Dict[str, Any], channel_id: str) -> Dict[str, Any]:
+        """The `message` event Slack delivers for a stored message."""
+        event = {"type": "message", "channel": channel_id, "channel_type": "channel",
+                 "event_ts": message["ts"], **message}
+        return event
+
+    async def inject(self, event: Dict[str, Any], *, timeout: float = 10.0) -> None:
+        """Deliver one Events API event over the connected socket and wait for the ack."""
+        await asyncio.wait_for(self._socket_ready.wait(), timeout)
+        envelope_id = f"env-{next(self._envelopes)}"
+        envelope = {
+            "envelope_id": envelope_id, "type": "events_api", "accepts_response_payload": False,
+            "retry_attempt": 0, "retry_reason": "",
+            "payload": {"token": "bench", "team_id": TEAM_ID, "api_app_id": APP_ID,
+                        "event": event, "type": "event_callback", "event_id": f"Ev{envelope_id}",
+                        "event_time": int(time.time()),
+                        "authorizations": [{"team_id": TEAM_ID, "user_id": BOT_USER_ID,
+                                            "is_bot": True, "enterprise_id": None}]},
+        }
+        ack = asyncio.get_running_loop().create_future()
+        self._acks[envelope_id] = ack
+        try:
+            await self._sockets[-1].send_str(json.dumps(envelope))
+            await asyncio.wait_for(ack, timeout)
+        finally:
+            self._acks.pop(envelope_id, None)
+
+    async def _socket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets.append(ws)
+        await ws.send_str(json.dumps({"type": "hello", "num_connections": len(self._sockets),
+                                      "connection_info": {"app_id": APP_ID},
+                                      "debug_info": {"host": "fake-slack"}}))
+        self._socket_ready.set()
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    envelope_id = json.loads(msg.data).get("envelope_id")
+                except ValueError:
+                    continue
+                ack = self._acks.get(envelope_id)
+                if ack is not None and not ack.done():
+                    ack.set_result(True)
+        finally:
+            self._sockets.remove(ws)
+            if not self._sockets:
+                self._socket_ready.clear()
+        return ws
+
+    # -- HTTP ----------------------------------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Listen on `host:port` (0 = any free port) and return the Web API base URL."""
+        app = web.Application()
+        app.router.add_route("*", "/api/{method}", self._api)
+        app.router.add_get("/socket", self._socket)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.base_url = f"http://{host}:{bound}/api/"
+        return self.base_url
+
+    async def stop(self) -> None:
+        for ws in list(self._sockets):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _api(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        args: Dict[str, Any] = dict(request.query)
+        if request.can_read_body:
+            if request.content_type == "application/json":
+                body = await request.json()
+                if isinstance(body, dict):
+                    args.update(body)
+            else:
+                args.update(dict(await request.post()))
+        delay = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000.0
+        if delay:
+            await asyncio.sleep(delay)
+        if (self.rate_limit_ratio and method != "apps.connections.open"
+                and (not self.rate_limit_methods or method in self.rate_limit_methods)
+                and self._rng.random() < self.rate_limit_ratio):
+            self.rate_limited[method] += 1
+            return web.json_response({"ok": False, "error": "ratelimited"}, status=429,
+                                     headers={"Retry-After": str(self.retry_after_s)})
+        handler = getattr(self, "_m_" + method.replace(".", "_"), None)
+        result = handler(args) if handler is not None else {"ok": True}
+        return web.json_response(result)
+
+    # -- methods -------------------------------------------------------------------------------
+
+    def _m_auth_test(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "url": "https://bench.example.com/", "team": "Bench",
+                "user": BOT_NAME, "team_id": TEAM_ID, "user_id": BOT_USER_ID, "bot_id": BOT_ID,
+                "app_id": APP_ID, "is_enterprise_install": False}
+
+    def _m_apps_connections_open(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "url": self.base_url.replace("http://", "ws://")
+                .replace("/api/", "/socket")}
+
+    def _m_team_info(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "team": {"id": TEAM_ID, "name": "Bench", "domain": "bench"}}
+
+    def _m_bots_info(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "bot": {"id": args.get("bot") or BOT_ID, "name": BOT_NAME,
+                                    "app_id": APP_ID, "user_id": BOT_USER_ID}}
+
+    def _m_users_info(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        user = self.users.get(str(args.get("user")))
+        return {"ok": True, "user": user} if user else {"ok": False, "error": "user_not_found"}
+
+    def _m_users_list(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "members": list(self.users.values()),
+                "response_metadata": {"next_cursor": ""}}
+
+    def _m_users_conversations(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "channels": list(self.channels.values()),
+                "response_metadata": {"next_cursor": ""}}
+
+    def _m_conversations_info(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel = self.channels.get(str(args.get("channel")))
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        return {"ok": True, "channel": {**channel,
+                                        "num_members": len(self.members.get(channel["id"], []))}}
+
+    def _m_conversations_members(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = str(args.get("channel"))
+        if channel_id not in self.channels:
+            return {"ok": False, "error": "channel_not_found"}
+        return {"ok": True, "members": self.members.get(channel_id, []),
+                "response_metadata": {"next_cursor": ""}}
+
+    def _m_conversations_history(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = str(args.get("channel"))
+        if channel_id not in self.channels:
+            return {"ok": False, "error": "channel_not_found"}
+        top = [m for m in self.messages.get(channel_id, [])
+               if m.get("thread_ts") in (None, m["ts"])]
+        return self._page(list(reversed(top)), args)
+
+    def _m_conversations_replies(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id, root = str(args.get("channel")), str(args.get("ts"))
+        thread = [m for m in self.messages.get(channel_id, [])
+                  if m["ts"] == root or m.get("thread_ts") == root]
+        if not thread:
+            return {"ok": False, "error": "thread_not_found"}
+        return self._page(thread, args)
+
+    def _page(self, messages: List[Dict[str, Any]], args: Dict[str, Any]) -> Dict[str, Any]:
+        inclusive = str(args.get("inclusive", "")).lower() in ("1", "true")
+
+        def _inside(ts: str) -> bool:
+            value = float(ts)
+            oldest, latest = args.get("oldest"), args.get("latest")
+            if oldest and (value < float(oldest) or (value == float(oldest) and not inclusive)):
+                return False
+            return not (latest and (value > float(latest)
+                                    or (value == float(latest) and not inclusive)))
+
+        window = [m for m in messages if _inside(m["ts"])]
+        start = int(args.get("cursor") or 0)
+        limit = max(1, int(args.get("limit") or _DEFAULT_LIMIT))
+        page = window[start:start + limit]
+        more = start + limit < len(window)
+        return {"ok": True, "messages": [dict(m) for m in page], "has_more": more,
+                "response_metadata": {"next_cursor": str(start + limit) if more else ""}}
+
+    def _m_chat_postMessage(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = str(args.get("channel"))
+        if channel_id not in self.channels:
+            return {"ok": False, "error": "channel_not_found"}
+        message = self.post(channel_id, str(args.get("text") or ""), user=BOT_USER_ID,
+                            thread_ts=args.get("thread_ts") or None)
+        return {"ok": True, "channel": channel_id, "ts": message["ts"], "message": message}
+
+    _m_chat_postEphemeral = _m_chat_postMessage
+
+    def _m_chat_update(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = str(args.get("channel"))
+        message = self._find(channel_id, args.get("ts"))
+        if message is None:
+            return {"ok": False, "error": "message_not_found"}
+        if "text" in args:
+            message["text"] = str(args.get("text") or "")
+        return {"ok": True, "channel": channel_id, "ts": message["ts"], "text": message["text"]}
+
+    def _m_chat_delete(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = str(args.get("channel"))
+        message = self._find(channel_id, args.get("ts"))
+        if message is None:
+            return {"ok": False, "error": "message_not_found"}
+        self.messages[channel_id].remove(message)
+        return {"ok": True, "channel": channel_id, "ts": message["ts"]}
+
+    def _m_chat_startStream(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = str(args.get("channel"))
+        message = self.post(channel_id, str(args.get("markdown_text") or ""), user=BOT_USER_ID,
+                            thread_ts=args.get("thread_ts") or None)
+        return {"ok": True, "channel": channel_id, "ts": message["ts"]}
+
+    def _m_chat_appendStream(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = str(args.get("channel"))
+        message = self._find(channel_id, args.get("ts"))
+        if message is None:
+            return {"ok": False, "error": "message_not_found"}
+        message["text"] += str(args.get("markdown_text") or "")
+        return {"ok": True, "channel": channel_id, "ts": message["ts"]}
+
+    _m_chat_stopStream = _m_chat_appendStream
+
+    def _m_chat_getPermalink(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "permalink": f"https://bench.example.com/archives/"
+                                         f"{args.get('channel')}/p{args.get('message_ts')}"}
+
+    def _m_emoji_list(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "emoji": {}}
+
+    def _m_bookmarks_list(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "bookmarks": []}
+
+    def _m_pins_list(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "items": []}
+
+    def _m_reactions_get(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        message = self._find(str(args.get("channel")), args.get("timestamp"))
+        return {"ok": True, "type": "message", "message": dict(message or {})}
+
+    def _m_chat_scheduledMessages_list(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "scheduled_messages": [], "response_metadata": {"next_cursor": ""}}
+
+
+async def _serve(args: argparse.Namespace) -> int:
+    slack = FakeSlack(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                      rate_limit_ratio=args.rate_limit_ratio, retry_after_s=args.retry_after)
+    slack.add_user("U0BENCH001", "Dana Whitfield")
+    slack.add_channel("C0BENCH001", "bench", ["U0BENCH001"])
+    print(f"fake Slack Web API at {await slack.start(port=args.port)} — Ctrl-C to stop",
+          flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await slack.stop()
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="mean latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="latency std deviation")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0,
+                        help="share of calls refused with HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After on a 429 (s)")
+    try:
+        return asyncio.run(_serve(parser.parse_args(argv)))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -231,6 +231,11 @@ STREAM_RENDER_MANDATORY = (STREAM_RENDER_STRINGS + STREAM_RENDER_HASHES
                            + STREAM_RENDER_COUNTS + STREAM_RENDER_VERSIONS
                            + STREAM_RENDER_BOOLS + ("inventory_state",))
 
+# `item_digests` is OPTIONAL: rows written before the per-item digests existed lack it, and a
+# consumer that finds it absent simply cannot locate a divergence. When present it is a list of
+# `<key>:<12 hex>`, one per canonical item, `horizon` first and `end` last.
+_ITEM_DIGEST = re.compile(r"\A[^:\s]+:[0-9a-f]{12}\Z")
+
 # THE FAIL-CLOSED VOCABULARY, by enumeration. Three survive W1's excision and W2 adds the
 # fourth. RETIRED CODES ARE VIOLATIONS, NOT GRANDFATHERED: `snapshot_unsupported` and
 # `coverage_not_ready` have no producer any more, so a fresh row carrying one means a producer
@@ -666,6 +671,14 @@ def _check_stream_render(row: Row, report: Report) -> None:
     _check_vocabulary(row, report, "inventory_state", INVENTORY_STATES,
                       "stream_render_bad_inventory_state", required=False)
 
+    if "item_digests" in row.obj:
+        digests = row.obj.get("item_digests")
+        if (not isinstance(digests, list) or len(digests) < 2
+                or not all(isinstance(d, str) and _ITEM_DIGEST.match(d) for d in digests)
+                or not digests[0].startswith("horizon:") or not digests[-1].startswith("end:")):
+            report.fail("stream_render_bad_field", row,
+                        "item_digests is not a horizon-first, end-last list of <key>:<12 hex>")
+
     # The rendered window can never hold more roots than it holds messages: roots are a SUBSET
     # of the periphery's message items, so this catches a count computed over the wrong subject
     # — the pre-filter root count, say — which no type check would notice.
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""How much of the channel stream's prompt cache actually pays off, read from the ledger.
+
+    python3 -m tools.prompt_cache_report logs/participation.jsonl.1 logs/participation.jsonl
+    python3 -m tools.prompt_cache_report logs/participation.jsonl --json
+
+WHAT IT ANSWERS. The serializer keeps the pre-breakpoint periphery byte-identical across origins
+and turns so the provider can serve it from cache; `model_response.cached_input_tokens` is the
+provider's own word on whether it did. This puts the two side by side:
+
+  * cached vs uncached input tokens per SURFACE and per CHANNEL, each split by `fork_reason` —
+    a retry or a reconsideration that re-sends a warm prefix should be mostly cached, and one
+    that is not is money spent twice;
+  * for each channel, what happened to the prefix between one `stream_render` and the next:
+    IDENTICAL (same `stream_sha256`), APPEND (the previous items, end marker aside, are a prefix
+    of the new ones — only the tail is new), or REWRITE (something above the tail moved);
+  * for every rewrite, the first divergent item — named by its message ts, or `horizon` /
+    `orphan` / `end` — and which pinned inputs changed with it (serializer config, actor map,
+    capability profile, sidecars, floor), which is usually the whole explanation;
+  * the hit rate of the turns behind each of those outcomes, which is the number that says
+    whether keeping the prefix stable is worth what it costs.
+
+THE JOINS. `model_response` carries no channel, so it is joined to `turn_start` by `turn_id`; an
+attempt whose `turn_start` rotated out of the input lands under channel `?` / surface `unknown`
+rather than being dropped. Divergence needs `stream_render.item_digests`; a pair where either row
+predates them is counted as `unlocated`.
+
+Stdlib only, for the same reason as `participation_ledger_check.py`: it runs where the ledger
+is. It reports; it never fails a ledger — that is the checker's job.
+
+Exit: 0 report written, 2 nothing readable.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# The pinned inputs whose change explains a rewrite. Named on each divergence when they differ
+# between the two renders — the stream hash moved, and these say what moved it.
+PIN_FIELDS = ("serializer_version", "serializer_config_hash", "actor_map_hash",
+              "capability_profile_hash", "sidecar_versions_hash", "periphery_floor_ts",
+              "inventory_state")
+
+IDENTICAL = "identical"
+APPEND = "append"
+REWRITE = "rewrite"
+UNLOCATED = "unlocated"
+FIRST = "first"          # a channel's first render in the input: nothing to compare against
+
+NO_FORK = "none"         # `fork_reason` absent: the turn's first pass, not a re-run
+UNKNOWN_CHANNEL = "?"
+UNKNOWN_SURFACE = "unknown"
+
+_LABEL = 34              # wide enough for the longest fork bucket, indented under its row
+
+
+def _key(digest: str) -> str:
+    return digest.rsplit(":", 1)[0]
+
+
+def first_divergence(before: Sequence[str], after: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """Where two consecutive renders' `item_digests` part, or None when they are identical.
+
+    APPEND when everything above the previous end marker survives in place: the new items only
+    extend the stream, so the cached prefix reaches the old tail. Anything else is a REWRITE at
+    the first index where the two disagree. `kept` is the share of the previous items, end
+    marker excluded, still in place above that index.
+    """
+    before, after = list(before), list(after)
+    if before == after:
+        return None
+    body = before[:-1]
+    if body and after[:len(body)] == body:
+        index, kind = len(body), APPEND
+    else:
+        index = next((i for i, (a, b) in enumerate(zip(before, after)) if a != b),
+                     min(len(before), len(after)))
+        kind = REWRITE
+    return {
+        "kind": kind,
+        "index": index,
+        "before": _key(before[index]) if index < len(before) else None,
+        "after": _key(after[index]) if index < len(after) else None,
+        "kept": round(min(index, len(body)) / len(body), 3) if body else 0.0,
+    }
+
+
+# ===========================================================================================
+# reading
+# ===========================================================================================
+
+def read_rows(paths: Iterable[str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Every JSON-object line, in file order (rotations oldest first). A line that does not
+    parse is counted, not fatal: this reads ledgers it has no say over."""
+    rows: List[Dict[str, Any]] = []
+    counts = {"files_read": 0, "lines_read": 0, "unparsable_lines": 0, "unreadable_files": 0}
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as handle:
+                raw_lines = handle.readlines()
+        except OSError:
+            counts["unreadable_files"] += 1
+            continue
+        counts["files_read"] += 1
+        for raw in raw_lines:
+            text = raw.strip()
+            if not text:
+                continue
+            counts["lines_read"] += 1
+            try:
+                obj = json.loads(text)
+            except ValueError:
+                counts["unparsable_lines"] += 1
+                continue
+            if isinstance(obj, dict):
+                rows.append(obj)
+            else:
+                counts["unparsable_lines"] += 1
+    return rows, counts
+
+
+# ===========================================================================================
+# aggregation
+# ===========================================================================================
+
+def _int(value: Any) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+class _Tokens:
+    """Attempts and input tokens for one bucket. An attempt with no usage — one that raised —
+    counts as an attempt and adds no tokens."""
+
+    __slots__ = ("attempts", "input_tokens", "cached_input_tokens")
+
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.input_tokens = 0
+        self.cached_input_tokens = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.attempts += 1
+        self.input_tokens += _int(row.get("input_tokens"))
+        self.cached_input_tokens += _int(row.get("cached_input_tokens"))
+
+    def as_dict(self) -> Dict[str, Any]:
+        uncached = max(0, self.input_tokens - self.cached_input_tokens)
+        return {"attempts": self.attempts, "input_tokens": self.input_tokens,
+                "cached_input_tokens": self.cached_input_tokens,
+                "uncached_input_tokens": uncached,
+                "hit_rate": (round(self.cached_input_tokens / self.input_tokens, 4)
+                             if self.input_tokens else None)}
+
+
+class _Bucket:
+    def __init__(self) -> None:
+        self.tokens = _Tokens()
+        self.forks: Dict[str, _Tokens] = defaultdict(_Tokens)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.tokens.add(row)
+        self.forks[str(row.get("fork_reason") or NO_FORK)].add(row)
+
+    def as_dict(self) -> Dict[str, Any]:
+        out = self.tokens.as_dict()
+        out["fork_reasons"] = {name: self.forks[name].as_dict() for name in sorted(self.forks)}
+        return out
+
+
+def build_report(rows: Sequence[Dict[str, Any]], *, max_divergences: int = 20) -> Dict[str, Any]:
+    turns: Dict[str, Tuple[str, str]] = {}
+    for row in rows:
+        if row.get("event") == "turn_start" and row.get("turn_id"):
+            turns[str(row["turn_id"])] = (str(row.get("channel_id") or UNKNOWN_CHANNEL),
+                                          str(row.get("surface") or UNKNOWN_SURFACE))
+
+    # ---- prefix outcomes: consecutive stream_render rows per channel ---------------------
+    last_render: Dict[str, Dict[str, Any]] = {}
+    prefix: Dict[str, Dict[str, int]] = defaultdict(
+        lambda: {"renders": 0, IDENTICAL: 0, APPEND: 0, REWRITE: 0, UNLOCATED: 0})
+    outcome_of_turn: Dict[str, str] = {}
+    divergences: List[Dict[str, Any]] = []
+    for row in rows:
+        if row.get("event") != "stream_render":
+            continue
+        channel = str(row.get("channel_id") or UNKNOWN_CHANNEL)
+        stats = prefix[channel]
+        stats["renders"] += 1
+        previous = last_render.get(channel)
+        last_render[channel] = row
+        if previous is None:
+            outcome = FIRST
+        elif previous.get("stream_sha256") == row.get("stream_sha256"):
+            outcome = IDENTICAL
+        elif (not isinstance(previous.get("item_digests"), list)
+              or not isinstance(row.get("item_digests"), list)):
+            outcome = UNLOCATED
+        else:
+            split = first_divergence(previous["item_digests"], row["item_digests"])
+            outcome = split["kind"] if split else IDENTICAL
+            if split and outcome == REWRITE:
+                divergences.append({
+                    "channel_id": channel, "at": row.get("at"),
+                    "turn_id": row.get("turn_id"), "previous_turn_id": previous.get("turn_id"),
+                    **split,
+                    "changed": [f for f in PIN_FIELDS if previous.get(f) != row.get(f)],
+                })
+        if outcome != FIRST:
+            stats[outcome] += 1
+        if row.get("turn_id"):
+            # A turn that rendered twice (a retry rebuilt it) is judged by its LAST build — the
+            # one its later attempts were sent with.
+            outcome_of_turn[str(row["turn_id"])] = outcome
+
+    # ---- token buckets -----------------------------------------------------------------
+    total = _Bucket()
+    by_surface: Dict[str, _Bucket] = defaultdict(_Bucket)
+    by_channel: Dict[str, _Bucket] = defaultdict(_Bucket)
+    by_outcome: Dict[str, _Tokens] = defaultdict(_Tokens)
+    for row in rows:
+        if row.get("event") != "model_response":
+            continue
+        turn_id = str(row.get("turn_id") or "")
+        channel, surface = turns.get(turn_id, (UNKNOWN_CHANNEL, UNKNOWN_SURFACE))
+        total.add(row)
+        by_surface[surface].add(row)
+        by_channel[channel].add(row)
+        if turn_id in outcome_of_turn:
+            by_outcome[outcome_of_turn[turn_id]].add(row)
+
+    channels = sorted(set(by_channel) | set(prefix))
+    return {
+        "totals": total.as_dict(),
+        "by_surface": {name: by_surface[name].as_dict() for name in sorted(by_surface)},
+        "by_channel": {name: {**(by_channel[name].as_dict() if name in by_channel
+                                 else _Bucket().as_dict()),
+                              "prefix": dict(prefix[name]) if name in prefix else None}
+                       for name in channels},
+        "by_prefix_outcome": {name: by_outcome[name].as_dict() for name in sorted(by_outcome)},
+        "divergence_count": len(divergences),
+        "divergences": divergences[-max_divergences:] if max_divergences > 0 else [],
+    }
+
+
+# ===========================================================================================
+# output
+# ===========================================================================================
+
+def _rate(stats: Dict[str, Any]) -> str:
+    rate = stats.get("hit_rate")
+    return "    -" if rate is None else f"{rate * 100:4.0f}%"
+
+
+def _line(label: str, stats: Dict[str, Any], width: int) -> str:
+    return (f"  {label:<{width}} {stats['attempts']:>6} att  {stats['input_tokens']:>10} in  "
+            f"{stats['cached_input_tokens']:>10} cached  {stats['uncached_input_tokens']:>10} "
+            f"uncached  {_rate(stats)}")
+
+
+def _print_human(report: Dict[str, Any], counts: Dict[str, int], out) -> None:
+    print(f"prompt cache report — {counts['lines_read']} lines from {counts['files_read']} "
+          f"file(s), {counts['unparsable_lines']} unparsable", file=out)
+    print(_line("all", report["totals"], _LABEL), file=out)
+    for title, section in (("surface", report["by_surface"]), ("channel", report["by_channel"])):
+        if not section:
+            continue
+        print(f"\nby {title}:", file=out)
+        for name, stats in section.items():
+            print(_line(name, stats, _LABEL), file=out)
+            for reason, fork in stats["fork_reasons"].items():
+                if reason != NO_FORK:
+                    print(_line(f"  fork={reason}", fork, _LABEL), file=out)
+            pre = stats.get("prefix")
+            if pre:
+                print(f"    prefix: {pre['renders']} renders — {pre[IDENTICAL]} identical, "
+                      f"{pre[APPEND]} append, {pre[REWRITE]} rewrite, "
+                      f"{pre[UNLOCATED]} unlocated", file=out)
+    if report["by_prefix_outcome"]:
+        print("\nby prefix outcome of the turn's render:", file=out)
+        for name, stats in report["by_prefix_outcome"].items():
+            print(_line(name, stats, _LABEL), file=out)
+    if report["divergences"]:
+        print(f"\nrewrites ({report['divergence_count']}, newest "
+              f"{len(report['divergences'])} shown):", file=out)
+        for d in report["divergences"]:
+            changed = ", ".join(d["changed"]) or "no pinned input"
+            print(f"  {d['channel_id']} turn {d['turn_id']} (after {d['previous_turn_id']}): "
+                  f"item {d['index']} {d['before']} -> {d['after']}, {d['kept'] * 100:.0f}% "
+                  f"kept; changed: {changed}", file=out)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="prompt_cache_report",
+        description="Cached vs uncached input tokens and channel-stream prefix stability, "
+                    "from participation.jsonl.")
+    parser.add_argument("paths", nargs="+", metavar="LEDGER",
+                        help="participation.jsonl files (rotations too, oldest first)")
+    parser.add_argument("--json", action="store_true", dest="as_json",
+                        help="machine-readable report on stdout")
+    parser.add_argument("--divergences", type=int, default=20, metavar="N",
+                        help="list the newest N rewrites (default 20, 0 for none)")
+    args = parser.parse_args(argv)
+
+    rows, counts = read_rows(args.paths)
+    if not counts["files_read"]:
+        print("prompt_cache_report: no readable ledger", file=sys.stderr)
+        return 2
+    report = build_report(rows, max_divergences=args.divergences)
+    if args.as_json:
+        json.dump({"counts": counts, **report}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        _print_human(report, counts, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
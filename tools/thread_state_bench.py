@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""A turn-preparation benchmark for warm threads: full rebuilds vs. event deltas.
+
+    python3 -m tools.thread_state_bench [--messages 1500] [--turns 200] [--edit-rate 0.2] [--json]
+
+Each run warms one thread of `--messages` messages, then plays `--turns` turns against it. Before
+every turn a human posts a reply, and with the given probabilities edits or deletes one of the
+earlier human messages. Events go through the real listener feed (`_feed_thread_state`) and the
+turn through the real `_get_or_rebuild_thread_state`; only Slack is simulated — a transcript in
+memory whose conversations.replies costs `--page-ms` per `--page-size` messages, and whose
+root-only counter read costs one page. `--miss-rate` drops that share of events on the floor, the
+way a Socket Mode reconnect does, so the consistency check has something to catch.
+
+Reported per mode (THREAD_STATE_DELTAS off, then on): full rebuilds, turns served by deltas,
+counter checks and divergences, Slack pages read, and p50/p99/max turn-preparation latency.
+Both modes replay the same seeded event stream. No network, no database.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
+
+from config import config
+from message_processor.client_contract import BaseClient, Message
+from message_processor.thread_management import ThreadManagementMixin
+from message_processor.thread_manager import AsyncThreadStateManager
+from message_processor.utilities import MessageUtilitiesMixin
+from slack_client.event_handlers.message_events import SlackMessageEventsMixin
+
+CHANNEL, ROOT = "C0BENCH", "1000000.000000"
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _ts(n: int) -> str:
+    return f"{1000000 + n}.000000"
+
+
+class _Quiet:
+    def log_info(self, *a, **k): pass
+    log_debug = log_warning = log_error = log_info
+
+
+class _Proc(_Quiet, ThreadManagementMixin, MessageUtilitiesMixin):
+    def __init__(self):
+        self.db = None
+        self.thread_manager = AsyncThreadStateManager(db=None)
+        self.openai_client = None
+        self.document_handler = None
+
+    def _update_status(self, *a, **k): pass
+
+
+class _Listener(_Quiet, SlackMessageEventsMixin):
+    def __init__(self, proc: _Proc):
+        self.processor = proc
+
+    def is_own_message(self, event: Dict[str, Any]) -> bool:
+        return False
+
+
+class _Slack:
+    """The thread as Slack holds it, and what reading it costs."""
+
+    def __init__(self, messages: int, page_size: int, page_ms: float):
+        self.transcript: List[Dict[str, str]] = [
+            {"ts": _ts(i), "text": f"message {i} about the rollout plan"} for i in range(messages)]
+        self.page_size, self.page_ms = page_size, page_ms
+        self.pages = 0
+        self.user_cache: Dict[str, Dict[str, Any]] = {}
+        self.name, self.bot_user_id = "slack", "UBOT"
+
+    async def _read(self, pages: int) -> None:
+        self.pages += pages
+        await asyncio.sleep(pages * self.page_ms / 1000.0)
+
+    async def get_thread_history(self, channel_id, thread_id, limit=None, oldest=None):
+        await self._read(max(1, -(-len(self.transcript) // self.page_size)))
+        history = []
+        for i, raw in enumerate(self.transcript):
+            metadata = {"ts": raw["ts"], "is_bot": False, "sender_type": "human",
+                        "bot_name": None, "username": "Peter", "reactions": None}
+            if i == 0:
+                metadata.update(self._counters_meta())
+            history.append(Message(text=raw["text"], user_id="U1", channel_id=channel_id,
+                                   thread_id=thread_id, attachments=[], metadata=metadata))
+        return history
+
+    async def get_thread_reply_counters(self, channel_id, thread_id) -> Tuple[int, str]:
+        await self._read(1)
+        meta = self._counters_meta()
+        return meta["reply_count"], meta["latest_reply"]
+
+    def _counters_meta(self) -> Dict[str, Any]:
+        return {"reply_count": len(self.transcript) - 1, "latest_reply": self.transcript[-1]["ts"]}
+
+
+async def _run_mode(deltas: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    saved = config.thread_state_deltas
+    config.thread_state_deltas = deltas
+    try:
+        return await _play(args)
+    finally:
+        config.thread_state_deltas = saved
+
+
+async def _play(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    slack = _Slack(args.messages, args.page_size, args.page_ms)
+    proc = _Proc()
+    listener = _Listener(proc)
+    next_n = args.messages
+
+    def deliver(event: Dict[str, Any]) -> None:
+        if rng.random() >= args.miss_rate:
+            listener._feed_thread_state(event)
+
+    async def turn(ts: str) -> float:
+        started = time.perf_counter()
+        incoming = Message(text="next", user_id="U1", channel_id=CHANNEL, thread_id=ROOT,
+                           attachments=[], metadata={"ts": ts})
+        state = await proc._get_or_rebuild_thread_state(
+            incoming, cast(BaseClient, slack))  # the two reads a warm turn makes, nothing more
+        elapsed = (time.perf_counter() - started) * 1000.0
+        if not any((m.get("metadata") or {}).get("ts") == ts for m in state.messages):
+            state.add_message("user", slack.transcript[-1]["text"], message_ts=ts)
+        return elapsed
+
+    await turn(slack.transcript[-1]["ts"])  # warm-up: the cold rebuild every mode pays once
+    latencies: List[float] = []
+    for _ in range(args.turns):
+        if rng.random() < args.edit_rate and len(slack.transcript) > 2:
+            raw = rng.choice(slack.transcript[1:])
+            old, raw["text"] = raw["text"], raw["text"] + " (edited)"
+            deliver({"channel": CHANNEL, "subtype": "message_changed",
+                     "message": {"ts": raw["ts"], "thread_ts": ROOT, "text": raw["text"]},
+                     "previous_message": {"ts": raw["ts"], "text": old}})
+        if rng.random() < args.delete_rate and len(slack.transcript) > 2:
+            raw = slack.transcript.pop(rng.randrange(1, len(slack.transcript)))
+            deliver({"channel": CHANNEL, "subtype": "message_deleted", "deleted_ts": raw["ts"],
+                     "previous_message": {"ts": raw["ts"], "thread_ts": ROOT,
+                                          "text": raw["text"]}})
+        ts = _ts(next_n)
+        next_n += 1
+        slack.transcript.append({"ts": ts, "text": f"message {next_n} asking what changed"})
+        deliver({"channel": CHANNEL, "ts": ts, "thread_ts": ROOT})
+        latencies.append(await turn(ts))
+
+    stats = proc.thread_manager.get_rebuild_stats()
+    return {
+        "thread_state_deltas": config.thread_state_deltas,
+        "turns": len(latencies),
+        "rebuilds": stats["rebuilds"] - 1,  # not counting the warm-up
+        "delta_turns": stats["delta_turns"],
+        "checks": stats["checks"],
+        "divergences": stats["divergences"],
+        "slack_pages": slack.pages,
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+    }
+
+
+def _print_human(results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+    print(f"{args.messages}-message thread, {args.turns} turns; per turn edit {args.edit_rate:g} "
+          f"delete {args.delete_rate:g} missed events {args.miss_rate:g}; a page is "
+          f"{args.page_size} messages / {args.page_ms:g}ms")
+    for r in results:
+        label = "deltas ON " if r["thread_state_deltas"] else "deltas OFF"
+        print(f"  {label}: rebuilds {r['rebuilds']:>4}  delta turns {r['delta_turns']:>4}  "
+              f"checks {r['checks']:>4}  divergences {r['divergences']:>3}  "
+              f"pages {r['slack_pages']:>5}  p50 {r['p50_ms']:>8.2f}ms  "
+              f"p99 {r['p99_ms']:>8.2f}ms  max {r['max_ms']:>8.2f}ms")
+
+
+async def _amain(args: argparse.Namespace) -> int:
+    results = [await _run_mode(False, args), await _run_mode(True, args)]
+    if args.as_json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        _print_human(results, args)
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1500, help="messages in the warm thread")
+    parser.add_argument("--turns", type=int, default=200, help="turns played against it")
+    parser.add_argument("--edit-rate", type=float, default=0.2,
+                        help="chance per turn that an earlier message is edited first")
+    parser.add_argument("--delete-rate", type=float, default=0.05,
+                        help="chance per turn that an earlier message is deleted first")
+    parser.add_argument("--miss-rate", type=float, default=0.0,
+                        help="share of events never delivered (exercises the counter check)")
+    parser.add_argument("--page-size", type=int, default=200,
+                        help="messages per conversations.replies page")
+    parser.add_argument("--page-ms", type=float, default=150.0,
+                        help="simulated latency of one Slack page")
+    parser.add_argument("--seed", type=int, default=7, help="seed for the event stream")
+    parser.add_argument("--json", action="store_true", dest="as_json",
+                        help="machine-readable results on stdout")
+    return asyncio.run(_amain(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""An end-to-end turn benchmark: the whole bot against local Slack and OpenAI stand-ins.
+
+    python3 -m tools.turn_bench [--channels 4] [--turns 40] [--concurrency 4] [--history 60]
+                                [--slack-latency-ms 40] [--rate-limit-ratio 0] [--ttft-ms 300]
+                                [--unpaced] [--json]
+
+Nothing is simulated inside the bot. `tools/fake_slack.py` and `tools/fake_openai.py` listen on
+loopback; the bot is a real `ChatBotV2`, initialized the way `main.py` does it (database,
+migrations, receipts) in a temporary directory, and its Socket Mode client connects to the fake.
+Each turn is a human @mention posted to the fake workspace and delivered over that socket, so it
+goes through Bolt, the listener, `handle_message`, the gate, the channel stream, the streamed
+model call and the posting of the reply — every Slack call on the way is a real HTTP request the
+fake counts.
+
+Traffic: `--channels` channels, each seeded with `--history` messages (every fifth one a thread
+with a few replies) before the bot starts. Turns go round-robin over the channels with at most
+one in flight per channel, `--concurrency` channels at a time; `--thread-share` of them are
+replies inside a thread the bot already answered. The first turn in each channel is a warm-up
+and is not measured — it pays for first contact (settings card, cold caches).
+
+Reported: p50/p99/max turn latency (event delivered → `handle_message` returned), Slack calls
+per turn in total and by method, 429s served, model requests per turn with the connections
+they opened (a warm pool opens none), and resident memory before and after the measured turns.
+`--tracemalloc` adds the Python heap growth, at a large cost to the latencies.
+
+PACING. By default the bot's client-side rate scheduler is on, as in production, and it spaces
+calls to each method at Slack's published tier — so with a few channels busy at once most of a
+turn is spent waiting for `conversations.replies` tokens, not working. That is the number a
+capacity question wants. `--unpaced` turns the scheduler off to measure what the bot itself
+costs per turn, which is the number an optimisation wants. What the numbers are good for is
+comparing two builds, or two settings, on the same machine — not predicting production, where
+Slack and the model set the pace.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from tools.fake_openai import FakeOpenAI
+from tools.fake_slack import BOT_USER_ID, FakeSlack
+
+_PEOPLE = ("Dana Whitfield", "Jamie Jensen", "Riley Reyes", "Sam Sutton", "Tessa Tran",
+           "Alice Anderson")
+_LINES = ("Did the rollout finish on the staging cluster?",
+          "I think the retry budget is too low for the nightly job.",
+          "Can someone check why the dashboard shows a gap after midnight?",
+          "The migration notes are in the usual doc, second section.",
+          "We should move the review to Thursday.",
+          "Latency looks fine since the cache change went in.")
+# How long one turn may take before it is counted as unanswered and the run moves on.
+_TURN_TIMEOUT_S = 120.0
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _rss_mb() -> float:
+    """Resident set size now, from /proc; the peak from getrusage where /proc is missing."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _seed(slack: FakeSlack, channels: int, history: int, rng: random.Random) -> List[str]:
+    """The workspace the bot wakes up in: people, channels, and some conversation already had."""
+    people = [slack.add_user(f"U0PERSON{i:02d}", name)["id"] for i, name in enumerate(_PEOPLE)]
+    channel_ids = []
+    for c in range(channels):
+        channel_id = f"C0BENCH{c:03d}"
+        slack.add_channel(channel_id, f"bench-{c}", people)
+        for n in range(history):
+            root = slack.post(channel_id, rng.choice(_LINES), user=rng.choice(people))
+            if n % 5 == 0:
+                for _ in range(3):
+                    slack.post(channel_id, rng.choice(_LINES), user=rng.choice(people),
+                               thread_ts=root["ts"])
+        channel_ids.append(channel_id)
+    return channel_ids
+
+
+def _point_bot_at(slack_url: str, openai_url: str, workdir: str, *, paced: bool) -> None:
+    """Environment first (read at import), then the live config (in case it was imported)."""
+    settings = {"SLACK_API_URL": slack_url, "OPENAI_BASE_URL": openai_url,
+                "SLACK_RATE_SCHEDULER": "true" if paced else "false",
+                "SLACK_BOT_TOKEN": "xoxb-bench", "SLACK_APP_TOKEN": "xapp-bench",
+                "OPENAI_API_KEY": "sk-bench", "DATABASE_DIR": workdir, "LOG_DIRECTORY": workdir,
+                "CONSOLE_LOGGING_ENABLED": "FALSE"}
+    os.environ.update(settings)
+    from config import config
+    config.slack_api_url, config.database_dir = slack_url, workdir
+    config.slack_bot_token, config.slack_app_token = "xoxb-bench", "xapp-bench"
+    config.openai_api_key, config.log_directory = "sk-bench", workdir
+    config.slack_rate_scheduler = paced
+
+
+class _Turns:
+    """Wraps `handle_message` so every turn reports when it is done, keyed by its message ts."""
+
+    def __init__(self) -> None:
+        self.waiting: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.handler_s: List[float] = []
+
+    def expect(self, channel_id: str, ts: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[(channel_id, ts)] = future
+        return future
+
+    def wrap(self, bot: Any, handle: Any) -> Any:
+        async def timed(message: Any, client: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await handle(bot, message, client)
+            finally:
+                self.handler_s.append(time.perf_counter() - started)
+                future = self.waiting.pop(
+                    (message.channel_id, str((message.metadata or {}).get("ts"))), None)
+                if future is not None and not future.done():
+                    future.set_result(time.perf_counter())
+        return timed
+
+
+async def _turn(slack: FakeSlack, turns: _Turns, channel_id: str, user: str, text: str,
+                thread_ts: Optional[str]) -> Tuple[Optional[float], str]:
+    """One @mention, delivered over the socket: its latency (None when it went unanswered), and
+    its ts."""
+    message = slack.post(channel_id, f"<@{BOT_USER_ID}> {text}", user=user, thread_ts=thread_ts)
+    event = slack.message_event(message, channel_id)
+    event["type"] = "app_mention"
+    done = turns.expect(channel_id, message["ts"])
+    sent = time.perf_counter()
+    await slack.inject(event)
+    try:
+        return await asyncio.wait_for(done, _TURN_TIMEOUT_S) - sent, message["ts"]
+    except asyncio.TimeoutError:
+        turns.waiting.pop((channel_id, message["ts"]), None)
+        return None, message["ts"]
+
+
+async def _amain(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    slack = FakeSlack(latency_ms=args.slack_latency_ms, jitter_ms=args.slack_jitter_ms,
+                      rate_limit_ratio=args.rate_limit_ratio, retry_after_s=args.retry_after,
+                      seed=args.seed)
+    model = FakeOpenAI(ttft_ms=args.ttft_ms, delta_ms=args.delta_ms, deltas=args.deltas)
+    channels = _seed(slack, args.channels, args.history, rng)
+    people = [u for u in slack.users if u != BOT_USER_ID]
+    workdir = tempfile.mkdtemp(prefix="turn-bench-")
+    _point_bot_at(await slack.start(), await model.start(), workdir, paced=not args.unpaced)
+
+    import main as bot_main  # after _point_bot_at: the bot reads its settings at import
+    bot = bot_main.ChatBotV2()
+    turns = _Turns()
+    setattr(bot, "handle_message", turns.wrap(bot, bot_main.ChatBotV2.handle_message))
+    # What `run()` does around the client: shutdown cancels every task but its own and this one.
+    bot._run_task = asyncio.current_task()
+    await bot.initialize()
+    client = bot.client
+    assert client is not None, "initialize() builds the Slack client"
+    bot.running = True
+    client_task = asyncio.create_task(client.start())
+
+    answered: Dict[str, List[str]] = {c: [] for c in channels}
+    locks = {c: asyncio.Lock() for c in channels}
+    gate = asyncio.Semaphore(max(1, args.concurrency))
+    latencies: List[float] = []
+    unanswered = 0
+
+    async def _one(n: int, measured: bool) -> None:
+        nonlocal unanswered
+        channel_id = channels[n % len(channels)]
+        async with gate, locks[channel_id]:
+            roots = answered[channel_id]
+            thread_ts = (rng.choice(roots) if roots and rng.random() < args.thread_share
+                         else None)
+            latency, ts = await _turn(slack, turns, channel_id, rng.choice(people),
+                                  rng.choice(_LINES), thread_ts)
+            if latency is None:
+                unanswered += measured
+                return
+            if thread_ts is None:
+                roots.append(ts)
+            if measured:
+                latencies.append(latency)
+
+    try:
+        await asyncio.gather(*(_one(n, False) for n in range(len(channels))))
+        gc.collect()
+        calls_before, limited_before = Counter(slack.calls), Counter(slack.rate_limited)
+        model_before = model.calls["stream"] + model.calls["create"]
+        transport = bot.processor.openai_client.transport
+        opened_before, sent_before = transport.connections_opened, transport.requests
+        handler_before = len(turns.handler_s)
+        rss_before = _rss_mb()
+        if args.tracemalloc:
+            tracemalloc.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(_one(len(channels) + n, True) for n in range(args.turns)))
+        wall = time.perf_counter() - started
+        heap_growth = None
+        if args.tracemalloc:
+            gc.collect()
+            heap_growth = tracemalloc.get_traced_memory()[0] / 1024.0
+            tracemalloc.stop()
+        gc.collect()
+        rss_after = _rss_mb()
+        opened = transport.connections_opened - opened_before
+        sent = transport.requests - sent_before
+    finally:
+        await bot.begin_shutdown()
+        client_task.cancel()
+        await asyncio.gather(client_task, return_exceptions=True)
+        await slack.stop()
+        await model.stop()
+
+    measured = max(1, len(latencies))
+    calls = slack.calls - calls_before
+    handler = turns.handler_s[handler_before:]
+    return {
+        "channels": args.channels, "turns": args.turns, "answered": len(latencies),
+        "unanswered": unanswered, "concurrency": args.concurrency, "history": args.history,
+        "slack_latency_ms": args.slack_latency_ms, "rate_limit_ratio": args.rate_limit_ratio,
+        "ttft_ms": args.ttft_ms, "paced": not args.unpaced, "wall_s": round(wall, 3),
+        "turns_per_s": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": {"p50": round(_percentile(latencies, 50) * 1000, 1),
+                       "p99": round(_percentile(latencies, 99) * 1000, 1),
+                       "max": round(max(latencies, default=0.0) * 1000, 1),
+                       "mean": round(statistics.fmean(latencies) * 1000, 1) if latencies
+                       else 0.0},
+        "handler_ms_p50": round(_percentile(handler, 50) * 1000, 1),
+        "slack_calls_per_turn": round(sum(calls.values()) / measured, 2),
+        "slack_calls_by_method": {m: round(n / measured, 2) for m, n in calls.most_common()},
+        "rate_limited": sum((slack.rate_limited - limited_before).values()),
+        "model_requests_per_turn": round((model.calls["stream"] + model.calls["create"]
+                                          - model_before) / measured, 2),
+        "model_connections": {"opened": opened, "requests": sent,
+                              "reuse_rate": round(1 - opened / sent, 3) if sent else None},
+        "rss_mb": {"before": round(rss_before, 1), "after": round(rss_after, 1),
+                   "growth": round(rss_after - rss_before, 1)},
+        "rss_kb_per_turn": round((rss_after - rss_before) * 1024 / measured, 1),
+        "heap_growth_kb": None if heap_growth is None else round(heap_growth, 1),
+    }
+
+
+def _print_human(result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(f"{result['answered']}/{result['turns']} turns answered over {result['channels']} "
+          f"channel(s), {result['concurrency']} at a time, in {result['wall_s']:.1f}s "
+          f"({result['turns_per_s']:.2f} turns/s), "
+          f"{'paced' if result['paced'] else 'unpaced'}")
+    print(f"  turn latency    p50 {latency['p50']:8.1f} ms   p99 {latency['p99']:8.1f} ms   "
+          f"max {latency['max']:8.1f} ms   (handler p50 {result['handler_ms_p50']:.1f} ms)")
+    print(f"  Slack calls     {result['slack_calls_per_turn']:.2f} per turn, "
+          f"{result['rate_limited']} answered 429")
+    for method, per_turn in result["slack_calls_by_method"].items():
+        print(f"      {method:<32} {per_turn:6.2f}")
+    connections = result["model_connections"]
+    print(f"  model requests  {result['model_requests_per_turn']:.2f} per turn, "
+          f"{connections['opened']} new connection(s) for {connections['requests']} "
+          f"request(s)")
+    rss = result["rss_mb"]
+    print(f"  memory          RSS {rss['before']:.1f} → {rss['after']:.1f} MB "
+          f"({result['rss_kb_per_turn']:+.1f} KB/turn)"
+          + (f", heap +{result['heap_growth_kb']:.0f} KB"
+             if result["heap_growth_kb"] is not None else ""))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=40, help="measured turns")
+    parser.add_argument("--concurrency", type=int, default=4, help="channels in flight at once")
+    parser.add_argument("--history", type=int, default=60, help="seed messages per channel")
+    parser.add_argument("--thread-share", type=float, default=0.5,
+                        help="share of turns asked inside a thread the bot answered")
+    parser.add_argument("--slack-latency-ms", type=float, default=40.0)
+    parser.add_argument("--slack-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0,
+                        help="share of Slack calls refused with HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After on a 429 (s)")
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="model time to first token")
+    parser.add_argument("--delta-ms", type=float, default=15.0, help="gap between text deltas")
+    parser.add_argument("--deltas", type=int, default=12, help="text deltas per answer")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--unpaced", action="store_true",
+                        help="turn the bot's Slack rate scheduler off (see PACING above)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="also measure Python heap growth (slows every turn)")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+    # Bolt prints its boot banner; keep stdout for the report so `--json` stays parseable.
+    with contextlib.redirect_stdout(sys.stderr):
+        result = asyncio.run(_amain(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_human(result)
+    return 0 if not result["unanswered"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())